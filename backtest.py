@@ -3,25 +3,124 @@ Backtesting Module for F&O Trading Bot
 Test strategy on historical data
 """
 
+import numpy as np
 import pandas as pd
 import logging
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Optional, Tuple
 
 from src.fno_trading_bot import FnOTradingBot
 from src.trading_models import TradeType
 from src.indicators import TechnicalIndicators
 from src.trading_config import TradingConfig
+from src.candle_store import CandleStore
 from src.utils import setup_logging
 
 
 logger = logging.getLogger(__name__)
 
+# Compact mode: the only columns the bot reads during a backtest.
+# Prices stay float64 (premiums and P&L are derived from them), and so do
+# MACD, Signal and Histogram: the entry checks compare them with each other
+# and with the previous bar, and two close float64 values can round to the
+# same float32. RSI and ADX, checked against config thresholds, are float32.
+COMPACT_DAILY_COLUMNS = ['close', 'ADX']
+COMPACT_INTRADAY_COLUMNS = ['close', 'MACD', 'MACD_Signal', 'MACD_Hist', 'RSI']
+COMPACT_CROSSOVER_COLUMNS = ['MACD_Cross_Up', 'MACD_Cross_Down', 'DI_Cross_Up', 'DI_Cross_Down']
+FLOAT32_COLUMNS = {'RSI', 'ADX', '+DI', '-DI'}
+
+
+def load_history_from_store(
+    instruments: Dict[str, Tuple[str, str]],
+    start: datetime,
+    end: Optional[datetime] = None,
+    store_dir: str = "data/candles"
+) -> tuple:
+    """
+    Load daily and 15-minute bars from the on-disk candle store
+    
+    The live bot and diagnostic scripts persist every history download
+    there, so recent sessions can be backtested without any API calls.
+    
+    Parameters:
+    -----------
+    instruments : Dict[str, Tuple[str, str]]
+        Underlying -> (exchange, instrument_token)
+        Example: {"NIFTY50": ("NSE", "26000"), "BANKNIFTY": ("NSE", "26009")}
+    start : datetime
+        First bar to load (naive values are taken as IST)
+    end : Optional[datetime]
+        Last bar to load (default: everything stored)
+    store_dir : str
+        Candle store root directory
+        
+    Returns:
+    --------
+    tuple
+        (daily_data_dict, intraday_data_dict) ready for run_backtest;
+        underlyings with no stored data are left out
+    """
+    store = CandleStore(store_dir)
+    daily_data = {}
+    intraday_data = {}
+    
+    for underlying, (exchange, token) in instruments.items():
+        daily = store.read((exchange.upper(), str(token), "day"), start, end)
+        intraday = store.read((exchange.upper(), str(token), "15minute"), start, end)
+        if daily is None or intraday is None:
+            logger.warning(f"No stored candles for {underlying} ({exchange}:{token}) - skipping")
+            continue
+        daily_data[underlying] = daily
+        intraday_data[underlying] = intraday
+    
+    return daily_data, intraday_data
+
+
+def _indicator_columns(data: pd.DataFrame, config: TradingConfig) -> Dict[str, pd.Series]:
+    """MACD/RSI/ADX columns (float64) for an OHLC frame"""
+    columns = {}
+    columns['MACD'], columns['MACD_Signal'], columns['MACD_Hist'] = \
+        TechnicalIndicators.calculate_macd(data['close'], config.macd_fast, config.macd_slow, config.macd_signal)
+    columns['RSI'] = TechnicalIndicators.calculate_rsi(data['close'], config.rsi_period)
+    columns['ADX'], columns['+DI'], columns['-DI'] = \
+        TechnicalIndicators.calculate_adx(data['high'], data['low'], data['close'], config.adx_period)
+    return columns
+
+
+def _compact_frame(data: pd.DataFrame, config: TradingConfig, keep: list, crossovers: bool) -> pd.DataFrame:
+    """
+    Indicator frame holding only `keep` columns (FLOAT32_COLUMNS as float32)
+    
+    Rows are the ones the full frame keeps after dropna, and crossover
+    masks are taken from the float64 values, so every row and every
+    crossover flag is the same as in the full frame. The source OHLC is
+    never copied as a whole.
+    """
+    indicators = _indicator_columns(data, config)
+    valid = data.notna().all(axis=1).to_numpy().copy()
+    for values in indicators.values():
+        valid &= values.notna().to_numpy()
+    
+    columns = {}
+    for name in keep:
+        values = (indicators[name] if name in indicators else data[name]).to_numpy()[valid]
+        columns[name] = values.astype(np.float32) if name in FLOAT32_COLUMNS else values
+    frame = pd.DataFrame(columns, index=data.index[valid])
+    
+    if crossovers:
+        kept = {name: indicators[name].to_numpy()[valid] for name in ('MACD', 'MACD_Signal', '+DI', '-DI')}
+        frame['MACD_Cross_Up'], frame['MACD_Cross_Down'] = \
+            TechnicalIndicators.crossover_masks(kept['MACD'], kept['MACD_Signal'])
+        frame['DI_Cross_Up'], frame['DI_Cross_Down'] = \
+            TechnicalIndicators.crossover_masks(kept['+DI'], kept['-DI'])
+    return frame
+
 
 def prepare_data_with_indicators(
     daily_data: pd.DataFrame,
     intraday_data: pd.DataFrame,
-    config: TradingConfig
+    config: TradingConfig,
+    compact: bool = False
 ) -> tuple:
     """
     Add technical indicators to daily and intraday data
@@ -34,41 +133,69 @@ def prepare_data_with_indicators(
         15-minute OHLC data
     config : TradingConfig
         Trading configuration
+    compact : bool
+        Keep only the columns the backtest reads (COMPACT_*_COLUMNS), with
+        RSI and ADX stored as float32. Rows, prices, MACD columns and
+        crossover flags are the same as the full frames; RSI and ADX differ
+        from float64 by float32 rounding only (about 7 significant digits).
+        Use it for long horizons (e.g. multi-year 1-minute data)
         
     Returns:
     --------
     tuple
         (daily_data_with_indicators, intraday_data_with_indicators)
     """
+    if compact:
+        daily = _compact_frame(daily_data, config, COMPACT_DAILY_COLUMNS, crossovers=False)
+        intraday = _compact_frame(intraday_data, config, COMPACT_INTRADAY_COLUMNS, crossovers=True)
+        return daily, intraday
+    
     # Calculate indicators for daily data
     daily = daily_data.copy()
-    daily['MACD'], daily['MACD_Signal'], daily['MACD_Hist'] = \
-        TechnicalIndicators.calculate_macd(daily['close'], config.macd_fast, config.macd_slow, config.macd_signal)
-    daily['RSI'] = TechnicalIndicators.calculate_rsi(daily['close'], config.rsi_period)
-    daily['ADX'], daily['+DI'], daily['-DI'] = \
-        TechnicalIndicators.calculate_adx(daily['high'], daily['low'], daily['close'], config.adx_period)
+    for name, values in _indicator_columns(daily, config).items():
+        daily[name] = values
     
     # Calculate indicators for intraday data
     intraday = intraday_data.copy()
-    intraday['MACD'], intraday['MACD_Signal'], intraday['MACD_Hist'] = \
-        TechnicalIndicators.calculate_macd(intraday['close'], config.macd_fast, config.macd_slow, config.macd_signal)
-    intraday['RSI'] = TechnicalIndicators.calculate_rsi(intraday['close'], config.rsi_period)
-    intraday['ADX'], intraday['+DI'], intraday['-DI'] = \
-        TechnicalIndicators.calculate_adx(intraday['high'], intraday['low'], intraday['close'], config.adx_period)
+    for name, values in _indicator_columns(intraday, config).items():
+        intraday[name] = values
     
     # Drop NaN values
     daily = daily.dropna()
     intraday = intraday.dropna()
     
+    # Crossover masks for every bar at once: reversal exits become lookups
+    intraday = TechnicalIndicators.add_crossover_columns(intraday)
+    
     return daily, intraday
 
 
+def memory_budget(daily: pd.DataFrame, intraday: pd.DataFrame) -> Dict:
+    """
+    Bytes held by one underlying's prepared frames
+    
+    Returns:
+    --------
+    Dict
+        daily_bytes, intraday_bytes, total_bytes and intraday bytes_per_bar
+    """
+    daily_bytes = int(daily.memory_usage(index=True, deep=True).sum())
+    intraday_bytes = int(intraday.memory_usage(index=True, deep=True).sum())
+    return {
+        'daily_bytes': daily_bytes,
+        'intraday_bytes': intraday_bytes,
+        'total_bytes': daily_bytes + intraday_bytes,
+        'bytes_per_bar': round(intraday_bytes / len(intraday), 1) if len(intraday) else 0.0,
+    }
+
+
 def run_backtest(
     daily_data_dict: Dict[str, pd.DataFrame],
     intraday_data_dict: Dict[str, pd.DataFrame],
     vix_data: pd.Series,
     config: TradingConfig,
-    output_file: str = "backtest_results.csv"
+    output_file: str = "backtest_results.csv",
+    compact: bool = False
 ):
     """
     Run backtest on historical data
@@ -86,6 +213,9 @@ def run_backtest(
         Trading configuration
     output_file : str
         Path to save results CSV
+    compact : bool
+        Prepare compact (column-pruned, float32 RSI/ADX) frames, see
+        prepare_data_with_indicators
     """
     logger.info("="*60)
     logger.info("STARTING BACKTEST")
@@ -97,24 +227,34 @@ def run_backtest(
     # Prepare data with indicators
     prepared_daily = {}
     prepared_intraday = {}
+    total_bytes = 0
     
     for underlying in daily_data_dict:
         logger.info(f"Preparing data for {underlying}...")
         daily, intraday = prepare_data_with_indicators(
             daily_data_dict[underlying],
             intraday_data_dict[underlying],
-            config
+            config,
+            compact=compact
         )
         prepared_daily[underlying] = daily
         prepared_intraday[underlying] = intraday
+        budget = memory_budget(daily, intraday)
+        total_bytes += budget['total_bytes']
         logger.info(f"  Daily: {len(daily)} candles | Intraday: {len(intraday)} candles")
+        logger.info(
+            f"  Memory: {budget['total_bytes'] / 1024 ** 2:.1f} MB "
+            f"(daily {budget['daily_bytes'] / 1024:.0f} KB, intraday {budget['bytes_per_bar']:.0f} bytes/bar)"
+        )
+    logger.info(f"Prepared data: {total_bytes / 1024 ** 2:.1f} MB for {len(prepared_intraday)} underlyings"
+                f"{' (compact)' if compact else ''}")
     
-    # Get common intraday timestamps across all underlyings
-    all_timestamps = set(prepared_intraday[list(prepared_intraday.keys())[0]].index)
+    # Get common intraday timestamps across all underlyings (sorted DatetimeIndex, no per-timestamp objects held)
+    all_timestamps = None
     for underlying in prepared_intraday:
-        all_timestamps &= set(prepared_intraday[underlying].index)
-    
-    all_timestamps = sorted(list(all_timestamps))
+        index = prepared_intraday[underlying].index
+        all_timestamps = index if all_timestamps is None else all_timestamps.intersection(index)
+    all_timestamps = all_timestamps.sort_values()
     logger.info(f"\nSimulating {len(all_timestamps)} time periods...")
     
     # Main backtest loop
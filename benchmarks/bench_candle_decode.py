@@ -0,0 +1,68 @@
+"""
+Candle decode benchmark: legacy DataFrame path vs NumPy decoder
+
+Usage:
+    python benchmarks/bench_candle_decode.py [--repeat 5] [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.candle_decoder import decode_candles
+
+
+def legacy_candles_to_frame(candles, timeframe):
+    """The pre-decoder MStockAPI._candles_to_frame, kept for comparison"""
+    cols = ["timestamp", "open", "high", "low", "close", "volume"]
+    df = pd.DataFrame(candles, columns=cols)
+    df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True).dt.tz_convert("Asia/Kolkata")
+    df.set_index("timestamp", inplace=True)
+    if timeframe != "day":
+        df = df.between_time("09:15", "15:30")
+    return df[["open", "high", "low", "close"]]
+
+
+def make_payload(n):
+    """n 15-minute candles shaped like the historical endpoint's JSON (round the clock, so the mask has work)"""
+    index = pd.date_range("2020-01-01 09:15", periods=n, freq="15min", tz="Asia/Kolkata")
+    stamps = index.strftime("%Y-%m-%dT%H:%M:%S+0530")
+    return [[stamps[i], 100.0 + i % 50, 101.0 + i % 50, 99.0 + i % 50, 100.5 + i % 50, 1000 + i] for i in range(n)]
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark historical candle decoding")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'candles':>10} {'legacy ms':>11} {'arrays ms':>11} {'+frame ms':>11} {'speedup':>9}")
+    for n in args.sizes:
+        payload = make_payload(n)
+
+        legacy = legacy_candles_to_frame(payload, "15minute")
+        decoded = decode_candles(payload, "15minute").to_frame()
+        assert legacy.index.equals(decoded.index) and (legacy.to_numpy(float) == decoded.to_numpy()).all()
+
+        t_legacy = best_of(lambda: legacy_candles_to_frame(payload, "15minute"), args.repeat)
+        t_arrays = best_of(lambda: decode_candles(payload, "15minute"), args.repeat)
+        t_frame = best_of(lambda: decode_candles(payload, "15minute").to_frame(), args.repeat)
+        print(f"{n:>10} {t_legacy * 1000:>11.2f} {t_arrays * 1000:>11.2f} {t_frame * 1000:>11.2f} {t_legacy / t_frame:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""
+Indicator micro-benchmarks with a JSON history and regression gating
+
+Times MACD/RSI/ADX, the crossover checks and masks, the incremental
+(per-tick) path and the batched (symbols x bars) kernels over a grid of
+series lengths and symbol counts. Each run is appended to a JSON history;
+the run fails (exit code 1) when a case's throughput drops more than
+--threshold percent below the median of the previous runs on this host.
+
+Usage:
+    python benchmarks/bench_indicators.py                  # full grid, 100 .. 10M bars, 1 .. 200 symbols
+    python benchmarks/bench_indicators.py --quick          # small grid for a pre-commit check
+    python benchmarks/bench_indicators.py --cases adx batched --lengths 1000 100000 --symbols 1 50
+    python benchmarks/bench_indicators.py --no-record --threshold 15
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from src.batch_indicators import indicators_2d
+from src.indicator_cache import IndicatorCache
+from src.indicators import TechnicalIndicators
+from src.streaming_indicators import ProvisionalIndicators
+
+DEFAULT_HISTORY = os.path.join(os.path.dirname(__file__), "indicator_history.json")
+DEFAULT_LENGTHS = [100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+DEFAULT_SYMBOLS = [1, 10, 50, 200]
+QUICK_LENGTHS = [100, 10_000]
+QUICK_SYMBOLS = [1, 10]
+
+# Largest symbols x bars grid cell timed per case (bigger cells are skipped, not failed).
+# The incremental path builds its committed state bar by bar before the timed ticks.
+MAX_CELLS = 20_000_000
+MAX_INCREMENTAL_CELLS = 1_000_000
+
+
+def make_frames(length, symbols, seed=7):
+    """`symbols` random-walk OHLC frames of `length` one-minute bars"""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2020-01-01 09:15", periods=length, freq="min", tz="Asia/Kolkata")
+    frames = []
+    for _ in range(symbols):
+        close = 23000 + np.cumsum(rng.normal(0, 20, length))
+        high = close + rng.uniform(0, 15, length)
+        low = close - rng.uniform(0, 15, length)
+        frames.append(pd.DataFrame({"open": close, "high": high, "low": low, "close": close}, index=index))
+    return frames
+
+
+def best_of(fn, repeat, budget=2.0, min_sample=0.02):
+    """
+    Fastest per-call time over up to `repeat` samples
+
+    Calls shorter than `min_sample` seconds are looped inside one sample so
+    timer resolution and scheduling noise do not dominate; sampling stops
+    early once `budget` seconds are spent (one sample is always taken).
+    """
+    start = time.perf_counter()
+    fn()
+    once = time.perf_counter() - start
+    number = 1 if once >= min_sample else int(min_sample / max(once, 1e-9)) + 1
+    best, spent = (once if number == 1 else float("inf")), once
+    for _ in range(repeat):
+        if spent > budget and best < float("inf"):
+            break
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        best, spent = min(best, elapsed / number), spent + elapsed
+    return best
+
+
+# Each case: setup(frames) -> (timed callable, work units per call, unit)
+
+def _macd(frames):
+    closes = [frame["close"] for frame in frames]
+    return lambda: [TechnicalIndicators.calculate_macd(close) for close in closes], "bars"
+
+
+def _rsi(frames):
+    closes = [frame["close"] for frame in frames]
+    return lambda: [TechnicalIndicators.calculate_rsi(close) for close in closes], "bars"
+
+
+def _adx(frames):
+    columns = [(frame["high"], frame["low"], frame["close"]) for frame in frames]
+    return lambda: [TechnicalIndicators.calculate_adx(*hlc) for hlc in columns], "bars"
+
+
+def _indicator_columns(frames):
+    pairs = []
+    for frame in frames:
+        macd, signal, _ = TechnicalIndicators.calculate_macd(frame["close"])
+        _, plus_di, minus_di = TechnicalIndicators.calculate_adx(frame["high"], frame["low"], frame["close"])
+        pairs.append((macd, signal, plus_di, minus_di))
+    return pairs
+
+
+def _crossover_checks(frames):
+    """The per-bar checks the entry/exit logic runs on the latest bar"""
+    pairs = _indicator_columns(frames)
+    last = len(frames[0]) - 1
+
+    def run():
+        for macd, signal, plus_di, minus_di in pairs:
+            TechnicalIndicators.check_macd_crossover_bullish(macd, signal, last)
+            TechnicalIndicators.check_macd_crossover_bearish(macd, signal, last)
+            TechnicalIndicators.check_di_crossover_bullish(plus_di, minus_di, last)
+            TechnicalIndicators.check_di_crossover_bearish(plus_di, minus_di, last)
+    return run, "symbol checks"
+
+
+def _crossover_masks(frames):
+    pairs = _indicator_columns(frames)
+
+    def run():
+        for macd, signal, plus_di, minus_di in pairs:
+            TechnicalIndicators.crossover_masks(macd, signal)
+            TechnicalIndicators.crossover_masks(plus_di, minus_di)
+    return run, "bars"
+
+
+def _incremental(frames):
+    """One tick per symbol against committed sealed bars (the live entry-loop path)"""
+    indicators = ProvisionalIndicators(cache=IndicatorCache())
+    for key, frame in enumerate(frames):
+        indicators.last(key, frame)
+    return lambda: [indicators.last(key, frame) for key, frame in enumerate(frames)], "symbol ticks"
+
+
+def _batched(frames):
+    high = np.vstack([frame["high"].to_numpy() for frame in frames])
+    low = np.vstack([frame["low"].to_numpy() for frame in frames])
+    close = np.vstack([frame["close"].to_numpy() for frame in frames])
+    return lambda: indicators_2d(high, low, close), "bars"
+
+
+CASES = {
+    "macd": _macd,
+    "rsi": _rsi,
+    "adx": _adx,
+    "crossover_checks": _crossover_checks,
+    "crossover_masks": _crossover_masks,
+    "incremental": _incremental,
+    "batched": _batched,
+}
+
+
+def case_key(case, length, symbols):
+    return f"{case}|bars={length}|symbols={symbols}"
+
+
+def run_suite(cases, lengths, symbols_list, repeat=5, max_cells=MAX_CELLS, verbose=True):
+    """
+    Time every case over the lengths x symbols grid
+
+    Returns:
+    --------
+    dict
+        case_key -> {"case", "bars", "symbols", "seconds", "throughput",
+        "unit"}; cells larger than
+        the case's limit are left out
+    """
+    results = {}
+    for length in lengths:
+        for symbols in symbols_list:
+            cells = length * symbols
+            applicable = [
+                case for case in cases
+                if cells <= (min(max_cells, MAX_INCREMENTAL_CELLS) if case == "incremental" else max_cells)
+            ]
+            if not applicable:
+                continue
+            frames = make_frames(length, symbols)
+            for case in applicable:
+                fn, unit = CASES[case](frames)
+                seconds = best_of(fn, repeat)
+                work = symbols if unit.startswith("symbol") else cells
+                key = case_key(case, length, symbols)
+                results[key] = {
+                    "case": case, "bars": length, "symbols": symbols,
+                    "seconds": seconds, "throughput": work / seconds, "unit": f"{unit}/s",
+                }
+                if verbose:
+                    print(f"{key:<48} {seconds * 1000:>11.3f} ms {work / seconds:>16,.0f} {unit}/s")
+    return results
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_history(path, history):
+    with open(path, "w") as f:
+        json.dump(history, f, indent=2)
+
+
+def environment():
+    """Identity of this run: host, library versions and the checked-out commit"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "host": platform.node(),
+        "machine": platform.machine(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "commit": commit,
+    }
+
+
+def find_regressions(results, history, host, threshold=15.0, baseline_runs=5):
+    """
+    Cases slower than the recent baseline by more than `threshold` percent
+
+    The baseline of a case is the median throughput of its last
+    `baseline_runs` results recorded on the same host (different machines
+    are never compared).
+
+    Returns:
+    --------
+    list
+        (case_key, baseline throughput, current throughput, change percent)
+    """
+    regressions = []
+    previous = [run for run in history if run.get("host") == host]
+    for key, result in results.items():
+        samples = [run["results"][key]["throughput"] for run in previous if key in run.get("results", {})]
+        if not samples:
+            continue
+        baseline = statistics.median(samples[-baseline_runs:])
+        change = (result["throughput"] / baseline - 1.0) * 100.0
+        if change < -threshold:
+            regressions.append((key, baseline, result["throughput"], change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark indicator calculations and gate on throughput regressions")
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--lengths", type=int, nargs="+")
+    parser.add_argument("--symbols", type=int, nargs="+")
+    parser.add_argument("--quick", action="store_true", help=f"lengths {QUICK_LENGTHS}, symbols {QUICK_SYMBOLS}")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--max-cells", type=int, default=MAX_CELLS, help="skip grid cells with more symbols x bars")
+    parser.add_argument("--history", default=DEFAULT_HISTORY)
+    parser.add_argument("--threshold", type=float, default=15.0, help="allowed throughput drop in percent")
+    parser.add_argument("--baseline-runs", type=int, default=5)
+    parser.add_argument("--no-record", action="store_true", help="compare only, do not append to the history")
+    args = parser.parse_args()
+
+    lengths = args.lengths or (QUICK_LENGTHS if args.quick else DEFAULT_LENGTHS)
+    symbols_list = args.symbols or (QUICK_SYMBOLS if args.quick else DEFAULT_SYMBOLS)
+
+    results = run_suite(args.cases, lengths, symbols_list, args.repeat, args.max_cells)
+    env = environment()
+    history = load_history(args.history)
+    regressions = find_regressions(results, history, env["host"], args.threshold, args.baseline_runs)
+    if regressions:
+        # Time flagged cases once more so one noisy sample does not fail the run
+        print(f"\nRe-timing {len(regressions)} case(s) below baseline...")
+        for key, *_ in regressions:
+            result = results[key]
+            again = run_suite([result["case"]], [result["bars"]], [result["symbols"]], args.repeat, args.max_cells)[key]
+            if again["throughput"] > result["throughput"]:
+                results[key] = again
+        regressions = find_regressions(results, history, env["host"], args.threshold, args.baseline_runs)
+
+    if not args.no_record:
+        history.append({
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            **env,
+            "threshold": args.threshold,
+            "results": results,
+            "regressions": [key for key, *_ in regressions],
+        })
+        save_history(args.history, history)
+        print(f"\nRecorded {len(results)} results to {args.history}")
+
+    if regressions:
+        print(f"\nREGRESSION: {len(regressions)} case(s) more than {args.threshold}% below baseline")
+        for key, baseline, current, change in regressions:
+            print(f"  {key:<48} {baseline:>16,.0f} -> {current:>16,.0f} ({change:+.1f}%)")
+        sys.exit(1)
+    print("\nNo throughput regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,9 @@ sys.path.insert(0, os.path.dirname(__file__))
 
 from src.market_data import MStockAPI
 from src.indicators import TechnicalIndicators
+from src.streaming_indicators import ProvisionalIndicators
 from src.trading_config import config
+from src.lookback import converged_tail, history_days
 from src.utils import now_ist
 import pandas as pd
 
@@ -34,11 +36,18 @@ def load_symbols():
             "NIFTY BANK": ("NSE", "26009")
         }
 
+def describe_bars_since(bars) -> str:
+    """Human-readable bars-since value (NaN = no cross in the window)"""
+    return "none in window" if pd.isna(bars) else f"{int(bars)} bars ago"
+
 def check_entry_diagnostics():
     """Check all entry conditions and show which ones pass/fail"""
     
     api = MStockAPI()
     symbols_config = load_symbols()
+    # Sealed bars come from the shared indicator cache when already computed in this process
+    daily_indicators = ProvisionalIndicators(timeframe="day")
+    intraday_indicators = ProvisionalIndicators(timeframe="15minute")
     
     print("\n" + "="*80)
     print("ENTRY CONDITION DIAGNOSTIC REPORT")
@@ -54,8 +63,8 @@ def check_entry_diagnostics():
         
         try:
             # Fetch data
-            daily_df = api.get_historical_data(symbol, exchange, instrument_token, "day", days=60)
-            intraday_df = api.get_historical_data(symbol, exchange, instrument_token, "15minute", days=10)
+            daily_df = api.get_historical_data(symbol, exchange, instrument_token, "day", days=history_days("day"))
+            intraday_df = api.get_historical_data(symbol, exchange, instrument_token, "15minute", days=history_days("15minute"))
             
             if daily_df is None or intraday_df is None:
                 print(f"Could not fetch data for {underlying}")
@@ -80,13 +89,14 @@ def check_entry_diagnostics():
                 }, index=[now_ist()])
                 intraday_df = pd.concat([intraday_df, live_candle])
             
-            # Calculate indicators
-            daily_df['MACD'], daily_df['MACD_Signal'], _ = TechnicalIndicators.calculate_macd(daily_df['close'])
-            daily_df['RSI'] = TechnicalIndicators.calculate_rsi(daily_df['close'])
+            # Calculate indicators (over the converged tail, as the bot does)
+            daily_df = daily_indicators.frame((exchange, symbol), converged_tail(daily_df))
+            intraday_df = intraday_indicators.frame((exchange, symbol), converged_tail(intraday_df))
             
-            intraday_df['MACD'], intraday_df['MACD_Signal'], _ = TechnicalIndicators.calculate_macd(intraday_df['close'])
-            intraday_df['RSI'] = TechnicalIndicators.calculate_rsi(intraday_df['close'])
-            intraday_df['ADX'], _, _ = TechnicalIndicators.calculate_adx(intraday_df['high'], intraday_df['low'], intraday_df['close'])
+            # Crossovers for the whole series in one pass (same rules as the bot's checks)
+            macd_up, macd_down = TechnicalIndicators.crossover_masks(intraday_df['MACD'], intraday_df['MACD_Signal'])
+            bars_since_up = TechnicalIndicators.bars_since(macd_up)[-1]
+            bars_since_down = TechnicalIndicators.bars_since(macd_down)[-1]
             
             # Get VIX
             vix_quote = api.get_quote("INDIA VIX", "NSE")
@@ -138,15 +148,13 @@ def check_entry_diagnostics():
             print(f"   Open = {daily_row['open']:.2f}, Close = {daily_row['close']:.2f}")
             
             # 5. 15m MACD crossover bullish
-            macd_crossover_bullish = (
-                current_row['MACD'] > current_row['MACD_Signal'] and
-                prev_row['MACD'] <= prev_row['MACD_Signal']
-            )
+            macd_crossover_bullish = bool(macd_up[-1])
             status = "PASS" if macd_crossover_bullish else "FAIL"
             conditions_ce.append(macd_crossover_bullish)
             print(f"5. 15m MACD Bullish Crossover: {status}")
             print(f"   Current: MACD = {current_row['MACD']:.2f}, Signal = {current_row['MACD_Signal']:.2f}")
             print(f"   Previous: MACD = {prev_row['MACD']:.2f}, Signal = {prev_row['MACD_Signal']:.2f}")
+            print(f"   Last bullish crossover: {describe_bars_since(bars_since_up)}")
             
             # 6. 15m RSI in range
             rsi = current_row['RSI']
@@ -199,15 +207,13 @@ def check_entry_diagnostics():
             print(f"   Open = {daily_row['open']:.2f}, Close = {daily_row['close']:.2f}")
             
             # 15m MACD crossover bearish
-            macd_crossover_bearish = (
-                current_row['MACD'] < current_row['MACD_Signal'] and
-                prev_row['MACD'] >= prev_row['MACD_Signal']
-            )
+            macd_crossover_bearish = bool(macd_down[-1])
             status = "PASS" if macd_crossover_bearish else "FAIL"
             conditions_pe.append(macd_crossover_bearish)
             print(f"5. 15m MACD Bearish Crossover: {status}")
             print(f"   Current: MACD = {current_row['MACD']:.2f}, Signal = {current_row['MACD_Signal']:.2f}")
             print(f"   Previous: MACD = {prev_row['MACD']:.2f}, Signal = {prev_row['MACD_Signal']:.2f}")
+            print(f"   Last bearish crossover: {describe_bars_since(bars_since_down)}")
             
             conditions_pe.append(rsi_ok)
             conditions_pe.append(adx_ok)
@@ -10,6 +10,7 @@ sys.path.insert(0, os.path.dirname(__file__))
 from src.market_data import MStockAPI
 from src.indicators import TechnicalIndicators
 from src.trading_config import config
+from src.lookback import converged_tail, history_days
 from src.utils import now_ist
 import pandas as pd
 from datetime import datetime
@@ -44,8 +45,8 @@ def check_conditions():
         
         try:
             # Fetch data
-            daily_df = api.get_historical_data(symbol_name, exchange, token, "day", days=60)
-            intraday_df = api.get_historical_data(symbol_name, exchange, token, "15minute", days=10)
+            daily_df = api.get_historical_data(symbol_name, exchange, token, "day", days=history_days("day"))
+            intraday_df = api.get_historical_data(symbol_name, exchange, token, "15minute", days=history_days("15minute"))
             
             if daily_df is None or intraday_df is None or len(daily_df) < 30 or len(intraday_df) < 30:
                 output.append(f"ERROR: Insufficient data for {key}")
@@ -67,12 +68,19 @@ def check_conditions():
                 }, index=[now_ist()])
                 intraday_df = pd.concat([intraday_df, live_candle])
             
-            # Calculate indicators
+            # Calculate indicators (over the converged tail, as the bot does)
+            daily_df = converged_tail(daily_df).copy()
+            intraday_df = converged_tail(intraday_df).copy()
             daily_df['MACD'], daily_df['MACD_Signal'], _ = TechnicalIndicators.calculate_macd(daily_df['close'])
             intraday_df['MACD'], intraday_df['MACD_Signal'], _ = TechnicalIndicators.calculate_macd(intraday_df['close'])
             intraday_df['RSI'] = TechnicalIndicators.calculate_rsi(intraday_df['close'])
             intraday_df['ADX'], _, _ = TechnicalIndicators.calculate_adx(intraday_df['high'], intraday_df['low'], intraday_df['close'])
             
+            # Crossovers for the whole series in one pass (same rules as the bot's checks)
+            macd_up, macd_down = TechnicalIndicators.crossover_masks(intraday_df['MACD'], intraday_df['MACD_Signal'])
+            since_up = TechnicalIndicators.bars_since(macd_up)[-1]
+            since_down = TechnicalIndicators.bars_since(macd_down)[-1]
+            
             # Get VIX
             vix_quote = api.get_quote("INDIA VIX", "NSE")
             vix = vix_quote.get('last_price', 15.0) if vix_quote else 15.0
@@ -123,12 +131,12 @@ def check_conditions():
             output.append(f"   Open = {daily_row['open']:.2f}, Close = {daily_row['close']:.2f}")
             
             # 5. 15m MACD crossover
-            macd_cross_bullish = (current_row['MACD'] > current_row['MACD_Signal'] and 
-                                 prev_row['MACD'] <= prev_row['MACD_Signal'])
+            macd_cross_bullish = bool(macd_up[-1])
             status = "PASS" if macd_cross_bullish else "FAIL"
             output.append(f"5. 15m MACD Bullish Crossover: [{status}]")
             output.append(f"   Current: MACD={current_row['MACD']:.2f}, Signal={current_row['MACD_Signal']:.2f}")
             output.append(f"   Previous: MACD={prev_row['MACD']:.2f}, Signal={prev_row['MACD_Signal']:.2f}")
+            output.append(f"   Last bullish crossover: {'none in window' if pd.isna(since_up) else f'{int(since_up)} bars ago'}")
             
             # 6. RSI
             rsi = current_row['RSI']
@@ -170,11 +178,11 @@ def check_conditions():
             output.append(f"4. Daily Candle Red: [{status}]")
             output.append(f"   Open = {daily_row['open']:.2f}, Close = {daily_row['close']:.2f}")
             
-            macd_cross_bearish = (current_row['MACD'] < current_row['MACD_Signal'] and 
-                                 prev_row['MACD'] >= prev_row['MACD_Signal'])
+            macd_cross_bearish = bool(macd_down[-1])
             status = "PASS" if macd_cross_bearish else "FAIL"
             output.append(f"5. 15m MACD Bearish Crossover: [{status}]")
             output.append(f"   Current: MACD={current_row['MACD']:.2f}, Signal={current_row['MACD_Signal']:.2f}")
+            output.append(f"   Last bearish crossover: {'none in window' if pd.isna(since_down) else f'{int(since_down)} bars ago'}")
             
             # Summary
             pe_conditions = [entry_allowed, vix_pass, daily_macd_bearish, daily_red,
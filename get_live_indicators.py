@@ -1,7 +1,8 @@
 
 from src.market_data import MStockAPI
-from src.indicators import TechnicalIndicators
+from src.streaming_indicators import ProvisionalIndicators
 from src.trading_config import config
+from src.lookback import converged_tail, history_days
 import pandas as pd
 from datetime import datetime
 import pytz
@@ -16,6 +17,8 @@ def get_live_stats():
     }
     
     results = {}
+    # Sealed bars come from the shared indicator cache when already computed in this process
+    indicators = ProvisionalIndicators()
     
     print(f"Fetching Live Data as of {datetime.now(pytz.timezone('Asia/Kolkata')).strftime('%H:%M:%S')} IST...")
     
@@ -26,21 +29,17 @@ def get_live_stats():
             current_spot = quote.get('last_price', 0) if quote else 0
             
             # Fetch intraday 15min data
-            intraday_df = api.get_hybrid_history(name, exchange, token, "15minute", days=10)
+            intraday_df = api.get_hybrid_history(name, exchange, token, "15minute", days=history_days("15minute"))
             
             if intraday_df is not None and len(intraday_df) >= 50:
-                # Calculate indicators
-                macd, signal, hist = TechnicalIndicators.calculate_macd(intraday_df['close'])
-                rsi = TechnicalIndicators.calculate_rsi(intraday_df['close'])
-                adx, plus_di, minus_di = TechnicalIndicators.calculate_adx(intraday_df['high'], intraday_df['low'], intraday_df['close'])
-                
-                # Get latest values
+                # Latest values (the last bar is the forming one)
+                latest = indicators.last((exchange, name), converged_tail(intraday_df))
                 results[underlying] = {
                     "Spot": current_spot,
-                    "RSI": rsi.iloc[-1],
-                    "MACD": macd.iloc[-1],
-                    "Signal": signal.iloc[-1],
-                    "ADX": adx.iloc[-1]
+                    "RSI": latest["RSI"],
+                    "MACD": latest["MACD"],
+                    "Signal": latest["MACD_Signal"],
+                    "ADX": latest["ADX"]
                 }
         except Exception as e:
             print(f"Error for {underlying}: {e}")
@@ -15,10 +15,11 @@ import pytz
 import time
 import socket
 from typing import Dict, Tuple, Optional
-from dataclasses import dataclass
 import numpy as np
 from getRSI import calculate_intraday_rsi_tv
 from requests.exceptions import Timeout, ConnectionError, RequestException
+from src.single_flight import SingleFlight
+from src.recursive_filters import rma, tv_rma as _tv_rma, wilder_smooth
 
 # ---------------- State & Utils ----------------
 
@@ -33,16 +34,11 @@ def log_fetch(symbol_ex: str):
     if not LOG_SUPPRESS and is_market_open_now_ist():
         log_ok(f"🔍 Fetching → {symbol_ex}")
 
-@dataclass
-class InflightState:
-    fetching: bool
-    result: Optional[dict]
-
 OFFLINE = {"active": False, "since": None}
 FETCH_INFLIGHT: Dict[str, bool] = {}
 CYCLE_QUOTES: Dict[str, Optional[dict]] = {}
 SYMBOL_LOCKS: Dict[str, bool] = {}  # Simplified to boolean for sync
-FETCH_STATE: Dict[str, InflightState] = {}
+QUOTE_FLIGHTS = SingleFlight(window=0.25)  # Concurrent fetches of one symbol share a request
 MISSING_TOKEN_LOGGED: Dict[str, bool] = {}
 
 def reset_cycle_state():
@@ -55,13 +51,6 @@ def log_missing_token_once(exchange: str, symbol: str, err: Exception):
         log_ok(f"❌ Missing token for {exchange}:{symbol} — {err}")
         MISSING_TOKEN_LOGGED[key] = True
 
-def ensure_inflight(key: str) -> InflightState:
-    st = FETCH_STATE.get(key)
-    if st is None:
-        st = InflightState(fetching=False, result=None)
-        FETCH_STATE[key] = st
-    return st
-
 def fetch_market_data_once(symbol: str, exchange: str) -> Tuple[Optional[dict], Optional[str]]:
     if is_offline():
         return None, None
@@ -71,32 +60,24 @@ def fetch_market_data_once(symbol: str, exchange: str) -> Tuple[Optional[dict],
     if cached is not None:
         return cached, exchange
 
-    st = ensure_inflight(key)
-    if st.fetching:
-        for _ in range(20):  # Spin-wait for sync compatibility
-            time.sleep(0.01)
-            cached = CYCLE_QUOTES.get(key)
-            if cached is not None:
-                return cached, exchange
+    try:
+        result = QUOTE_FLIGHTS.do(key, lambda: _fetch_quote(key), timeout=5)
+    except TimeoutError:
         return None, None
+    CYCLE_QUOTES[key] = result
+    return result, exchange
 
-    st.fetching = True
-    try:
-        url = "https://api.mstock.trade/openapi/typea/instruments/quote/ohlc"
-        headers = {"Authorization": f"token {API_KEY}:{ACCESS_TOKEN}", "X-Mirae-Version": "1"}
-        params = {"i": key}
-        resp = safe_request("GET", url, headers=headers, params=params)
-        if resp is None or resp.status_code != 200:
-            if resp is not None:
-                log_ok(f"❌ API error {resp.status_code}: {resp.text}")
-            st.result = None
-        else:
-            data = resp.json() or {}
-            st.result = (data.get("data") or {}).get(params["i"])
-        CYCLE_QUOTES[key] = st.result
-        return st.result, exchange
-    finally:
-        st.fetching = False
+def _fetch_quote(key: str) -> Optional[dict]:
+    url = "https://api.mstock.trade/openapi/typea/instruments/quote/ohlc"
+    headers = {"Authorization": f"token {API_KEY}:{ACCESS_TOKEN}", "X-Mirae-Version": "1"}
+    params = {"i": key}
+    resp = safe_request("GET", url, headers=headers, params=params)
+    if resp is None or resp.status_code != 200:
+        if resp is not None:
+            log_ok(f"❌ API error {resp.status_code}: {resp.text}")
+        return None
+    data = resp.json() or {}
+    return (data.get("data") or {}).get(key)
 
 INSUFFICIENT_HISTORY_TS: Dict[str, pd.Timestamp] = {}
 
@@ -380,16 +361,7 @@ live_positions = safe_get_positions()
 
 def tv_rma(series: pd.Series, length: int) -> pd.Series:
     x = pd.to_numeric(series, errors="coerce")
-    alpha = 1.0 / float(length)
-    sma = x.rolling(length, min_periods=length).mean()
-    rma = pd.Series(np.nan, index=x.index)
-    first = sma.first_valid_index()
-    if first is None:
-        return rma
-    rma.loc[first] = sma.loc[first]
-    for i in range(x.index.get_loc(first) + 1, len(x)):
-        rma.iloc[i] = alpha * x.iloc[i] + (1 - alpha) * rma.iloc[i - 1]
-    return rma
+    return pd.Series(_tv_rma(x.to_numpy(dtype=float), length), index=x.index)
 
 def tv_rsi(close: pd.Series, length: int = 14) -> pd.Series:
     c = pd.to_numeric(close, errors="coerce")
@@ -423,8 +395,8 @@ def rsi_tradingview(close: pd.Series, length: int = 14) -> pd.Series:
     change = close.diff()
     gain = change.clip(lower=0)
     loss = -change.clip(upper=0)
-    avg_gain = gain.ewm(alpha=1/length, adjust=False, min_periods=length).mean()
-    avg_loss = loss.ewm(alpha=1/length, adjust=False, min_periods=length).mean()
+    avg_gain = pd.Series(rma(gain, length, min_periods=length), index=gain.index)
+    avg_loss = pd.Series(rma(loss, length, min_periods=length), index=loss.index)
     rs = avg_gain / avg_loss
     rsi = 100 - (100 / (1 + rs))
     return rsi
@@ -434,8 +406,8 @@ def compute_rsi_wilder(close: pd.Series, period: int = 14) -> pd.Series:
     delta = close.diff()
     gain = delta.clip(lower=0)
     loss = -delta.clip(upper=0)
-    avg_gain = gain.ewm(alpha=1/period, adjust=False, min_periods=period).mean()
-    avg_loss = loss.ewm(alpha=1/period, adjust=False, min_periods=period).mean()
+    avg_gain = pd.Series(rma(gain, period, min_periods=period), index=gain.index)
+    avg_loss = pd.Series(rma(loss, period, min_periods=period), index=loss.index)
     rs = avg_gain / avg_loss
     rsi = 100 - (100 / (1 + rs))
     return rsi
@@ -461,9 +433,8 @@ def compute_rsi_progressive(close, period=14):
     if len(gain) >= period:
         avg_gain.iloc[period-1] = gain.iloc[:period].mean()
         avg_loss.iloc[period-1] = loss.iloc[:period].mean()
-    for i in range(period, len(gain)):
-        avg_gain.iloc[i] = (avg_gain.iloc[i-1] * (period - 1) + gain.iloc[i]) / period
-        avg_loss.iloc[i] = (avg_loss.iloc[i-1] * (period - 1) + loss.iloc[i]) / period
+        avg_gain.iloc[period:] = wilder_smooth(gain.iloc[period:], period, avg_gain.iloc[period-1])
+        avg_loss.iloc[period:] = wilder_smooth(loss.iloc[period:], period, avg_loss.iloc[period-1])
     rs = avg_gain / avg_loss
     rsi = 100 - (100 / (1 + rs))
     return rsi
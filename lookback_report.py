@@ -0,0 +1,61 @@
+"""
+Indicator Lookback Tolerance Report
+Checks that computing over the warmup window leaves indicator values at the entry thresholds unchanged
+"""
+
+import sys
+import os
+import json
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.market_data import MStockAPI
+from src.trading_config import config
+from src.lookback import format_report, history_days, indicator_warmup, tolerance_report, warmup_bars
+from src.utils import now_ist
+
+# Long downloads used as the "full history" reference
+REFERENCE_DAYS = {"15minute": 60, "day": 730}
+
+
+def run_report(evaluate: int = 200):
+    """Compare warmup-window indicators with long-history values for every configured symbol"""
+    api = MStockAPI()
+
+    with open('config.json', 'r') as f:
+        cfg = json.load(f)
+
+    bars = warmup_bars(config)
+    warmups = indicator_warmup(
+        config.macd_fast, config.macd_slow, config.macd_signal,
+        config.rsi_period, config.adx_period, config.indicator_lookback_tolerance
+    )
+    params = (config.macd_fast, config.macd_slow, config.macd_signal, config.rsi_period, config.adx_period)
+
+    print("=" * 80)
+    print("INDICATOR LOOKBACK TOLERANCE REPORT")
+    print(f"Time: {now_ist().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Tolerance: {config.indicator_lookback_tolerance} -> warmup bars {warmups}, window {bars} bars")
+    print(f"Downloads: 15minute {history_days('15minute', config)} days, day {history_days('day', config)} days")
+    print("=" * 80)
+
+    for symbol_name, symbol_data in cfg['symbols'].items():
+        if symbol_name == 'comment':
+            continue
+        exchange, token = symbol_data['exchange'], symbol_data['token']
+        for interval, adx_min in (("15minute", config.adx_min), ("day", config.adx_daily_min)):
+            print(f"\n{symbol_data['key']} {interval}")
+            frame = api.get_historical_data(symbol_name, exchange, token, interval, days=REFERENCE_DAYS[interval])
+            if frame is None or len(frame) <= bars:
+                print(f"  Not enough history for a {bars}-bar window")
+                continue
+            report = tolerance_report(
+                frame, bars, *params,
+                rsi_range=(config.rsi_min, config.rsi_max),
+                adx_min=adx_min,
+                evaluate=evaluate
+            )
+            print(format_report(report))
+
+
+if __name__ == "__main__":
+    run_report()
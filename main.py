@@ -10,6 +10,7 @@ import sys
 import time
 import threading
 import json
+import asyncio
 from datetime import datetime
 
 # Add src to path
@@ -18,8 +19,18 @@ sys.path.insert(0, os.path.dirname(__file__))
 from src.fno_trading_bot import FnOTradingBot
 from src.trading_models import TradeType, ExitReason
 from src.indicators import TechnicalIndicators
+from src.streaming_indicators import ProvisionalIndicators
+from src.indicator_cache import get_indicator_cache
+from src.lookback import converged_tail, history_days
 from src.trading_config import TradingConfig, config
 from src.market_data import MStockAPI
+from src.daily_context import DailyContext
+from src.rate_limiter import Priority, set_thread_priority
+from src.resilience import BrokerBlindError
+from src.tick_source import TickSource, PollingTickSource, create_tick_source
+from src.bar_aggregator import BarAggregator, append_live_bar
+from src.warmup import Warmup
+from src.option_chain import OptionChain
 from src.utils import setup_logging, now_ist, is_trading_day, console, print_holographic_banner
 from src.option_selector import OptionSelector
 from src.order_manager import OrderManager
@@ -77,82 +88,209 @@ def wait_for_market_open():
             time.sleep(3600)
 
 
+def is_market_open() -> bool:
+    """Whether now is within market hours of a trading day"""
+    current_time = now_ist()
+    return is_trading_day(current_time) and config.market_open <= current_time.time() <= config.market_close
+
+
+def wait_for_warmup():
+    """Wait until the pre-market warmup window (config.warmup_start) of the next trading day"""
+    from datetime import timedelta
+    
+    while not shutdown_event.is_set():
+        current_time = now_ist()
+        current_time_only = current_time.time()
+        if is_trading_day(current_time) and config.warmup_start <= current_time_only <= config.market_close:
+            return
+        
+        # Sleep towards the next warmup_start (at most an hour at a time, so holidays are re-checked)
+        next_start = current_time.replace(
+            hour=config.warmup_start.hour, minute=config.warmup_start.minute, second=0, microsecond=0
+        )
+        if next_start <= current_time:
+            next_start += timedelta(days=1)
+        remaining = (next_start - current_time).total_seconds()
+        logger.info(f"Pre-market warmup at {config.warmup_start} (in {remaining / 60:.0f} min)")
+        time.sleep(min(3600, max(1, remaining)))
+
+
+# India VIX quote instrument (exchange, symbol)
+VIX_INSTRUMENT = ("NSE", "INDIA VIX")
+
+# Safety net: -50% must be confirmed this many times, at most once per
+# SAFETY_CONFIRM_SPACING seconds unless the option premium itself moved
+SAFETY_CONFIRMATIONS = 3
+SAFETY_CONFIRM_SPACING = 1.0
+
+
+def confirm_safety_breach(safety_counts: dict, pos_id: str, premium: float, now: float = None) -> int:
+    """
+    Record a -50% reading for a position and return its confirmation count
+    
+    The exit loop wakes on every tick of any subscribed instrument (spots,
+    VIX, the option-chain band), so the same cached premium can be read many
+    times within milliseconds. A reading only counts when the position's own
+    premium changed since the last counted one, or SAFETY_CONFIRM_SPACING
+    seconds have passed.
+    
+    Parameters:
+    -----------
+    safety_counts : dict
+        {position_id: (count, last counted premium, monotonic time counted)}
+    """
+    now = time.monotonic() if now is None else now
+    count, last_premium, last_time = safety_counts.get(pos_id, (0, None, None))
+    if last_time is None or premium != last_premium or now - last_time >= SAFETY_CONFIRM_SPACING:
+        count += 1
+        safety_counts[pos_id] = (count, premium, now)
+    return count
+
+
+def resolve_spot_instrument(underlying: str, symbols_config: dict) -> tuple:
+    """
+    Reverse lookup (symbol, exchange, instrument_token) for an underlying key
+    """
+    for sym_name, info in symbols_config.items():
+        if info[2] == underlying:
+            return sym_name, info[0], info[1]
+    
+    # Fallback for imported positions
+    symbol_map = {
+        "NIFTY50": "NIFTY 50",
+        "BANKNIFTY": "NIFTY BANK",
+        "NIFTYBANK": "NIFTY BANK",
+        "FINNIFTY": "NIFTY FIN SERVICE",
+        "NIFTYFINSERVICE": "NIFTY FIN SERVICE",
+        "SENSEX": "SENSEX"
+    }
+    symbol = symbol_map.get(underlying, underlying)
+    exchange, instrument_token = symbols_config.get(symbol, ("NSE", "", underlying))[:2]
+    return symbol, exchange, instrument_token
+
+
+async def fetch_histories_async(async_api, symbols_config: dict, include_daily: bool = True) -> dict:
+    """
+    Fetch daily and 15-minute history for every underlying concurrently
+    
+    Returns dict {symbol: (daily_df, intraday_df)}; daily_df is None when
+    include_daily is False (daily frames come from the pinned DailyContext)
+    """
+    async def no_daily():
+        return None
+    
+    async def fetch_one(symbol, exchange, instrument_token):
+        return await asyncio.gather(
+            async_api.get_historical_data(symbol, exchange, instrument_token, "day", days=history_days("day")) if include_daily else no_daily(),
+            async_api.get_hybrid_history(symbol, exchange, instrument_token, "15minute", days=history_days("15minute"))
+        )
+    
+    items = list(symbols_config.items())
+    results = await asyncio.gather(*(
+        fetch_one(symbol, exchange, instrument_token)
+        for symbol, (exchange, instrument_token, _) in items
+    ))
+    return {symbol: tuple(result) for (symbol, _), result in zip(items, results)}
+
+
 def get_market_data_with_indicators(
     api: MStockAPI,
     symbol: str,
     exchange: str,
-    instrument_token: str
+    instrument_token: str,
+    quotes: dict = None,
+    history: tuple = None,
+    daily_context: DailyContext = None,
+    bars: BarAggregator = None,
+    indicators: ProvisionalIndicators = None
 ) -> tuple:
     """
     Fetch market data and calculate indicators with REAL-TIME live candle
     Creates streaming indicators that update every second
+    
+    If a quote snapshot from the tick source is passed, spot and VIX
+    are read from it instead of issuing separate quote requests. If
+    (daily_df, intraday_df) history was prefetched (see
+    fetch_histories_async), it is used instead of downloading again.
+    If a DailyContext is passed, the pinned (read-only) daily frame is
+    returned instead of downloading and recomputing daily indicators.
+    If a BarAggregator is passed, the forming bar is its tick-built OHLC
+    rather than an estimate from the last close and the current price.
+    If ProvisionalIndicators are passed, sealed bars are computed once and
+    only the forming bar is evaluated per tick (same values).
     """
     try:
         # Get current spot price FIRST for live candle
-        quote = api.get_quote(symbol, exchange)
+        if quotes is not None:
+            quote = quotes.get((exchange, symbol))
+        else:
+            quote = api.get_quote(symbol, exchange)
         current_spot = quote.get('last_price', 0) if quote else 0
         
         # Fetch daily data
-        daily_df = api.get_historical_data(symbol, exchange, instrument_token, "day", days=60)
-        if daily_df is None or len(daily_df) < 30:
-            logger.error(f"Insufficient daily data for {symbol}")
-            return None, None, None, None
+        if history is not None:
+            daily_df, intraday_df = history
+        else:
+            daily_df = intraday_df = None
         
-        # Calculate daily indicators (no live candle needed)
-        daily_df['MACD'], daily_df['MACD_Signal'], daily_df['MACD_Hist'] = \
-            TechnicalIndicators.calculate_macd(daily_df['close'])
-        daily_df['RSI'] = TechnicalIndicators.calculate_rsi(daily_df['close'])
-        daily_df['ADX'], daily_df['+DI'], daily_df['-DI'] = \
-            TechnicalIndicators.calculate_adx(daily_df['high'], daily_df['low'], daily_df['close'])
+        if daily_context is not None:
+            # Pinned once per session - no download or recompute per tick
+            daily_df = daily_context.get(symbol, exchange, instrument_token)
+            if daily_df is None:
+                logger.error(f"Insufficient daily data for {symbol}")
+                return None, None, None, None
+        else:
+            if daily_df is None:
+                daily_df = api.get_historical_data(symbol, exchange, instrument_token, "day", days=history_days("day"))
+            if daily_df is None or len(daily_df) < 30:
+                logger.error(f"Insufficient daily data for {symbol}")
+                return None, None, None, None
+            
+            # Calculate daily indicators (no live candle needed) over the converged tail only
+            daily_df = converged_tail(daily_df).copy()
+            daily_df['MACD'], daily_df['MACD_Signal'], daily_df['MACD_Hist'] = \
+                TechnicalIndicators.calculate_macd(daily_df['close'])
+            daily_df['RSI'] = TechnicalIndicators.calculate_rsi(daily_df['close'])
+            daily_df['ADX'], daily_df['+DI'], daily_df['-DI'] = \
+                TechnicalIndicators.calculate_adx(daily_df['high'], daily_df['low'], daily_df['close'])
         
         # Fetch intraday 15min data (used for RSI, MACD, ADX)
-        intraday_df = api.get_hybrid_history(symbol, exchange, instrument_token, "15minute", days=10)
+        if intraday_df is None:
+            intraday_df = api.get_hybrid_history(symbol, exchange, instrument_token, "15minute", days=history_days("15minute"))
         if intraday_df is None or len(intraday_df) < 50:
             logger.error(f"Insufficient intraday data for {symbol}")
             return None, None, None, None
         
-        # CREATE LIVE FORMING CANDLE for real-time indicators
+        # LIVE FORMING CANDLE for real-time indicators
         # This makes RSI/ADX/MACD update every second!
-        import pytz
-        
-        ist = pytz.timezone("Asia/Kolkata")
-        current_time = now_ist()
-        
-        # ALIGN TO 15-MINUTE BAR START (Standardizes indicator calculation)
-        bar_start = current_time.replace(minute=current_time.minute - current_time.minute % 15, second=0, microsecond=0)
-        
-        if current_spot > 0:
-            # Use current spot price as close, last candle's close as open
-            last_close = intraday_df.iloc[-1]['close']
-            
-            # Use last candle's high/low if current spot is within that range, 
-            # otherwise expand to current spot
-            
-            # Build live candle
-            live_candle = pd.DataFrame({
-                'open': [last_close],
-                'high': [max(last_close, current_spot)],
-                'low': [min(last_close, current_spot)],
-                'close': [current_spot]
-            }, index=[bar_start])
-            
-            # Append live candle to historical data
-            intraday_df_live = pd.concat([intraday_df, live_candle])
+        if bars is not None:
+            # True OHLC of the forming bar from every observed tick (plus bars sealed since the download)
+            intraday_df_live = bars.extend((exchange, symbol), intraday_df)
         else:
-            intraday_df_live = intraday_df
-            if current_spot == 0:
-                current_spot = intraday_df.iloc[-1]['close']
+            intraday_df_live = append_live_bar(intraday_df, current_spot, now_ist())
+        if current_spot == 0:
+            current_spot = intraday_df_live.iloc[-1]['close']
         
         # Calculate intraday indicators WITH LIVE CANDLE - updates in real-time!
-        intraday_df_live['MACD'], intraday_df_live['MACD_Signal'], intraday_df_live['MACD_Hist'] = \
-            TechnicalIndicators.calculate_macd(intraday_df_live['close'])
-        intraday_df_live['RSI'] = TechnicalIndicators.calculate_rsi(intraday_df_live['close'])
-        intraday_df_live['ADX'], intraday_df_live['+DI'], intraday_df_live['-DI'] = \
-            TechnicalIndicators.calculate_adx(intraday_df_live['high'], intraday_df_live['low'], intraday_df_live['close'])
+        # Only the warmup window is computed; older bars no longer move the values
+        intraday_df_live = converged_tail(intraday_df_live)
+        if indicators is not None:
+            # Committed state for the sealed bars, only the live candle is evaluated
+            intraday_df_live = indicators.frame((exchange, symbol), intraday_df_live)
+        else:
+            intraday_df_live = intraday_df_live.copy()
+            intraday_df_live['MACD'], intraday_df_live['MACD_Signal'], intraday_df_live['MACD_Hist'] = \
+                TechnicalIndicators.calculate_macd(intraday_df_live['close'])
+            intraday_df_live['RSI'] = TechnicalIndicators.calculate_rsi(intraday_df_live['close'])
+            intraday_df_live['ADX'], intraday_df_live['+DI'], intraday_df_live['-DI'] = \
+                TechnicalIndicators.calculate_adx(intraday_df_live['high'], intraday_df_live['low'], intraday_df_live['close'])
         
         # Fetch VIX with robust fallback
         try:
-            vix_quote = api.get_quote("INDIA VIX", "NSE")
+            if quotes is not None:
+                vix_quote = quotes.get(VIX_INSTRUMENT)
+            else:
+                vix_quote = api.get_quote(VIX_INSTRUMENT[1], VIX_INSTRUMENT[0])
             current_vix = vix_quote.get('last_price', 15.0) if vix_quote else 15.0
         except Exception as e:
             logger.warning(f"Failed to fetch India VIX: {e}. Using default 15.0")
@@ -168,15 +306,33 @@ def get_market_data_with_indicators(
         return None, None, None, None
 
 
-def exit_monitoring_loop(api: MStockAPI, bot: FnOTradingBot, order_manager: OrderManager, symbols_config: dict):
+def exit_monitoring_loop(
+    api: MStockAPI,
+    bot: FnOTradingBot,
+    order_manager: OrderManager,
+    symbols_config: dict,
+    ticks: TickSource = None
+):
     """
     REAL-TIME EXIT MONITORING
-    Runs every 1 second to check SL and Profit targets
+    Checks SL and Profit targets on every price change (at least once a second)
+    
+    ticks : TickSource shared with the entry loop; a private REST poller
+    is started if omitted
     """
-    logger.info("EXIT MONITORING THREAD STARTED (1-second checks)")
+    logger.info("EXIT MONITORING THREAD STARTED (tick-driven checks)")
+    
+    # Stop-loss quotes and exits get first call on the broker rate limit
+    set_thread_priority(Priority.EXIT)
+    
+    own_ticks = ticks is None
+    if own_ticks:
+        ticks = PollingTickSource(api, interval=config.tick_poll_interval)
+        ticks.start()
+    version = ticks.version
     
     # Track consecutive bad ticks for safety exits
-    safety_counts = {} # {position_id: count}
+    safety_counts = {} # {position_id: (count, premium, time)}
     
     while not shutdown_event.is_set():
         try:
@@ -189,6 +345,19 @@ def exit_monitoring_loop(api: MStockAPI, bot: FnOTradingBot, order_manager: Orde
             # Check each active position
             with bot.lock:
                 underlyings = list(bot.positions.keys())
+                option_symbols = {u: bot.positions[u].option_symbol for u in underlyings}
+            
+            # Latest feed snapshot (spot + option for every position)
+            instruments = []
+            for underlying in underlyings:
+                symbol, exchange, _ = resolve_spot_instrument(underlying, symbols_config)
+                instruments.append((exchange, symbol))
+                if option_symbols[underlying]:
+                    # Determine correct exchange: BFO for SENSEX, NFO for others
+                    opt_exchange = "BFO" if underlying == "SENSEX" else "NFO"
+                    instruments.append((opt_exchange, option_symbols[underlying]))
+            ticks.set_subscriptions("exit", instruments)
+            snapshot = ticks.snapshot(instruments, max_age=config.tick_max_age)
                 
             for underlying in underlyings:
                 with bot.lock:
@@ -197,29 +366,10 @@ def exit_monitoring_loop(api: MStockAPI, bot: FnOTradingBot, order_manager: Orde
                     position = bot.positions[underlying]
                 
                 # Get symbol info from config (reverse lookup or use position's underlying)
-                symbol_info = None
-                for sym_name, info in symbols_config.items():
-                    if info[2] == underlying:
-                        symbol_info = (sym_name, info[0], info[1])
-                        break
-                
-                if not symbol_info:
-                    # Fallback for imported positions
-                    symbol_map = {
-                        "NIFTY50": "NIFTY 50",
-                        "BANKNIFTY": "NIFTY BANK",
-                        "NIFTYBANK": "NIFTY BANK",
-                        "FINNIFTY": "NIFTY FIN SERVICE",
-                        "NIFTYFINSERVICE": "NIFTY FIN SERVICE",
-                        "SENSEX": "SENSEX"
-                    }
-                    symbol = symbol_map.get(underlying, underlying)
-                    exchange, instrument_token = symbols_config.get(symbol, ("NSE", "", underlying))[:2]
-                else:
-                    symbol, exchange, instrument_token = symbol_info
+                symbol, exchange, instrument_token = resolve_spot_instrument(underlying, symbols_config)
                 
-                # Get current spot price (FAST - just spot price)
-                quote = api.get_quote(symbol, exchange)
+                # Get current spot price from this tick's snapshot
+                quote = snapshot.get((exchange, symbol))
                 if not quote:
                     continue
                     
@@ -232,7 +382,7 @@ def exit_monitoring_loop(api: MStockAPI, bot: FnOTradingBot, order_manager: Orde
                 if position.option_symbol:
                     # Determine correct exchange: BFO for SENSEX, NFO for others
                     opt_exchange = "BFO" if underlying == "SENSEX" else "NFO"
-                    opt_quote = api.get_quote(position.option_symbol, opt_exchange)
+                    opt_quote = snapshot.get((opt_exchange, position.option_symbol))
                     if opt_quote:
                         current_premium = opt_quote.get('last_price', 0.0)
                 
@@ -254,11 +404,11 @@ def exit_monitoring_loop(api: MStockAPI, bot: FnOTradingBot, order_manager: Orde
                     
                     pos_id = position.position_id
                     if pnl_pct <= max_loss:
-                        safety_counts[pos_id] = safety_counts.get(pos_id, 0) + 1
-                        logger.warning(f"SAFETY CHECK {underlying}: Premium P&L ({pnl_pct:.2f}%) <= {max_loss}% (Count: {safety_counts[pos_id]}/3)")
+                        count = confirm_safety_breach(safety_counts, pos_id, current_premium)
+                        logger.warning(f"SAFETY CHECK {underlying}: Premium P&L ({pnl_pct:.2f}%) <= {max_loss}% (Count: {count}/{SAFETY_CONFIRMATIONS})")
                         
-                        if safety_counts[pos_id] >= 3:
-                            logger.error(f"!!! SAFETY EXIT TRIGGERED !!!: -50% loss confirmed for 3 ticks")
+                        if count >= SAFETY_CONFIRMATIONS:
+                            logger.error(f"!!! SAFETY EXIT TRIGGERED !!!: -50% loss confirmed for {SAFETY_CONFIRMATIONS} ticks")
                             exit_reason = ExitReason.STOP_LOSS
                     else:
                         if pos_id in safety_counts:
@@ -305,22 +455,61 @@ def exit_monitoring_loop(api: MStockAPI, bot: FnOTradingBot, order_manager: Orde
                     bot.exit_trade(underlying, current_premium, current_spot, exit_reason)
                     continue
             
-            # Sleep 1 second before next check
-            time.sleep(1)
+            # React as soon as any price moves; re-check at least once a second
+            version = ticks.wait_for_update(version, timeout=1.0)
             
+        except BrokerBlindError as e:
+            # Fail fast and keep probing: never sit on a hung request with positions open
+            with bot.lock:
+                held = list(bot.positions.keys())
+            logger.critical(f"BROKER BLIND - exits not monitored for {held or 'no positions'}: {e}")
+            time.sleep(1)
         except Exception as e:
             logger.error(f"EXIT THREAD ERROR: {e}")
             time.sleep(1)
     
+    ticks.set_subscriptions("exit", [])
+    if own_ticks:
+        ticks.stop()
     logger.info("EXIT MONITORING THREAD STOPPED")
 
 
-def entry_monitoring_loop(api: MStockAPI, bot: FnOTradingBot, order_manager: OrderManager, symbols_config: dict):
+def entry_monitoring_loop(
+    api: MStockAPI,
+    bot: FnOTradingBot,
+    order_manager: OrderManager,
+    symbols_config: dict,
+    async_client: tuple = None,
+    daily_context: DailyContext = None,
+    ticks: TickSource = None,
+    bars: BarAggregator = None,
+    option_chain: OptionChain = None
+):
     """
     ENTRY MONITORING (1-second real-time checks)
     Checks entry conditions and MACD reversals continuously
+    
+    async_client : optional (AsyncLoopThread, AsyncMStockAPI) used to fetch
+    history for all underlyings concurrently at the start of each tick
+    daily_context : optional DailyContext with the session's pinned daily
+    indicator frames (daily history is then not fetched per tick)
+    ticks : TickSource shared with the exit loop; a private REST poller
+    is started if omitted
+    bars : optional BarAggregator attached to `ticks` (true forming-bar OHLC)
+    option_chain : optional OptionChain; entries take strike, token and
+    premium from it instead of quoting at signal time
     """
     logger.info("ENTRY MONITORING THREAD STARTED (1-second real-time checks)")
+    set_thread_priority(Priority.ENTRY)
+    
+    own_ticks = ticks is None
+    if own_ticks:
+        ticks = PollingTickSource(api, interval=config.tick_poll_interval)
+        ticks.start()
+    version = ticks.version
+    
+    # Sealed-bar indicator state per index; each tick only evaluates the forming candle
+    live_indicators = ProvisionalIndicators()
     
     iteration = 0
     
@@ -340,6 +529,32 @@ def entry_monitoring_loop(api: MStockAPI, bot: FnOTradingBot, order_manager: Ord
             logger.info(f"\n{'='*60}")
             logger.info(f"ENTRY CHECK #{iteration} | Time: {now_ist().strftime('%H:%M:%S')}")
             logger.info(f"{'='*60}")
+            if iteration % 300 == 0:
+                logger.info(f"Indicator cache: {get_indicator_cache().stats()}")
+            
+            # Feed snapshot for this tick: all index spots, VIX and held options
+            instruments = [(exchange, symbol) for symbol, (exchange, _, _) in symbols_config.items()]
+            instruments.append(VIX_INSTRUMENT)
+            with bot.lock:
+                for underlying, position in bot.positions.items():
+                    if position.option_symbol:
+                        opt_exchange = "BFO" if underlying == "SENSEX" else "NFO"
+                        instruments.append((opt_exchange, position.option_symbol))
+            ticks.set_subscriptions("entry", instruments)
+            snapshot = ticks.snapshot(instruments)
+            
+            # Fetch history for ALL underlyings concurrently (bounded by the slowest request)
+            histories = {}
+            if async_client is not None:
+                runner, async_api = async_client
+                try:
+                    histories = runner.run(
+                        fetch_histories_async(async_api, symbols_config, include_daily=daily_context is None),
+                        timeout=60
+                    )
+                except Exception as e:
+                    logger.warning(f"Concurrent history fetch failed, falling back to sequential: {e}")
+                    histories = {}
             
             # Process each symbol
             for symbol, (exchange, instrument_token, underlying) in symbols_config.items():
@@ -348,7 +563,9 @@ def entry_monitoring_loop(api: MStockAPI, bot: FnOTradingBot, order_manager: Ord
                 
                 # Get market data with indicators
                 daily_df, intraday_df, current_spot, current_vix = get_market_data_with_indicators(
-                    api, symbol, exchange, instrument_token
+                    api, symbol, exchange, instrument_token, quotes=snapshot,
+                    history=histories.get(symbol), daily_context=daily_context, bars=bars,
+                    indicators=live_indicators
                 )
                 
                 if daily_df is None or intraday_df is None:
@@ -366,7 +583,7 @@ def entry_monitoring_loop(api: MStockAPI, bot: FnOTradingBot, order_manager: Ord
                     current_premium = 0.0
                     if position.option_symbol:
                         opt_exchange = "BFO" if underlying == "SENSEX" else "NFO"
-                        opt_quote = api.get_quote(position.option_symbol, opt_exchange)
+                        opt_quote = snapshot.get((opt_exchange, position.option_symbol))
                         if opt_quote:
                             current_premium = opt_quote.get('last_price', 0.0)
                     
@@ -473,27 +690,36 @@ def entry_monitoring_loop(api: MStockAPI, bot: FnOTradingBot, order_manager: Ord
                         trade_type = TradeType.PE
                     
                     if trade_type:
-                        # Select option contract
-                        strike, option_symbol = OptionSelector.select_option(
-                            underlying, 
-                            current_spot, 
-                            trade_type.value,
-                            depth=config.strike_depth
-                        )
-                        logger.info(f"  Selected option: {option_symbol}")
+                        # Select option contract: from the in-memory chain when it has a fresh premium
+                        chosen = None
+                        if option_chain is not None:
+                            chosen = option_chain.select(underlying, current_spot, trade_type.value, depth=config.strike_depth)
                         
-                        # Get option premium (initial estimate for logging entry)
-                        current_premium = 0.0
-                        opt_exchange = "BFO" if underlying == "SENSEX" else "NFO"
-                        opt_quote = api.get_quote(option_symbol, opt_exchange)
-                        if opt_quote:
-                            current_premium = opt_quote.get('last_price', 0.0)
-                        
-                        if current_premium == 0:
-                             current_premium = current_spot * 0.015 # Safe only for initial logging estimate
+                        if chosen is not None:
+                            contract, current_premium = chosen
+                            strike, option_symbol = contract.strike, contract.symbol
+                            logger.info(f"  Selected option: {option_symbol} @ Rs {current_premium:.2f} (chain)")
+                        else:
+                            strike, option_symbol = OptionSelector.select_option(
+                                underlying, 
+                                current_spot, 
+                                trade_type.value,
+                                depth=config.strike_depth
+                            )
+                            logger.info(f"  Selected option: {option_symbol}")
+                            
+                            # Get option premium (initial estimate for logging entry)
+                            current_premium = 0.0
+                            opt_exchange = "BFO" if underlying == "SENSEX" else "NFO"
+                            opt_quote = api.get_quote(option_symbol, opt_exchange)
+                            if opt_quote:
+                                current_premium = opt_quote.get('last_price', 0.0)
+                            
+                            if current_premium == 0:
+                                 current_premium = current_spot * 0.015 # Safe only for initial logging estimate
                         
                         # Get instrument token for the symbol
-                        token = SymbolMaster().get_token(option_symbol)
+                        token = chosen[0].token if chosen is not None and chosen[0].token else SymbolMaster().get_token(option_symbol)
                         if not token:
                             logger.warning(f"Token not found for {option_symbol}")
                             token = "" # Try anyway? Or fail? Better try with empty.
@@ -555,15 +781,22 @@ def entry_monitoring_loop(api: MStockAPI, bot: FnOTradingBot, order_manager: Ord
                 logger.info(f"\nActive Positions: {summary['open_positions']}")
                 logger.info(f"Daily P&L: Rs {summary['daily_pnl']:+,.2f}")
             
-            # Wait 1 second before next check
-            time.sleep(1)
+            # Next check once prices move (no more than once a second, heartbeat every 5s when idle)
+            version = ticks.wait_for_update(version, timeout=5.0, min_wait=1.0)
             
+        except BrokerBlindError as e:
+            # No prices: skip entries this tick, retry once the circuit probes again
+            logger.warning(f"ENTRY THREAD: broker blind, skipping entries: {e}")
+            time.sleep(max(1.0, e.retry_in))
         except Exception as e:
             import traceback
             logger.error(f"ENTRY THREAD ERROR: {e}")
             logger.error(traceback.format_exc())
             time.sleep(60)
     
+    ticks.set_subscriptions("entry", [])
+    if own_ticks:
+        ticks.stop()
     logger.info("ENTRY MONITORING THREAD STOPPED")
 
 
@@ -581,8 +814,8 @@ def run_live_trading(symbols_config: dict):
     logger.info(f"Daily Loss Limit: [bold red]{config.daily_loss_limit_pct}%[/bold red]")
     logger.info("[dim]--------------------------------------------------[/dim]")
     logger.info("MONITORING STRATEGY:")
-    logger.info("  Entry Checks: Every 1 second (REAL-TIME)")
-    logger.info("  Exit Checks: Every 1 second (REAL-TIME)")
+    logger.info("  Entry Checks: On price change, at most every 1 second (REAL-TIME)")
+    logger.info("  Exit Checks: On every price change, at least every 1 second (REAL-TIME)")
     logger.info("="*60)
     
     # Initialize API, bot, and order manager
@@ -590,31 +823,83 @@ def run_live_trading(symbols_config: dict):
     bot = FnOTradingBot(config)
     order_manager = OrderManager()
     
+    # Async client for concurrent per-tick history fetches
+    async_client = None
+    if config.api_async_scan:
+        try:
+            from src.async_market_data import AsyncMStockAPI, AsyncLoopThread
+            async_client = (AsyncLoopThread(), AsyncMStockAPI(api))
+            logger.info("Concurrent entry scan ENABLED (asyncio)")
+        except ImportError:
+            logger.warning("aiohttp not installed - entry scan will fetch symbols sequentially")
+    
+    # Daily indicators only change between sessions: pinned for the day at warmup
+    daily_context = DailyContext(api)
+    
+    # One price feed for both loops (batched REST poll, websocket push or replay)
+    ticks = create_tick_source(
+        api,
+        config.tick_source,
+        interval=config.tick_poll_interval,
+        url=config.tick_websocket_url,
+        replay_file=config.tick_replay_file
+    )
+    logger.info(f"Price feed: {type(ticks).__name__}")
+    
+    # Every tick folds into the forming 15-minute bar (real intra-bar high/low for the indicators)
+    bars = BarAggregator().attach(ticks)
+    
+    # ATM band of options rides on the same feed: entries are priced from memory
+    option_chain = OptionChain(
+        api,
+        symbols_config,
+        band=max(config.option_chain_band, config.strike_depth + 1),
+        max_age=config.option_chain_max_age
+    )
+    
     # Sync any existing positions from broker
     logger.info("Checking for existing positions in broker account...")
     synced_count = sync_positions_from_broker(bot, api)
     if synced_count > 0:
         logger.info(f"Imported {synced_count} existing position(s) for monitoring")
     
-    # Wait for market to open
-    wait_for_market_open()
+    # Both loops share the feed; the exit loop is started first on a mid-session restart
+    entry_thread = threading.Thread(
+        target=entry_monitoring_loop,
+        args=(api, bot, order_manager, symbols_config, async_client, daily_context, ticks, bars, option_chain),
+        name="EntryMonitor"
+    )
     
+    exit_thread = threading.Thread(
+        target=exit_monitoring_loop,
+        args=(api, bot, order_manager, symbols_config, ticks),
+        name="ExitMonitor"
+    )
+    
+    exit_started = False
     try:
-        # Start both monitoring threads
-        entry_thread = threading.Thread(
-            target=entry_monitoring_loop,
-            args=(api, bot, order_manager, symbols_config),
-            name="EntryMonitor"
-        )
+        if is_market_open():
+            # Restarted during the session: protect synced positions before the (long) warmup
+            logger.info("Market already open - exit monitoring starts before the warmup")
+            ticks.start()
+            exit_thread.start()
+            exit_started = True
         
-        exit_thread = threading.Thread(
-            target=exit_monitoring_loop,
-            args=(api, bot, order_manager, symbols_config),
-            name="ExitMonitor"
-        )
+        # From 09:05: history, daily context, connections, yfinance and option tokens before the first tick
+        wait_for_warmup()
+        Warmup(api, symbols_config, daily_context, option_chain=option_chain).run()
+        api.yf_cache.start()
+        option_chain.attach(ticks)
+        
+        # Wait for market to open
+        wait_for_market_open()
+        
+        ticks.start()
         
+        # Start both monitoring threads
         entry_thread.start()
-        exit_thread.start()
+        if not exit_started:
+            exit_thread.start()
         
         logger.info("\nBoth monitoring threads started!")
         logger.info("Press Ctrl+C to stop...\n")
@@ -628,6 +913,11 @@ def run_live_trading(symbols_config: dict):
         shutdown_event.set()
         
     finally:
+        ticks.stop()
+        api.yf_cache.stop()
+        if async_client is not None:
+            async_client[0].stop(async_client[1])
+        
         # Final summary
         logger.info("\n" + "="*60)
         logger.info(f"{mode} SESSION COMPLETE")
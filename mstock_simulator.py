@@ -0,0 +1,404 @@
+"""
+mStock API Simulator
+Local stand-in for the mStock Type A REST API, for load and latency testing
+
+Implements the endpoints MStockAPI uses:
+    GET  /instruments/quote/ohlc?i=EXCHANGE:SYMBOL[&i=...]
+    GET  /instruments/historical/{EXCHANGE}/{TOKEN}/{TIMEFRAME}?from=...&to=...
+    GET  /portfolio/positions
+    GET  /portfolio/holdings
+    POST /orders/regular
+    GET  /orders/tradebook
+    POST /connect/login, /session/token   (always succeed)
+
+Prices are synthetic (deterministic per instrument and timestamp) unless a
+recorded data file is supplied. Latency, jitter and error rate can be
+injected globally or per endpoint group.
+
+Usage:
+    python mstock_simulator.py --port 8765 --latency-ms 80 --jitter-ms 40 --error-rate 0.02
+
+Then point the bot at it (any non-empty credentials work):
+    set MSTOCK_BASE_URL=http://127.0.0.1:8765      (Windows)
+    export MSTOCK_BASE_URL=http://127.0.0.1:8765   (Linux/Mac)
+    python main.py
+
+Recorded data file format (JSON):
+    {
+      "quotes":  {"NSE:NIFTY 50": {"last_price": 23500.5, ...}, ...},
+      "candles": {"NSE/26000/15minute": [["2025-01-02T09:15:00+05:30", o, h, l, c, v], ...], ...}
+    }
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs, unquote
+
+import pytz
+
+IST = pytz.timezone("Asia/Kolkata")
+
+# Reference levels for synthetic index prices
+BASE_PRICES = {
+    "NIFTY 50": 23500.0,
+    "NIFTY BANK": 50500.0,
+    "NIFTY FIN SERVICE": 23800.0,
+    "SENSEX": 77500.0,
+    "INDIA VIX": 14.0,
+}
+
+# Index tokens used by config.json
+TOKEN_SYMBOLS = {
+    "26000": "NIFTY 50",
+    "26009": "NIFTY BANK",
+    "26037": "NIFTY FIN SERVICE",
+    "51": "SENSEX",
+}
+
+TIMEFRAME_MINUTES = {
+    "1minute": 1,
+    "3minute": 3,
+    "5minute": 5,
+    "10minute": 10,
+    "15minute": 15,
+    "30minute": 30,
+    "60minute": 60,
+}
+
+
+def _seed(text: str) -> int:
+    """Stable integer seed for a string"""
+    return int(hashlib.md5(text.encode()).hexdigest()[:8], 16)
+
+
+def synthetic_price(name: str, epoch_seconds: float) -> float:
+    """
+    Deterministic synthetic price for an instrument at a point in time
+
+    Smooth multi-period oscillation plus a small hash-based wiggle, so the
+    same (instrument, time) always yields the same price across requests.
+    """
+    seed = _seed(name)
+    base = BASE_PRICES.get(name, 50.0 + seed % 400)
+    phase = (seed % 1000) / 1000.0 * 2 * math.pi
+    t = epoch_seconds / 60.0
+    drift = (
+        0.012 * math.sin(t / 390.0 + phase)
+        + 0.004 * math.sin(t / 45.0 + 2 * phase)
+        + 0.0015 * math.sin(t / 7.0 + 3 * phase)
+    )
+    wiggle = ((_seed(f"{name}:{int(t)}") % 2001) - 1000) / 1000.0 * 0.0005
+    return round(base * (1 + drift + wiggle), 2)
+
+
+class SimulatorState:
+    """Shared state: recorded data, fault injection settings, orders and positions"""
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, endpoint_latency=None, recorded=None, seed=None):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.endpoint_latency = endpoint_latency or {}
+        self.recorded_quotes = (recorded or {}).get("quotes", {})
+        self.recorded_candles = (recorded or {}).get("candles", {})
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.orders = []
+        self.positions = {}
+        self.request_count = 0
+
+    def delay(self, endpoint: str) -> float:
+        """Latency to inject for one request (seconds)"""
+        base = self.endpoint_latency.get(endpoint, self.latency_ms)
+        with self.lock:
+            jitter = self.rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, base + jitter) / 1000.0
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            return self.error_rate > 0 and self.rng.random() < self.error_rate
+
+    # ---------------- Data ----------------
+
+    def quote(self, key: str) -> dict:
+        if key in self.recorded_quotes:
+            return self.recorded_quotes[key]
+
+        exchange, _, symbol = key.partition(":")
+        now = datetime.now(IST)
+        ltp = synthetic_price(symbol, now.timestamp())
+        session_open = now.replace(hour=9, minute=15, second=0, microsecond=0)
+        open_price = synthetic_price(symbol, session_open.timestamp())
+        return {
+            "instrument_token": str(_seed(key) % 900000 + 100000),
+            "last_price": ltp,
+            "ohlc": {
+                "open": open_price,
+                "high": max(open_price, ltp),
+                "low": min(open_price, ltp),
+                "close": synthetic_price(symbol, (session_open - timedelta(days=1)).timestamp()),
+            },
+        }
+
+    def candles(self, exchange: str, token: str, timeframe: str, from_dt: datetime, to_dt: datetime) -> list:
+        recorded = self.recorded_candles.get(f"{exchange}/{token}/{timeframe}")
+        if recorded is not None:
+            lo, hi = from_dt.isoformat(), to_dt.isoformat()
+            return [c for c in recorded if lo <= c[0] <= hi]
+
+        name = TOKEN_SYMBOLS.get(token, f"{exchange}:{token}")
+        rows = []
+        if timeframe == "day":
+            day = from_dt.date()
+            while day <= to_dt.date():
+                if day.weekday() < 5:
+                    start = IST.localize(datetime.combine(day, datetime.min.time())).replace(hour=9, minute=15)
+                    rows.append(self._bar(name, start, 375))
+                day += timedelta(days=1)
+            return rows
+
+        minutes = TIMEFRAME_MINUTES.get(timeframe, 15)
+        bar = from_dt.replace(second=0, microsecond=0)
+        bar -= timedelta(minutes=(bar.hour * 60 + bar.minute - 555) % minutes)
+        while bar <= to_dt:
+            minute_of_day = bar.hour * 60 + bar.minute
+            if bar.weekday() < 5 and 555 <= minute_of_day <= 925:
+                rows.append(self._bar(name, bar, minutes))
+            bar += timedelta(minutes=minutes)
+        return rows
+
+    @staticmethod
+    def _bar(name: str, start: datetime, minutes: int) -> list:
+        t0 = start.timestamp()
+        samples = [synthetic_price(name, t0 + 60 * minutes * k / 4) for k in range(5)]
+        return [
+            start.isoformat(),
+            samples[0], max(samples), min(samples), samples[-1],
+            1000 + _seed(f"{name}{t0}") % 9000,
+        ]
+
+    # ---------------- Orders ----------------
+
+    def place_order(self, form: dict) -> dict:
+        symbol = form.get("tradingsymbol", "")
+        exchange = form.get("exchange", "NFO")
+        side = form.get("transaction_type", "BUY")
+        qty = int(form.get("quantity", "0") or 0)
+        price = self.quote(f"{exchange}:{symbol.upper()}")["last_price"]
+
+        with self.lock:
+            order_id = str(1000000000 + len(self.orders) + 1)
+            trade = {
+                "order_id": order_id,
+                "tradingsymbol": symbol,
+                "exchange": exchange,
+                "transaction_type": side,
+                "quantity": qty,
+                "average_price": price,
+                "fill_timestamp": datetime.now(IST).strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            self.orders.append(trade)
+
+            pos = self.positions.setdefault((symbol, exchange), {"qty": 0, "cost": 0.0})
+            signed = qty if side == "BUY" else -qty
+            if signed > 0:
+                pos["cost"] += price * signed
+            elif pos["qty"]:
+                pos["cost"] *= (pos["qty"] + signed) / pos["qty"]
+            pos["qty"] += signed
+
+        return {"status": "success", "data": {"order_id": order_id}}
+
+    def net_positions(self) -> list:
+        with self.lock:
+            items = list(self.positions.items())
+        out = []
+        for (symbol, exchange), pos in items:
+            if pos["qty"] == 0:
+                continue
+            out.append({
+                "tradingsymbol": symbol,
+                "exchange": exchange,
+                "quantity": pos["qty"],
+                "averagePrice": round(pos["cost"] / pos["qty"], 2),
+                "lastPrice": self.quote(f"{exchange}:{symbol.upper()}")["last_price"],
+            })
+        return out
+
+
+def make_handler(state: SimulatorState):
+    """Build a request handler bound to the simulator state"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _route(self, method: str):
+            parsed = urlparse(self.path)
+            path = parsed.path
+            # Accept both bare paths and the /openapi/typea prefix
+            if "/openapi/typea" in path:
+                path = path.split("/openapi/typea", 1)[1]
+            query = parse_qs(parsed.query)
+
+            if path.startswith("/instruments/quote"):
+                endpoint = "quote"
+            elif path.startswith("/instruments/historical"):
+                endpoint = "historical"
+            elif path.startswith("/portfolio"):
+                endpoint = "positions"
+            elif path.startswith("/orders"):
+                endpoint = "orders"
+            else:
+                endpoint = "auth"
+
+            with state.lock:
+                state.request_count += 1
+
+            time.sleep(state.delay(endpoint))
+            if endpoint != "auth" and state.should_fail():
+                self._send(503, {"status": "error", "message": "Simulated broker error"})
+                return
+
+            if method == "GET" and endpoint == "quote":
+                keys = query.get("i", [])
+                self._send(200, {"status": "success", "data": {k: state.quote(k) for k in keys}})
+
+            elif method == "GET" and endpoint == "historical":
+                parts = path.strip("/").split("/")
+                if len(parts) < 5:
+                    self._send(400, {"status": "error", "message": "Bad historical path"})
+                    return
+                _, _, exchange, token, timeframe = parts[:5]
+                now = datetime.now(IST)
+                from_dt = self._parse_dt(query.get("from", [None])[0], now - timedelta(days=10))
+                to_dt = self._parse_dt(query.get("to", [None])[0], now)
+                candles = state.candles(exchange.upper(), token, timeframe, from_dt, min(to_dt, now))
+                self._send(200, {"status": "success", "data": {"candles": candles}})
+
+            elif method == "GET" and path == "/portfolio/positions":
+                self._send(200, {"status": "success", "data": state.net_positions()})
+
+            elif method == "GET" and path == "/portfolio/holdings":
+                self._send(200, {"status": "success", "data": []})
+
+            elif method == "POST" and path == "/orders/regular":
+                length = int(self.headers.get("Content-Length", 0) or 0)
+                raw = self.rfile.read(length).decode() if length else ""
+                form = {k: v[0] for k, v in parse_qs(raw).items()}
+                self._send(200, [state.place_order(form)])
+
+            elif method == "GET" and path in ("/orders/tradebook", "/orders/trades"):
+                with state.lock:
+                    trades = list(state.orders)
+                self._send(200, {"status": "success", "data": trades})
+
+            elif method == "POST" and path == "/connect/login":
+                self._send(200, {"status": "success", "data": {}})
+
+            elif method == "POST" and path == "/session/token":
+                self._send(200, {"status": "success", "data": {"access_token": "SIMULATED_TOKEN"}})
+
+            else:
+                self._send(404, {"status": "error", "message": f"Unknown endpoint {method} {path}"})
+
+        @staticmethod
+        def _parse_dt(value, default: datetime) -> datetime:
+            if not value:
+                return default
+            try:
+                return IST.localize(datetime.strptime(unquote(value), "%Y-%m-%d %H:%M:%S"))
+            except ValueError:
+                return default
+
+        def do_GET(self):
+            self._route("GET")
+
+        def do_POST(self):
+            self._route("POST")
+
+    return Handler
+
+
+def start_simulator(host: str = "127.0.0.1", port: int = 0, **state_kwargs):
+    """
+    Start the simulator in a background thread
+
+    Returns:
+    --------
+    Tuple[ThreadingHTTPServer, SimulatorState, str]
+        (server, state, base_url) - call server.shutdown() to stop
+    """
+    state = SimulatorState(**state_kwargs)
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="MStockSimulator", daemon=True).start()
+    base_url = f"http://{host}:{server.server_address[1]}"
+    return server, state, base_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mStock API simulator")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Base latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter per request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 503")
+    parser.add_argument(
+        "--endpoint-latency", action="append", default=[], metavar="GROUP=MS",
+        help="Override base latency for quote/historical/positions/orders (repeatable)"
+    )
+    parser.add_argument("--data", help="Recorded quotes/candles JSON file")
+    parser.add_argument("--seed", type=int, help="Random seed for jitter and error injection")
+    args = parser.parse_args()
+
+    endpoint_latency = {}
+    for item in args.endpoint_latency:
+        group, _, ms = item.partition("=")
+        endpoint_latency[group.strip()] = float(ms)
+
+    recorded = None
+    if args.data:
+        with open(args.data, "r") as f:
+            recorded = json.load(f)
+
+    server, state, base_url = start_simulator(
+        args.host, args.port,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        endpoint_latency=endpoint_latency,
+        recorded=recorded,
+        seed=args.seed,
+    )
+
+    print(f"mStock simulator listening on {base_url}")
+    print(f"  latency={args.latency_ms}ms jitter={args.jitter_ms}ms error_rate={args.error_rate}")
+    print(f"  Set MSTOCK_BASE_URL={base_url} to point MStockAPI at it")
+    try:
+        while True:
+            time.sleep(60)
+            print(f"  requests served: {state.request_count}")
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
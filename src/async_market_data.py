@@ -0,0 +1,409 @@
+"""
+Async mStock API Module
+asyncio variant of MStockAPI for concurrent multi-symbol fetches
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Optional, Dict, List, Tuple
+
+import aiohttp
+import pandas as pd
+
+from src.market_data import MStockAPI
+from src.rate_limiter import Priority
+from src.resilience import BrokerBlindError
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMStockAPI:
+    """
+    asyncio mStock API wrapper with the same surface as MStockAPI
+
+    Credentials, base URL, timeouts, response parsing, the candle cache and the candle store
+    are shared with a synchronous MStockAPI instance; all requests go through one
+    aiohttp.ClientSession whose connector keeps connections alive, so
+    concurrent calls (e.g. history for every underlying) overlap instead
+    of running back to back.
+    """
+
+    # Maximum simultaneous connections held by the shared connector
+    CONNECTOR_LIMIT = 16
+
+    def __init__(self, api: Optional[MStockAPI] = None, priority: Priority = Priority.ENTRY):
+        """
+        Initialize async API
+
+        Parameters:
+        -----------
+        api : Optional[MStockAPI]
+            Synchronous client to borrow credentials and settings from
+            (a new one is created if omitted)
+        priority : Priority
+            Rate limiter lane for every request from this client
+        """
+        self.api = api if api is not None else MStockAPI()
+        self.priority = priority
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    @property
+    def base_url(self) -> str:
+        return self.api.base_url
+
+    def get_headers(self) -> Dict[str, str]:
+        """Get headers with authorization"""
+        return self.api.get_headers()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Create the shared session lazily (must run inside the event loop)"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.CONNECTOR_LIMIT, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    def _timeout(self, endpoint: str) -> aiohttp.ClientTimeout:
+        """Per-endpoint timeout mirroring the sync session pool (adaptive for idempotent endpoints only)"""
+        connect, read = self.api.http.deadline_for(endpoint)
+        return aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+
+    async def _request(
+        self, method: str, url: str, endpoint: str, priority: Optional[Priority] = None, **kwargs
+    ) -> Tuple[int, object]:
+        """
+        Perform a request and decode the JSON body
+
+        Parameters:
+        -----------
+        priority : Optional[Priority]
+            Rate limiter lane for this call (default: the client's lane)
+
+        Returns:
+        --------
+        Tuple[int, object]
+            (HTTP status, decoded JSON or None)
+
+        Raises:
+        -------
+        BrokerBlindError
+            If the endpoint's circuit (shared with the sync client) is open
+        """
+        http = self.api.http
+        probe = http.breaker.check(endpoint) if http.breaker is not None else None
+        try:
+            limiter = http.limiter
+            lane = priority if priority is not None else self.priority
+            if limiter is not None and not limiter.acquire(lane, timeout=0):
+                # Out of tokens: wait in a worker thread so the event loop keeps running
+                await asyncio.to_thread(limiter.acquire, lane)
+
+            session = self._get_session()
+            start = time.monotonic()
+            try:
+                async with session.request(method, url, timeout=self._timeout(endpoint), **kwargs) as response:
+                    try:
+                        payload = await response.json(content_type=None)
+                    except Exception:
+                        payload = None
+                    status = response.status
+            except Exception as e:
+                if http.tracks_latency(endpoint) and isinstance(e, asyncio.TimeoutError):
+                    http.latency.record(endpoint, time.monotonic() - start)
+                if http.breaker is not None:
+                    http.breaker.failure(endpoint, f"{type(e).__name__}: {e}")
+                raise
+
+            # Same latency samples and circuit state as the sync client
+            if http.tracks_latency(endpoint):
+                http.latency.record(endpoint, time.monotonic() - start)
+            if http.breaker is not None:
+                if status >= 500:
+                    http.breaker.failure(endpoint, f"HTTP {status}")
+                else:
+                    http.breaker.success(endpoint)
+            return status, payload
+        finally:
+            # Also runs on cancellation: a probe that never finished must not keep the circuit shut
+            if probe is not None:
+                http.breaker.release(endpoint, probe)
+
+    async def close(self):
+        """Close the shared session and connector"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def get_quote(self, symbol: str, exchange: str = "NSE") -> Optional[Dict]:
+        """Get current market quote for a symbol (see MStockAPI.get_quote)"""
+        try:
+            url = f"{self.base_url}/instruments/quote/ohlc"
+            key = f"{exchange}:{symbol.upper()}"
+
+            status, data = await self._request("GET", url, "quote", headers=self.get_headers(), params={"i": key})
+            if status != 200:
+                logger.error(f"Quote fetch error for {symbol}: {status}")
+                return None
+
+            if data and data.get("status") == "success":
+                return data.get("data", {}).get(key)
+
+            return None
+
+        except BrokerBlindError:
+            raise
+        except Exception as e:
+            logger.error(f"Error fetching quote for {symbol}: {e}")
+            return None
+
+    async def get_quotes(self, instruments: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict]:
+        """
+        Get quotes for many instruments (see MStockAPI.get_quotes)
+
+        Batches are sent concurrently when more than MAX_QUOTE_BATCH
+        instruments are requested.
+        """
+        wanted: Dict[str, Tuple[str, str]] = {}
+        for exchange, symbol in instruments:
+            wanted.setdefault(f"{exchange}:{symbol.upper()}", (exchange, symbol))
+
+        keys = list(wanted.keys())
+        url = f"{self.base_url}/instruments/quote/ohlc"
+        batch_size = self.api.MAX_QUOTE_BATCH
+        batches = [keys[i:i + batch_size] for i in range(0, len(keys), batch_size)]
+
+        async def fetch_batch(batch: List[str]) -> Dict:
+            try:
+                params = [("i", key) for key in batch]
+                status, data = await self._request("GET", url, "quote", headers=self.get_headers(), params=params)
+                if status != 200:
+                    logger.error(f"Batch quote fetch error ({len(batch)} instruments): {status}")
+                    return {}
+                if not data or data.get("status") != "success":
+                    return {}
+                return data.get("data", {}) or {}
+            except BrokerBlindError:
+                raise
+            except Exception as e:
+                logger.error(f"Error fetching batch quotes ({len(batch)} instruments): {e}")
+                return {}
+
+        quotes: Dict[Tuple[str, str], Dict] = {}
+        for batch, payload in zip(batches, await asyncio.gather(*(fetch_batch(b) for b in batches))):
+            for key in batch:
+                if payload.get(key):
+                    quotes[wanted[key]] = payload[key]
+
+        return quotes
+
+    async def get_historical_data(
+        self,
+        symbol: str,
+        exchange: str,
+        instrument_token: str,
+        timeframe: str = "15minute",
+        days: int = 10
+    ) -> Optional[pd.DataFrame]:
+        """
+        Fetch historical OHLC data (see MStockAPI.get_historical_data)
+
+        Candle cache and candle store work (disk reads and writes, coverage
+        files, decoding) runs in worker threads, never on the event loop.
+        """
+        try:
+            key, window_start, fetch_from, ready = await asyncio.to_thread(
+                self.api._history_plan, exchange, instrument_token, timeframe, days
+            )
+            if ready is not None:
+                return ready
+
+            url = self.api._history_url(exchange, instrument_token, timeframe, days, from_dt=fetch_from)
+
+            status, data = await self._request("GET", url, "historical", headers=self.get_headers())
+            if status != 200:
+                logger.error(f"Historical data error: {status}")
+                return None
+
+            if not data or data.get("status") != "success":
+                logger.error(f"Historical data fetch failed: {(data or {}).get('message')}")
+                return None
+
+            candles = data.get("data", {}).get("candles", [])
+            return await asyncio.to_thread(
+                self.api._finish_history, symbol, timeframe, key, window_start, fetch_from, candles
+            )
+
+        except Exception as e:
+            logger.error(f"Error fetching historical data for {symbol}: {e}")
+            return None
+
+    async def get_hybrid_history(
+        self,
+        symbol: str,
+        exchange: str,
+        instrument_token: str,
+        timeframe: str = "15minute",
+        days: int = 10
+    ) -> Optional[pd.DataFrame]:
+        """
+        Fetch history from mStock and fill missing today's bars from yfinance
+        (the yfinance leg comes from the shared boundary-aligned cache; a cold
+        download runs in a worker thread alongside the mStock request)
+        """
+        if symbol in self.api.YF_SYMBOLS and timeframe == "15minute":
+            mstock_df, yf_df = await asyncio.gather(
+                self.get_historical_data(symbol, exchange, instrument_token, timeframe, days),
+                asyncio.to_thread(self.api.yf_cache.get, symbol)
+            )
+            return self.api._stitch_hybrid(symbol, mstock_df, yf_df)
+
+        return await self.get_historical_data(symbol, exchange, instrument_token, timeframe, days)
+
+    async def get_positions(self) -> Optional[Dict[Tuple[str, str], Dict]]:
+        """Get current holdings (see MStockAPI.get_positions)"""
+        try:
+            url = f"{self.base_url}/portfolio/holdings"
+            status, data = await self._request("GET", url, "holdings", headers=self.get_headers())
+
+            if status != 200:
+                logger.error(f"Holdings fetch error: {status}")
+                return None
+
+            return self.api._parse_holdings((data or {}).get("data", []) or [])
+
+        except Exception as e:
+            logger.error(f"Error fetching holdings: {e}")
+            return None
+
+    async def get_net_positions(self) -> Optional[List[Dict]]:
+        """Get all active F&O net positions (see MStockAPI.get_net_positions)"""
+        try:
+            url = f"{self.base_url}/portfolio/positions"
+            status, data = await self._request("GET", url, "positions", headers=self.get_headers())
+
+            if status != 200:
+                logger.error(f"Net Positions fetch error: {status}")
+                return None
+
+            if not data or data.get("status") != "success":
+                return None
+
+            return self.api._normalize_net_positions(data.get("data", []))
+
+        except Exception as e:
+            logger.error(f"Error fetching net positions: {e}")
+            return None
+
+    async def get_tradebook(self) -> Optional[List[Dict]]:
+        """Get all trades executed today (see MStockAPI.get_tradebook)"""
+        try:
+            url = f"{self.base_url}/orders/tradebook"
+            status, data = await self._request("GET", url, "tradebook", headers=self.get_headers())
+
+            if status != 200:
+                if status == 405:
+                    logger.warning("Tradebook endpoint returned 405 (Method Not Allowed). Skipping tradebook fetch.")
+                    return []
+
+                # Fallback check for alternate endpoint
+                url_alt = f"{self.base_url}/orders/trades"
+                status, data = await self._request("GET", url_alt, "tradebook", headers=self.get_headers())
+
+            if status != 200:
+                logger.error(f"Tradebook fetch error: {status}")
+                return None
+
+            trades = (data or {}).get("data", [])
+            if isinstance(trades, list):
+                return trades
+            elif isinstance(trades, dict):
+                logger.warning("Tradebook returned dict instead of list")
+
+            return []
+
+        except Exception as e:
+            logger.error(f"Error fetching tradebook: {e}")
+            return None
+
+    async def place_order(
+        self,
+        symbol: str,
+        exchange: str,
+        qty: int,
+        side: str,
+        order_type: str = "MARKET",
+        price: float = 0,
+        paper_mode: bool = True,
+        token: str = ""
+    ) -> Optional[str]:
+        """Place an order (see MStockAPI.place_order)"""
+        if paper_mode:
+            logger.info(
+                f"PAPER TRADE: {side} {qty} x {symbol} @ {exchange} | "
+                f"Type: {order_type} {f'@ Rs {price}' if order_type == 'LIMIT' else ''}"
+            )
+            return f"PAPER_{datetime.now().strftime('%Y%m%d%H%M%S')}"
+
+        try:
+            url = f"{self.base_url}/orders/regular"
+            payload = self.api._build_order_payload(symbol, exchange, qty, side, order_type, price, token)
+            headers = {
+                **self.get_headers(),
+                "Content-Type": "application/x-www-form-urlencoded"
+            }
+
+            logger.info(f"Placing LIVE order: {side} {qty} x {symbol}")
+            # Exit orders always take the highest-priority lane
+            priority = Priority.EXIT if side.upper() == "SELL" else None
+            status, data = await self._request("POST", url, "orders", priority=priority, data=payload, headers=headers)
+
+            if status != 200:
+                logger.error(f"ERROR Order placement failed: HTTP {status}")
+                logger.error(f"Response: {data}")
+                return None
+
+            return self.api._parse_order_response(data)
+
+        except Exception as e:
+            logger.error(f"ERROR placing order: {e}")
+            raise e
+
+
+class AsyncLoopThread:
+    """
+    Background event loop for driving AsyncMStockAPI from threaded code
+
+    The loop (and therefore the client's connector) lives for the whole
+    session, so keep-alive connections survive between monitoring ticks.
+    """
+
+    def __init__(self, name: str = "AsyncBroker"):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """Run a coroutine on the background loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def stop(self, client: Optional[AsyncMStockAPI] = None):
+        """Close the client (if given) and stop the loop"""
+        if client is not None:
+            try:
+                self.run(client.close(), timeout=5)
+            except Exception:
+                pass
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
@@ -0,0 +1,238 @@
+"""
+Bar Aggregator Module
+Folds live ticks into true OHLC for the forming 15-minute bar
+"""
+
+import threading
+import time
+import logging
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+IST_OFFSET = 19800           # Seconds east of UTC
+SESSION_OPEN = 9 * 3600 + 15 * 60    # 09:15 IST, seconds into the day
+SESSION_CLOSE = 15 * 3600 + 30 * 60  # 15:30 IST
+OHLC = ["open", "high", "low", "close"]
+
+Instrument = Tuple[str, str]   # (exchange, symbol)
+
+
+class Bar:
+    """One aggregated bar (start is epoch seconds of the bar open)"""
+    __slots__ = ("start", "open", "high", "low", "close", "ticks", "partial")
+
+    def __init__(self, start: int, price: float, partial: bool):
+        self.start = start
+        self.open = self.high = self.low = self.close = price
+        self.ticks = 1
+        self.partial = partial  # First tick arrived after the bar opened: open/high/low incomplete
+
+    def update(self, price: float):
+        if price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        self.close = price
+        self.ticks += 1
+
+    def __repr__(self):
+        return (f"Bar({pd.Timestamp(self.start, unit='s', tz='Asia/Kolkata')}, o={self.open}, h={self.high}, "
+                f"l={self.low}, c={self.close}, ticks={self.ticks}{', partial' if self.partial else ''})")
+
+
+def _epoch(ts) -> float:
+    if isinstance(ts, datetime):
+        return ts.timestamp()
+    return float(ts)
+
+
+class BarAggregator:
+    """
+    Builds the forming bar per instrument from every observed tick
+
+    Ticks (e.g. from a TickSource listener) update open/high/low/close of
+    the bar they fall in; the first tick after a boundary seals the
+    previous bar. Sealed bars are kept so a history frame that has not
+    been re-downloaded since the boundary can still be completed with
+    extend(), and indicators see the real intra-bar high and low instead
+    of a candle guessed from the last close and the current price.
+    """
+
+    def __init__(self, bar_minutes: int = 15, max_sealed: int = 64, partial_grace: float = 5.0):
+        """
+        Initialize aggregator
+
+        Parameters:
+        -----------
+        bar_minutes : int
+            Bar length (aligned to 09:15 IST)
+        max_sealed : int
+            Sealed bars kept per instrument
+        partial_grace : float
+            A bar whose first tick arrives later than this many seconds
+            after the open is flagged partial
+        """
+        self.bar_seconds = bar_minutes * 60
+        self.partial_grace = partial_grace
+        self._forming: Dict[Instrument, Bar] = {}
+        self._sealed: Dict[Instrument, Deque[Bar]] = {}
+        self._max_sealed = max_sealed
+        self._lock = threading.Lock()
+
+    def bar_start(self, ts: float) -> int:
+        """Epoch seconds of the bar containing ts"""
+        local = int(ts) + IST_OFFSET
+        return local - local % self.bar_seconds - IST_OFFSET
+
+    @staticmethod
+    def in_session(ts: float) -> bool:
+        """Whether ts falls inside 09:15-15:30 IST"""
+        seconds = (int(ts) + IST_OFFSET) % 86400
+        return SESSION_OPEN <= seconds < SESSION_CLOSE
+
+    def attach(self, source) -> "BarAggregator":
+        """Receive every tick of a TickSource"""
+        source.add_listener(self.on_tick)
+        return self
+
+    def on_tick(self, instrument: Instrument, quote: Dict, ts: float):
+        """TickSource listener: fold a quote's last_price into its bar"""
+        price = quote.get("last_price") if quote else None
+        if price:
+            self.update(instrument, float(price), ts)
+
+    def update(self, instrument: Instrument, price: float, ts) -> Optional[Bar]:
+        """
+        Add one trade/quote price
+
+        Returns:
+        --------
+        Optional[Bar]
+            The bar sealed by this tick, if it crossed a boundary
+        """
+        ts = _epoch(ts)
+        if not self.in_session(ts):
+            return None
+        start = self.bar_start(ts)
+        sealed = None
+        with self._lock:
+            bar = self._forming.get(instrument)
+            if bar is not None and start < bar.start:
+                return None  # Late tick for a bar already sealed
+            if bar is not None and start == bar.start:
+                bar.update(price)
+                return None
+            if bar is not None:
+                sealed = self._seal(instrument, bar)
+            self._forming[instrument] = Bar(start, price, partial=ts - start > self.partial_grace)
+        return sealed
+
+    def _seal(self, instrument: Instrument, bar: Bar) -> Bar:
+        sealed = self._sealed.get(instrument)
+        if sealed is None:
+            sealed = self._sealed[instrument] = deque(maxlen=self._max_sealed)
+        sealed.append(bar)
+        return bar
+
+    def _roll(self, instrument: Instrument, now: float):
+        """Seal the forming bar once its boundary has passed (no tick needed)"""
+        bar = self._forming.get(instrument)
+        if bar is not None and now >= bar.start + self.bar_seconds:
+            self._seal(instrument, bar)
+            del self._forming[instrument]
+
+    def forming(self, instrument: Instrument, now=None) -> Optional[Bar]:
+        """Current (unsealed) bar, or None if no tick has arrived since the last boundary"""
+        now = _epoch(now) if now is not None else time.time()
+        with self._lock:
+            self._roll(instrument, now)
+            return self._forming.get(instrument)
+
+    def sealed(self, instrument: Instrument, now=None) -> List[Bar]:
+        """Bars sealed so far (oldest first)"""
+        now = _epoch(now) if now is not None else time.time()
+        with self._lock:
+            self._roll(instrument, now)
+            return list(self._sealed.get(instrument, ()))
+
+    def extend(self, instrument: Instrument, history: pd.DataFrame, now=None) -> pd.DataFrame:
+        """
+        History plus the aggregated bars it does not have yet
+
+        Bars newer than the last history bar are appended (sealed ones,
+        then the forming one). If the last history bar is itself the one
+        being aggregated, its high/low are widened and its close updated.
+        A partial bar (bot started mid-bar) opens at the previous close.
+
+        Parameters:
+        -----------
+        instrument : Instrument
+            (exchange, symbol)
+        history : pd.DataFrame
+            IST-indexed OHLC frame
+        now : optional datetime / epoch seconds
+            Defaults to the current time
+
+        Returns:
+        --------
+        pd.DataFrame
+            New OHLC frame (history is not modified)
+        """
+        now = _epoch(now) if now is not None else time.time()
+        with self._lock:
+            self._roll(instrument, now)
+            bars = list(self._sealed.get(instrument, ()))
+            if instrument in self._forming:
+                bars.append(self._forming[instrument])
+            bars = [(b.start, b.open, b.high, b.low, b.close, b.partial) for b in bars]
+
+        if history is None or history.empty or not bars:
+            return history.copy(deep=False) if history is not None else None
+
+        ohlc = history[OHLC].to_numpy(dtype=np.float64, copy=True)
+        last_start = int(history.index[-1].timestamp())
+        rows, starts = [], []
+        for start, o, h, l, c, partial in bars:
+            if start < last_start:
+                continue
+            if start == last_start:
+                ohlc[-1, 1] = max(ohlc[-1, 1], h)
+                ohlc[-1, 2] = min(ohlc[-1, 2], l)
+                ohlc[-1, 3] = c
+                continue
+            if partial:
+                o = rows[-1][3] if rows else ohlc[-1, 3]
+                h, l = max(h, o), min(l, o)
+            rows.append((o, h, l, c))
+            starts.append(start)
+
+        index = history.index
+        if rows:
+            ohlc = np.vstack([ohlc, np.asarray(rows, dtype=np.float64)])
+            added = pd.to_datetime(starts, unit="s", utc=True).tz_convert(index.tz or "Asia/Kolkata")
+            index = index.append(added)
+        return pd.DataFrame(ohlc, index=index, columns=OHLC)
+
+
+def append_live_bar(history: pd.DataFrame, price: float, now: datetime, bar_minutes: int = 15) -> pd.DataFrame:
+    """
+    Estimated forming bar when no tick aggregator is available
+
+    open = last close, high/low = max/min(last close, price), close = price.
+    """
+    if history is None or history.empty or price <= 0:
+        return history.copy(deep=False) if history is not None else None
+    bar_start = now.replace(minute=now.minute - now.minute % bar_minutes, second=0, microsecond=0)
+    last_close = float(history["close"].iloc[-1])
+    ohlc = np.vstack([
+        history[OHLC].to_numpy(dtype=np.float64),
+        [[last_close, max(last_close, price), min(last_close, price), price]],
+    ])
+    return pd.DataFrame(ohlc, index=history.index.append(pd.DatetimeIndex([bar_start])), columns=OHLC)
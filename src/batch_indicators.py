@@ -0,0 +1,213 @@
+"""
+Batch Indicators Module
+MACD, RSI and ADX for many symbols at once over (symbols x bars) arrays
+"""
+
+import logging
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src import recursive_filters
+
+logger = logging.getLogger(__name__)
+
+
+def ewm_2d(values: np.ndarray, alpha: float, min_periods: int = 0) -> np.ndarray:
+    """
+    Row-wise pandas `ewm(alpha=..., adjust=False).mean()` of a 2-D array
+
+    Every row is processed in one pass, so the cost hardly grows with the
+    number of rows. Rows observed without gaps once they start (leading
+    NaN padding of shorter histories included) go through one block scan
+    of the whole matrix (recursive_filters._scan, equal to pandas within a
+    few ulps); rows with NaN gaps take the per-bar recursion, which
+    reproduces pandas' gap handling bit for bit.
+
+    Parameters:
+    -----------
+    values : np.ndarray
+        (symbols, bars) float array
+    alpha : float
+        Smoothing factor
+    min_periods : int
+        Observations required before a value is returned
+
+    Returns:
+    --------
+    np.ndarray
+        (symbols, bars) means
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        return ewm_2d(values[np.newaxis, :], alpha, min_periods)[0]
+    rows, bars = values.shape
+    out = np.full(values.shape, np.nan)
+    if bars == 0 or rows == 0:
+        return out
+    min_periods = max(int(min_periods), 1)
+
+    observed = values == values
+    started = np.maximum.accumulate(observed, axis=1)
+    gapped = (started & ~observed).any(axis=1)
+    contiguous = started[:, -1] & ~gapped
+    if contiguous.any():
+        out[contiguous] = _ewm_contiguous(values[contiguous], started[contiguous], alpha, min_periods)
+    if gapped.any():
+        out[gapped] = _ewm_steps(values[gapped], alpha, min_periods)
+    return out
+
+
+def _ewm_contiguous(values: np.ndarray, started: np.ndarray, alpha: float, min_periods: int) -> np.ndarray:
+    """ewm_2d for rows with no NaN after their first observation, as one block scan"""
+    decay = 1.0 - alpha
+    norm = decay + alpha  # pandas divides by (decay + alpha) on every step
+    first = np.argmax(started, axis=1)
+    seed = values[np.arange(len(values)), first]
+    # Holding the seed over the leading padding leaves the recursion at the
+    # seed up to the first observation, which is where pandas starts
+    filled = np.where(started, values, seed[:, np.newaxis])
+    out = recursive_filters._scan(seed, filled, decay / norm, alpha / norm)
+    out[np.arange(len(values)), first] = seed
+    nobs = np.arange(values.shape[1]) - first[:, np.newaxis] + 1
+    out[nobs < min_periods] = np.nan
+    return out
+
+
+def _ewm_steps(values: np.ndarray, alpha: float, min_periods: int) -> np.ndarray:
+    """ewm_2d as a per-bar recursion over all rows, NaN gaps included"""
+    rows, bars = values.shape
+    out = np.empty_like(values)
+    decay = 1.0 - alpha
+    denominator = decay + alpha
+
+    # Bars where every row is observed on this and the previous bar take the
+    # plain recursion (weights are all 1 there); gaps take the general one
+    complete = ~np.isnan(values).any(axis=0)
+    plain = np.zeros(bars, dtype=bool)
+    plain[1:] = complete[1:] & complete[:-1]
+
+    value = values[:, 0].copy()
+    weight = np.ones(rows)
+    nobs = (value == value).astype(np.int64)
+    out[:, 0] = np.where(nobs >= min_periods, value, np.nan)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for t in range(1, bars):
+            cur = values[:, t]
+            if plain[t]:
+                nobs += 1
+                blended = (decay * value + alpha * cur) / denominator
+                value = np.where(value != cur, blended, value)
+                out[:, t] = value if nobs.min() >= min_periods else np.where(nobs >= min_periods, value, np.nan)
+                continue
+            observed = cur == cur
+            nobs += observed
+            seeded = value == value
+            weight = np.where(seeded, weight * decay, weight)
+            blended = (weight * value + alpha * cur) / (weight + alpha)
+            value = np.where(seeded & observed & (value != cur), blended, value)
+            value = np.where(~seeded & observed, cur, value)
+            weight = np.where(seeded & observed, 1.0, weight)
+            out[:, t] = np.where(nobs >= min_periods, value, np.nan)
+    return out
+
+
+def ema_2d(values: np.ndarray, span: int) -> np.ndarray:
+    """Row-wise EMA (pandas span convention, adjust=False)"""
+    return ewm_2d(values, 2.0 / (span + 1.0))
+
+
+def rma_2d(values: np.ndarray, period: int, min_periods: int = 0) -> np.ndarray:
+    """Row-wise Wilder RMA (alpha = 1/period)"""
+    return ewm_2d(values, 1.0 / period, min_periods)
+
+
+def _shift(values: np.ndarray) -> np.ndarray:
+    """Previous bar along the last axis (NaN for the first)"""
+    shifted = np.empty_like(values)
+    shifted[..., 0] = np.nan
+    shifted[..., 1:] = values[..., :-1]
+    return shifted
+
+
+def macd_2d(close: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Row-wise TechnicalIndicators.calculate_macd: (macd, signal, histogram)"""
+    close = np.asarray(close, dtype=np.float64)
+    macd = ema_2d(close, fast) - ema_2d(close, slow)
+    signal_line = ema_2d(macd, signal)
+    return macd, signal_line, macd - signal_line
+
+
+def rsi_2d(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """Row-wise TechnicalIndicators.calculate_rsi"""
+    close = np.asarray(close, dtype=np.float64)
+    delta = close - _shift(close)
+    gain = np.where(delta != delta, delta, np.maximum(delta, 0.0))
+    loss = -np.where(delta != delta, delta, np.minimum(delta, 0.0))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rs = rma_2d(gain, period) / rma_2d(loss, period)
+        return 100 - (100 / (1 + rs))
+
+
+def adx_2d(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int = 14) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Row-wise TechnicalIndicators.calculate_adx: (adx, +di, -di)"""
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    prev_close = _shift(close)
+
+    # fmax skips NaN like DataFrame.max(axis=1)
+    tr = np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+    atr = rma_2d(tr, period, min_periods=period)
+
+    up_move = high - _shift(high)
+    down_move = _shift(low) - low
+    with np.errstate(invalid="ignore"):
+        plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+        minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        plus_di = 100 * (rma_2d(plus_dm, period) / atr)
+        minus_di = 100 * (rma_2d(minus_dm, period) / atr)
+        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    return rma_2d(dx, period), plus_di, minus_di
+
+
+def stack_frames(frames: Dict[str, pd.DataFrame], columns: Tuple[str, ...] = ("high", "low", "close")) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    """
+    Right-align per-symbol frames into (symbols x bars) arrays
+
+    Shorter histories are padded with leading NaN, which the kernels
+    treat exactly like the shorter series (the last bar of every row is
+    its own last bar).
+
+    Returns:
+    --------
+    Tuple[List[str], Dict[str, np.ndarray]]
+        Row order and column -> (symbols, bars) array
+    """
+    keys = list(frames.keys())
+    bars = max((len(frame) for frame in frames.values()), default=0)
+    stacked = {}
+    for column in columns:
+        matrix = np.full((len(keys), bars), np.nan)
+        for row, key in enumerate(keys):
+            values = frames[key][column].to_numpy(dtype=np.float64)
+            if len(values):
+                matrix[row, bars - len(values):] = values
+        stacked[column] = matrix
+    return keys, stacked
+
+
+def indicators_2d(high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                  fast: int = 12, slow: int = 26, signal: int = 9,
+                  rsi_period: int = 14, adx_period: int = 14) -> Dict[str, np.ndarray]:
+    """All intraday/daily indicator columns for every row, keyed like the frame columns"""
+    macd, signal, hist = macd_2d(close, fast, slow, signal)
+    adx, plus_di, minus_di = adx_2d(high, low, close, adx_period)
+    return {
+        "MACD": macd, "MACD_Signal": signal, "MACD_Hist": hist,
+        "RSI": rsi_2d(close, rsi_period),
+        "ADX": adx, "+DI": plus_di, "-DI": minus_di,
+    }
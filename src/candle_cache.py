@@ -0,0 +1,152 @@
+"""
+Candle Cache Module
+In-memory incremental cache for historical OHLC windows
+"""
+
+import threading
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+CacheKey = Tuple[str, str, str]  # (exchange, token, timeframe)
+
+
+class CandleCache:
+    """
+    Holds the last fetched history window per (exchange, token, timeframe)
+
+    The first request for a key downloads the full window. Later requests
+    only need bars from the cached tail onwards: the last cached bar is
+    re-fetched too, because it may still have been forming when it was
+    stored. The fresh bars replace the overlapping tail, so the cost per
+    call stays roughly constant instead of growing with the lookback.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        """
+        Initialize candle cache
+
+        Parameters:
+        -----------
+        max_entries : int
+            Maximum number of cached instrument/timeframe windows
+            (least recently used entries are evicted first)
+        """
+        self.max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[CacheKey, Tuple[datetime, pd.DataFrame]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(exchange: str, token: str, timeframe: str) -> CacheKey:
+        return (exchange.upper(), str(token), timeframe)
+
+    def fetch_start(self, key: CacheKey, window_start: datetime) -> Optional[datetime]:
+        """
+        Timestamp to fetch from for an incremental update
+
+        Parameters:
+        -----------
+        key : CacheKey
+            (exchange, token, timeframe)
+        window_start : datetime
+            Oldest bar the caller needs
+
+        Returns:
+        --------
+        Optional[datetime]
+            Timestamp of the cached tail bar, or None if a full fetch is
+            needed (nothing cached, or the cache does not reach back to
+            window_start)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            covered_from, df = entry
+            if df.empty or covered_from > window_start:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return df.index[-1].to_pydatetime()
+
+    def update(
+        self,
+        key: CacheKey,
+        window_start: datetime,
+        fresh: Optional[pd.DataFrame],
+        incremental: bool
+    ) -> Optional[pd.DataFrame]:
+        """
+        Merge freshly fetched bars into the cache
+
+        Parameters:
+        -----------
+        key : CacheKey
+            (exchange, token, timeframe)
+        window_start : datetime
+            Oldest bar the caller needs
+        fresh : Optional[pd.DataFrame]
+            Bars just downloaded (full window, or tail only if incremental)
+        incremental : bool
+            True if `fresh` only covers the cached tail onwards
+
+        Returns:
+        --------
+        Optional[pd.DataFrame]
+            Copy of the cached window trimmed to window_start
+        """
+        with self._lock:
+            if incremental and key in self._entries:
+                covered_from, cached = self._entries[key]
+                if fresh is not None and not fresh.empty:
+                    cached = pd.concat([cached[cached.index < fresh.index[0]], fresh])
+                    cached = cached[~cached.index.duplicated(keep="last")]
+                    # Slide the window forward so the cache stays bounded
+                    covered_from = max(covered_from, window_start)
+                    cached = cached[cached.index >= covered_from]
+            else:
+                if fresh is None or fresh.empty:
+                    return None
+                covered_from, cached = window_start, fresh
+
+            self._entries[key] = (covered_from, cached)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+            window = cached[cached.index >= window_start]
+            return window.copy() if not window.empty else None
+
+    def get(self, key: CacheKey, window_start: datetime) -> Optional[pd.DataFrame]:
+        """Copy of the cached window trimmed to window_start (no counters touched)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            window = entry[1][entry[1].index >= window_start]
+            return window.copy() if not window.empty else None
+
+    def invalidate(self, key: Optional[CacheKey] = None):
+        """Drop one cached window, or everything if key is None"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict:
+        """Cache hit/miss counters"""
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
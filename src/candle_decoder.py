@@ -0,0 +1,163 @@
+"""
+Candle Decoder Module
+Decodes historical candle payloads straight into NumPy arrays
+"""
+
+import logging
+import re
+from itertools import chain
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+IST = "Asia/Kolkata"
+IST_OFFSET = 19800                   # Seconds east of UTC
+SESSION_OPEN = 9 * 3600 + 15 * 60    # 09:15 IST, seconds into the day
+SESSION_CLOSE = 15 * 3600 + 30 * 60  # 15:30 IST (inclusive, like between_time)
+OHLCV = ["open", "high", "low", "close", "volume"]
+
+_OFFSET = re.compile(r"^([+-])(\d{2}):?(\d{2})$")
+
+
+class CandleBlock:
+    """
+    Decoded candles as flat arrays
+
+    ts     : int64 epoch seconds (bar start)
+    ohlcv  : float64 (n, 5) open, high, low, close, volume
+    mask   : bool, True for bars inside market hours (all True for daily bars)
+
+    A DataFrame is only built when a caller asks for one (to_frame);
+    indicator code can work on the arrays directly.
+    """
+
+    __slots__ = ("ts", "ohlcv", "mask")
+
+    def __init__(self, ts: np.ndarray, ohlcv: np.ndarray, mask: np.ndarray):
+        self.ts = ts
+        self.ohlcv = ohlcv
+        self.mask = mask
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def column(self, name: str) -> np.ndarray:
+        """One OHLCV column (view, market-hours rows only if the mask excludes any)"""
+        values = self.ohlcv[:, OHLCV.index(name)]
+        return values if self.mask.all() else values[self.mask]
+
+    def to_frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        IST-indexed DataFrame of the market-hours bars
+
+        Parameters:
+        -----------
+        columns : Optional[List[str]]
+            Subset of OHLCV (default open/high/low/close, matching
+            MStockAPI history frames)
+
+        Returns:
+        --------
+        pd.DataFrame
+            Built on the decoded arrays without copying when every bar
+            is inside market hours and the columns are a leading slice
+        """
+        columns = columns or OHLCV[:4]
+        ts, values = self.ts, self.ohlcv
+        if not self.mask.all():
+            ts, values = ts[self.mask], values[self.mask]
+
+        positions = [OHLCV.index(col) for col in columns]
+        if positions == list(range(len(positions))):
+            values = values[:, :len(positions)]
+        else:
+            values = values[:, positions]
+
+        index = pd.DatetimeIndex(ts.astype("datetime64[s]"), tz="UTC").tz_convert(IST)
+        index.name = "timestamp"
+        return pd.DataFrame(values, index=index, columns=columns, copy=False)
+
+
+def _parse_offset(suffix: str) -> Optional[int]:
+    """UTC offset in seconds for a timestamp suffix like '+05:30', '+0530', 'Z' or '' (naive = UTC, as pd.to_datetime(utc=True))"""
+    if suffix in ("", "Z"):
+        return 0
+    match = _OFFSET.match(suffix)
+    if match is None:
+        return None
+    sign = -1 if match.group(1) == "-" else 1
+    return sign * (int(match.group(2)) * 3600 + int(match.group(3)) * 60)
+
+
+def decode_timestamps(values: list) -> np.ndarray:
+    """
+    Broker timestamps -> int64 epoch seconds
+
+    Handles epoch numbers (s or ms) and ISO strings with one common UTC
+    offset via NumPy's datetime parser; anything else falls back to
+    pandas.
+    """
+    n = len(values)
+    first = values[0]
+    if isinstance(first, (int, float)):
+        ts = np.fromiter(values, dtype=np.float64, count=n)
+        if ts[0] > 1e11:  # Milliseconds
+            ts = ts / 1000.0
+        return ts.astype(np.int64)
+
+    if isinstance(first, str) and len(first) >= 19:
+        suffixes = {value[19:] for value in values}
+        if len(suffixes) == 1:
+            offset = _parse_offset(suffixes.pop())
+            if offset is not None:
+                local = np.array([value[:19] for value in values], dtype="datetime64[s]")
+                return local.astype(np.int64) - offset
+
+    parsed = pd.to_datetime(pd.Series(values), utc=True)
+    return parsed.dt.tz_localize(None).to_numpy(dtype="datetime64[s]").astype(np.int64)
+
+
+def decode_candles(candles: list, timeframe: str = "15minute") -> CandleBlock:
+    """
+    Decode a historical candle payload
+
+    Parameters:
+    -----------
+    candles : list
+        [[timestamp, open, high, low, close, volume], ...] as returned by
+        the historical endpoint (volume may be missing)
+    timeframe : str
+        'day' skips the market-hours mask
+
+    Returns:
+    --------
+    CandleBlock
+    """
+    n = len(candles)
+    if n == 0:
+        return CandleBlock(np.empty(0, np.int64), np.empty((0, 5), np.float64), np.empty(0, bool))
+
+    ts = decode_timestamps([row[0] for row in candles])
+
+    width = 5 if all(len(row) >= 6 for row in candles) else 4
+    try:
+        flat = np.fromiter(chain.from_iterable(row[1:1 + width] for row in candles), dtype=np.float64, count=n * width)
+    except (TypeError, ValueError):
+        # Nulls (e.g. no volume for an index) or numeric strings: slower tolerant path
+        flat = pd.to_numeric(pd.Series(list(chain.from_iterable(row[1:1 + width] for row in candles))),
+                             errors="coerce").to_numpy(dtype=np.float64)
+    ohlcv = flat.reshape(n, width)
+    if width == 4:
+        ohlcv = np.hstack([ohlcv, np.zeros((n, 1))])
+
+    if timeframe == "day":
+        mask = np.ones(n, dtype=bool)
+    else:
+        seconds = (ts + IST_OFFSET) % 86400
+        mask = (seconds >= SESSION_OPEN) & (seconds <= SESSION_CLOSE)
+
+    return CandleBlock(ts, ohlcv, mask)
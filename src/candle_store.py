@@ -0,0 +1,287 @@
+"""
+Candle Store Module
+Persistent on-disk OHLC store partitioned by instrument, timeframe and trading day
+"""
+
+import json
+import os
+import threading
+import logging
+from datetime import datetime, timedelta, time as dt_time
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pytz
+
+logger = logging.getLogger(__name__)
+
+
+IST = pytz.timezone("Asia/Kolkata")
+
+# One record per bar; ts is the bar open time in epoch seconds (UTC)
+CANDLE_DTYPE = np.dtype([
+    ("ts", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+])
+
+MARKET_CLOSE = dt_time(15, 30)
+
+CacheKey = Tuple[str, str, str]  # (exchange, token, timeframe)
+
+
+def last_session_close(now: datetime) -> datetime:
+    """Most recent weekday 15:30 IST at or before `now` (exchange holidays ignored)"""
+    now = now.astimezone(IST)
+    close = now.replace(hour=MARKET_CLOSE.hour, minute=MARKET_CLOSE.minute, second=0, microsecond=0)
+    if now < close or now.weekday() >= 5:
+        close -= timedelta(days=1)
+    while close.weekday() >= 5:
+        close -= timedelta(days=1)
+    return close
+
+
+class CandleStore:
+    """
+    Columnar candle store on local disk
+
+    Layout:
+        {root}/{EXCHANGE}_{TOKEN}/{timeframe}/{YYYY-MM-DD}.npy   intraday bars, one file per trading day
+        {root}/{EXCHANGE}_{TOKEN}/day/{YYYY-MM}.npy               daily bars, one file per month
+        {root}/{EXCHANGE}_{TOKEN}/{timeframe}/_coverage.json      contiguous range known to be complete
+
+    The coverage record lets a restarted process (or a diagnostic script)
+    serve a history window straight from disk and fetch only the bars after
+    the stored tail. Files are replaced atomically so concurrent readers
+    never see a half-written partition.
+    """
+
+    def __init__(self, root: str = "data/candles"):
+        """
+        Initialize candle store
+
+        Parameters:
+        -----------
+        root : str
+            Directory holding the partitions (created on first write)
+        """
+        self.root = root
+        self._lock = threading.Lock()
+
+    # ---------------- Paths ----------------
+
+    def _dir(self, key: CacheKey) -> str:
+        exchange, token, timeframe = key
+        return os.path.join(self.root, f"{exchange.upper()}_{token}", timeframe)
+
+    @staticmethod
+    def _partition_name(key: CacheKey, ts: pd.Timestamp) -> str:
+        if key[2] == "day":
+            return ts.strftime("%Y-%m")
+        return ts.strftime("%Y-%m-%d")
+
+    def _coverage_path(self, key: CacheKey) -> str:
+        return os.path.join(self._dir(key), "_coverage.json")
+
+    # ---------------- Coverage ----------------
+
+    def coverage(self, key: CacheKey) -> Optional[Dict]:
+        """
+        Stored coverage record
+
+        Returns:
+        --------
+        Optional[Dict]
+            {"from": epoch, "to": epoch, "fetched_at": epoch} or None
+        """
+        try:
+            with open(self._coverage_path(key), "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_coverage(self, key: CacheKey, record: Dict):
+        path = self._coverage_path(key)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(record, f)
+        os.replace(tmp, path)
+
+    def is_current(self, key: CacheKey, now: Optional[datetime] = None) -> bool:
+        """
+        True if nothing can have traded since the stored data was fetched
+
+        Outside market hours, data fetched after the last session close is
+        complete, so callers can skip the network entirely.
+        """
+        record = self.coverage(key)
+        if not record:
+            return False
+        now = now or datetime.now(IST)
+        return record.get("fetched_at", 0) >= last_session_close(now).timestamp() and (
+            now.weekday() >= 5 or not (dt_time(9, 15) <= now.astimezone(IST).time() <= MARKET_CLOSE)
+        )
+
+    # ---------------- Read / write ----------------
+
+    def load(self, key: CacheKey, window_start: datetime) -> Optional[pd.DataFrame]:
+        """
+        Load a window from disk if the stored coverage reaches back to it
+
+        Parameters:
+        -----------
+        key : CacheKey
+            (exchange, token, timeframe)
+        window_start : datetime
+            Oldest bar required
+
+        Returns:
+        --------
+        Optional[pd.DataFrame]
+            IST-indexed open/high/low/close frame, or None if the store
+            does not cover window_start
+        """
+        record = self.coverage(key)
+        if not record or record["from"] > window_start.timestamp():
+            return None
+
+        df = self.read(key, window_start)
+        if df is None or df.empty:
+            return None
+        return df
+
+    def read(self, key: CacheKey, start: datetime, end: Optional[datetime] = None) -> Optional[pd.DataFrame]:
+        """
+        Read all stored bars in [start, end]
+
+        Returns:
+        --------
+        Optional[pd.DataFrame]
+            IST-indexed open/high/low/close frame, or None if nothing stored
+        """
+        directory = self._dir(key)
+        if not os.path.isdir(directory):
+            return None
+
+        start_ts = self._to_ist(start)
+        end_ts = self._to_ist(end) if end is not None else None
+        first = self._partition_name(key, start_ts)
+        last = self._partition_name(key, end_ts) if end_ts is not None else None
+
+        arrays = []
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(".npy"):
+                continue
+            part = name[:-4]
+            if part < first or (last is not None and part > last):
+                continue
+            try:
+                arrays.append(np.load(os.path.join(directory, name)))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable candle partition {name}: {e}")
+
+        if not arrays:
+            return None
+
+        data = np.concatenate(arrays)
+        mask = data["ts"] >= int(start_ts.timestamp())
+        if end is not None:
+            mask &= data["ts"] <= int(end_ts.timestamp())
+        data = data[mask]
+        if len(data) == 0:
+            return None
+
+        return self.to_frame(data)
+
+    def write(self, key: CacheKey, df: pd.DataFrame, window_start: Optional[datetime] = None):
+        """
+        Merge bars into their partitions and extend the coverage record
+
+        Parameters:
+        -----------
+        key : CacheKey
+            (exchange, token, timeframe)
+        df : pd.DataFrame
+            IST-indexed open/high/low/close bars (newer values win)
+        window_start : Optional[datetime]
+            Set for a full-window download: the bars form a complete range
+            from window_start. None for a tail update that continues the
+            existing coverage.
+        """
+        if df is None or df.empty:
+            return
+
+        records = self.from_frame(df)
+        directory = self._dir(key)
+
+        with self._lock:
+            os.makedirs(directory, exist_ok=True)
+
+            parts: Dict[str, np.ndarray] = {}
+            names = np.array([self._partition_name(key, self._to_ist(ts)) for ts in df.index])
+            for name in np.unique(names):
+                parts[name] = records[names == name]
+
+            for name, new in parts.items():
+                path = os.path.join(directory, f"{name}.npy")
+                if os.path.exists(path):
+                    try:
+                        old = np.load(path)
+                        old = old[~np.isin(old["ts"], new["ts"])]
+                        new = np.concatenate([old, new])
+                    except (OSError, ValueError):
+                        pass
+                new = np.sort(new, order="ts")
+                tmp = f"{path}.tmp.npy"
+                np.save(tmp, new)
+                os.replace(tmp, path)
+
+            record = self.coverage(key)
+            first, last = int(records["ts"].min()), int(records["ts"].max())
+            now = datetime.now(IST).timestamp()
+            if window_start is not None:
+                start = int(window_start.timestamp())
+                if record and start <= record["to"] and last >= record["from"]:
+                    # Overlaps what is already stored: extend the known range
+                    record = {"from": min(start, record["from"]), "to": max(last, record["to"])}
+                else:
+                    record = {"from": start, "to": last}
+            elif record and first <= record["to"]:
+                record = {"from": record["from"], "to": max(record["to"], last)}
+            else:
+                # Tail update that does not connect to known coverage
+                return
+            record["fetched_at"] = now
+            self._write_coverage(key, record)
+
+    # ---------------- Conversion ----------------
+
+    @staticmethod
+    def _to_ist(value) -> pd.Timestamp:
+        """Timestamp in IST (naive values are taken as IST)"""
+        ts = pd.Timestamp(value)
+        return ts.tz_convert(IST) if ts.tzinfo is not None else ts.tz_localize(IST)
+
+    @staticmethod
+    def from_frame(df: pd.DataFrame) -> np.ndarray:
+        """OHLC DataFrame -> structured candle array"""
+        records = np.empty(len(df), dtype=CANDLE_DTYPE)
+        index = df.index if df.index.tz is not None else df.index.tz_localize(IST)
+        # Resolution-independent epoch seconds (pandas 2 may hold us/ms indexes)
+        records["ts"] = index.tz_convert("UTC").tz_localize(None).to_numpy(dtype="datetime64[s]").astype(np.int64)
+        for col in ("open", "high", "low", "close"):
+            records[col] = df[col].to_numpy(dtype=np.float64)
+        return records
+
+    @staticmethod
+    def to_frame(records: np.ndarray) -> pd.DataFrame:
+        """Structured candle array -> IST-indexed OHLC DataFrame"""
+        index = pd.to_datetime(records["ts"], unit="s", utc=True).tz_convert(IST)
+        index.name = "timestamp"
+        return pd.DataFrame(
+            {col: records[col] for col in ("open", "high", "low", "close")},
+            index=index
+        )
@@ -0,0 +1,210 @@
+"""
+Daily Context Module
+Daily-timeframe indicators computed once per session and pinned for the day
+"""
+
+import threading
+import logging
+from datetime import date
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.batch_indicators import indicators_2d, stack_frames
+from src.indicators import TechnicalIndicators
+from src.lookback import converged_tail, history_days
+from src.utils import now_ist
+
+logger = logging.getLogger(__name__)
+
+
+# Columns of a pinned daily frame (OHLC + indicators)
+DAILY_COLUMNS = ["open", "high", "low", "close", "MACD", "MACD_Signal", "MACD_Hist", "RSI", "ADX", "+DI", "-DI"]
+
+
+class DailyContext:
+    """
+    Once-per-session daily indicator frames
+
+    Daily bars only change when a session completes, so the daily
+    MACD/RSI/ADX frame for each underlying is built once (normally at
+    warmup) from completed sessions and reused by every entry tick.
+    Callers (e.g. check_entry_conditions_ce/pe) get a shallow view over
+    read-only arrays, so nothing a caller does can alter the pinned data.
+    """
+
+    def __init__(self, api, days: Optional[int] = None, min_bars: int = 30):
+        """
+        Initialize daily context
+
+        Parameters:
+        -----------
+        api : MStockAPI
+            API used to download daily history
+        days : Optional[int]
+            Daily lookback to download (default: src.lookback.history_days)
+        min_bars : int
+            Minimum completed daily bars required for a usable frame
+        """
+        self.api = api
+        self.days = days if days is not None else history_days("day")
+        self.min_bars = min_bars
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._session: Optional[date] = None
+        self._lock = threading.Lock()
+
+    def get(self, symbol: str, exchange: str, instrument_token: str) -> Optional[pd.DataFrame]:
+        """
+        Get the pinned daily frame for a symbol, building it on first use
+
+        Returns:
+        --------
+        Optional[pd.DataFrame]
+            View of the pinned daily frame with DAILY_COLUMNS, or None if
+            not enough daily history is available
+        """
+        today = now_ist().date()
+        with self._lock:
+            if self._session != today:
+                # New session: yesterday's completed bar changes every indicator
+                self._frames.clear()
+                self._session = today
+            frame = self._frames.get(symbol)
+        if frame is None:
+            frame = self._build(symbol, exchange, instrument_token, today)
+            if frame is None:
+                return None
+            with self._lock:
+                frame = self._frames.setdefault(symbol, frame)
+
+        # Shallow view: shares the read-only data, but added columns stay with the caller
+        return frame.copy(deep=False)
+
+    def prepare(self, symbols_config: dict) -> Dict[str, bool]:
+        """
+        Build daily frames for every configured underlying (warmup)
+
+        Parameters:
+        -----------
+        symbols_config : dict
+            {symbol: (exchange, token, underlying)} as loaded from config.json
+
+        Returns:
+        --------
+        Dict[str, bool]
+            symbol -> whether a usable frame was pinned
+        """
+        today = now_ist().date()
+        with self._lock:
+            if self._session != today:
+                self._frames.clear()
+                self._session = today
+            pending = {symbol: spec for symbol, spec in symbols_config.items() if symbol not in self._frames}
+
+        # Download each underlying, then compute every daily frame in one 2-D pass
+        downloaded = {}
+        for symbol, (exchange, instrument_token, _) in pending.items():
+            daily_df = self._download(symbol, exchange, instrument_token, today)
+            if daily_df is not None:
+                downloaded[symbol] = daily_df
+        with self._lock:
+            for symbol, frame in self.compute_many(downloaded).items():
+                self._frames.setdefault(symbol, frame)
+
+        ready = {}
+        for symbol in symbols_config:
+            ready[symbol] = symbol in self._frames
+            if ready[symbol]:
+                adx = self._frames[symbol]["ADX"].iloc[-1]
+                logger.info(f"Daily context pinned for {symbol}: {len(self._frames[symbol])} bars, ADX {adx:.2f}")
+            else:
+                logger.warning(f"Daily context unavailable for {symbol}")
+        return ready
+
+    def invalidate(self):
+        """Drop all pinned frames (they are rebuilt on next use)"""
+        with self._lock:
+            self._frames.clear()
+            self._session = None
+
+    def _build(self, symbol: str, exchange: str, instrument_token: str, session: date) -> Optional[pd.DataFrame]:
+        """Download completed daily bars and compute the daily indicators"""
+        daily_df = self._download(symbol, exchange, instrument_token, session)
+        if daily_df is None:
+            return None
+        return self.compute(daily_df)
+
+    def _download(self, symbol: str, exchange: str, instrument_token: str, session: date) -> Optional[pd.DataFrame]:
+        """Completed daily bars before `session` (the converged tail), or None if too few"""
+        daily_df = self.api.get_historical_data(symbol, exchange, instrument_token, "day", days=self.days)
+        if daily_df is None:
+            return None
+
+        # Only completed sessions: a partial bar for today would make the pin depend on start time
+        daily_df = daily_df[daily_df.index.date < session]
+        if len(daily_df) < self.min_bars:
+            logger.error(f"Insufficient daily data for {symbol}")
+            return None
+        return converged_tail(daily_df)
+
+    @staticmethod
+    def compute(daily_df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compute daily indicators into a new read-only frame
+
+        Parameters:
+        -----------
+        daily_df : pd.DataFrame
+            Daily OHLC data
+
+        Returns:
+        --------
+        pd.DataFrame
+            Frame with DAILY_COLUMNS backed by one non-writeable array
+        """
+        close, high, low = daily_df["close"], daily_df["high"], daily_df["low"]
+        macd, signal, hist = TechnicalIndicators.calculate_macd(close)
+        rsi = TechnicalIndicators.calculate_rsi(close)
+        adx, plus_di, minus_di = TechnicalIndicators.calculate_adx(high, low, close)
+
+        columns = [daily_df["open"], high, low, close, macd, signal, hist, rsi, adx, plus_di, minus_di]
+        return DailyContext._pin(daily_df.index, columns)
+
+    @staticmethod
+    def compute_many(daily_frames: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """
+        Compute daily indicators for many underlyings in one batched pass
+
+        Same values as compute() per frame, but the recursions run once
+        over a (symbols x bars) array instead of once per symbol.
+
+        Parameters:
+        -----------
+        daily_frames : Dict[str, pd.DataFrame]
+            symbol -> daily OHLC data (lengths may differ)
+
+        Returns:
+        --------
+        Dict[str, pd.DataFrame]
+            symbol -> frame with DAILY_COLUMNS, as compute() returns
+        """
+        if not daily_frames:
+            return {}
+        symbols, stacked = stack_frames(daily_frames)
+        values = indicators_2d(stacked["high"], stacked["low"], stacked["close"])
+        result = {}
+        for row, symbol in enumerate(symbols):
+            daily_df = daily_frames[symbol]
+            n = len(daily_df)
+            columns = [daily_df["open"], daily_df["high"], daily_df["low"], daily_df["close"]]
+            columns += [values[name][row, values[name].shape[1] - n:] for name in DAILY_COLUMNS[4:]]
+            result[symbol] = DailyContext._pin(daily_df.index, columns)
+        return result
+
+    @staticmethod
+    def _pin(index: pd.Index, columns: list) -> pd.DataFrame:
+        """Frame with DAILY_COLUMNS backed by one non-writeable array"""
+        values = np.column_stack([np.asarray(col, dtype=np.float64) for col in columns])
+        values.setflags(write=False)
+        return pd.DataFrame(values, index=index, columns=DAILY_COLUMNS, copy=False)
@@ -530,16 +530,21 @@ Returns:
         if check_idx > 0: # Ensure valid index
             if position.trade_type == TradeType.CE:
                 # For CALL: Exit if MACD Bearish OR DI Bearish (+DI crosses below -DI)
-                macd_rev = TechnicalIndicators.check_macd_crossover_bearish(
-                    intraday_data['MACD'],
-                    intraday_data['MACD_Signal'],
-                    check_idx
-                )
-                di_rev = TechnicalIndicators.check_di_crossover_bearish(
-                    intraday_data['+DI'],
-                    intraday_data['-DI'],
-                    check_idx
-                )
+                if 'MACD_Cross_Down' in intraday_data.columns:
+                    # Crossover masks precomputed for the whole series (backtests)
+                    macd_rev = bool(intraday_data['MACD_Cross_Down'].iat[check_idx])
+                    di_rev = bool(intraday_data['DI_Cross_Down'].iat[check_idx])
+                else:
+                    macd_rev = TechnicalIndicators.check_macd_crossover_bearish(
+                        intraday_data['MACD'],
+                        intraday_data['MACD_Signal'],
+                        check_idx
+                    )
+                    di_rev = TechnicalIndicators.check_di_crossover_bearish(
+                        intraday_data['+DI'],
+                        intraday_data['-DI'],
+                        check_idx
+                    )
                 
                 if macd_rev or di_rev:
                     logger.info(f"EXIT SIGNAL {position.underlying}: Trend Reversal CONFIRMED on Candle Close (MACD: {macd_rev}, DI: {di_rev})")
@@ -547,16 +552,21 @@ Returns:
                     
             else:
                 # For PUT: Exit if MACD Bullish OR DI Bullish (+DI crosses above -DI)
-                macd_rev = TechnicalIndicators.check_macd_crossover_bullish(
-                    intraday_data['MACD'],
-                    intraday_data['MACD_Signal'],
-                    check_idx
-                )
-                di_rev = TechnicalIndicators.check_di_crossover_bullish(
-                    intraday_data['+DI'],
-                    intraday_data['-DI'],
-                    check_idx
-                )
+                if 'MACD_Cross_Up' in intraday_data.columns:
+                    # Crossover masks precomputed for the whole series (backtests)
+                    macd_rev = bool(intraday_data['MACD_Cross_Up'].iat[check_idx])
+                    di_rev = bool(intraday_data['DI_Cross_Up'].iat[check_idx])
+                else:
+                    macd_rev = TechnicalIndicators.check_macd_crossover_bullish(
+                        intraday_data['MACD'],
+                        intraday_data['MACD_Signal'],
+                        check_idx
+                    )
+                    di_rev = TechnicalIndicators.check_di_crossover_bullish(
+                        intraday_data['+DI'],
+                        intraday_data['-DI'],
+                        check_idx
+                    )
                 
                 if macd_rev or di_rev:
                     logger.info(f"EXIT SIGNAL {position.underlying}: Trend Reversal CONFIRMED on Candle Close (MACD: {macd_rev}, DI: {di_rev})")
@@ -0,0 +1,441 @@
+"""
+HTTP Session Pool Module
+Keep-alive session pool shared by the broker API wrapper
+"""
+
+import queue
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import ExitStack, contextmanager
+from typing import Dict, Iterable, Optional, Tuple, TYPE_CHECKING
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.resilience import IDEMPOTENT_ENDPOINTS
+
+if TYPE_CHECKING:
+    from src.rate_limiter import RateLimiter
+    from src.resilience import CircuitBreaker, LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+
+# Default (connect, read) timeouts per endpoint group, in seconds.
+# Quotes are on the hot path and should fail fast; history and orders
+# are allowed longer reads.
+DEFAULT_TIMEOUTS: Dict[str, Tuple[float, float]] = {
+    "auth": (30, 60),
+    "quote": (5, 10),
+    "historical": (10, 30),
+    "holdings": (10, 30),
+    "positions": (10, 30),
+    "tradebook": (10, 30),
+    "orders": (10, 30),
+    "reports": (10, 30),
+}
+
+FALLBACK_TIMEOUT: Tuple[float, float] = (30, 60)
+
+
+class PoolExhaustedError(RuntimeError):
+    """Every pooled session stayed in use for as long as a request could wait"""
+
+
+class SessionPool:
+    """
+    Thread-safe pool of keep-alive requests.Session objects
+
+    Each worker thread borrows a session for the duration of one request,
+    so TCP/TLS connections are reused across calls instead of being
+    re-established by every bare requests.get/post. When every session is
+    busy, a request waits at most its connect timeout for one to be
+    returned, then raises PoolExhaustedError.
+
+    With a LatencyTracker attached, timeouts of idempotent endpoints shrink
+    to a multiple of their recent p95 (orders and auth always keep their
+    configured timeouts, a slow acknowledgement is not a failure) and GETs that outlive their p95 are
+    hedged with a second request (first response wins). With a
+    CircuitBreaker attached, an endpoint that keeps failing raises
+    BrokerBlindError immediately instead of waiting out its timeout.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 4,
+        timeouts: Optional[Dict[str, Tuple[float, float]]] = None,
+        limiter: Optional["RateLimiter"] = None,
+        latency: Optional["LatencyTracker"] = None,
+        breaker: Optional["CircuitBreaker"] = None,
+        hedge_delay: Optional[float] = None,
+        hedge_endpoints: Iterable[str] = IDEMPOTENT_ENDPOINTS,
+        adaptive_endpoints: Iterable[str] = IDEMPOTENT_ENDPOINTS
+    ):
+        """
+        Initialize session pool
+
+        Parameters:
+        -----------
+        pool_size : int
+            Maximum number of concurrent sessions (one in-flight request each)
+        timeouts : Optional[Dict[str, Tuple[float, float]]]
+            Per-endpoint (connect, read) timeout overrides
+        limiter : Optional[RateLimiter]
+            Shared rate limiter; every request takes a token first
+        latency : Optional[LatencyTracker]
+            Records round trips and supplies adaptive deadlines
+        breaker : Optional[CircuitBreaker]
+            Fails fast on endpoints that keep failing
+        hedge_delay : Optional[float]
+            Minimum seconds before a GET is hedged (None disables hedging);
+            the actual delay is the endpoint's p95 if that is longer
+        hedge_endpoints : Iterable[str]
+            Endpoint groups whose GETs may be hedged
+        adaptive_endpoints : Iterable[str]
+            Endpoint groups whose latency is sampled and whose timeouts
+            adapt; all others always use their static timeout
+        """
+        self.pool_size = max(1, int(pool_size))
+        self.limiter = limiter
+        self.latency = latency
+        self.breaker = breaker
+        self.hedge_delay = hedge_delay
+        self.hedge_endpoints = set(hedge_endpoints)
+        self.adaptive_endpoints = set(adaptive_endpoints)
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        for endpoint, value in (timeouts or {}).items():
+            self.timeouts[endpoint] = tuple(value)
+
+        self._idle: "queue.LifoQueue[requests.Session]" = queue.LifoQueue()
+        self._sessions = []
+        self._lock = threading.Lock()
+        self._request_counts: Dict[str, int] = {}
+        self._error_counts: Dict[str, int] = {}
+        self._hedge_counts: Dict[str, int] = {}
+
+    def _new_session(self) -> requests.Session:
+        """Create a session with a small keep-alive connection pool"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=2, max_retries=0)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _borrow(self, timeout: Optional[float] = None) -> requests.Session:
+        """Take an idle session (or open one below pool_size), waiting at most `timeout` seconds"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._sessions) < self.pool_size:
+                sess = self._new_session()
+                self._sessions.append(sess)
+                return sess
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise PoolExhaustedError(
+                f"All {self.pool_size} broker sessions stayed busy for {timeout:.2f}s"
+            ) from None
+
+    @staticmethod
+    def _borrow_timeout(timeout) -> Optional[float]:
+        """Seconds a request may wait for a session: its connect timeout"""
+        if isinstance(timeout, (tuple, list)):
+            return timeout[0]
+        return timeout
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = None):
+        """
+        Borrow a session from the pool
+
+        Waits for one to be returned if all are in use, at most `timeout`
+        seconds (None = as long as needed).
+
+        Raises:
+        -------
+        PoolExhaustedError
+            If no session became free within `timeout`
+        """
+        sess = self._borrow(timeout)
+        try:
+            yield sess
+        finally:
+            self._idle.put(sess)
+
+    def timeout_for(self, endpoint: str) -> Tuple[float, float]:
+        """Get (connect, read) timeout for an endpoint group"""
+        return self.timeouts.get(endpoint, FALLBACK_TIMEOUT)
+
+    def tracks_latency(self, endpoint: str) -> bool:
+        """Whether round trips of an endpoint are sampled and its deadline adapts"""
+        return self.latency is not None and endpoint in self.adaptive_endpoints
+
+    def deadline_for(self, endpoint: str) -> Tuple[float, float]:
+        """Timeout for the next request: adaptive for tracked idempotent endpoints, else static"""
+        static = self.timeout_for(endpoint)
+        if not self.tracks_latency(endpoint):
+            return static
+        return self.latency.deadline(endpoint, static)
+
+    def _hedge_after(self, endpoint: str) -> Optional[float]:
+        """Seconds to wait before hedging a GET (None = do not hedge)"""
+        if self.hedge_delay is None or self.latency is None or endpoint not in self.hedge_endpoints:
+            return None
+        p95 = self.latency.percentile(endpoint)
+        if p95 is None:
+            return None
+        return max(self.hedge_delay, p95)
+
+    def request(self, method: str, url: str, endpoint: str = "", **kwargs) -> requests.Response:
+        """
+        Perform an HTTP request on a pooled session
+
+        Parameters:
+        -----------
+        method : str
+            'GET' or 'POST'
+        url : str
+            Full request URL
+        endpoint : str
+            Endpoint group used for timeouts and counters (e.g. 'quote')
+        **kwargs
+            Passed through to requests.Session.request; an optional
+            'priority' (rate limiter lane) is consumed here
+
+        Returns:
+        --------
+        requests.Response
+
+        Raises:
+        -------
+        BrokerBlindError
+            If the circuit breaker for the endpoint is open
+        PoolExhaustedError
+            If every session stayed busy for the request's connect timeout
+        """
+        priority = kwargs.pop("priority", None)
+        probe = self.breaker.check(endpoint) if self.breaker is not None else None
+        try:
+            if kwargs.get("timeout") is None:
+                kwargs["timeout"] = self.deadline_for(endpoint)
+
+            if self.limiter is not None:
+                self.limiter.acquire(priority)
+
+            with self._lock:
+                self._request_counts[endpoint] = self._request_counts.get(endpoint, 0) + 1
+
+            hedge_after = self._hedge_after(endpoint) if method.upper() == "GET" else None
+            if hedge_after is None:
+                return self._send(method, url, endpoint, **kwargs)
+            return self._send_hedged(method, url, endpoint, hedge_after, priority, **kwargs)
+        finally:
+            # A probe that never reached the wire must not keep the circuit shut
+            if probe is not None:
+                self.breaker.release(endpoint, probe)
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        endpoint: str,
+        reserved: Optional[requests.Session] = None,
+        **kwargs
+    ) -> requests.Response:
+        """
+        One request: records latency and feeds the circuit breaker
+
+        Waits for a session no longer than the request's connect timeout
+        (a busy pool is not a broker failure, so it is not counted as one).
+        A session already taken from the pool can be passed as `reserved`.
+        """
+        sess = reserved if reserved is not None else self._borrow(self._borrow_timeout(kwargs.get("timeout")))
+        start = time.monotonic()  # Time on the wire only, not waiting for a free session
+        try:
+            response = sess.request(method, url, **kwargs)
+        except Exception as e:
+            with self._lock:
+                self._error_counts[endpoint] = self._error_counts.get(endpoint, 0) + 1
+            if self.tracks_latency(endpoint) and isinstance(e, requests.Timeout):
+                # A timeout is a (censored) latency sample: keeps p95 honest when the broker slows down
+                self.latency.record(endpoint, time.monotonic() - start)
+            if self.breaker is not None:
+                self.breaker.failure(endpoint, f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            self._idle.put(sess)
+
+        if self.tracks_latency(endpoint):
+            self.latency.record(endpoint, time.monotonic() - start)
+        if self.breaker is not None:
+            if response.status_code >= 500:
+                self.breaker.failure(endpoint, f"HTTP {response.status_code}")
+            else:
+                self.breaker.success(endpoint)
+        return response
+
+    def _send_hedged(self, method: str, url: str, endpoint: str, hedge_after: float, priority, **kwargs) -> requests.Response:
+        """
+        Send a GET; if it has not answered after `hedge_after` seconds, send
+        a duplicate and return whichever succeeds first
+        """
+        with self._lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(max_workers=self.pool_size * 2, thread_name_prefix="HttpHedge")
+            executor = self._hedge_pool
+
+        primary = executor.submit(self._send, method, url, endpoint, **kwargs)
+        done, _ = wait([primary], timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        # The hedge needs a second session: only send it if one is free right now
+        try:
+            spare = self._borrow(0)
+        except PoolExhaustedError:
+            return primary.result()
+
+        # The hedge costs a token but never waits for one (and never eats a reserve)
+        if self.limiter is not None and not self.limiter.acquire(priority, timeout=0):
+            self._idle.put(spare)
+            return primary.result()
+
+        with self._lock:
+            self._hedge_counts[endpoint] = self._hedge_counts.get(endpoint, 0) + 1
+        pending = {primary, executor.submit(self._send, method, url, endpoint, spare, **kwargs)}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    # The slower twin finishes in the background and returns its session
+                    return future.result()
+                error = future.exception()
+        raise error
+
+    def prewarm(self, url: str, endpoint: str = "", count: Optional[int] = None, **kwargs) -> int:
+        """
+        Open the pooled keep-alive connections ahead of time
+
+        Borrows `count` sessions at once (creating them as needed) and sends
+        one GET on each in parallel, so every session has paid its TCP/TLS
+        handshake before the first real request. Latency samples are
+        recorded; failures do not count against the circuit breaker.
+
+        Parameters:
+        -----------
+        url : str
+            Cheap idempotent GET to send (e.g. a quote)
+        endpoint : str
+            Endpoint group used for timeouts and counters
+        count : Optional[int]
+            Sessions to open (default: pool_size)
+
+        Returns:
+        --------
+        int
+            Sessions that received a non-5xx response
+        """
+        priority = kwargs.pop("priority", None)
+        count = max(1, min(count or self.pool_size, self.pool_size))
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout_for(endpoint)
+
+        def send(sess: requests.Session) -> bool:
+            if self.limiter is not None:
+                self.limiter.acquire(priority)
+            with self._lock:
+                self._request_counts[endpoint] = self._request_counts.get(endpoint, 0) + 1
+            start = time.monotonic()
+            try:
+                response = sess.request("GET", url, **kwargs)
+            except Exception as e:
+                logger.debug(f"Prewarm request failed: {e}")
+                with self._lock:
+                    self._error_counts[endpoint] = self._error_counts.get(endpoint, 0) + 1
+                return False
+            if self.tracks_latency(endpoint):
+                self.latency.record(endpoint, time.monotonic() - start)
+            return response.status_code < 500
+
+        with ExitStack() as stack:
+            wait_for = self._borrow_timeout(kwargs["timeout"])
+            sessions = [stack.enter_context(self.session(wait_for)) for _ in range(count)]
+            with ThreadPoolExecutor(max_workers=count, thread_name_prefix="HttpWarm") as executor:
+                return sum(executor.map(send, sessions))
+
+    def get(self, url: str, endpoint: str = "", **kwargs) -> requests.Response:
+        """GET on a pooled session"""
+        return self.request("GET", url, endpoint, **kwargs)
+
+    def post(self, url: str, endpoint: str = "", **kwargs) -> requests.Response:
+        """POST on a pooled session"""
+        return self.request("POST", url, endpoint, **kwargs)
+
+    def stats(self) -> Dict:
+        """
+        Connection reuse counters
+
+        Returns:
+        --------
+        Dict
+            sessions, requests, connections_opened, connections_reused,
+            plus per-endpoint request, error and hedge counts
+        """
+        opened = 0
+        sent = 0
+        with self._lock:
+            sessions = list(self._sessions)
+            per_endpoint = dict(self._request_counts)
+            errors = dict(self._error_counts)
+            hedges = dict(self._hedge_counts)
+
+        seen = set()
+        for sess in sessions:
+            for adapter in sess.adapters.values():
+                if id(adapter) in seen:
+                    continue
+                seen.add(id(adapter))
+                manager = getattr(adapter, "poolmanager", None)
+                if manager is None:
+                    continue
+                for key in list(manager.pools.keys()):
+                    pool = manager.pools.get(key)
+                    if pool is None:
+                        continue
+                    opened += getattr(pool, "num_connections", 0)
+                    sent += getattr(pool, "num_requests", 0)
+
+        return {
+            "sessions": len(sessions),
+            "requests": sent,
+            "connections_opened": opened,
+            "connections_reused": max(0, sent - opened),
+            "requests_by_endpoint": per_endpoint,
+            "errors_by_endpoint": errors,
+            "hedges_by_endpoint": hedges,
+        }
+
+    def close(self):
+        """Close all pooled sessions"""
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+            hedge_pool, self._hedge_pool = self._hedge_pool, None
+        if hedge_pool is not None:
+            hedge_pool.shutdown(wait=False)
+        while not self._idle.empty():
+            try:
+                self._idle.get_nowait()
+            except queue.Empty:
+                break
+        for sess in sessions:
+            try:
+                sess.close()
+            except Exception:
+                pass
@@ -0,0 +1,138 @@
+"""
+Indicator Cache Module
+Process-wide LRU of sealed-bar indicator results
+"""
+
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+def sizeof(value: Any) -> int:
+    """Approximate bytes held by a cached value (arrays and frames are counted exactly)"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=False).sum())
+    if isinstance(value, (np.ndarray, pd.Series)):
+        return int(value.nbytes)
+    nbytes = getattr(value, "nbytes", None)
+    if nbytes is not None:
+        return int(nbytes)
+    return 1024
+
+
+class IndicatorCache:
+    """
+    Bounded LRU of computed indicator results
+
+    Keys are (instrument, timeframe, last sealed bar timestamp, params)
+    tuples, so a result is computed once per sealed bar and instrument and
+    every consumer in the process (entry loop, dashboard, diagnostics)
+    reuses it. Entries are evicted least-recently-used first whenever the
+    total size exceeds max_bytes or the count exceeds max_entries.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024, max_entries: int = 4096):
+        """
+        Initialize indicator cache
+
+        Parameters:
+        -----------
+        max_bytes : int
+            Memory budget for cached values
+        max_entries : int
+            Maximum number of entries regardless of size
+        """
+        self.max_bytes = int(max_bytes)
+        self.max_entries = int(max_entries)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(instrument: Hashable, timeframe: str, last_bar: int, params: tuple) -> tuple:
+        """Cache key of one instrument's sealed bars up to last_bar"""
+        return (instrument, timeframe, int(last_bar), tuple(params))
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Cached value (now most recently used), or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value: Any, nbytes: Optional[int] = None):
+        """Store a value, evicting least-recently-used entries to stay in budget"""
+        size = sizeof(value) if nbytes is None else int(nbytes)
+        if size > self.max_bytes:
+            logger.debug(f"Indicator cache: {size} byte value exceeds the budget, not cached")
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """Cached value for key, computing and storing it on a miss"""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        """Entries, bytes held and hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+_shared: Optional[IndicatorCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_indicator_cache() -> IndicatorCache:
+    """
+    Process-wide cache shared by every indicator consumer
+
+    Created on first use with the configured memory budget
+    (indicators.cache_mb in config.json).
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            from src.trading_config import config
+            _shared = IndicatorCache(max_bytes=int(config.indicator_cache_mb * 1024 * 1024))
+        return _shared
@@ -5,7 +5,27 @@ Implements MACD, RSI, and ADX calculations
 
 import pandas as pd
 import numpy as np
-from typing import Tuple
+from typing import Dict, Tuple
+
+from src.recursive_filters import ema, rma
+from src.streaming_indicators import INDICATOR_COLUMNS, IndicatorState
+
+
+# Per-bar signal columns added by TechnicalIndicators.add_crossover_columns
+CROSSOVER_COLUMNS = ["MACD_Cross_Up", "MACD_Cross_Down", "DI_Cross_Up", "DI_Cross_Down", "Bars_Since_MACD_Cross"]
+
+
+def _like(values: np.ndarray, series: pd.Series, name=None) -> pd.Series:
+    """Wrap an array result with the index of the input series"""
+    return pd.Series(values, index=series.index, name=name)
+
+
+def _previous(values: np.ndarray) -> np.ndarray:
+    """Series.shift() on an array: previous bar, NaN for the first"""
+    shifted = np.empty_like(values)
+    shifted[:1] = np.nan
+    shifted[1:] = values[:-1]
+    return shifted
 
 
 class TechnicalIndicators:
@@ -35,20 +55,22 @@ class TechnicalIndicators:
         if not isinstance(data, pd.Series):
             data = pd.Series(data)
         
+        close = data.to_numpy(dtype=np.float64)
+        
         # Calculate EMAs
-        ema_fast = data.ewm(span=fast, adjust=False).mean()
-        ema_slow = data.ewm(span=slow, adjust=False).mean()
+        ema_fast = ema(close, fast)
+        ema_slow = ema(close, slow)
         
         # MACD line = Fast EMA - Slow EMA
         macd_line = ema_fast - ema_slow
         
         # Signal line = EMA of MACD line
-        signal_line = macd_line.ewm(span=signal, adjust=False).mean()
+        signal_line = ema(macd_line, signal)
         
         # MACD histogram = MACD line - Signal line
         macd_histogram = macd_line - signal_line
         
-        return macd_line, signal_line, macd_histogram
+        return _like(macd_line, data, data.name), _like(signal_line, data, data.name), _like(macd_histogram, data, data.name)
     
     @staticmethod
     def calculate_rsi(data: pd.Series, period: int = 14) -> pd.Series:
@@ -71,23 +93,26 @@ class TechnicalIndicators:
         if not isinstance(data, pd.Series):
             data = pd.Series(data)
         
+        close = data.to_numpy(dtype=np.float64)
+        
         # Calculate price changes
-        delta = data.diff()
+        delta = close - _previous(close)
         
-        # Separate gains and losses
-        gain = delta.clip(lower=0)
-        loss = -delta.clip(upper=0)
+        # Separate gains and losses (NaN kept, like Series.clip)
+        gain = np.where(delta < 0, 0.0, delta)
+        loss = -np.where(delta > 0, 0.0, delta)
         
         # Wilder's Smoothing Method (Matches TradingView RMA)
         # Alpha = 1/period uses the recursive smoothing formula
-        avg_gain = gain.ewm(alpha=1/period, adjust=False).mean()
-        avg_loss = loss.ewm(alpha=1/period, adjust=False).mean()
+        avg_gain = rma(gain, period)
+        avg_loss = rma(loss, period)
         
         # Calculate RS and RSI
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rs = avg_gain / avg_loss
+            rsi = 100 - (100 / (1 + rs))
         
-        return rsi
+        return _like(rsi, data, data.name)
     
     @staticmethod
     def calculate_adx(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> Tuple[pd.Series, pd.Series, pd.Series]:
@@ -117,41 +142,65 @@ class TechnicalIndicators:
         if not isinstance(close, pd.Series):
             close = pd.Series(close)
         
-        # Calculate True Range (TR)
-        high_low = high - low
-        high_close = np.abs(high - close.shift())
-        low_close = np.abs(low - close.shift())
+        high_values = high.to_numpy(dtype=np.float64)
+        low_values = low.to_numpy(dtype=np.float64)
+        prev_close = _previous(close.to_numpy(dtype=np.float64))
+        
+        # Calculate True Range (TR); fmax skips NaN like DataFrame.max(axis=1)
+        high_low = high_values - low_values
+        high_close = np.abs(high_values - prev_close)
+        low_close = np.abs(low_values - prev_close)
         
-        tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-        atr = tr.ewm(alpha=1/period, adjust=False, min_periods=period).mean()
+        tr = np.fmax(np.fmax(high_low, high_close), low_close)
+        atr = rma(tr, period, min_periods=period)
         
         # Calculate directional movements
-        up_move = high - high.shift()
-        down_move = low.shift() - low
+        up_move = high_values - _previous(high_values)
+        down_move = _previous(low_values) - low_values
         
         # Positive Directional Movement (+DM)
-        plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0)
-        plus_dm = pd.Series(plus_dm, index=high.index)
+        plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
         
         # Negative Directional Movement (-DM)
-        minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0)
-        minus_dm = pd.Series(minus_dm, index=high.index)
+        minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
         
         # Smoothed directional movements (RMA)
-        plus_dm_smooth = plus_dm.ewm(alpha=1/period, adjust=False).mean()
-        minus_dm_smooth = minus_dm.ewm(alpha=1/period, adjust=False).mean()
+        plus_dm_smooth = rma(plus_dm, period)
+        minus_dm_smooth = rma(minus_dm, period)
         
-        # Directional Indicators
-        plus_di = 100 * (plus_dm_smooth / atr)
-        minus_di = 100 * (minus_dm_smooth / atr)
-        
-        # Calculate DX (Directional Index)
-        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Directional Indicators
+            plus_di = 100 * (plus_dm_smooth / atr)
+            minus_di = 100 * (minus_dm_smooth / atr)
+            
+            # Calculate DX (Directional Index)
+            dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
         
         # Calculate ADX (smoothed DX using RMA)
-        adx = dx.ewm(alpha=1/period, adjust=False).mean()
+        adx = rma(dx, period)
         
-        return adx, plus_di, minus_di
+        return _like(adx, high), _like(plus_di, high), _like(minus_di, high)
+    
+    @staticmethod
+    def evaluate_provisional(state: IndicatorState, high: float, low: float, close: float) -> Dict[str, float]:
+        """
+        Last-bar indicators for a hypothetical (forming) bar
+        
+        Parameters:
+        -----------
+        state : IndicatorState
+            Committed MACD/RSI/ADX state of the sealed bars
+        high, low, close : float
+            The forming bar
+            
+        Returns:
+        --------
+        Dict[str, float]
+            MACD, MACD_Signal, MACD_Hist, RSI, ADX, +DI, -DI of that bar,
+            equal to the last row of calculate_macd/rsi/adx over the sealed
+            bars plus this one (the state is not modified)
+        """
+        return dict(zip(INDICATOR_COLUMNS, state.peek(high, low, close)))
     
     @staticmethod
     def check_macd_crossover_bullish(macd_line: pd.Series, signal_line: pd.Series, current_idx: int) -> bool:
@@ -296,3 +345,78 @@ class TechnicalIndicators:
             return (not prev_bearish) and curr_bearish
         except Exception:
             return False
+
+    @staticmethod
+    def crossover_masks(fast, slow) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bullish and bearish crossovers of `fast` over `slow` for every bar
+        
+        One vectorized pass with the same rules as the per-bar checks:
+        bullish[i] == check_macd_crossover_bullish(fast, slow, i) (and
+        check_di_crossover_bullish for +DI/-DI), likewise for bearish.
+        Bar 0 and any bar with a NaN in it or its predecessor is False.
+        
+        Parameters:
+        -----------
+        fast : array-like
+            MACD line or +DI
+        slow : array-like
+            Signal line or -DI
+        
+        Returns:
+        --------
+        Tuple[np.ndarray, np.ndarray]
+            (bullish, bearish) boolean masks
+        """
+        fast = np.asarray(fast, dtype=np.float64)
+        slow = np.asarray(slow, dtype=np.float64)
+        bullish = np.zeros(len(fast), dtype=bool)
+        bearish = np.zeros(len(fast), dtype=bool)
+        if len(fast) < 2:
+            return bullish, bearish
+        
+        prev_fast, prev_slow = fast[:-1], slow[:-1]
+        curr_fast, curr_slow = fast[1:], slow[1:]
+        valid = ~(np.isnan(prev_fast) | np.isnan(prev_slow) | np.isnan(curr_fast) | np.isnan(curr_slow))
+        bullish[1:] = valid & (prev_fast <= prev_slow) & (curr_fast > curr_slow)
+        bearish[1:] = valid & (prev_fast >= prev_slow) & (curr_fast < curr_slow)
+        return bullish, bearish
+    
+    @staticmethod
+    def bars_since(mask) -> np.ndarray:
+        """
+        Bars since the mask was last True (0 on a True bar, NaN before the first)
+        
+        Parameters:
+        -----------
+        mask : array-like
+            Boolean event mask (e.g. from crossover_masks)
+        
+        Returns:
+        --------
+        np.ndarray
+            float array, same length as mask
+        """
+        mask = np.asarray(mask, dtype=bool)
+        bars = np.arange(len(mask))
+        last = np.maximum.accumulate(np.where(mask, bars, -1)) if len(mask) else bars
+        return np.where(last >= 0, bars - last, np.nan)
+    
+    @staticmethod
+    def add_crossover_columns(frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        Add CROSSOVER_COLUMNS (MACD and DI crossover masks, bars since the
+        last MACD cross) to a frame with MACD, MACD_Signal, +DI and -DI
+        
+        Reversal exits then read one precomputed flag per bar instead of
+        calling the per-bar checks (see FnOTradingBot.check_exit_conditions).
+        The frame is modified in place and returned.
+        """
+        macd_up, macd_down = TechnicalIndicators.crossover_masks(frame['MACD'], frame['MACD_Signal'])
+        di_up, di_down = TechnicalIndicators.crossover_masks(frame['+DI'], frame['-DI'])
+        frame['MACD_Cross_Up'] = macd_up
+        frame['MACD_Cross_Down'] = macd_down
+        frame['DI_Cross_Up'] = di_up
+        frame['DI_Cross_Down'] = di_down
+        frame['Bars_Since_MACD_Cross'] = TechnicalIndicators.bars_since(macd_up | macd_down)
+        return frame
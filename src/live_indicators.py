@@ -9,7 +9,12 @@ from typing import Dict, Optional
 import logging
 
 from src.market_data import MStockAPI
-from src.indicators import TechnicalIndicators
+from src.streaming_indicators import ProvisionalIndicators
+from src.daily_context import DailyContext
+from src.lookback import converged_tail, history_days
+from src.resilience import BrokerBlindError
+from src.bar_aggregator import BarAggregator, append_live_bar
+from src.utils import now_ist
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +22,12 @@ logger = logging.getLogger(__name__)
 class LiveIndicators:
     """Fetch and calculate real-time market indicators"""
     
-    def __init__(self, api: MStockAPI):
+    def __init__(
+        self,
+        api: MStockAPI,
+        daily_context: Optional[DailyContext] = None,
+        bars: Optional[BarAggregator] = None
+    ):
         """
         Initialize live indicators
         
@@ -25,10 +35,20 @@ class LiveIndicators:
         -----------
         api : MStockAPI
             mStock API instance
+        daily_context : Optional[DailyContext]
+            Shared once-per-session daily indicator frames (a private one
+            is created if omitted)
+        bars : Optional[BarAggregator]
+            Tick aggregator fed by a TickSource; its true forming bar is
+            used instead of an estimate from the current price
         """
         self.api = api
+        self.daily_context = daily_context if daily_context is not None else DailyContext(api)
+        self.bars = bars
+        # Sealed 15-minute bars are folded in once; each refresh only evaluates the live candle
+        self.indicators = ProvisionalIndicators()
     
-    def get_live_indicators(self, symbol: str, exchange: str, instrument_token: str) -> Dict:
+    def get_live_indicators(self, symbol: str, exchange: str, instrument_token: str, quotes: Optional[Dict] = None) -> Dict:
         """
         Get live indicators for a symbol with REAL-TIME updates
         Creates a live forming candle from current price for streaming indicators
@@ -41,6 +61,9 @@ class LiveIndicators:
             Exchange (NSE)
         instrument_token : str
             Instrument token
+        quotes : Optional[Dict]
+            Batched quote snapshot keyed by (exchange, symbol); if given,
+            the spot price is read from it instead of a separate request
             
         Returns:
         --------
@@ -49,74 +72,50 @@ class LiveIndicators:
         """
         try:
             # Get current spot price FIRST for live candle
-            quote = self.api.get_quote(symbol, exchange)
+            if quotes is not None:
+                quote = quotes.get((exchange, symbol))
+            else:
+                quote = self.api.get_quote(symbol, exchange)
             spot_price = quote.get('last_price', 0) if quote else 0
             
-            # Fetch daily data
-            daily_df = self.api.get_historical_data(symbol, exchange, instrument_token, "day", days=60)
-            if daily_df is None or len(daily_df) < 30:
+            # Daily indicators are pinned once per session
+            daily_df = self.daily_context.get(symbol, exchange, instrument_token)
+            if daily_df is None:
                 logger.warning(f"Insufficient daily data for {symbol}")
                 return self._empty_indicators()
             
-            # Fetch 15-minute data (using 10 days hybrid for Today's bars)
-            intraday_df = self.api.get_hybrid_history(symbol, exchange, instrument_token, "15minute", days=10)
+            # Fetch 15-minute data (hybrid for Today's bars)
+            intraday_df = self.api.get_hybrid_history(symbol, exchange, instrument_token, "15minute", days=history_days("15minute"))
             if intraday_df is None or len(intraday_df) < 50:
                 logger.warning(f"Insufficient intraday data for {symbol}")
                 return self._empty_indicators()
             
-            # CREATE LIVE FORMING CANDLE for real-time indicators
+            # LIVE FORMING CANDLE for real-time indicators
             # This makes RSI/ADX/MACD update every second instead of every 15 minutes!
-            import pytz
-            from datetime import datetime as dt
-            
-            ist = pytz.timezone("Asia/Kolkata")
-            current_time = dt.now(ist)
-            
-            # ALIGN TO 15-MINUTE BAR START (Standardizes indicator calculation)
-            bar_start = current_time.replace(minute=current_time.minute - current_time.minute % 15, second=0, microsecond=0)
-            
-            # Create a new row for the current forming candle
-            if spot_price > 0:
-                # Use current spot price as close, and last candle's close as open
-                last_close = intraday_df.iloc[-1]['close']
-                
-                # Build live candle (open=last close, high/low/close=current price estimate)
-                live_candle = pd.DataFrame({
-                    'open': [last_close],
-                    'high': [max(last_close, spot_price)],
-                    'low': [min(last_close, spot_price)],
-                    'close': [spot_price]
-                }, index=[bar_start])
-                
-                # Append live candle to historical data
-                intraday_df_live = pd.concat([intraday_df, live_candle])
+            if self.bars is not None:
+                # True OHLC of the forming bar from every observed tick
+                intraday_df_live = self.bars.extend((exchange, symbol), intraday_df)
             else:
-                intraday_df_live = intraday_df
-            
-            # Calculate daily indicators (no live candle needed for daily)
-            daily_macd, daily_macd_signal, _ = TechnicalIndicators.calculate_macd(daily_df['close'])
-            daily_rsi = TechnicalIndicators.calculate_rsi(daily_df['close'])
-            daily_adx, _, _ = TechnicalIndicators.calculate_adx(daily_df['high'], daily_df['low'], daily_df['close'])
+                intraday_df_live = append_live_bar(intraday_df, spot_price, now_ist())
             
             # Calculate 15min indicators WITH LIVE CANDLE - updates in real-time!
-            intraday_macd, intraday_macd_signal, _ = TechnicalIndicators.calculate_macd(intraday_df_live['close'])
-            intraday_rsi = TechnicalIndicators.calculate_rsi(intraday_df_live['close'])
-            intraday_adx, _, _ = TechnicalIndicators.calculate_adx(intraday_df_live['high'], intraday_df_live['low'], intraday_df_live['close'])
+            live = self.indicators.last((exchange, symbol), converged_tail(intraday_df_live))
             
             # Use spot price if available, otherwise fallback
             if spot_price == 0:
                 spot_price = quote.get('last_price', intraday_df.iloc[-1]['close']) if quote else intraday_df.iloc[-1]['close']
             
             # Get latest values
-            daily_macd_val = daily_macd.iloc[-1]
-            daily_signal_val = daily_macd_signal.iloc[-1]
-            daily_rsi_val = daily_rsi.iloc[-1]
-            daily_adx_val = daily_adx.iloc[-1]
+            daily_row = daily_df.iloc[-1]
+            daily_macd_val = daily_row['MACD']
+            daily_signal_val = daily_row['MACD_Signal']
+            daily_rsi_val = daily_row['RSI']
+            daily_adx_val = daily_row['ADX']
             
-            intraday_macd_val = intraday_macd.iloc[-1]
-            intraday_signal_val = intraday_macd_signal.iloc[-1]
-            intraday_rsi_val = intraday_rsi.iloc[-1]
-            intraday_adx_val = intraday_adx.iloc[-1]
+            intraday_macd_val = live['MACD']
+            intraday_signal_val = live['MACD_Signal']
+            intraday_rsi_val = live['RSI']
+            intraday_adx_val = live['ADX']
             
             # Determine MACD trend
             daily_macd_trend = "Bullish" if daily_macd_val > daily_signal_val else "Bearish"
@@ -145,10 +144,15 @@ class LiveIndicators:
             logger.error(f"Error fetching indicators for {symbol}: {e}")
             return self._empty_indicators()
     
-    def get_vix(self) -> Optional[float]:
+    def get_vix(self, quotes: Optional[Dict] = None) -> Optional[float]:
         """
         Get current VIX value
         
+        Parameters:
+        -----------
+        quotes : Optional[Dict]
+            Batched quote snapshot keyed by (exchange, symbol)
+        
         Returns:
         --------
         Optional[float]
@@ -156,7 +160,10 @@ class LiveIndicators:
         """
         try:
             # VIX symbol on NSE
-            quote = self.api.get_quote("INDIA VIX", "NSE")
+            if quotes is not None:
+                quote = quotes.get(("NSE", "INDIA VIX"))
+            else:
+                quote = self.api.get_quote("INDIA VIX", "NSE")
             if quote:
                 return quote.get('last_price', 15.0)
             return 15.0  # Default
@@ -196,25 +203,41 @@ class LiveIndicators:
         """
         indicators = {}
         
+        # One batched quote request for all spots and VIX
+        try:
+            quotes = self.api.get_quotes([
+                ("NSE", "NIFTY 50"),
+                ("NSE", "NIFTY BANK"),
+                ("NSE", "NIFTY FIN SERVICE"),
+                ("BSE", "SENSEX"),
+                ("NSE", "INDIA VIX")
+            ])
+        except BrokerBlindError as e:
+            logger.warning(f"Indicators without live prices: {e}")
+            quotes = {}
+        
         # Nifty50
         indicators['NIFTY50'] = self.get_live_indicators(
             "NIFTY 50",
             "NSE",
-            "26000"
+            "26000",
+            quotes=quotes
         )
         
         # BankNifty
         indicators['BANKNIFTY'] = self.get_live_indicators(
             "NIFTY BANK",
             "NSE",
-            "26009"
+            "26009",
+            quotes=quotes
         )
         
         # FINNIFTY
         indicators['FINNIFTY'] = self.get_live_indicators(
             "NIFTY FIN SERVICE",
             "NSE",
-            "26037"
+            "26037",
+            quotes=quotes
         )
         
         # SENSEX (BSE)
@@ -222,10 +245,11 @@ class LiveIndicators:
         indicators['SENSEX'] = self.get_live_indicators(
             "SENSEX",
             "BSE", 
-            "51" 
+            "51",
+            quotes=quotes
         )
         
         # VIX
-        indicators['VIX'] = self.get_vix()
+        indicators['VIX'] = self.get_vix(quotes=quotes)
         
         return indicators
@@ -0,0 +1,254 @@
+"""
+Lookback Module
+Convergence-bounded warmup windows for the recursive indicators
+"""
+
+import math
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.batch_indicators import indicators_2d
+
+logger = logging.getLogger(__name__)
+
+
+# Completed bars per NSE session (09:15-15:30) for each broker interval
+BARS_PER_SESSION = {
+    "minute": 375,
+    "3minute": 125,
+    "5minute": 75,
+    "10minute": 38,
+    "15minute": 25,
+    "30minute": 13,
+    "60minute": 7,
+    "day": 1,
+}
+
+# Download windows (calendar days) the entry loop has always used; history_days
+# never asks for more. Raise one only when lookback_report.py shows the
+# truncated window moving values at the entry thresholds.
+FETCH_DAYS = {
+    "15minute": 10,
+    "day": 60,
+}
+
+REPORT_COLUMNS = ["MACD", "MACD_Signal", "MACD_Hist", "RSI", "ADX", "+DI", "-DI"]
+
+
+def ewm_warmup(alpha: float, tolerance: float) -> int:
+    """
+    Bars after which a seed carries at most `tolerance` of an EWM's weight
+
+    With y[t] = alpha * x[t] + (1 - alpha) * y[t-1], the value a window
+    starts from (its first observation, instead of the full history) is
+    still present with weight (1 - alpha) ** n after n more bars.
+    """
+    if not 0 < tolerance < 1:
+        raise ValueError("tolerance must be between 0 and 1")
+    if alpha >= 1:
+        return 0
+    return int(math.ceil(math.log(tolerance) / math.log(1.0 - alpha)))
+
+
+def indicator_warmup(
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9,
+    rsi_period: int = 14,
+    adx_period: int = 14,
+    tolerance: float = 0.01
+) -> Dict[str, int]:
+    """
+    Bars after which a window's start carries at most `tolerance` of the weight
+
+    This bounds the seed's leftover weight per indicator, not how far the
+    values are from full history; tolerance_report measures that. Chained
+    smoothers each need their own warmup: MACD's signal line smooths the
+    MACD line, ADX smooths DX computed from smoothed TR/DM. The
+    differences that feed RSI and ADX cost one extra bar.
+
+    Returns:
+    --------
+    dict
+        {"MACD": bars, "RSI": bars, "ADX": bars}
+    """
+    slow_alpha = 2.0 / (max(fast, slow) + 1.0)
+    wilder = ewm_warmup(1.0 / adx_period, tolerance)
+    return {
+        "MACD": ewm_warmup(slow_alpha, tolerance) + ewm_warmup(2.0 / (signal + 1.0), tolerance),
+        "RSI": 1 + ewm_warmup(1.0 / rsi_period, tolerance),
+        "ADX": 1 + max(wilder, adx_period) + wilder,
+    }
+
+
+def warmup_bars(config=None) -> int:
+    """Bars every configured indicator needs (the longest warmup)"""
+    if config is None:
+        from src.trading_config import config
+    return max(indicator_warmup(
+        config.macd_fast, config.macd_slow, config.macd_signal,
+        config.rsi_period, config.adx_period,
+        config.indicator_lookback_tolerance
+    ).values())
+
+
+def lookback_days(bars: int, interval: str) -> int:
+    """
+    Calendar days of history that contain at least `bars` completed bars
+
+    Intraday windows add the forming session; weekends and a margin for
+    exchange holidays are added on top of the trading sessions.
+    """
+    per_session = BARS_PER_SESSION.get(interval)
+    if per_session is None:
+        raise ValueError(f"Unknown interval: {interval}")
+    sessions = int(math.ceil(bars / per_session))
+    if interval != "day":
+        sessions += 1
+    return int(math.ceil(sessions * 7 / 5)) + 1 + sessions // 15
+
+
+def history_days(interval: str, config=None) -> int:
+    """
+    Calendar days to download for an interval
+
+    The days that hold the warmup window, capped at FETCH_DAYS: a shorter
+    window than the warmup (60 days of daily bars against ADX's 127) is
+    used as is rather than downloading more.
+    """
+    days = lookback_days(warmup_bars(config), interval)
+    return min(days, FETCH_DAYS.get(interval, days))
+
+
+def converged_tail(frame: pd.DataFrame, bars: Optional[int] = None) -> pd.DataFrame:
+    """
+    The part of a frame the indicators are computed over
+
+    Keeps the last `bars` rows (default: warmup_bars()), extended back to
+    the start of that bar's session on a DatetimeIndex. The start then only
+    moves once a session, so incremental indicator states are rebuilt at
+    most daily instead of on every new bar. Frames no longer than the
+    window are returned unchanged.
+    """
+    if bars is None:
+        bars = warmup_bars()
+    if len(frame) <= bars:
+        return frame
+    if isinstance(frame.index, pd.DatetimeIndex):
+        start = frame.index.searchsorted(frame.index[-bars].normalize())
+    else:
+        start = len(frame) - bars
+    return frame.iloc[start:]
+
+
+def tolerance_report(
+    frame: pd.DataFrame,
+    bars: int,
+    fast: int = 12,
+    slow: int = 26,
+    signal: int = 9,
+    rsi_period: int = 14,
+    adx_period: int = 14,
+    rsi_range: tuple = (30.0, 65.0),
+    adx_min: Optional[float] = 25.0,
+    evaluate: int = 100
+) -> Dict:
+    """
+    Compare indicators over a truncated window with full-history values
+
+    For each of the last `evaluate` bars of frame, the indicators are
+    computed over only the `bars` bars ending there and compared with the
+    values computed over everything before it. All windows are evaluated
+    in one batched pass.
+
+    Parameters:
+    -----------
+    frame : pd.DataFrame
+        high/low/close history, longer than bars
+    bars : int
+        Truncated window length under test
+    rsi_range, adx_min :
+        Entry thresholds whose pass/fail verdict must not change
+
+    Returns:
+    --------
+    dict
+        bars, evaluated bar count, per-column max absolute error, the
+        number of threshold/crossover verdicts that differ (flips) and how
+        far from the threshold the full-history value was at those bars,
+        and for each verdict the bars where the full-history verdict
+        changes (crossings) with the largest deviation of the deciding
+        value (RSI, ADX, MACD - Signal, +DI - -DI) at them
+    """
+    length = len(frame)
+    evaluate = min(evaluate, length - bars + 1)
+    if evaluate < 1:
+        raise ValueError(f"Need more than {bars} bars of history, got {length}")
+
+    params = (fast, slow, signal, rsi_period, adx_period)
+    columns = {name: frame[name].to_numpy(dtype=np.float64) for name in ("high", "low", "close")}
+    full = indicators_2d(columns["high"][np.newaxis, :], columns["low"][np.newaxis, :], columns["close"][np.newaxis, :], *params)
+    full = {name: values[0, length - evaluate:] for name, values in full.items()}
+
+    # One row per evaluated bar: the `bars` bars ending at it
+    starts = np.arange(length - evaluate - bars + 1, length - bars + 1)
+    rows = starts[:, np.newaxis] + np.arange(bars)
+    windows = {name: values[rows] for name, values in columns.items()}
+    tail = indicators_2d(windows["high"], windows["low"], windows["close"], *params)
+    tail = {name: values[:, -1] for name, values in tail.items()}
+
+    errors = {name: float(np.nanmax(np.abs(tail[name] - full[name]), initial=0.0)) for name in REPORT_COLUMNS}
+
+    def verdicts(values):
+        # Each check: (passes, distance of the deciding value from its threshold, deciding value)
+        rsi = values["RSI"]
+        checks = {
+            "RSI in range": ((rsi >= rsi_range[0]) & (rsi <= rsi_range[1]),
+                             np.minimum(np.abs(rsi - rsi_range[0]), np.abs(rsi - rsi_range[1])), rsi),
+            "MACD > Signal": (values["MACD"] > values["MACD_Signal"], np.abs(values["MACD_Hist"]), values["MACD_Hist"]),
+            "+DI > -DI": (values["+DI"] > values["-DI"], np.abs(values["+DI"] - values["-DI"]),
+                          values["+DI"] - values["-DI"]),
+        }
+        if adx_min is not None:
+            checks["ADX > min"] = (values["ADX"] > adx_min, np.abs(values["ADX"] - adx_min), values["ADX"])
+        return checks
+
+    truncated, reference = verdicts(tail), verdicts(full)
+    flips, margins, crossings, crossing_errors = {}, {}, {}, {}
+    for name, (passes, distance, value) in reference.items():
+        flipped = truncated[name][0] != passes
+        flips[name] = int(np.count_nonzero(flipped))
+        # How close to the threshold the full-history value was where a verdict flipped
+        margins[name] = float(distance[flipped].max()) if flips[name] else 0.0
+
+        # Bars where the full-history verdict changes: the window must reproduce the value there
+        crossed = np.zeros(len(passes), dtype=bool)
+        crossed[1:] = passes[1:] != passes[:-1]
+        crossings[name] = int(np.count_nonzero(crossed))
+        deviation = np.abs(truncated[name][2] - value)[crossed]
+        crossing_errors[name] = float(np.nanmax(deviation, initial=0.0))
+    return {
+        "bars": bars,
+        "evaluated": int(evaluate),
+        "max_abs_error": errors,
+        "flips": flips,
+        "flip_margin": margins,
+        "crossings": crossings,
+        "crossing_error": crossing_errors,
+    }
+
+
+def format_report(report: Dict) -> str:
+    """Readable multi-line summary of a tolerance_report result"""
+    lines = [f"Window {report['bars']} bars, {report['evaluated']} bars compared with full history"]
+    for name, error in report["max_abs_error"].items():
+        lines.append(f"  {name:<12} max abs error {error:.6f}")
+    for name, count in report["flips"].items():
+        detail = f" (all within {report['flip_margin'][name]:.4f} of the threshold)" if count else ""
+        lines.append(f"  {name:<14} verdict flips {count}{detail}")
+    for name, count in report["crossings"].items():
+        lines.append(f"  {name:<14} {count} crossings, max deviation there {report['crossing_error'][name]:.6f}")
+    return "\n".join(lines)
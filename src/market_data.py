@@ -3,7 +3,6 @@ mStock API Integration Module
 Handles market data fetching, order placement, and position tracking
 """
 
-import requests
 import hashlib
 import json
 import os
@@ -15,14 +14,45 @@ import logging
 from urllib.parse import quote
 import pytz
 
+from src.http_pool import SessionPool
+from src.candle_cache import CandleCache
+from src.candle_store import CandleStore
+from src.yf_cache import YFinanceBarCache
+from src.rate_limiter import Priority, current_priority, get_rate_limiter
+from src.single_flight import SingleFlight
+from src.candle_decoder import decode_candles
+from src.resilience import BrokerBlindError, CircuitBreaker, LatencyTracker
+
 logger = logging.getLogger(__name__)
 
 
 class MStockAPI:
     """mStock API wrapper for market data and order execution"""
     
-    def __init__(self):
-        """Initialize mStock API with credentials from .env"""
+    # Maximum instruments packed into one quote request
+    MAX_QUOTE_BATCH = 50
+    
+    DEFAULT_BASE_URL = "https://api.mstock.trade/openapi/typea"
+    
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        timeouts: Optional[Dict[str, Tuple[float, float]]] = None,
+        base_url: Optional[str] = None
+    ):
+        """
+        Initialize mStock API with credentials from .env
+        
+        Parameters:
+        -----------
+        pool_size : Optional[int]
+            Number of keep-alive sessions (default: config 'api.pool_size')
+        timeouts : Optional[Dict[str, Tuple[float, float]]]
+            Per-endpoint (connect, read) timeouts (default: config 'api.timeouts')
+        base_url : Optional[str]
+            API root override, e.g. a local mstock_simulator.py instance
+            (default: MSTOCK_BASE_URL env var, else the live mStock API)
+        """
         load_dotenv()
         
         self.api_key = os.getenv('API_KEY')
@@ -36,8 +66,77 @@ class MStockAPI:
         self.access_token = None
         self.load_access_token()
         
-        self.base_url = "https://api.mstock.trade/openapi/typea"
+        self.base_url = (base_url or os.getenv('MSTOCK_BASE_URL') or self.DEFAULT_BASE_URL).rstrip("/")
+        if self.base_url != self.DEFAULT_BASE_URL:
+            logger.warning(f"Using non-default mStock API endpoint: {self.base_url}")
         self.headers_base = {"X-Mirae-Version": "1"}
+        
+        # Keep-alive session pool shared by all threads using this instance
+        from src.trading_config import config
+        self.http = SessionPool(
+            pool_size=pool_size if pool_size is not None else config.api_pool_size,
+            timeouts=timeouts if timeouts is not None else config.api_timeouts,
+            # One token bucket for the whole process (bot, dashboard, sync all share the quota)
+            limiter=get_rate_limiter(config.api_rate_limit, config.api_rate_burst),
+            # Deadlines follow observed latency; dead endpoints fail fast instead of hanging the loops
+            latency=LatencyTracker(multiplier=config.api_deadline_multiplier, floor=config.api_deadline_floor),
+            breaker=CircuitBreaker(config.api_breaker_failures, config.api_breaker_reset),
+            hedge_delay=config.api_hedge_delay
+        )
+        
+        # Identical concurrent GETs (e.g. entry and exit threads quoting the same index) share one request
+        self.single_flight = SingleFlight(config.api_coalesce_window)
+        
+        # Incremental history cache: repeat calls only download the newest bars
+        self.candle_cache: Optional[CandleCache] = CandleCache() if config.api_candle_cache else None
+        
+        # yfinance leg of get_hybrid_history, valid until the next 15-minute boundary
+        self.yf_cache = YFinanceBarCache(self._fetch_yfinance_bars)
+        
+        # On-disk candle store: warm starts read history from disk and fetch only the gap.
+        # Disk reads are merged through the memory cache, so the store implies one.
+        self.candle_store: Optional[CandleStore] = None
+        if config.api_candle_store:
+            self.candle_store = CandleStore(config.api_candle_store_dir)
+            if self.candle_cache is None:
+                self.candle_cache = CandleCache()
+    
+    def get_connection_stats(self) -> Dict:
+        """Get connection reuse counters for the session pool (plus rate limiter lanes, latency and circuits)"""
+        stats = self.http.stats()
+        stats["single_flight"] = self.single_flight.stats()
+        if self.http.limiter is not None:
+            stats["rate_limiter"] = self.http.limiter.stats()
+        if self.http.latency is not None:
+            stats["latency"] = self.http.latency.stats()
+        if self.http.breaker is not None:
+            stats["circuit_breaker"] = self.http.breaker.stats()
+        return stats
+    
+    def blind_endpoints(self) -> List[str]:
+        """Endpoint groups currently failing fast (circuit open)"""
+        return self.http.breaker.blind() if self.http.breaker is not None else []
+    
+    def warm_connections(self, instruments: List[Tuple[str, str]]) -> int:
+        """
+        Open every pooled keep-alive connection before the session starts
+        
+        Sends one batched quote for the instruments on each session in
+        parallel (see SessionPool.prewarm).
+        
+        Parameters:
+        -----------
+        instruments : List[Tuple[str, str]]
+            (exchange, symbol) pairs to quote
+        
+        Returns:
+        --------
+        int
+            Sessions with an open connection
+        """
+        url = f"{self.base_url}/instruments/quote/ohlc"
+        params = [("i", f"{exchange}:{symbol.upper()}") for exchange, symbol in instruments[:self.MAX_QUOTE_BATCH]]
+        return self.http.prewarm(url, "quote", headers=self.get_headers(), params=params)
     
     def load_access_token(self):
         """Load access token from credentials.json"""
@@ -72,7 +171,7 @@ class MStockAPI:
             login_payload = {"username": self.client_code, "password": self.password}
             headers = {**self.headers_base, "Content-Type": "application/x-www-form-urlencoded"}
             
-            login_resp = requests.post(login_url, data=login_payload, headers=headers, timeout=(30, 60))
+            login_resp = self.http.post(login_url, "auth", data=login_payload, headers=headers)
             if login_resp.status_code != 200:
                 logger.error(f"Login failed: {login_resp.status_code}")
                 return False
@@ -108,7 +207,7 @@ class MStockAPI:
             }
             session_headers = {**self.headers_base, "Content-Type": "application/x-www-form-urlencoded"}
             
-            session_resp = requests.post(session_url, data=session_payload, headers=session_headers, timeout=(30, 60))
+            session_resp = self.http.post(session_url, "auth", data=session_payload, headers=session_headers)
             if session_resp.status_code != 200:
                 logger.error(f"Session generation failed: {session_resp.status_code}")
                 return False
@@ -161,12 +260,28 @@ class MStockAPI:
         --------
         Optional[Dict]
             Quote data with last_price, ohlc, etc.
+            
+        Concurrent calls for the same instrument (including instruments
+        inside a get_quotes batch) share one in-flight request, unless it
+        was started from a lower-priority lane (then this call leads).
+        
+        Raises:
+        -------
+        BrokerBlindError
+            If the quote endpoint's circuit is open (broker unreachable)
         """
+        key = f"{exchange}:{symbol.upper()}"
+        return self.single_flight.do(
+            ("quote", key), lambda: self._fetch_quote(symbol, key), lane=current_priority()
+        )
+    
+    def _fetch_quote(self, symbol: str, key: str) -> Optional[Dict]:
+        """Single-instrument quote request (see get_quote)"""
         try:
             url = f"{self.base_url}/instruments/quote/ohlc"
-            params = {"i": f"{exchange}:{symbol.upper()}"}
+            params = {"i": key}
             
-            response = requests.get(url, headers=self.get_headers(), params=params, timeout=(30, 60))
+            response = self.http.get(url, "quote", headers=self.get_headers(), params=params)
             if response.status_code != 200:
                 logger.error(f"Quote fetch error for {symbol}: {response.status_code}")
                 return None
@@ -177,10 +292,95 @@ class MStockAPI:
             
             return None
             
+        except BrokerBlindError:
+            raise
         except Exception as e:
             logger.error(f"Error fetching quote for {symbol}: {e}")
             return None
     
+    def get_quotes(self, instruments: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict]:
+        """
+        Get quotes for many instruments in as few requests as possible
+        
+        The quote endpoint accepts a repeated 'i' parameter, so up to
+        MAX_QUOTE_BATCH instruments are packed into each request.
+        
+        Parameters:
+        -----------
+        instruments : List[Tuple[str, str]]
+            (exchange, symbol) pairs, e.g. [("NSE", "NIFTY 50"), ("NFO", "NIFTY25FEB23000CE")]
+            
+        Returns:
+        --------
+        Dict[Tuple[str, str], Dict]
+            Quote data keyed by the (exchange, symbol) pair as passed in.
+            Instruments the broker did not return are omitted.
+            
+        Raises:
+        -------
+        BrokerBlindError
+            If the quote endpoint's circuit is open (broker unreachable)
+        """
+        # De-duplicate while preserving order
+        wanted: Dict[str, Tuple[str, str]] = {}
+        for exchange, symbol in instruments:
+            wanted.setdefault(f"{exchange}:{symbol.upper()}", (exchange, symbol))
+        
+        # Join requests other threads already have in flight for the same instruments
+        # (never one queued behind a lower-priority lane's rate-limit token)
+        lane = current_priority()
+        leading, following = {}, {}
+        for key in wanted:
+            call, leader = self.single_flight.begin(("quote", key), lane)
+            (leading if leader else following)[key] = call
+        
+        keys = list(leading.keys())
+        quotes: Dict[Tuple[str, str], Dict] = {}
+        url = f"{self.base_url}/instruments/quote/ohlc"
+        
+        for start in range(0, len(keys), self.MAX_QUOTE_BATCH):
+            batch = keys[start:start + self.MAX_QUOTE_BATCH]
+            payload = {}
+            try:
+                params = [("i", key) for key in batch]
+                response = self.http.get(url, "quote", headers=self.get_headers(), params=params)
+                if response.status_code != 200:
+                    logger.error(f"Batch quote fetch error ({len(batch)} instruments): {response.status_code}")
+                else:
+                    data = response.json()
+                    if data.get("status") == "success":
+                        payload = data.get("data", {}) or {}
+                        
+            except BrokerBlindError as e:
+                # Release every follower with the same error, then surface it
+                for key in keys[start:]:
+                    self.single_flight.finish(leading[key], error=e)
+                raise
+            except Exception as e:
+                logger.error(f"Error fetching batch quotes ({len(batch)} instruments): {e}")
+            
+            # Always release followers, even when the batch failed
+            for key in batch:
+                self.single_flight.finish(leading[key], payload.get(key))
+                if payload.get(key):
+                    quotes[wanted[key]] = payload[key]
+        
+        blind = None
+        for key, call in following.items():
+            try:
+                quote = self.single_flight.wait(call)
+            except BrokerBlindError as e:
+                blind, quote = e, None
+            except Exception as e:
+                logger.error(f"Shared quote request for {key} failed: {e}")
+                quote = None
+            if quote:
+                quotes[wanted[key]] = quote
+        
+        if blind is not None:
+            raise blind
+        return quotes
+    
     def get_hybrid_history(
         self,
         symbol: str,
@@ -195,60 +395,72 @@ class MStockAPI:
         # 1. Fetch from mStock (Standard)
         mstock_df = self.get_historical_data(symbol, exchange, instrument_token, timeframe, days)
         
-        # If we need today's data for an index, check for gap
-        ist = pytz.timezone("Asia/Kolkata")
-        now = datetime.now(ist)
-        
-        # Only use hybrid for major indices
-        yf_symbols = {
-            "NIFTY 50": "^NSEI",
-            "NIFTY BANK": "^NSEBANK",
-            "NIFTY FIN SERVICE": "NIFTY_FIN_SERVICE.NS",
-            "SENSEX": "^BSESN"
-        }
-        
-        if symbol in yf_symbols and timeframe == "15minute":
-            try:
-                import yfinance as yf
-                yf_ticker = yf_symbols[symbol]
-                
-                # Fetch last 3 days from yfinance (15m)
-                yf_df = yf.download(yf_ticker, period="3d", interval="15m", progress=False, auto_adjust=False)
-                
-                if yf_df is not None and not yf_df.empty:
-                    # Clean up yfinance columns
-                    yf_df.columns = [col[0] if isinstance(col, tuple) else col for col in yf_df.columns]
-                    yf_df = yf_df.rename(columns={
-                        'Open': 'open', 'High': 'high', 'Low': 'low', 'Close': 'close'
-                    })
-                    yf_df = yf_df[['open', 'high', 'low', 'close']]
-                    
-                    # Convert index to IST
-                    if yf_df.index.tz is None:
-                        yf_df.index = yf_df.index.tz_localize("UTC").tz_convert("Asia/Kolkata")
-                    else:
-                        yf_df.index = yf_df.index.tz_convert("Asia/Kolkata")
-                    
-                    # Filter only market hours
-                    yf_df = yf_df.between_time("09:15", "15:30")
-                    
-                    if mstock_df is None or mstock_df.empty:
-                        return yf_df
-                    
-                    # Stitching logic:
-                    # Keep mstock_df as base, append yf_df bars that are NOT in mstock_df
-                    last_mstock_time = mstock_df.index[-1]
-                    missing_bars = yf_df[yf_df.index > last_mstock_time]
-                    
-                    if not missing_bars.empty:
-                        logger.info(f"Hybrid Data: Added {len(missing_bars)} missing bars from yfinance for {symbol}")
-                        combined_df = pd.concat([mstock_df, missing_bars])
-                        return combined_df
-                        
-            except Exception as e:
-                logger.warning(f"Failed to fetch hybrid data from yfinance for {symbol}: {e}")
+        if symbol in self.YF_SYMBOLS and timeframe == "15minute":
+            # Cached until the next bar closes; refreshed in the background after that
+            yf_df = self.yf_cache.get(symbol)
+            return self._stitch_hybrid(symbol, mstock_df, yf_df)
                 
         return mstock_df
+    
+    # Only use hybrid for major indices
+    YF_SYMBOLS = {
+        "NIFTY 50": "^NSEI",
+        "NIFTY BANK": "^NSEBANK",
+        "NIFTY FIN SERVICE": "NIFTY_FIN_SERVICE.NS",
+        "SENSEX": "^BSESN"
+    }
+    
+    def _fetch_yfinance_bars(self, symbol: str) -> Optional[pd.DataFrame]:
+        """Fetch the last 3 days of 15m bars from yfinance (IST, market hours)"""
+        try:
+            import yfinance as yf
+            yf_ticker = self.YF_SYMBOLS[symbol]
+            
+            # Fetch last 3 days from yfinance (15m)
+            yf_df = yf.download(yf_ticker, period="3d", interval="15m", progress=False, auto_adjust=False)
+            
+            if yf_df is None or yf_df.empty:
+                return None
+            
+            # Clean up yfinance columns
+            yf_df.columns = [col[0] if isinstance(col, tuple) else col for col in yf_df.columns]
+            yf_df = yf_df.rename(columns={
+                'Open': 'open', 'High': 'high', 'Low': 'low', 'Close': 'close'
+            })
+            yf_df = yf_df[['open', 'high', 'low', 'close']]
+            
+            # Convert index to IST
+            if yf_df.index.tz is None:
+                yf_df.index = yf_df.index.tz_localize("UTC").tz_convert("Asia/Kolkata")
+            else:
+                yf_df.index = yf_df.index.tz_convert("Asia/Kolkata")
+            
+            # Filter only market hours
+            return yf_df.between_time("09:15", "15:30")
+            
+        except Exception as e:
+            logger.warning(f"Failed to fetch hybrid data from yfinance for {symbol}: {e}")
+            return None
+    
+    @staticmethod
+    def _stitch_hybrid(symbol: str, mstock_df: Optional[pd.DataFrame], yf_df: Optional[pd.DataFrame]) -> Optional[pd.DataFrame]:
+        """Append yfinance bars newer than the last mStock bar"""
+        if yf_df is None or yf_df.empty:
+            return mstock_df
+        
+        if mstock_df is None or mstock_df.empty:
+            return yf_df
+        
+        # Stitching logic:
+        # Keep mstock_df as base, append yf_df bars that are NOT in mstock_df
+        last_mstock_time = mstock_df.index[-1]
+        missing_bars = yf_df[yf_df.index > last_mstock_time]
+        
+        if not missing_bars.empty:
+            logger.info(f"Hybrid Data: Added {len(missing_bars)} missing bars from yfinance for {symbol}")
+            return pd.concat([mstock_df, missing_bars])
+        
+        return mstock_df
 
     def get_historical_data(
         self,
@@ -280,25 +492,13 @@ class MStockAPI:
             OHLC dataframe with datetime index
         """
         try:
-            # Build time window
-            from datetime import timedelta
-            import pytz
-            
-            ist = pytz.timezone("Asia/Kolkata")
-            now_ist = datetime.now(ist)
-            from_dt = (now_ist - timedelta(days=days)).replace(hour=9, minute=15, second=0, microsecond=0)
-            to_dt = now_ist
-            
-            from_encoded = quote(from_dt.strftime("%Y-%m-%d %H:%M:%S"))
-            to_encoded = quote(to_dt.strftime("%Y-%m-%d %H:%M:%S"))
-            
-            url = (
-                f"{self.base_url}/instruments/historical/"
-                f"{exchange.upper()}/{instrument_token}/{timeframe}"
-                f"?from={from_encoded}&to={to_encoded}"
-            )
+            key, window_start, fetch_from, ready = self._history_plan(exchange, instrument_token, timeframe, days)
+            if ready is not None:
+                return ready
             
-            response = requests.get(url, headers=self.get_headers(), timeout=(30, 60))
+            url = self._history_url(exchange, instrument_token, timeframe, days, from_dt=fetch_from)
+            
+            response = self.http.get(url, "historical", headers=self.get_headers())
             if response.status_code != 200:
                 logger.error(f"Historical data error: {response.status_code}")
                 return None
@@ -309,69 +509,175 @@ class MStockAPI:
                 return None
             
             candles = data.get("data", {}).get("candles", [])
-            if not candles:
-                logger.warning(f"No candles returned for {symbol}")
-                return None
-            
-            # Convert to DataFrame
-            cols = ["timestamp", "open", "high", "low", "close", "volume"]
-            df = pd.DataFrame(candles, columns=cols)
-            df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True).dt.tz_convert("Asia/Kolkata")
-            df.set_index("timestamp", inplace=True)
-            
-            # Filter market hours
-            if timeframe != "day":
-                df = df.between_time("09:15", "15:30")
-            
-            return df[["open", "high", "low", "close"]]
+            return self._finish_history(symbol, timeframe, key, window_start, fetch_from, candles)
             
         except Exception as e:
             logger.error(f"Error fetching historical data for {symbol}: {e}")
             return None
     
+    @staticmethod
+    def _history_window_start(days: int) -> datetime:
+        """First bar time (09:15 IST, `days` days ago) of a history window"""
+        from datetime import timedelta
+        
+        now_ist = datetime.now(pytz.timezone("Asia/Kolkata"))
+        return (now_ist - timedelta(days=days)).replace(hour=9, minute=15, second=0, microsecond=0)
+    
+    def _history_plan(
+        self,
+        exchange: str,
+        instrument_token: str,
+        timeframe: str,
+        days: int
+    ) -> Tuple[Tuple[str, str, str], datetime, Optional[datetime], Optional[pd.DataFrame]]:
+        """
+        Work out what a history call has to download
+        
+        The in-memory cache is consulted first, then the on-disk candle
+        store (which seeds the memory cache on a warm start).
+        
+        Returns:
+        --------
+        Tuple
+            (cache key, window start, fetch_from, ready) - fetch_from is the
+            cached tail bar for an incremental fetch, or None for a full
+            download; ready is the finished window when no download is
+            needed at all (stored data is already complete)
+        """
+        key = CandleCache.make_key(exchange, instrument_token, timeframe)
+        window_start = self._history_window_start(days)
+        if self.candle_cache is None:
+            return key, window_start, None, None
+        
+        fetch_from = self.candle_cache.fetch_start(key, window_start)
+        if self.candle_store is None:
+            return key, window_start, fetch_from, None
+        
+        if fetch_from is None:
+            stored = self.candle_store.load(key, window_start)
+            if stored is not None:
+                logger.info(f"Loaded {len(stored)} {timeframe} bars for {exchange}:{instrument_token} from candle store")
+                self.candle_cache.update(key, window_start, stored, incremental=False)
+                fetch_from = stored.index[-1].to_pydatetime()
+        
+        if fetch_from is not None and self.candle_store.is_current(key):
+            return key, window_start, fetch_from, self.candle_cache.get(key, window_start)
+        
+        return key, window_start, fetch_from, None
+    
+    def _finish_history(
+        self,
+        symbol: str,
+        timeframe: str,
+        key: Tuple[str, str, str],
+        window_start: datetime,
+        fetch_from: Optional[datetime],
+        candles: List[List]
+    ) -> Optional[pd.DataFrame]:
+        """Convert downloaded candles and merge them into the candle cache and store"""
+        if not candles and fetch_from is None:
+            logger.warning(f"No candles returned for {symbol}")
+            return None
+        
+        fresh = self._candles_to_frame(candles, timeframe) if candles else None
+        if self.candle_cache is None:
+            return fresh
+        
+        window = self.candle_cache.update(key, window_start, fresh, incremental=fetch_from is not None)
+        
+        if self.candle_store is not None and fresh is not None:
+            try:
+                self.candle_store.write(key, fresh, window_start=None if fetch_from is not None else window_start)
+            except Exception as e:
+                logger.warning(f"Could not persist {timeframe} candles for {symbol}: {e}")
+        
+        return window
+    
+    def _history_url(
+        self,
+        exchange: str,
+        instrument_token: str,
+        timeframe: str,
+        days: int,
+        from_dt: Optional[datetime] = None
+    ) -> str:
+        """Build the historical candles URL for the last `days` days (or from `from_dt`)"""
+        ist = pytz.timezone("Asia/Kolkata")
+        if from_dt is None:
+            from_dt = self._history_window_start(days)
+        to_dt = datetime.now(ist)
+        
+        from_encoded = quote(from_dt.astimezone(ist).strftime("%Y-%m-%d %H:%M:%S"))
+        to_encoded = quote(to_dt.strftime("%Y-%m-%d %H:%M:%S"))
+        
+        return (
+            f"{self.base_url}/instruments/historical/"
+            f"{exchange.upper()}/{instrument_token}/{timeframe}"
+            f"?from={from_encoded}&to={to_encoded}"
+        )
+    
+    @staticmethod
+    def _candles_to_frame(candles: List[List], timeframe: str) -> pd.DataFrame:
+        """Convert raw candle rows to an IST-indexed OHLC DataFrame (market hours only for intraday)"""
+        # Rows are decoded straight into int64/float64 arrays; the frame is built on top of them
+        return decode_candles(candles, timeframe).to_frame()
+    
     def get_positions(self) -> Optional[Dict[Tuple[str, str], Dict]]:
         """
         Get current holdings (Equity/Long-term)
         """
+        return self.single_flight.do(("holdings",), self._fetch_holdings, lane=current_priority())
+    
+    def _fetch_holdings(self) -> Optional[Dict[Tuple[str, str], Dict]]:
+        """Holdings request (see get_positions)"""
         try:
             url = f"{self.base_url}/portfolio/holdings"
-            response = requests.get(url, headers=self.get_headers(), timeout=(30, 60))
+            response = self.http.get(url, "holdings", headers=self.get_headers())
             
             if response.status_code != 200:
                 logger.error(f"Holdings fetch error: {response.status_code}")
                 return None
             
             data = response.json()
-            positions_list = data.get("data", []) or []
-            
-            positions = {}
-            for pos in positions_list:
-                symbol = pos.get("tradingsymbol")
-                qty = pos.get("quantity", 0)
-                if qty > 0:
-                    exchange = pos.get("exchange") or pos.get("exchangeSegment") or "NSE"
-                    positions[(symbol, exchange)] = {
-                        "qty": qty,
-                        "price": pos.get("averageprice", pos.get("price", 0.0)),
-                        "ltp": pos.get("last_price", 0.0),
-                        "pnl": pos.get("pnl", 0.0)
-                    }
-            
-            return positions
+            return self._parse_holdings(data.get("data", []) or [])
             
         except Exception as e:
             logger.error(f"Error fetching holdings: {e}")
             return None
 
-    def get_net_positions(self, timeout=(30, 60)) -> Optional[List[Dict]]:
+    @staticmethod
+    def _parse_holdings(positions_list: List[Dict]) -> Dict[Tuple[str, str], Dict]:
+        """Convert holdings rows to {(symbol, exchange): {...}}"""
+        positions = {}
+        for pos in positions_list:
+            symbol = pos.get("tradingsymbol")
+            qty = pos.get("quantity", 0)
+            if qty > 0:
+                exchange = pos.get("exchange") or pos.get("exchangeSegment") or "NSE"
+                positions[(symbol, exchange)] = {
+                    "qty": qty,
+                    "price": pos.get("averageprice", pos.get("price", 0.0)),
+                    "ltp": pos.get("last_price", 0.0),
+                    "pnl": pos.get("pnl", 0.0)
+                }
+        return positions
+
+    def get_net_positions(self, timeout=None) -> Optional[List[Dict]]:
         """
         Get all Active F&O Net Positions (Today's Open/Closed positions)
         Includes Manual and Bot trades.
         """
+        positions = self.single_flight.do(
+            ("positions",), lambda: self._fetch_net_positions(timeout), lane=current_priority()
+        )
+        return list(positions) if positions is not None else None
+    
+    def _fetch_net_positions(self, timeout=None) -> Optional[List[Dict]]:
+        """Net positions request (see get_net_positions)"""
         try:
             # Endpoint verified for Daywise Net Positions
             url = f"{self.base_url}/portfolio/positions"
-            response = requests.get(url, headers=self.get_headers(), timeout=timeout)
+            response = self.http.get(url, "positions", headers=self.get_headers(), timeout=timeout)
             
             if response.status_code != 200:
                 logger.error(f"Net Positions fetch error: {response.status_code}")
@@ -381,48 +687,58 @@ class MStockAPI:
             if data.get("status") != "success":
                 return None
                 
-            positions = data.get("data", [])
-            
-            # Robustness: Handle Dict response (e.g. {'net': [...], 'day': [...]})
-            if isinstance(positions, dict):
-                # Mirae/mStock often returns {'net': [...], 'day': [...]}
-                # We want 'net' typically, but let's combine or prioritize net.
-                # Actually, 'net' is usually what we want (open positions).
-                # 'day' might be today's activity?
-                # Let's aggregate both to be safe, or just take 'net'.
-                # Recommendation: Use 'net' as it represents the actual open position.
-                
-                net_pos = positions.get('net', [])
-                day_pos = positions.get('day', [])
-                
-                if isinstance(net_pos, list):
-                    return net_pos
-                elif isinstance(day_pos, list):
-                    return day_pos
-                else:
-                    return []
-                    
-            elif isinstance(positions, list):
-                return positions
-            else:
-                logger.warning(f"Net positions returned unexpected type: {type(positions)}")
-                return []
+            return self._normalize_net_positions(data.get("data", []))
             
         except Exception as e:
             logger.error(f"Error fetching net positions: {e}")
             return None
+    
+    @staticmethod
+    def _normalize_net_positions(positions) -> List[Dict]:
+        """Normalize the net positions payload to a list"""
+        # Robustness: Handle Dict response (e.g. {'net': [...], 'day': [...]})
+        if isinstance(positions, dict):
+            # Mirae/mStock often returns {'net': [...], 'day': [...]}
+            # We want 'net' typically, but let's combine or prioritize net.
+            # Actually, 'net' is usually what we want (open positions).
+            # 'day' might be today's activity?
+            # Let's aggregate both to be safe, or just take 'net'.
+            # Recommendation: Use 'net' as it represents the actual open position.
+            
+            net_pos = positions.get('net', [])
+            day_pos = positions.get('day', [])
+            
+            if isinstance(net_pos, list):
+                return net_pos
+            elif isinstance(day_pos, list):
+                return day_pos
+            else:
+                return []
+                
+        elif isinstance(positions, list):
+            return positions
+        else:
+            logger.warning(f"Net positions returned unexpected type: {type(positions)}")
+            return []
 
-    def get_tradebook(self, timeout=(30, 60)) -> Optional[List[Dict]]:
+    def get_tradebook(self, timeout=None) -> Optional[List[Dict]]:
         """
         Get all Trades executed today (Manual + Bot)
         """
+        trades = self.single_flight.do(
+            ("tradebook",), lambda: self._fetch_tradebook(timeout), lane=current_priority()
+        )
+        return list(trades) if trades is not None else None
+    
+    def _fetch_tradebook(self, timeout=None) -> Optional[List[Dict]]:
+        """Tradebook request (see get_tradebook)"""
         try:
             # Tradebook endpoint
             url = f"{self.base_url}/orders/tradebook"
             # Some APIs require GET, some require POST. Probing showed 405 for GET.
             # Try POST with empty payload if GET fails, but usually Mirae is GET. 
             # If 405, it might be a different endpoint or specific to Type A/B.
-            response = requests.get(url, headers=self.get_headers(), timeout=timeout)
+            response = self.http.get(url, "tradebook", headers=self.get_headers(), timeout=timeout)
             
             if response.status_code != 200:
                 if response.status_code == 405:
@@ -431,7 +747,7 @@ class MStockAPI:
                 
                 # Fallback check for alternate endpoint
                 url_alt = f"{self.base_url}/orders/trades"
-                response = requests.get(url_alt, headers=self.get_headers(), timeout=timeout)
+                response = self.http.get(url_alt, "tradebook", headers=self.get_headers(), timeout=timeout)
                 
             if response.status_code != 200:
                 logger.error(f"Tradebook fetch error: {response.status_code}")
@@ -461,7 +777,7 @@ class MStockAPI:
         try:
             url = f"{self.base_url}/reports/tradelist"
             params = {"from": from_date, "to": to_date}
-            response = requests.get(url, headers=self.get_headers(), params=params, timeout=(30, 60))
+            response = self.http.get(url, "reports", headers=self.get_headers(), params=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -518,25 +834,7 @@ class MStockAPI:
             # Type A API usually requires Order Variety in URL
             url = f"{self.base_url}/orders/regular"
             
-            # Construct Form Data Payload (application/x-www-form-urlencoded)
-            # Keys verified via documentation: transaction_type, order_type, etc.
-            payload = {
-                "tradingsymbol": symbol,
-                "exchange": exchange.upper(),
-                "transaction_type": side,   # Changed from transactiontype
-                "order_type": order_type,   # Changed from ordertype
-                "quantity": str(qty),
-                "product": "NRML",          # Default to NRML for F&O. Doc used MIS.
-                "validity": "DAY", 
-            }
-            
-            # Optional Price for LIMIT
-            if order_type == "LIMIT":
-                payload["price"] = str(price)
-                
-            # Add token if available (though testing showed it works without)
-            if token:
-                payload["symboltoken"] = str(token)
+            payload = self._build_order_payload(symbol, exchange, qty, side, order_type, price, token)
 
             headers = {
                 **self.get_headers(),
@@ -548,45 +846,86 @@ class MStockAPI:
             logger.info(f"DEBUG Payload: {payload}")
             
             # Use data=payload for Form Data (not json=payload)
-            response = requests.post(url, data=payload, headers=headers, timeout=(30, 60))
+            # Exit orders always take the highest-priority lane
+            priority = Priority.EXIT if side.upper() == "SELL" else current_priority()
+            response = self.http.post(url, "orders", data=payload, headers=headers, priority=priority)
             
             if response.status_code != 200:
                 logger.error(f"ERROR Order placement failed: HTTP {response.status_code}")
                 logger.error(f"Response: {response.text}")
                 return None
             
-            data = response.json()
-            
-            # Handle List response (API returns list of dicts)
-            responseData = {}
-            if isinstance(data, list) and len(data) > 0:
-                responseData = data[0]
-            elif isinstance(data, dict):
-                responseData = data
-            
-            if responseData.get("status") == "success":
-                # Extract Order ID
-                # Response format: [{"status": "success", "data": {"order_id": "..."}}]
-                order_id = responseData.get("data", {}).get("order_id") # Note: order_id (underscore?)
-                # Check debug output: 'order_id': '13422602062692'
-                
-                # Check if it was "orderid" in previous code?
-                if not order_id:
-                     order_id = responseData.get("data", {}).get("orderid")
-                     
-                logger.info(f"Order placed successfully! Order ID: {order_id}")
-                return order_id
-            else:
-                error_msg = responseData.get("message", "Unknown error")
-                logger.error(f"Order rejected: {error_msg}")
-                
-                # Check for insufficient funds
-                if "insufficient" in str(error_msg).lower() or "margin" in str(error_msg).lower():
-                    raise Exception("Insufficient funds")
-                
-                return None
+            return self._parse_order_response(response.json())
                 
         except Exception as e:
             logger.error(f"ERROR placing order: {e}")
             raise e
+    
+    @staticmethod
+    def _build_order_payload(
+        symbol: str,
+        exchange: str,
+        qty: int,
+        side: str,
+        order_type: str,
+        price: float,
+        token: str
+    ) -> Dict[str, str]:
+        """Construct the form-encoded order payload"""
+        # Construct Form Data Payload (application/x-www-form-urlencoded)
+        # Keys verified via documentation: transaction_type, order_type, etc.
+        payload = {
+            "tradingsymbol": symbol,
+            "exchange": exchange.upper(),
+            "transaction_type": side,   # Changed from transactiontype
+            "order_type": order_type,   # Changed from ordertype
+            "quantity": str(qty),
+            "product": "NRML",          # Default to NRML for F&O. Doc used MIS.
+            "validity": "DAY", 
+        }
+        
+        # Optional Price for LIMIT
+        if order_type == "LIMIT":
+            payload["price"] = str(price)
+            
+        # Add token if available (though testing showed it works without)
+        if token:
+            payload["symboltoken"] = str(token)
+        
+        return payload
+    
+    @staticmethod
+    def _parse_order_response(data) -> Optional[str]:
+        """
+        Extract the order ID from an order response
+        Raises Exception('Insufficient funds') on margin rejections
+        """
+        # Handle List response (API returns list of dicts)
+        responseData = {}
+        if isinstance(data, list) and len(data) > 0:
+            responseData = data[0]
+        elif isinstance(data, dict):
+            responseData = data
+        
+        if responseData.get("status") == "success":
+            # Extract Order ID
+            # Response format: [{"status": "success", "data": {"order_id": "..."}}]
+            order_id = responseData.get("data", {}).get("order_id") # Note: order_id (underscore?)
+            # Check debug output: 'order_id': '13422602062692'
+            
+            # Check if it was "orderid" in previous code?
+            if not order_id:
+                 order_id = responseData.get("data", {}).get("orderid")
+                 
+            logger.info(f"Order placed successfully! Order ID: {order_id}")
+            return order_id
+        else:
+            error_msg = responseData.get("message", "Unknown error")
+            logger.error(f"Order rejected: {error_msg}")
+            
+            # Check for insufficient funds
+            if "insufficient" in str(error_msg).lower() or "margin" in str(error_msg).lower():
+                raise Exception("Insufficient funds")
+            
+            return None
 
@@ -0,0 +1,334 @@
+"""
+Option Chain Module
+In-memory ATM band of option quotes for selection and entry pricing
+"""
+
+import threading
+import time
+import logging
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from src.option_selector import OptionSelector
+from src.rate_limiter import Priority, set_thread_priority
+from src.resilience import BrokerBlindError
+from src.symbol_master import SymbolMaster
+from src.utils import now_ist
+
+logger = logging.getLogger(__name__)
+
+
+Instrument = Tuple[str, str]   # (exchange, symbol)
+
+
+class ChainContract:
+    """One option of the band (last_price is None until quoted)"""
+    __slots__ = ("underlying", "strike", "option_type", "symbol", "exchange", "token", "last_price")
+
+    def __init__(self, underlying: str, strike: int, option_type: str, symbol: str, exchange: str, token: Optional[str]):
+        self.underlying = underlying
+        self.strike = strike
+        self.option_type = option_type
+        self.symbol = symbol
+        self.exchange = exchange
+        self.token = token
+        self.last_price: Optional[float] = None
+
+    @property
+    def instrument(self) -> Instrument:
+        return (self.exchange, self.symbol)
+
+    def __repr__(self):
+        return f"ChainContract({self.symbol}, token={self.token}, ltp={self.last_price})"
+
+
+class OptionChain:
+    """
+    Option chain snapshot around each watched underlying's ATM
+
+    Keeps CE and PE contracts for ATM +/- `band` strikes of the nearest
+    expiry, re-centred whenever the spot crosses into a new ATM strike.
+    Quotes arrive either through a TickSource (attach: the band joins the
+    feed's batched request, no extra calls) or from refresh() on the
+    chain's own polling thread (start). At signal time select() answers
+    from memory: strike, symbol, token and premium without a request.
+    """
+
+    def __init__(
+        self,
+        api,
+        symbols_config: dict,
+        band: int = 2,
+        interval: float = 2.0,
+        max_age: float = 10.0
+    ):
+        """
+        Initialize option chain
+
+        Parameters:
+        -----------
+        api : MStockAPI
+            Quote source for refresh()
+        symbols_config : dict
+            {symbol: (exchange, token, underlying)} as loaded from config.json
+        band : int
+            Strikes kept either side of ATM (must cover the strike depth)
+        interval : float
+            Seconds between refreshes of the polling thread
+        max_age : float
+            Premiums older than this are not served
+        """
+        self.api = api
+        self.band = max(0, int(band))
+        self.interval = interval
+        self.max_age = max_age
+        # Spot instrument -> underlying key, for the underlyings options exist on
+        self._spots: Dict[Instrument, str] = {
+            (exchange, symbol): underlying
+            for symbol, (exchange, _, underlying) in symbols_config.items()
+            if underlying in OptionSelector.STRIKE_INTERVALS
+        }
+        self._atm: Dict[str, int] = {}
+        self._expiry: Dict[str, date] = {}
+        self._contracts: Dict[str, Dict[Tuple[int, str], ChainContract]] = {}
+        self._by_instrument: Dict[Instrument, ChainContract] = {}
+        self._quoted_at: Dict[Instrument, float] = {}
+        self._lock = threading.Lock()
+        self.ticks = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def option_exchange(underlying: str) -> str:
+        return "BFO" if underlying == "SENSEX" else "NFO"
+
+    # --- band ----------------------------------------------------------
+
+    def recenter(self, underlying: str, spot: float) -> bool:
+        """
+        Move the band to the spot's ATM strike
+
+        Contracts already in the band keep their quotes; new strikes get
+        their symbol and token from the symbol master.
+
+        Returns:
+        --------
+        bool
+            Whether the band changed
+        """
+        interval = OptionSelector.STRIKE_INTERVALS.get(underlying)
+        if interval is None or not spot or spot <= 0:
+            return False
+        atm = int(round(spot / interval) * interval)
+        today = now_ist().date()
+        with self._lock:
+            expiry = self._expiry.get(underlying)
+            if self._atm.get(underlying) == atm and expiry is not None and expiry >= today:
+                return False
+
+        master = SymbolMaster()
+        name = OptionSelector._normalize_symbol(underlying)
+        if expiry is None or expiry < today:
+            expiry = master.get_nearest_expiry(name)
+            if expiry is None:
+                logger.warning(f"Option chain: no expiry for {underlying}")
+                return False
+
+        exchange = self.option_exchange(underlying)
+        with self._lock:
+            previous = self._contracts.get(underlying, {}) if self._expiry.get(underlying) == expiry else {}
+        band: Dict[Tuple[int, str], ChainContract] = {}
+        for step in range(-self.band, self.band + 1):
+            strike = atm + step * interval
+            for option_type in ("CE", "PE"):
+                contract = previous.get((strike, option_type))
+                if contract is None:
+                    symbol = master.get_symbol(name, expiry, strike, option_type)
+                    if not symbol:
+                        continue
+                    contract = ChainContract(underlying, strike, option_type, symbol, exchange, master.get_token(symbol))
+                band[(strike, option_type)] = contract
+
+        keep = {contract.instrument for contract in band.values()}
+        with self._lock:
+            for contract in self._contracts.get(underlying, {}).values():
+                if contract.instrument not in keep:
+                    self._by_instrument.pop(contract.instrument, None)
+                    self._quoted_at.pop(contract.instrument, None)
+            for contract in band.values():
+                self._by_instrument[contract.instrument] = contract
+            self._contracts[underlying] = band
+            self._atm[underlying] = atm
+            self._expiry[underlying] = expiry
+        logger.debug(f"Option chain {underlying}: ATM {atm}, expiry {expiry}, {len(band)} contracts")
+
+        if self.ticks is not None:
+            self.ticks.set_subscriptions("chain", self.instruments())
+        return True
+
+    def instruments(self) -> List[Instrument]:
+        """(exchange, symbol) of every contract in every band"""
+        with self._lock:
+            return list(self._by_instrument.keys())
+
+    def contracts(self, underlying: str) -> Dict[Tuple[int, str], ChainContract]:
+        """(strike, 'CE'/'PE') -> contract for an underlying's current band"""
+        with self._lock:
+            return dict(self._contracts.get(underlying, {}))
+
+    def atm(self, underlying: str) -> Optional[int]:
+        with self._lock:
+            return self._atm.get(underlying)
+
+    # --- quotes --------------------------------------------------------
+
+    def _store(self, quotes: Dict[Instrument, Dict]):
+        """Apply option quotes (and re-centre on spot quotes)"""
+        now = time.monotonic()
+        for instrument, quote in quotes.items():
+            if not quote:
+                continue
+            price = quote.get("last_price")
+            underlying = self._spots.get(instrument)
+            if underlying is not None:
+                self.recenter(underlying, price)
+                continue
+            with self._lock:
+                contract = self._by_instrument.get(instrument)
+                if contract is None or not price:
+                    continue
+                contract.last_price = float(price)
+                if contract.token is None and quote.get("instrument_token"):
+                    contract.token = str(quote["instrument_token"])
+                self._quoted_at[instrument] = now
+
+    def refresh(self) -> int:
+        """
+        Quote the spots and every band contract in one batched request
+
+        The band follows the spot first, so newly added strikes are quoted
+        in a second request only when the ATM moved.
+
+        Returns:
+        --------
+        int
+            Contracts with a premium
+        """
+        try:
+            quotes = self.api.get_quotes(list(self._spots.keys()) + self.instruments())
+            self._store(quotes)
+            missing = [i for i in self.instruments() if i not in quotes]
+            if missing:
+                self._store(self.api.get_quotes(missing))
+        except BrokerBlindError as e:
+            logger.debug(f"Option chain refresh skipped: {e}")
+        except Exception as e:
+            logger.warning(f"Option chain refresh failed: {e}")
+        with self._lock:
+            return sum(1 for c in self._by_instrument.values() if c.last_price)
+
+    def attach(self, ticks) -> "OptionChain":
+        """Take quotes from a TickSource: the band is subscribed as owner 'chain'"""
+        self.ticks = ticks
+        ticks.add_listener(self.on_tick)
+        ticks.subscribe(self._spots.keys(), owner="chain-spots")
+        ticks.set_subscriptions("chain", self.instruments())
+        return self
+
+    def on_tick(self, instrument: Instrument, quote: Dict, ts: float):
+        """TickSource listener"""
+        if instrument in self._spots or instrument in self._by_instrument:
+            self._store({instrument: quote})
+
+    def _fresh_price(self, contract: ChainContract, max_age: float) -> Optional[float]:
+        if self.ticks is not None:
+            # The feed knows when it last confirmed a price (unchanged ticks are not delivered)
+            try:
+                quote = self.ticks.snapshot([contract.instrument], max_age=max_age).get(contract.instrument)
+            except BrokerBlindError:
+                return None
+            price = (quote or {}).get("last_price")
+            return float(price) if price else None
+        with self._lock:
+            quoted = self._quoted_at.get(contract.instrument)
+        if quoted is None or time.monotonic() - quoted > max_age:
+            return None
+        return contract.last_price
+
+    def select(
+        self,
+        underlying: str,
+        spot_price: float,
+        option_type: str,
+        depth: int = 0,
+        max_age: Optional[float] = None
+    ) -> Optional[Tuple[ChainContract, float]]:
+        """
+        Pick the contract select_option would and price it from memory
+
+        Parameters:
+        -----------
+        underlying : str
+        spot_price : float
+        option_type : str
+            'CE' or 'PE'
+        depth : int
+            Strike depth (0=ATM, 1=ITM1, ...)
+        max_age : Optional[float]
+            Override of the chain's max_age
+
+        Returns:
+        --------
+        Optional[Tuple[ChainContract, float]]
+            (contract, premium), or None if the strike is outside the band
+            or has no fresh quote (the caller falls back to select_option
+            and a direct quote)
+        """
+        strike = OptionSelector.select_strike(underlying, spot_price, option_type, depth)
+        with self._lock:
+            contract = self._contracts.get(underlying, {}).get((strike, option_type))
+        if contract is None:
+            logger.info(f"Option chain miss: {underlying} {strike} {option_type} outside the band")
+            return None
+        premium = self._fresh_price(contract, self.max_age if max_age is None else max_age)
+        if not premium:
+            logger.info(f"Option chain miss: no fresh premium for {contract.symbol}")
+            return None
+        return contract, premium
+
+    # --- polling thread (when not attached to a feed) -------------------
+
+    def start(self):
+        """Refresh every `interval` seconds in the background"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="OptionChain", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        # Entry pricing reads from here: same lane as the entry scan
+        set_thread_priority(Priority.ENTRY)
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self.refresh()
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def stats(self) -> Dict:
+        """Band size and how much of it is priced, per underlying"""
+        with self._lock:
+            return {
+                underlying: {
+                    "atm": self._atm.get(underlying),
+                    "expiry": str(self._expiry.get(underlying)),
+                    "contracts": len(band),
+                    "priced": sum(1 for c in band.values() if c.last_price),
+                    "tokens": sum(1 for c in band.values() if c.token),
+                }
+                for underlying, band in self._contracts.items()
+            }
@@ -117,16 +117,14 @@ class OptionSelector:
         return OptionSelector.get_expiry(underlying)
     
     @staticmethod
-    def select_option(
+    def select_strike(
         underlying: str,
         spot_price: float,
         option_type: str,
         depth: int = 0
-    ) -> Tuple[int, str]:
+    ) -> int:
         """
-        Automatically select option for trading
-        - Nifty50: Weekly expiry ATM
-        - BankNifty: Monthly expiry ATM
+        Strike select_option trades: ATM shifted `depth` strikes ITM, never OTM
         
         Parameters:
         -----------
@@ -138,8 +136,8 @@ class OptionSelector:
             
         Returns:
         --------
-        Tuple[int, str]
-            (strike_price, option_symbol)
+        int
+            Strike price
         """
         interval = OptionSelector.STRIKE_INTERVALS.get(underlying, 50)
         
@@ -163,7 +161,34 @@ class OptionSelector:
                 logger.info(f"  [STRIKE ADJUST] Closest strike {selected_strike} is OTM for PE. Shifting to {selected_strike + interval} (ITM/ATM)")
                 selected_strike += interval
             
-        selected_strike = int(selected_strike)
+        return int(selected_strike)
+    
+    @staticmethod
+    def select_option(
+        underlying: str,
+        spot_price: float,
+        option_type: str,
+        depth: int = 0
+    ) -> Tuple[int, str]:
+        """
+        Automatically select option for trading
+        - Nifty50: Weekly expiry ATM
+        - BankNifty: Monthly expiry ATM
+        
+        Parameters:
+        -----------
+        underlying : str
+        spot_price : float
+        option_type : str
+        depth : int
+            Strike depth (0=ATM, 1=ITM1, 2=ITM2, etc.)
+            
+        Returns:
+        --------
+        Tuple[int, str]
+            (strike_price, option_symbol)
+        """
+        selected_strike = OptionSelector.select_strike(underlying, spot_price, option_type, depth)
         
         # Get expiry (weekly for Nifty, monthly for BankNifty)
         expiry = OptionSelector.get_expiry(underlying)
@@ -11,6 +11,9 @@ from datetime import datetime
 import json
 import os
 
+from src.resilience import BrokerBlindError
+from src.rate_limiter import Priority, current_priority, priority_lane
+
 logger = logging.getLogger(__name__)
 
 
@@ -175,26 +178,36 @@ class OrderManager:
                 # LIVE MODE: Place real order to mStock
                 logger.info(f"DEBUG: Placing Order -> Symbol: '{symbol}', Exch: '{exchange}', Side: '{side}', Qty: {qty}, Type: 'MARKET'")
                 
+                # Exits (SELL) jump the broker rate-limit queue
+                lane = Priority.EXIT if side == 'SELL' else current_priority()
+                
                 # If token is missing, try to fetch it dynamically from Quote API
                 if not token:
                     logger.info(f"Token missing for {symbol}. Fetching dynamically...")
-                    forced_quote = api.get_quote(symbol, exchange)
+                    try:
+                        with priority_lane(lane):
+                            forced_quote = api.get_quote(symbol, exchange)
+                    except BrokerBlindError as e:
+                        # Quotes are down; the order endpoint may still work, so try without a token
+                        logger.warning(f"Token lookup skipped: {e}")
+                        forced_quote = None
                     if forced_quote and 'instrument_token' in forced_quote:
                         token = str(forced_quote['instrument_token'])
                         logger.info(f"Dynamic Token Fetched: {token}")
                     else:
                         logger.warning(f"Could not fetch token for {symbol}")
 
-                broker_order_id = api.place_order(
-                    symbol=symbol,
-                    exchange=exchange,
-                    qty=qty,
-                    side=side,
-                    order_type="MARKET",
-                    price=0,
-                    paper_mode=False,
-                    token=token  # Pass token if available
-                )
+                with priority_lane(lane):
+                    broker_order_id = api.place_order(
+                        symbol=symbol,
+                        exchange=exchange,
+                        qty=qty,
+                        side=side,
+                        order_type="MARKET",
+                        price=0,
+                        paper_mode=False,
+                        token=token  # Pass token if available
+                    )
                 
                 if broker_order_id:
                     order.status = OrderStatus.PLACED
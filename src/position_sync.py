@@ -8,10 +8,20 @@ from typing import List, Optional
 from datetime import datetime
 from src.trading_models import TradeType, ExitReason
 from src.market_data import MStockAPI
+from src.resilience import BrokerBlindError
 
 logger = logging.getLogger(__name__)
 
 
+def _quote_or_none(api: MStockAPI, symbol: str, exchange: str) -> Optional[dict]:
+    """Quote for price estimates; a blind broker must not stop a position from being imported"""
+    try:
+        return api.get_quote(symbol, exchange)
+    except BrokerBlindError as e:
+        logger.warning(f"No quote for {symbol} while importing position: {e}")
+        return None
+
+
 def sync_positions_from_broker(bot, api: MStockAPI) -> int:
     """
     Sync open positions from broker to bot tracking
@@ -204,7 +214,7 @@ def sync_positions_from_broker(bot, api: MStockAPI) -> int:
             
             # Use correct exchange for spot fetch
             spot_exchange = "BSE" if underlying == "SENSEX" else "NSE"
-            quote = api.get_quote(spot_symbol, spot_exchange)
+            quote = _quote_or_none(api, spot_symbol, spot_exchange)
 
             current_spot = quote.get('last_price', 0) if quote else 0
             
@@ -217,7 +227,7 @@ def sync_positions_from_broker(bot, api: MStockAPI) -> int:
             
             # Try to fetch current LTP for more accurate imported position state
             opt_exchange = "BFO" if underlying == "SENSEX" else "NFO"
-            opt_quote = api.get_quote(tracking_symbol, opt_exchange)
+            opt_quote = _quote_or_none(api, tracking_symbol, opt_exchange)
             current_premium_ltp = opt_quote.get('last_price', 0.0) if opt_quote else 0.0
             
             # Estimate entry premium: Broker Avg -> Current LTP -> Fallback
@@ -0,0 +1,182 @@
+"""
+Rate Limiter Module
+Process-wide token bucket with priority lanes for broker API calls
+"""
+
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Request lanes, highest priority first"""
+    EXIT = 0        # Stop-loss / exit quotes and exit orders
+    ENTRY = 1       # Entry scans and entry orders
+    BACKGROUND = 2  # Dashboard, diagnostics, position sync
+
+
+# Tokens each lane must leave in the bucket, so a burst of low-priority
+# work can never drain the capacity the exit path needs.
+DEFAULT_RESERVE: Dict[Priority, float] = {
+    Priority.EXIT: 0.0,
+    Priority.ENTRY: 1.0,
+    Priority.BACKGROUND: 3.0,
+}
+
+
+_lane = threading.local()
+
+
+def current_priority() -> Priority:
+    """Lane of the calling thread (BACKGROUND unless set)"""
+    return getattr(_lane, "priority", Priority.BACKGROUND)
+
+
+def set_thread_priority(priority: Priority):
+    """Set the default lane for every broker call made by this thread"""
+    _lane.priority = priority
+
+
+@contextmanager
+def priority_lane(priority: Priority):
+    """Run a block of broker calls in a given lane"""
+    previous = getattr(_lane, "priority", None)
+    _lane.priority = priority
+    try:
+        yield
+    finally:
+        if previous is None:
+            del _lane.priority
+        else:
+            _lane.priority = previous
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every broker call in the process
+
+    Tokens refill at `rate` per second up to `burst`. A caller takes one
+    token per request; when none is available it waits on a condition
+    variable. Waiters are served strictly by lane: a lower lane does not
+    take a token while a higher lane is waiting, and must leave its
+    reserve in the bucket, so under a quota squeeze the exit path keeps
+    its latency while entry scans and dashboard refreshes back off.
+    """
+
+    def __init__(self, rate: float = 10.0, burst: float = 10.0, reserve: Optional[Dict[Priority, float]] = None):
+        """
+        Initialize rate limiter
+
+        Parameters:
+        -----------
+        rate : float
+            Sustained requests per second
+        burst : float
+            Bucket capacity (requests that may be sent back to back)
+        reserve : Optional[Dict[Priority, float]]
+            Tokens each lane must leave untouched (default DEFAULT_RESERVE)
+        """
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self.reserve = dict(DEFAULT_RESERVE)
+        self.reserve.update(reserve or {})
+
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+        self._waiting = {lane: 0 for lane in Priority}
+        self._granted = {lane: 0 for lane in Priority}
+        self._wait_time = {lane: 0.0 for lane in Priority}
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority: Optional[Priority] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Take one token, waiting if necessary
+
+        Parameters:
+        -----------
+        priority : Optional[Priority]
+            Lane (default: the calling thread's lane)
+        timeout : Optional[float]
+            Maximum seconds to wait (None = wait as long as needed)
+
+        Returns:
+        --------
+        bool
+            True if a token was taken, False on timeout
+        """
+        if self.rate <= 0:
+            return True
+
+        lane = Priority(priority if priority is not None else current_priority())
+        needed = 1.0 + min(self.reserve.get(lane, 0.0), self.burst - 1.0)
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+
+        with self._cond:
+            self._waiting[lane] += 1
+            try:
+                while True:
+                    self._refill()
+                    higher_waiting = any(self._waiting[p] for p in Priority if p < lane)
+                    if not higher_waiting and self._tokens >= needed:
+                        self._tokens -= 1.0
+                        self._granted[lane] += 1
+                        self._wait_time[lane] += time.monotonic() - start
+                        return True
+
+                    # Sleep until enough tokens could have accrued; a higher lane
+                    # finishing its acquire wakes us through notify_all
+                    if self._tokens < needed:
+                        wait = max((needed - self._tokens) / self.rate, 0.001)
+                    else:
+                        wait = 0.05
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            return False
+                        wait = min(wait, remaining)
+                    self._cond.wait(wait)
+            finally:
+                self._waiting[lane] -= 1
+                self._cond.notify_all()
+
+    def stats(self) -> Dict:
+        """Granted requests and mean wait (ms) per lane"""
+        with self._cond:
+            self._refill()
+            return {
+                "tokens": round(self._tokens, 2),
+                "granted": {lane.name: self._granted[lane] for lane in Priority},
+                "mean_wait_ms": {
+                    lane.name: round(1000 * self._wait_time[lane] / self._granted[lane], 2) if self._granted[lane] else 0.0
+                    for lane in Priority
+                },
+            }
+
+
+_shared: Optional[RateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def get_rate_limiter(rate: float = 10.0, burst: float = 10.0) -> RateLimiter:
+    """
+    Process-wide limiter shared by every MStockAPI instance
+
+    The first call creates it with the given settings; later calls
+    return the same object so all threads draw from one quota.
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = RateLimiter(rate, burst)
+        return _shared
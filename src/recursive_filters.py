@@ -0,0 +1,299 @@
+"""
+Recursive Filters Module
+Low-overhead EMA / Wilder RMA cores on NumPy arrays
+"""
+
+import logging
+import math
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - numba is optional
+    njit = None
+
+# Largest ratio between the first and last decay weight inside one scan
+# block: keeps the block's rescaled prefix sums far from overflow and their
+# rounding near machine precision (blocks are ~110 bars for EMA(12), ~250 for RMA(14))
+BLOCK_WEIGHT_RATIO = 1e8
+
+
+def _ewm_reference(values: np.ndarray, com: float, min_periods: int) -> np.ndarray:
+    """Python-float port of pandas' adjust=False recursion (reference, and the numba kernel's source)"""
+    alpha = 1.0 / (1.0 + com)
+    decay = 1.0 - alpha
+    min_periods = max(min_periods, 1)
+    value = np.nan
+    weight = 1.0
+    nobs = 0
+    out = np.empty(len(values))
+    for i in range(len(values)):
+        cur = values[i]
+        if cur == cur:
+            nobs += 1
+            if value == value:
+                weight *= decay
+                if value != cur:
+                    value = (weight * value + alpha * cur) / (weight + alpha)
+                weight = 1.0
+            else:
+                value = cur
+        elif value == value:
+            weight *= decay
+        out[i] = value if nobs >= min_periods else np.nan
+    return out
+
+
+def _scan(seed, values: np.ndarray, decay: float, alpha: float) -> np.ndarray:
+    """
+    `y[i] = decay * y[i - 1] + alpha * values[i]` from y[-1] = seed, in NumPy
+
+    The run is cut into blocks short enough that decay**block stays above
+    1 / BLOCK_WEIGHT_RATIO. Inside a block the recursion is a rescaled
+    prefix sum, y[j] = decay**j * (y0 + alpha * cumsum(x[k] / decay**k)),
+    done for all blocks at once on a (blocks x block) matrix; only the
+    value carried from one block into the next is a Python loop, over
+    blocks rather than bars. A 2-D `values` (rows x bars, one seed per
+    row) is scanned along its last axis, every row in the same pass.
+    """
+    count = values.shape[-1]
+    if decay <= 0.0:
+        return values * alpha
+    block = max(1, min(count, int(math.log(BLOCK_WEIGHT_RATIO) / -math.log(decay))))
+    blocks = -(-count // block)
+    padded = np.zeros(values.shape[:-1] + (blocks * block,))
+    padded[..., :count] = values
+    padded = padded.reshape(values.shape[:-1] + (blocks, block))
+
+    powers = decay ** np.arange(1, block + 1)
+    local = np.cumsum(padded / powers, axis=-1)
+    local *= alpha * powers
+
+    span = powers[-1]
+    carries = np.empty(values.shape[:-1] + (blocks,))
+    if values.ndim == 1:
+        carry = seed
+        for b, end in enumerate(local[:, -1].tolist()):
+            carries[b] = carry
+            carry = span * carry + end
+    else:
+        carry = np.asarray(seed, dtype=np.float64)
+        for b in range(blocks):
+            carries[:, b] = carry
+            carry = span * carry + local[:, b, -1]
+    local += carries[..., np.newaxis] * powers
+    return local.reshape(values.shape[:-1] + (blocks * block,))[..., :count]
+
+
+def _ewm_numpy(values: np.ndarray, com: float, min_periods: int) -> np.ndarray:
+    """
+    pandas' adjust=False recursion as block scans over the observed runs
+
+    NaN gaps keep the last value and decay its weight exactly as pandas
+    does; each run of observations is one _scan. Values agree with the
+    sequential recursion to a few units in the last place.
+    """
+    alpha = 1.0 / (1.0 + com)
+    decay = 1.0 - alpha
+    norm = decay + alpha  # pandas divides by (decay + alpha) on every step
+    min_periods = max(min_periods, 1)
+    observed = values == values
+    if observed.all():
+        out = np.empty(len(values))
+        out[0] = values[0]
+        out[1:] = _scan(values[0], values[1:], decay / norm, alpha / norm)
+        out[:min_periods - 1] = np.nan
+        return out
+
+    out = np.full(len(values), np.nan)
+    if not observed.any():
+        return out
+
+    # [start, end) of every run of observations
+    edges = np.diff(observed.astype(np.int8), prepend=0, append=0)
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+    value, previous_end = None, None
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        first = values[start]
+        if value is None:
+            seed = first
+        else:
+            # Gap of NaNs: the old value's weight decayed once per missing bar
+            weight = decay ** (start - previous_end + 1)
+            out[previous_end:start] = value
+            seed = first if value == first else (weight * value + alpha * first) / (weight + alpha)
+        out[start] = seed
+        if end - start > 1:
+            out[start + 1:end] = _scan(seed, values[start + 1:end], decay / norm, alpha / norm)
+        value, previous_end = out[end - 1], end
+    out[previous_end:] = value
+
+    nobs = np.cumsum(observed)
+    out[nobs < min_periods] = np.nan
+    return out
+
+
+# The sequential recursion compiled with numba when it is installed
+# (bit-identical to pandas); otherwise the NumPy block scan
+_ewm_numba = njit(cache=True)(_ewm_reference) if njit is not None else None
+_ewm_kernel = _ewm_numba if _ewm_numba is not None else _ewm_numpy
+
+
+def ewm_mean(values, com: float, min_periods: int = 0) -> np.ndarray:
+    """
+    Exponentially weighted mean, `ewm(com=..., adjust=False).mean()`
+
+    Bit-identical to pandas with numba; otherwise equal to it within a few
+    units in the last place (relative error around 1e-15).
+
+    Parameters:
+    -----------
+    values : array-like
+        Input series (NaN leaves gaps exactly as pandas does)
+    com : float
+        Center of mass (alpha = 1 / (1 + com))
+    min_periods : int
+        Observations required before a value is returned
+
+    Returns:
+    --------
+    np.ndarray
+        float64 means, same length as values
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    if len(values) == 0:
+        return values.copy()
+    return _ewm_kernel(values, float(com), int(min_periods))
+
+
+def ema(values, span: int) -> np.ndarray:
+    """EMA with pandas' span convention: `ewm(span=span, adjust=False).mean()`"""
+    return ewm_mean(values, (span - 1) / 2.0)
+
+
+def rma(values, period: int, min_periods: int = 0) -> np.ndarray:
+    """Wilder RMA seeded by the first value: `ewm(alpha=1/period, adjust=False).mean()`"""
+    alpha = 1 / period
+    return ewm_mean(values, (1 - alpha) / alpha, min_periods)
+
+
+def _first_window_mean(values: np.ndarray, length: int):
+    """
+    (index, mean) of the first complete `length`-bar window
+
+    Replays pandas' rolling-mean summation up to that bar, so the seed is
+    the value `rolling(length, min_periods=length).mean()` reports there.
+    Returns (None, nan) if no window is complete.
+    """
+    finite = values == values
+    run = 0
+    first = None
+    for i, ok in enumerate(finite.tolist()):
+        run = run + 1 if ok else 0
+        if run >= length:
+            first = i
+            break
+    if first is None:
+        return None, np.nan
+
+    data = values.tolist()
+    total = add_comp = remove_comp = 0.0
+    nobs = negatives = same = 0
+    prev = data[0]
+    for i in range(first + 1):
+        if i >= length:
+            old = data[i - length]
+            if old == old:
+                nobs -= 1
+                y = -old - remove_comp
+                t = total + y
+                remove_comp = t - total - y
+                total = t
+                if np.signbit(old):
+                    negatives -= 1
+        val = data[i]
+        if val == val:
+            nobs += 1
+            y = val - add_comp
+            t = total + y
+            add_comp = t - total - y
+            total = t
+            if np.signbit(val):
+                negatives += 1
+            same = same + 1 if val == prev else 1
+            prev = val
+
+    mean = total / nobs
+    if same >= nobs:
+        mean = prev
+    elif negatives == 0 and mean < 0:
+        mean = 0.0
+    elif negatives == nobs and mean > 0:
+        mean = 0.0
+    return first, mean
+
+
+def tv_rma(values, length: int) -> np.ndarray:
+    """
+    TradingView RMA: SMA of the first `length` bars, then
+    `alpha * x + (1 - alpha) * previous` with alpha = 1/length
+
+    NaN before the seed; a NaN after it propagates like TradingView's na.
+
+    Parameters:
+    -----------
+    values : array-like
+        Input series
+    length : int
+        RMA length
+
+    Returns:
+    --------
+    np.ndarray
+        float64 RMA, same length as values
+    """
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    out = np.full(len(values), np.nan)
+    first, seed = _first_window_mean(values, length)
+    if first is None:
+        return out
+    alpha = 1.0 / float(length)
+    decay = 1 - alpha
+    previous = seed
+    smoothed = [seed]
+    for x in values[first + 1:].tolist():
+        previous = alpha * x + decay * previous
+        smoothed.append(previous)
+    out[first:] = smoothed
+    return out
+
+
+def wilder_smooth(values, period: int, seed: float) -> np.ndarray:
+    """
+    Wilder's running average `(previous * (period - 1) + x) / period`
+    continued from `seed` over every value
+
+    Parameters:
+    -----------
+    values : array-like
+        Values following the seed bar
+    period : int
+        Smoothing period
+    seed : float
+        Average at the bar before values[0]
+
+    Returns:
+    --------
+    np.ndarray
+        float64 averages, one per value
+    """
+    previous = float(seed)
+    out = []
+    for x in np.asarray(values, dtype=np.float64).tolist():
+        previous = (previous * (period - 1) + x) / period
+        out.append(previous)
+    return np.array(out, dtype=np.float64)
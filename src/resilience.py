@@ -0,0 +1,249 @@
+"""
+Broker Resilience Module
+Latency tracking, adaptive deadlines and a circuit breaker for broker calls
+"""
+
+import threading
+import time
+import logging
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# Idempotent read endpoints: safe to hedge, and worth failing fast on.
+# Orders and auth are never hedged or short-circuited.
+IDEMPOTENT_ENDPOINTS = ("quote", "historical", "holdings", "positions", "tradebook", "reports")
+
+
+class BrokerBlindError(Exception):
+    """
+    The broker is unreachable for an endpoint and the circuit is open
+
+    Raised instead of waiting on a request that is expected to hang, so
+    protective loops know they are blind (no prices) rather than stalled.
+    """
+
+    def __init__(self, endpoint: str, retry_in: float, last_error: str = ""):
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+        self.last_error = last_error
+        message = f"Broker blind on '{endpoint}' (circuit open, retry in {retry_in:.1f}s)"
+        if last_error:
+            message += f": {last_error}"
+        super().__init__(message)
+
+
+class LatencyTracker:
+    """
+    Rolling per-endpoint latency samples and the deadlines derived from them
+
+    The read deadline for an endpoint is `multiplier` x its recent p95,
+    clamped between `floor` and the endpoint's static timeout, so a hung
+    request is abandoned after a few normal round trips instead of after
+    the static 30-60 seconds. Until `min_samples` responses have been
+    seen the static timeout applies.
+    """
+
+    def __init__(self, window: int = 200, multiplier: float = 3.0, floor: float = 1.0, min_samples: int = 20):
+        """
+        Initialize latency tracker
+
+        Parameters:
+        -----------
+        window : int
+            Samples kept per endpoint
+        multiplier : float
+            Deadline as a multiple of p95
+        floor : float
+            Shortest read deadline ever used, in seconds
+        min_samples : int
+            Samples needed before deadlines adapt
+        """
+        self.multiplier = float(multiplier)
+        self.floor = float(floor)
+        self.min_samples = int(min_samples)
+        self._window = int(window)
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, seconds: float):
+        """Add one observed round trip"""
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if samples is None:
+                samples = self._samples[endpoint] = deque(maxlen=self._window)
+            samples.append(seconds)
+
+    def percentile(self, endpoint: str, q: float = 95.0) -> Optional[float]:
+        """Latency percentile in seconds (None until min_samples are available)"""
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            values = np.fromiter(samples, dtype=np.float64, count=len(samples))
+        return float(np.percentile(values, q))
+
+    def deadline(self, endpoint: str, static: Tuple[float, float]) -> Tuple[float, float]:
+        """
+        (connect, read) timeout for the next request
+
+        Parameters:
+        -----------
+        endpoint : str
+            Endpoint group
+        static : Tuple[float, float]
+            Configured timeout, used as the ceiling and as the fallback
+
+        Returns:
+        --------
+        Tuple[float, float]
+        """
+        p95 = self.percentile(endpoint)
+        if p95 is None:
+            return static
+        connect, read = static
+        read = min(read, max(self.floor, self.multiplier * p95))
+        return min(connect, read), read
+
+    def stats(self) -> Dict:
+        """p50 / p95 (ms) and sample count per endpoint"""
+        with self._lock:
+            endpoints = list(self._samples.keys())
+            counts = {endpoint: len(self._samples[endpoint]) for endpoint in endpoints}
+        report = {}
+        for endpoint in endpoints:
+            p50 = self.percentile(endpoint, 50)
+            p95 = self.percentile(endpoint, 95)
+            report[endpoint] = {
+                "samples": counts[endpoint],
+                "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            }
+        return report
+
+
+class CircuitBreaker:
+    """
+    Per-endpoint circuit breaker
+
+    After `threshold` consecutive failures (exceptions or 5xx) the circuit
+    for that endpoint opens: calls raise BrokerBlindError immediately for
+    `reset_after` seconds. Then one probe request is let through
+    (half-open); success closes the circuit, failure re-opens it. A probe
+    that never reports (cancelled, or raised before sending) is released by
+    its caller, or expires after `probe_timeout` seconds.
+    """
+
+    def __init__(
+        self,
+        threshold: int = 3,
+        reset_after: float = 5.0,
+        endpoints: Iterable[str] = IDEMPOTENT_ENDPOINTS,
+        probe_timeout: float = 30.0
+    ):
+        """
+        Initialize circuit breaker
+
+        Parameters:
+        -----------
+        threshold : int
+            Consecutive failures that open the circuit
+        reset_after : float
+            Seconds the circuit stays open before a probe
+        endpoints : Iterable[str]
+            Endpoint groups the breaker guards (others always pass)
+        probe_timeout : float
+            Seconds after which an unfinished probe no longer blocks the next
+        """
+        self.threshold = max(1, int(threshold))
+        self.reset_after = float(reset_after)
+        self.endpoints = set(endpoints)
+        self.probe_timeout = float(probe_timeout)
+        self._failures: Dict[str, int] = {}
+        self._opened: Dict[str, float] = {}
+        self._probing: Dict[str, float] = {}  # endpoint -> probe start
+        self._last_error: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def check(self, endpoint: str) -> Optional[float]:
+        """
+        Raise BrokerBlindError if the circuit for an endpoint is open
+
+        Returns:
+        --------
+        Optional[float]
+            Probe token if this caller is the half-open probe (pass it to
+            release() once the call is over), else None
+
+        Raises:
+        -------
+        BrokerBlindError
+        """
+        if endpoint not in self.endpoints:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            opened = self._opened.get(endpoint)
+            if opened is None:
+                return None
+            remaining = opened + self.reset_after - now
+            probe = self._probing.get(endpoint)
+            if probe is not None and now - probe >= self.probe_timeout:
+                logger.warning(f"Broker circuit probe for '{endpoint}' did not finish in {self.probe_timeout:.0f}s; probing again")
+                probe = None
+            if remaining <= 0 and probe is None:
+                # Half-open: this caller is the probe
+                self._probing[endpoint] = now
+                return now
+            raise BrokerBlindError(endpoint, max(remaining, 0.0), self._last_error.get(endpoint, ""))
+
+    def release(self, endpoint: str, probe: Optional[float]):
+        """
+        End a probe that recorded neither success nor failure
+
+        Call in a `finally` around the guarded call with the token from
+        check(); a no-op if the probe already reported (or was not one).
+        """
+        if probe is None:
+            return
+        with self._lock:
+            if self._probing.get(endpoint) == probe:
+                del self._probing[endpoint]
+
+    def success(self, endpoint: str):
+        """Record a successful call (closes the circuit)"""
+        with self._lock:
+            self._failures[endpoint] = 0
+            self._probing.pop(endpoint, None)
+            if self._opened.pop(endpoint, None) is not None:
+                logger.info(f"Broker circuit closed for '{endpoint}'")
+
+    def failure(self, endpoint: str, error: str = ""):
+        """Record a failed call (may open the circuit)"""
+        if endpoint not in self.endpoints:
+            return
+        with self._lock:
+            self._failures[endpoint] = self._failures.get(endpoint, 0) + 1
+            self._last_error[endpoint] = error
+            probe_failed = self._probing.pop(endpoint, None) is not None
+            if probe_failed or self._failures[endpoint] >= self.threshold:
+                if endpoint not in self._opened or probe_failed:
+                    logger.error(f"Broker circuit OPEN for '{endpoint}' after {self._failures[endpoint]} failures: {error}")
+                self._opened[endpoint] = time.monotonic()
+
+    def blind(self) -> List[str]:
+        """Endpoints whose circuit is currently open"""
+        with self._lock:
+            return sorted(self._opened.keys())
+
+    def stats(self) -> Dict:
+        """Open circuits and consecutive failure counts"""
+        with self._lock:
+            return {
+                "open": sorted(self._opened.keys()),
+                "consecutive_failures": {k: v for k, v in self._failures.items() if v},
+            }
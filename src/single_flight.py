@@ -0,0 +1,176 @@
+"""
+Single-Flight Module
+Coalesces identical concurrent broker calls into one request
+"""
+
+import threading
+import time
+import logging
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """One in-flight (or just finished) request shared by its callers"""
+    __slots__ = ("done", "result", "error", "finished", "waiters", "lane")
+
+    def __init__(self, lane: Any = None):
+        self.done = False
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.finished = 0.0
+        self.waiters = 0
+        self.lane = lane
+
+
+class SingleFlight:
+    """
+    Share one request among concurrent callers asking for the same key
+
+    The first caller for a key becomes the leader and performs the
+    request; anyone asking for the same key while it is in flight, or
+    within `window` seconds after it finished, gets the same result (or
+    exception). Followers block on a condition variable until the leader
+    finishes - no polling.
+
+    Callers may pass a lane (e.g. a rate limiter Priority, lower is more
+    urgent). A caller never waits on an in-flight call led from a less
+    urgent lane, which may still be queued for a rate-limit token; it
+    leads its own call instead, and later callers join that one. Finished
+    results are shared across lanes.
+    """
+
+    def __init__(self, window: float = 0.25):
+        """
+        Initialize single-flight group
+
+        Parameters:
+        -----------
+        window : float
+            Seconds a finished result keeps being shared with new callers
+        """
+        self.window = max(0.0, float(window))
+        self._calls: Dict[Hashable, _Call] = {}
+        self._cond = threading.Condition()
+        self.leaders = 0
+        self.shared = 0
+
+    def _prune(self, now: float):
+        expired = [
+            key for key, call in self._calls.items()
+            if call.done and call.waiters == 0 and now - call.finished > self.window
+        ]
+        for key in expired:
+            del self._calls[key]
+
+    def begin(self, key: Hashable, lane: Any = None) -> Tuple[_Call, bool]:
+        """
+        Join or start the call for a key
+
+        Parameters:
+        -----------
+        key : Hashable
+            Request identity
+        lane : Any
+            Caller's lane (lower is more urgent); None joins any call
+
+        Returns:
+        --------
+        Tuple[_Call, bool]
+            (call, is_leader) - the leader must call finish(); followers
+            call wait()
+        """
+        now = time.monotonic()
+        with self._cond:
+            self._prune(now)
+            call = self._calls.get(key)
+            if call is not None and (
+                (call.done and now - call.finished <= self.window)
+                or (not call.done and not self._outranks(lane, call.lane))
+            ):
+                call.waiters += 1
+                self.shared += 1
+                return call, False
+
+            # A lower lane's call keeps its own followers; it is just no longer the one joined
+            call = _Call(lane)
+            self._calls[key] = call
+            self.leaders += 1
+            return call, True
+
+    @staticmethod
+    def _outranks(lane: Any, other: Any) -> bool:
+        """Whether `lane` is more urgent than the lane of an in-flight call"""
+        return lane is not None and other is not None and lane < other
+
+    def finish(self, call: _Call, result: Any = None, error: Optional[BaseException] = None):
+        """Publish the leader's result and wake every follower"""
+        with self._cond:
+            call.result = result
+            call.error = error
+            call.finished = time.monotonic()
+            call.done = True
+            self._cond.notify_all()
+
+    def wait(self, call: _Call, timeout: Optional[float] = None) -> Any:
+        """
+        Wait for a call started by another thread
+
+        Raises:
+        -------
+        TimeoutError
+            If the leader has not finished within `timeout` seconds
+        """
+        with self._cond:
+            try:
+                if not self._cond.wait_for(lambda: call.done, timeout):
+                    raise TimeoutError("Timed out waiting for shared broker request")
+            finally:
+                call.waiters -= 1
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[[], Any],
+        timeout: Optional[float] = None,
+        lane: Any = None
+    ) -> Any:
+        """
+        Run fn() once for all concurrent callers of `key`
+
+        Parameters:
+        -----------
+        key : Hashable
+            Request identity, e.g. ("quote", "NSE:NIFTY 50")
+        fn : Callable[[], Any]
+            Performs the request (only called by the leader)
+        timeout : Optional[float]
+            Maximum seconds a follower waits for the leader
+        lane : Any
+            Caller's lane (see begin)
+
+        Returns:
+        --------
+        Any
+            fn()'s result (exceptions are re-raised in every caller)
+        """
+        call, leader = self.begin(key, lane)
+        if not leader:
+            return self.wait(call, timeout)
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self.finish(call, error=e)
+            raise
+        self.finish(call, result)
+        return result
+
+    def stats(self) -> Dict:
+        """Requests performed vs. results shared"""
+        with self._cond:
+            return {"leaders": self.leaders, "shared": self.shared}
@@ -0,0 +1,405 @@
+"""
+Streaming Indicators Module
+O(1) incremental MACD, RSI and ADX that reproduce the batch calculations
+"""
+
+import copy
+import math
+import threading
+import logging
+from typing import Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.indicator_cache import IndicatorCache, get_indicator_cache
+
+logger = logging.getLogger(__name__)
+
+
+NAN = float("nan")
+INF = float("inf")
+
+
+def _div(a: float, b: float) -> float:
+    """a / b with NumPy semantics (x/0 -> +-inf, 0/0 -> nan) instead of ZeroDivisionError"""
+    try:
+        return a / b
+    except ZeroDivisionError:
+        if a != a or a == 0:
+            return NAN
+        return math.copysign(INF, a) * math.copysign(1.0, b)
+
+
+class EWMState:
+    """
+    One exponentially weighted mean, advanced a value at a time
+
+    Reproduces pandas `ewm(alpha=..., adjust=False).mean()` step for step
+    (same arithmetic, so results are bit-identical): the first observation
+    seeds the mean, NaN inputs carry the mean forward while its weight
+    keeps decaying, and outputs are NaN until `min_periods` observations.
+    """
+
+    __slots__ = ("alpha", "decay", "min_periods", "value", "weight", "nobs")
+
+    def __init__(self, alpha: float, min_periods: int = 0):
+        """
+        Parameters:
+        -----------
+        alpha : float
+            Smoothing factor (2/(span+1) for an EMA, 1/period for Wilder's RMA)
+        min_periods : int
+            Observations required before a value is returned
+        """
+        self.alpha = alpha
+        self.decay = 1.0 - alpha
+        self.min_periods = max(int(min_periods), 1)
+        self.value = NAN
+        self.weight = 1.0
+        self.nobs = 0
+
+    @classmethod
+    def span(cls, span: int, min_periods: int = 0) -> "EWMState":
+        """EMA with pandas' span convention"""
+        return cls(2.0 / (span + 1.0), min_periods)
+
+    def step(self, x: float) -> Tuple[float, float, int]:
+        """Next (value, weight, nobs) after x, without changing the state"""
+        value, weight, nobs = self.value, self.weight, self.nobs
+        observed = x == x
+        nobs += observed
+        if value == value:
+            weight *= self.decay
+            if observed:
+                if value != x:
+                    value = (weight * value + self.alpha * x) / (weight + self.alpha)
+                weight = 1.0
+        elif observed:
+            value = x
+        return value, weight, nobs
+
+    def output(self, value: float, nobs: int) -> float:
+        return value if nobs >= self.min_periods else NAN
+
+    def update(self, x: float) -> float:
+        """Consume x and return the new mean"""
+        self.value, self.weight, self.nobs = self.step(x)
+        return self.output(self.value, self.nobs)
+
+    def peek(self, x: float) -> float:
+        """Mean after x, leaving the state untouched"""
+        value, _, nobs = self.step(x)
+        return self.output(value, nobs)
+
+    @property
+    def current(self) -> float:
+        return self.output(self.value, self.nobs)
+
+
+class StreamingMACD:
+    """MACD / Signal / Histogram of TechnicalIndicators.calculate_macd, one close at a time"""
+
+    __slots__ = ("fast", "slow", "signal", "bars")
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = EWMState.span(fast)
+        self.slow = EWMState.span(slow)
+        self.signal = EWMState.span(signal)
+        self.bars = 0
+
+    def _evaluate(self, close: float, commit: bool) -> Tuple[float, float, float]:
+        if commit:
+            macd = self.fast.update(close) - self.slow.update(close)
+            signal = self.signal.update(macd)
+            self.bars += 1
+        else:
+            macd = self.fast.peek(close) - self.slow.peek(close)
+            signal = self.signal.peek(macd)
+        return macd, signal, macd - signal
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        """Commit a sealed bar's close; returns (macd, signal, histogram)"""
+        return self._evaluate(float(close), True)
+
+    def peek(self, close: float) -> Tuple[float, float, float]:
+        """(macd, signal, histogram) if the next bar closed at `close` (state unchanged)"""
+        return self._evaluate(float(close), False)
+
+
+class StreamingRSI:
+    """Wilder RSI of TechnicalIndicators.calculate_rsi, one close at a time"""
+
+    __slots__ = ("gain", "loss", "prev_close", "bars")
+
+    def __init__(self, period: int = 14):
+        self.gain = EWMState(1.0 / period)
+        self.loss = EWMState(1.0 / period)
+        self.prev_close = NAN
+        self.bars = 0
+
+    def _evaluate(self, close: float, commit: bool) -> float:
+        delta = close - self.prev_close
+        # clip() keeps NaN; loss is negated like the batch code (0 becomes -0.0)
+        gain = delta if delta != delta else max(delta, 0.0)
+        loss = -(delta if delta != delta else min(delta, 0.0))
+        if commit:
+            avg_gain, avg_loss = self.gain.update(gain), self.loss.update(loss)
+            self.prev_close = close
+            self.bars += 1
+        else:
+            avg_gain, avg_loss = self.gain.peek(gain), self.loss.peek(loss)
+        rs = _div(avg_gain, avg_loss)
+        return 100 - _div(100, 1 + rs)
+
+    def update(self, close: float) -> float:
+        """Commit a sealed bar's close; returns RSI"""
+        return self._evaluate(float(close), True)
+
+    def peek(self, close: float) -> float:
+        """RSI if the next bar closed at `close` (state unchanged)"""
+        return self._evaluate(float(close), False)
+
+
+class StreamingADX:
+    """ADX / +DI / -DI of TechnicalIndicators.calculate_adx, one bar at a time"""
+
+    __slots__ = ("atr", "plus_dm", "minus_dm", "adx", "prev_high", "prev_low", "prev_close", "bars")
+
+    def __init__(self, period: int = 14):
+        alpha = 1.0 / period
+        self.atr = EWMState(alpha, min_periods=period)
+        self.plus_dm = EWMState(alpha)
+        self.minus_dm = EWMState(alpha)
+        self.adx = EWMState(alpha)
+        self.prev_high = self.prev_low = self.prev_close = NAN
+        self.bars = 0
+
+    def _evaluate(self, high: float, low: float, close: float, commit: bool) -> Tuple[float, float, float]:
+        # True range: max of the available candidates (pandas max(axis=1) skips NaN)
+        ranges = [r for r in (high - low, abs(high - self.prev_close), abs(low - self.prev_close)) if r == r]
+        tr = max(ranges) if ranges else NAN
+
+        up_move = high - self.prev_high
+        down_move = self.prev_low - low
+        plus_dm = up_move if (up_move > down_move and up_move > 0) else 0.0
+        minus_dm = down_move if (down_move > up_move and down_move > 0) else 0.0
+
+        if commit:
+            atr = self.atr.update(tr)
+            plus_smooth, minus_smooth = self.plus_dm.update(plus_dm), self.minus_dm.update(minus_dm)
+        else:
+            atr = self.atr.peek(tr)
+            plus_smooth, minus_smooth = self.plus_dm.peek(plus_dm), self.minus_dm.peek(minus_dm)
+
+        plus_di = 100 * _div(plus_smooth, atr)
+        minus_di = 100 * _div(minus_smooth, atr)
+        dx = _div(100 * abs(plus_di - minus_di), plus_di + minus_di)
+
+        if commit:
+            adx = self.adx.update(dx)
+            self.prev_high, self.prev_low, self.prev_close = high, low, close
+            self.bars += 1
+        else:
+            adx = self.adx.peek(dx)
+        return adx, plus_di, minus_di
+
+    def update(self, high: float, low: float, close: float) -> Tuple[float, float, float]:
+        """Commit a sealed bar; returns (adx, +di, -di)"""
+        return self._evaluate(float(high), float(low), float(close), True)
+
+    def peek(self, high: float, low: float, close: float) -> Tuple[float, float, float]:
+        """(adx, +di, -di) if the next bar had this high/low/close (state unchanged)"""
+        return self._evaluate(float(high), float(low), float(close), False)
+
+
+# Intraday indicator columns, in the order IndicatorState returns them
+INDICATOR_COLUMNS = ["MACD", "MACD_Signal", "MACD_Hist", "RSI", "ADX", "+DI", "-DI"]
+OHLC = ["open", "high", "low", "close"]
+
+
+class IndicatorState:
+    """
+    Committed MACD/RSI/ADX state of a series of sealed bars
+
+    update() commits a bar, peek() evaluates a hypothetical next bar; both
+    return the INDICATOR_COLUMNS values for that bar.
+    """
+
+    __slots__ = ("macd", "rsi", "adx")
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9, rsi_period: int = 14, adx_period: int = 14):
+        self.macd = StreamingMACD(fast, slow, signal)
+        self.rsi = StreamingRSI(rsi_period)
+        self.adx = StreamingADX(adx_period)
+
+    @property
+    def bars(self) -> int:
+        return self.macd.bars
+
+    def update(self, high: float, low: float, close: float) -> Tuple[float, ...]:
+        return self.macd.update(close) + (self.rsi.update(close),) + self.adx.update(high, low, close)
+
+    def peek(self, high: float, low: float, close: float) -> Tuple[float, ...]:
+        return self.macd.peek(close) + (self.rsi.peek(close),) + self.adx.peek(high, low, close)
+
+    def extend(self, ohlc: np.ndarray) -> np.ndarray:
+        """Commit rows of an (n, 4) OHLC array; returns their (n, 7) indicator rows"""
+        rows = np.empty((len(ohlc), len(INDICATOR_COLUMNS)), dtype=np.float64)
+        for i, (_, high, low, close) in enumerate(ohlc.tolist()):
+            rows[i] = self.update(high, low, close)
+        return rows
+
+
+class _Committed:
+    """Sealed bars already folded into an IndicatorState"""
+    __slots__ = ("state", "ts", "ohlc", "rows")
+
+    def __init__(self, state: IndicatorState):
+        self.state = state
+        self.ts = np.empty(0, dtype=np.int64)
+        self.ohlc = np.empty((0, 4), dtype=np.float64)
+        self.rows = np.empty((0, len(INDICATOR_COLUMNS)), dtype=np.float64)
+
+    @property
+    def nbytes(self) -> int:
+        # Arrays plus a rough allowance for the scalar filter state
+        return self.ts.nbytes + self.ohlc.nbytes + self.rows.nbytes + 2048
+
+    def clone(self) -> "_Committed":
+        """Copy whose state can advance independently (arrays are never written in place)"""
+        other = _Committed(copy.deepcopy(self.state))
+        other.ts, other.ohlc, other.rows = self.ts, self.ohlc, self.rows
+        return other
+
+    def matches(self, ts: np.ndarray, ohlc: np.ndarray) -> bool:
+        return (
+            len(self.ts) == len(ts)
+            and np.array_equal(self.ts, ts)
+            and np.array_equal(self.ohlc, ohlc, equal_nan=True)
+        )
+
+
+class ProvisionalIndicators:
+    """
+    Live-frame indicators without a full recompute per tick
+
+    Every bar but the last of a live OHLC frame is committed into a per-
+    instrument IndicatorState once (new sealed bars are appended in O(1)
+    each; a revised history rebuilds). The last (forming) bar is only
+    peeked, so a tick costs one state evaluation plus assembling the
+    output arrays, however long the lookback. Values match running the
+    batch TechnicalIndicators functions over the whole frame (bit for bit
+    with numba, else to a few ulps of the NumPy ewm core).
+
+    Committed states are also published to an IndicatorCache keyed by the
+    last sealed bar, so other consumers in the process (another
+    ProvisionalIndicators, e.g. the dashboard's) adopt them instead of
+    computing the same bars again.
+    """
+
+    def __init__(
+        self,
+        fast: int = 12,
+        slow: int = 26,
+        signal: int = 9,
+        rsi_period: int = 14,
+        adx_period: int = 14,
+        timeframe: str = "15minute",
+        cache: Optional[IndicatorCache] = None
+    ):
+        self._params = (fast, slow, signal, rsi_period, adx_period)
+        self.timeframe = timeframe
+        self.cache = cache if cache is not None else get_indicator_cache()
+        self._committed: Dict[Hashable, _Committed] = {}
+        self._lock = threading.Lock()
+        self.rebuilds = 0
+
+    def _sync(self, key: Hashable, ts: np.ndarray, ohlc: np.ndarray) -> _Committed:
+        """Committed state for ts/ohlc (the rows before the forming bar)"""
+        entry = self._committed.get(key)
+        count = 0 if entry is None else len(entry.ts)
+        if count == len(ts) and entry is not None and entry.matches(ts, ohlc):
+            return entry
+
+        # New sealed bars (or a revised history): someone may have computed them already
+        cache_key = IndicatorCache.key(key, self.timeframe, ts[-1], self._params) if len(ts) else None
+        if cache_key is not None:
+            cached = self.cache.get(cache_key)
+            if cached is not None and cached.matches(ts, ohlc):
+                entry = self._committed[key] = cached.clone()
+                return entry
+
+        if (
+            entry is None or count > len(ts)
+            or not np.array_equal(entry.ts, ts[:count])
+            or not np.array_equal(entry.ohlc, ohlc[:count], equal_nan=True)
+        ):
+            entry = self._committed[key] = _Committed(IndicatorState(*self._params))
+            count = 0
+            self.rebuilds += 1
+        if count < len(ts):
+            rows = entry.state.extend(ohlc[count:])
+            entry.ts = np.concatenate([entry.ts, ts[count:]])
+            entry.ohlc = np.vstack([entry.ohlc, ohlc[count:]])
+            entry.rows = np.vstack([entry.rows, rows])
+        if cache_key is not None:
+            snapshot = entry.clone()
+            self.cache.put(cache_key, snapshot, snapshot.nbytes)
+        return entry
+
+    @staticmethod
+    def _arrays(frame: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        if isinstance(frame.index, pd.DatetimeIndex):
+            # Nanoseconds whatever the index resolution, so equal bars always compare equal
+            ts = frame.index.values.astype("datetime64[ns]").view(np.int64)
+        else:
+            ts = np.arange(len(frame), dtype=np.int64)
+        return ts, frame[OHLC].to_numpy(dtype=np.float64)
+
+    def last(self, key: Hashable, frame: pd.DataFrame) -> Dict[str, float]:
+        """
+        Indicators of the frame's last bar only
+
+        Parameters:
+        -----------
+        key : Hashable
+            Instrument (e.g. (exchange, symbol)); one committed state per key
+        frame : pd.DataFrame
+            OHLC frame whose last row is the forming bar
+
+        Returns:
+        --------
+        Dict[str, float]
+            INDICATOR_COLUMNS -> value
+        """
+        ts, ohlc = self._arrays(frame)
+        with self._lock:
+            entry = self._sync(key, ts[:-1], ohlc[:-1])
+            values = entry.state.peek(*ohlc[-1, 1:].tolist())
+        return dict(zip(INDICATOR_COLUMNS, values))
+
+    def frame(self, key: Hashable, frame: pd.DataFrame) -> pd.DataFrame:
+        """
+        OHLC frame with INDICATOR_COLUMNS for every bar
+
+        Same values as calculate_macd/rsi/adx over the whole frame, built
+        from the committed rows plus one peeked row.
+        """
+        ts, ohlc = self._arrays(frame)
+        with self._lock:
+            entry = self._sync(key, ts[:-1], ohlc[:-1])
+            last = entry.state.peek(*ohlc[-1, 1:].tolist())
+            values = np.empty((len(ohlc), len(OHLC) + len(INDICATOR_COLUMNS)), dtype=np.float64)
+            values[:, :4] = ohlc
+            values[:-1, 4:] = entry.rows
+            values[-1, 4:] = last
+        return pd.DataFrame(values, index=frame.index, columns=OHLC + INDICATOR_COLUMNS, copy=False)
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Drop one instrument's committed state (or all)"""
+        with self._lock:
+            if key is None:
+                self._committed.clear()
+            else:
+                self._committed.pop(key, None)
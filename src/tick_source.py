@@ -0,0 +1,567 @@
+"""
+Tick Source Module
+Pluggable price feeds (REST polling, websocket, file replay) for the monitoring loops
+"""
+
+import asyncio
+import json
+import threading
+import time
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.rate_limiter import Priority, set_thread_priority
+from src.resilience import BrokerBlindError
+
+logger = logging.getLogger(__name__)
+
+
+Instrument = Tuple[str, str]   # (exchange, symbol)
+TickListener = Callable[[Instrument, Dict, float], None]
+
+
+class TickSource:
+    """
+    Base class for price feeds the monitoring loops subscribe to
+
+    A source keeps the latest quote per subscribed (exchange, symbol) in
+    the same dict shape the broker quote endpoint returns, and bumps a
+    version counter only when a price actually changes. Loops read
+    snapshot() and then block in wait_for_update() until something moves
+    (or a heartbeat timeout passes), instead of sleeping a fixed second.
+    Listeners (e.g. the bar aggregator) are called for every new tick.
+    """
+
+    def __init__(self):
+        self._owners: Dict[str, set] = {}
+        self._subscribed: Dict[Instrument, bool] = {}
+        self._quotes: Dict[Instrument, Dict] = {}
+        self._seen: Dict[Instrument, float] = {}
+        self._listeners: List[TickListener] = []
+        self._version = 0
+        self._error: Optional[BrokerBlindError] = None
+        self._cond = threading.Condition()
+
+    # --- subscriptions -------------------------------------------------
+
+    def subscribe(self, instruments: Iterable[Instrument], owner: str = "default"):
+        """Add instruments to an owner's subscription set"""
+        with self._cond:
+            wanted = self._owners.get(owner, set()) | {(i[0], i[1]) for i in instruments}
+        self.set_subscriptions(owner, wanted)
+
+    def unsubscribe(self, instruments: Iterable[Instrument], owner: str = "default"):
+        """Remove instruments from an owner's subscription set"""
+        with self._cond:
+            wanted = self._owners.get(owner, set()) - {(i[0], i[1]) for i in instruments}
+        self.set_subscriptions(owner, wanted)
+
+    def set_subscriptions(self, owner: str, instruments: Iterable[Instrument]):
+        """
+        Replace everything `owner` (e.g. 'exit', 'entry') needs
+
+        The feed carries the union of all owners; instruments nobody needs
+        any more (e.g. the option of a closed position) are dropped.
+        """
+        with self._cond:
+            before = set(self._subscribed)
+            self._owners[owner] = {(i[0], i[1]) for i in instruments}
+            after = set().union(*self._owners.values())
+            added, removed = sorted(after - before), sorted(before - after)
+            for instrument in added:
+                self._subscribed[instrument] = True
+            for instrument in removed:
+                del self._subscribed[instrument]
+                self._quotes.pop(instrument, None)
+                self._seen.pop(instrument, None)
+        if added:
+            self._on_subscribe(added)
+        if removed:
+            self._on_unsubscribe(removed)
+
+    def subscriptions(self) -> List[Instrument]:
+        """Currently subscribed instruments"""
+        with self._cond:
+            return list(self._subscribed.keys())
+
+    def add_listener(self, listener: TickListener):
+        """Call listener(instrument, quote, epoch_seconds) for every tick"""
+        with self._cond:
+            self._listeners.append(listener)
+
+    # --- reading -------------------------------------------------------
+
+    @property
+    def version(self) -> int:
+        """Increases every time any subscribed price changes"""
+        with self._cond:
+            return self._version
+
+    def snapshot(self, instruments: Optional[Iterable[Instrument]] = None, max_age: Optional[float] = None) -> Dict[Instrument, Dict]:
+        """
+        Latest quotes, in the same shape as MStockAPI.get_quotes()
+
+        Parameters:
+        -----------
+        instruments : Optional[Iterable[Instrument]]
+            Instruments wanted (default: all subscribed)
+        max_age : Optional[float]
+            Omit quotes the feed has not confirmed within this many seconds
+
+        Raises:
+        -------
+        BrokerBlindError
+            If the feed has lost the broker (circuit open / feed down)
+        """
+        now = time.monotonic()
+        with self._cond:
+            if self._error is not None:
+                raise self._error
+            keys = self._quotes.keys() if instruments is None else [(i[0], i[1]) for i in instruments]
+            return {
+                key: self._quotes[key] for key in keys
+                if key in self._quotes and (max_age is None or now - self._seen[key] <= max_age)
+            }
+
+    def wait_for_update(self, since: int, timeout: float = 1.0, min_wait: float = 0.0) -> int:
+        """
+        Block until the version moves past `since` (or timeout)
+
+        Parameters:
+        -----------
+        since : int
+            Version the caller last processed
+        timeout : float
+            Heartbeat: return after this many seconds even if nothing moved
+        min_wait : float
+            Return no sooner than this (caps a loop's rate on a fast feed)
+
+        Returns:
+        --------
+        int
+            Current version
+        """
+        start = time.monotonic()
+        if min_wait > 0:
+            time.sleep(min_wait)
+        remaining = max(0.0, timeout - (time.monotonic() - start))
+        with self._cond:
+            self._cond.wait_for(lambda: self._version != since or self._error is not None, remaining)
+            return self._version
+
+    # --- publishing (implementations) ---------------------------------
+
+    def _publish(self, updates: Dict[Instrument, Dict], ts: Optional[float] = None):
+        """Store new quotes; bump the version and notify only if a price changed"""
+        ts = ts if ts is not None else time.time()
+        seen = time.monotonic()
+        changed = []
+        with self._cond:
+            self._error = None
+            for instrument, quote in updates.items():
+                if instrument not in self._subscribed or not quote:
+                    continue
+                previous = self._quotes.get(instrument)
+                self._quotes[instrument] = quote
+                self._seen[instrument] = seen
+                if previous is None or _moved(previous, quote):
+                    changed.append((instrument, quote))
+            if changed:
+                self._version += 1
+            listeners = list(self._listeners)
+            self._cond.notify_all()
+
+        for instrument, quote in changed:
+            for listener in listeners:
+                try:
+                    listener(instrument, quote, ts)
+                except Exception as e:
+                    logger.error(f"Tick listener failed for {instrument}: {e}")
+
+    def _set_error(self, error: Optional[BrokerBlindError]):
+        with self._cond:
+            self._error = error
+            self._cond.notify_all()
+
+    def _on_subscribe(self, instruments: List[Instrument]):
+        """Hook: new instruments subscribed"""
+
+    def _on_unsubscribe(self, instruments: List[Instrument]):
+        """Hook: instruments no longer needed"""
+
+    def start(self):
+        """Start delivering ticks"""
+
+    def stop(self):
+        """Stop delivering ticks"""
+
+
+def _moved(previous: Dict, quote: Dict) -> bool:
+    """Whether a quote differs from the previous one in anything a loop cares about"""
+    return (
+        previous.get("last_price") != quote.get("last_price")
+        or previous.get("volume") != quote.get("volume")
+        or previous.get("ohlc") != quote.get("ohlc")
+    )
+
+
+class PollingTickSource(TickSource):
+    """
+    Batched REST poller
+
+    One get_quotes() request per interval covers every subscribed
+    instrument of both loops. Runs in the EXIT rate-limit lane because
+    the stop-loss checks read from it.
+    """
+
+    def __init__(self, api, interval: float = 1.0):
+        """
+        Initialize poller
+
+        Parameters:
+        -----------
+        api : MStockAPI
+            Broker client
+        interval : float
+            Seconds between polls
+        """
+        super().__init__()
+        self.api = api
+        self.interval = interval
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _on_subscribe(self, instruments: List[Instrument]):
+        # New instruments (e.g. a just-bought option) are fetched right away
+        self._wake.set()
+
+    def poll_once(self):
+        """Fetch one batched snapshot for all subscriptions and publish it"""
+        instruments = self.subscriptions()
+        if not instruments:
+            return
+        try:
+            self._publish(self.api.get_quotes(instruments))
+        except BrokerBlindError as e:
+            self._set_error(e)
+        except Exception as e:
+            logger.warning(f"Quote poll failed: {e}")
+
+    def start(self):
+        """Start the polling thread"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="TickPoller", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the polling thread"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        set_thread_priority(Priority.EXIT)
+        while not self._stop.is_set():
+            started = time.monotonic()
+            self.poll_once()
+            self._wake.wait(max(0.0, self.interval - (time.monotonic() - started)))
+            self._wake.clear()
+
+
+class WebSocketTickSource(TickSource):
+    """
+    Streaming feed adapter (aiohttp websocket client)
+
+    The feed's wire format is supplied by two callables, so the adapter
+    is not tied to one vendor:
+      build_subscribe(instruments, subscribe: bool) -> str | dict | None
+      parse(message: str | bytes) -> Dict[(exchange, symbol), quote]
+    The default codec speaks JSON: {"action": "subscribe", "instruments":
+    ["NSE:NIFTY 50", ...]} out, and {"exchange", "symbol", "last_price",
+    ...} objects (or lists of them) in. Reconnects with backoff; while
+    disconnected, snapshot() raises BrokerBlindError.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        build_subscribe: Optional[Callable] = None,
+        parse: Optional[Callable] = None,
+        reconnect_delay: float = 1.0
+    ):
+        """
+        Initialize websocket feed
+
+        Parameters:
+        -----------
+        url : str
+            ws:// or wss:// endpoint
+        headers : Optional[Dict[str, str]]
+            Handshake headers (e.g. MStockAPI.get_headers())
+        build_subscribe, parse : Optional[Callable]
+            Feed codec (default: JSON, see class docstring)
+        reconnect_delay : float
+            Initial reconnect backoff in seconds (doubles up to 30s)
+        """
+        super().__init__()
+        self.url = url
+        self.headers = headers or {}
+        self.build_subscribe = build_subscribe or json_subscribe_message
+        self.parse = parse or parse_json_ticks
+        self.reconnect_delay = reconnect_delay
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ws = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def _on_subscribe(self, instruments: List[Instrument]):
+        self._send_threadsafe(self.build_subscribe(instruments, True))
+
+    def _on_unsubscribe(self, instruments: List[Instrument]):
+        self._send_threadsafe(self.build_subscribe(instruments, False))
+
+    def _send_threadsafe(self, message):
+        if message is None or self._loop is None or self._ws is None:
+            return  # Sent on (re)connect instead
+        asyncio.run_coroutine_threadsafe(self._send(message), self._loop)
+
+    async def _send(self, message):
+        ws = self._ws
+        if ws is None or ws.closed:
+            return
+        if isinstance(message, (bytes, bytearray)):
+            await ws.send_bytes(bytes(message))
+        elif isinstance(message, str):
+            await ws.send_str(message)
+        else:
+            await ws.send_json(message)
+
+    def start(self):
+        """Connect in a background thread"""
+        try:
+            import aiohttp  # noqa: F401
+        except ImportError:
+            raise ImportError("aiohttp is required for the websocket tick source (pip install aiohttp)")
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_until_complete, args=(self._run(),),
+                                        name="TickWebSocket", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Disconnect and stop the feed thread"""
+        self._stopping = True
+        if self._loop is not None and self._ws is not None:
+            asyncio.run_coroutine_threadsafe(self._ws.close(), self._loop)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    async def _run(self):
+        import aiohttp
+
+        delay = self.reconnect_delay
+        async with aiohttp.ClientSession() as session:
+            while not self._stopping:
+                try:
+                    async with session.ws_connect(self.url, headers=self.headers, heartbeat=15) as ws:
+                        self._ws = ws
+                        delay = self.reconnect_delay
+                        logger.info(f"Tick feed connected: {self.url}")
+                        instruments = self.subscriptions()
+                        if instruments:
+                            await self._send(self.build_subscribe(instruments, True))
+                        async for message in ws:
+                            if message.type in (aiohttp.WSMsgType.TEXT, aiohttp.WSMsgType.BINARY):
+                                try:
+                                    updates = self.parse(message.data)
+                                except Exception as e:
+                                    logger.warning(f"Unparseable tick message: {e}")
+                                    continue
+                                if updates:
+                                    self._publish(updates)
+                            elif message.type == aiohttp.WSMsgType.ERROR:
+                                break
+                except Exception as e:
+                    logger.warning(f"Tick feed error: {e}")
+                finally:
+                    self._ws = None
+
+                if self._stopping:
+                    break
+                self._set_error(BrokerBlindError("tick_feed", delay, "websocket disconnected"))
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+
+
+def json_subscribe_message(instruments: List[Instrument], subscribe: bool) -> Dict:
+    """Default websocket subscribe/unsubscribe message"""
+    return {
+        "action": "subscribe" if subscribe else "unsubscribe",
+        "instruments": [f"{exchange}:{symbol.upper()}" for exchange, symbol in instruments],
+    }
+
+
+def parse_json_ticks(message) -> Dict[Instrument, Dict]:
+    """Default websocket message parser: one JSON tick object or a list of them"""
+    data = json.loads(message)
+    items = data if isinstance(data, list) else [data]
+    updates = {}
+    for item in items:
+        if "exchange" in item and "symbol" in item and "last_price" in item:
+            updates[(item["exchange"], item["symbol"])] = item
+    return updates
+
+
+class ReplayTickSource(TickSource):
+    """
+    Replays recorded ticks from a JSON-lines file (tests, backfills)
+
+    Each line: {"ts": <epoch seconds or ISO time>, "exchange": "NSE",
+    "symbol": "NIFTY 50", "last_price": 22000.5, ...}. With speed=0 ticks
+    are published as fast as the consumer calls step(); otherwise a
+    background thread replays them at `speed` x real time.
+    """
+
+    def __init__(self, path: str, speed: float = 0.0):
+        """
+        Initialize replay
+
+        Parameters:
+        -----------
+        path : str
+            JSON-lines tick file
+        speed : float
+            Replay speed multiplier (0 = manual stepping)
+        """
+        super().__init__()
+        self.path = path
+        self.speed = speed
+        self._ticks = self._load(path)
+        self._position = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _load(path: str) -> List[Tuple[float, Instrument, Dict]]:
+        import pandas as pd
+
+        ticks = []
+        with open(path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                item = json.loads(line)
+                ts = item.get("ts")
+                if isinstance(ts, str):
+                    ts = pd.Timestamp(ts).timestamp()
+                ticks.append((float(ts if ts is not None else 0.0), (item["exchange"], item["symbol"]), item))
+        ticks.sort(key=lambda tick: tick[0])
+        return ticks
+
+    def __len__(self) -> int:
+        return len(self._ticks)
+
+    def step(self, count: int = 1) -> int:
+        """
+        Publish the next `count` ticks
+
+        Returns:
+        --------
+        int
+            Ticks actually published (0 at end of file)
+        """
+        published = 0
+        while published < count and self._position < len(self._ticks):
+            ts, instrument, quote = self._ticks[self._position]
+            self._position += 1
+            self._publish({instrument: quote}, ts)
+            published += 1
+        return published
+
+    def start(self):
+        """Replay in real time (x speed) in a background thread; no-op for manual stepping"""
+        if self.speed <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="TickReplay", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the replay thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        previous = None
+        while not self._stop.is_set() and self._position < len(self._ticks):
+            ts = self._ticks[self._position][0]
+            if previous is not None and ts > previous:
+                if self._stop.wait((ts - previous) / self.speed):
+                    break
+            previous = ts
+            self.step()
+
+
+def record_ticks(source: TickSource, path: str) -> TickListener:
+    """
+    Append every tick from a source to a JSON-lines file (replayable by ReplayTickSource)
+
+    Returns:
+    --------
+    TickListener
+        The listener that was attached
+    """
+    lock = threading.Lock()
+
+    def listener(instrument: Instrument, quote: Dict, ts: float):
+        record = dict(quote)
+        record.update({"ts": ts, "exchange": instrument[0], "symbol": instrument[1]})
+        with lock, open(path, "a") as f:
+            f.write(json.dumps(record, default=str) + "\n")
+
+    source.add_listener(listener)
+    return listener
+
+
+def create_tick_source(api, kind: str = "poll", interval: float = 1.0, url: str = "", replay_file: str = "") -> TickSource:
+    """
+    Build the configured tick source
+
+    Parameters:
+    -----------
+    api : MStockAPI
+        Broker client (poller, websocket handshake headers)
+    kind : str
+        'poll', 'websocket' or 'replay'
+    interval : float
+        Poll interval in seconds ('poll')
+    url : str
+        Feed endpoint ('websocket')
+    replay_file : str
+        JSON-lines tick file ('replay')
+
+    Returns:
+    --------
+    TickSource
+    """
+    kind = (kind or "poll").lower()
+    if kind == "websocket":
+        if not url:
+            raise ValueError("tick_source.websocket_url is required for the websocket feed")
+        return WebSocketTickSource(url, headers=api.get_headers())
+    if kind == "replay":
+        if not replay_file:
+            raise ValueError("tick_source.replay_file is required for replay")
+        return ReplayTickSource(replay_file, speed=1.0)
+    if kind != "poll":
+        logger.warning(f"Unknown tick source '{kind}', using REST polling")
+    return PollingTickSource(api, interval=interval)
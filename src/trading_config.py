@@ -5,7 +5,7 @@ Centralized configuration for F&O Trading Bot
 
 from dataclasses import dataclass, field
 from datetime import time
-from typing import Dict
+from typing import Dict, Optional
 import json
 import os
 import logging
@@ -25,6 +25,7 @@ class TradingConfig:
     market_open: time = time(9, 15)    # 9:15 AM
     market_close: time = time(15, 30)  # 3:30 PM
     entry_cutoff: time = time(15, 15)  # 3:15 PM - no new entries after this
+    warmup_start: time = time(9, 5)    # 9:05 AM - pre-market warmup (history, connections, option tokens)
     
     # VIX Configuration
     vix_min_threshold: float = 10.0    # Skip trading if VIX < this
@@ -72,6 +73,8 @@ class TradingConfig:
     macd_signal: int = 9
     rsi_period: int = 14
     adx_period: int = 14
+    indicator_cache_mb: float = 32.0       # Memory budget of the shared sealed-bar indicator cache
+    indicator_lookback_tolerance: float = 0.01  # Weight the truncated history start may still carry (sizes downloads)
     
     # RSI Range for Entry
     # RSI Range for Entry
@@ -99,6 +102,29 @@ class TradingConfig:
     
     # Strike Selection
     strike_depth: int = 0                  # 0=ATM, 1=ITM1, 2=ITM2 etc.
+    option_chain_band: int = 2             # Strikes either side of ATM kept quoted (CE and PE)
+    option_chain_max_age: float = 10.0     # Entry pricing ignores chain premiums older than this
+    
+    # Broker API Transport
+    api_pool_size: int = 4                 # Keep-alive sessions shared by all threads
+    api_timeouts: Dict = field(default_factory=dict)  # {"quote": (connect, read), ...} overrides
+    api_async_scan: bool = True            # Fetch all underlyings concurrently (needs aiohttp)
+    api_candle_cache: bool = True          # Only download bars newer than the cached history tail
+    api_candle_store: bool = True          # Persist candles to disk for warm starts
+    api_candle_store_dir: str = "data/candles"
+    api_rate_limit: float = 10.0           # Broker requests/second shared by the whole process (0 = off)
+    api_rate_burst: float = 10.0           # Requests that may go back to back
+    api_coalesce_window: float = 0.25      # Seconds a finished GET result is shared with identical calls
+    api_deadline_multiplier: float = 3.0   # Read timeout = multiple x endpoint p95 (capped by api_timeouts)
+    api_deadline_floor: float = 1.0        # Shortest adaptive read timeout, seconds
+    api_hedge_delay: Optional[float] = 0.15  # Min seconds before a slow GET is duplicated (None = no hedging)
+    api_breaker_failures: int = 3          # Consecutive failures that open an endpoint's circuit
+    api_breaker_reset: float = 5.0         # Seconds before a probe request is let through
+    tick_source: str = "poll"              # Price feed for both loops: poll | websocket | replay
+    tick_poll_interval: float = 1.0        # Seconds between batched quote polls
+    tick_websocket_url: str = ""           # Streaming feed endpoint (websocket source)
+    tick_replay_file: str = ""             # JSON-lines tick file (replay source)
+    tick_max_age: float = 5.0              # Exit checks ignore quotes older than this
     
     # Logging
     log_file: str = "logs/trading_bot.log"
@@ -177,6 +203,15 @@ class TradingConfig:
                 if 'entry_cutoff' in hours:
                     h, m = map(int, hours['entry_cutoff'].split(':'))
                     self.entry_cutoff = time(h, m)
+                if 'warmup_start' in hours:
+                    h, m = map(int, hours['warmup_start'].split(':'))
+                    self.warmup_start = time(h, m)
+            
+            # Load option chain settings
+            if 'option_chain' in config_data:
+                chain_cfg = config_data['option_chain']
+                self.option_chain_band = chain_cfg.get('band', self.option_chain_band)
+                self.option_chain_max_age = chain_cfg.get('max_age_seconds', self.option_chain_max_age)
             
             # Load indicator settings
             if 'indicators' in config_data:
@@ -191,6 +226,40 @@ class TradingConfig:
                 self.macd_signal = ind.get('macd_signal', self.macd_signal)
                 self.rsi_period = ind.get('rsi_period', self.rsi_period)
                 self.adx_period = ind.get('adx_period', self.adx_period)
+                self.indicator_cache_mb = ind.get('cache_mb', self.indicator_cache_mb)
+                self.indicator_lookback_tolerance = ind.get('lookback_tolerance', self.indicator_lookback_tolerance)
+            
+            # Load broker API transport settings
+            if 'api' in config_data:
+                api_cfg = config_data['api']
+                self.api_pool_size = api_cfg.get('pool_size', self.api_pool_size)
+                self.api_async_scan = api_cfg.get('async_scan', self.api_async_scan)
+                self.api_candle_cache = api_cfg.get('candle_cache', self.api_candle_cache)
+                self.api_candle_store = api_cfg.get('candle_store', self.api_candle_store)
+                self.api_candle_store_dir = api_cfg.get('candle_store_dir', self.api_candle_store_dir)
+                self.api_coalesce_window = api_cfg.get('coalesce_window_ms', self.api_coalesce_window * 1000) / 1000.0
+                rate_cfg = api_cfg.get('rate_limit', {})
+                self.api_rate_limit = rate_cfg.get('requests_per_second', self.api_rate_limit)
+                self.api_rate_burst = rate_cfg.get('burst', self.api_rate_burst)
+                deadline_cfg = api_cfg.get('adaptive_deadline', {})
+                self.api_deadline_multiplier = deadline_cfg.get('p95_multiple', self.api_deadline_multiplier)
+                self.api_deadline_floor = deadline_cfg.get('min_seconds', self.api_deadline_floor)
+                if 'hedge_after_ms' in api_cfg:
+                    hedge_ms = api_cfg['hedge_after_ms']
+                    self.api_hedge_delay = hedge_ms / 1000.0 if hedge_ms is not None else None
+                breaker_cfg = api_cfg.get('circuit_breaker', {})
+                self.api_breaker_failures = breaker_cfg.get('failures', self.api_breaker_failures)
+                self.api_breaker_reset = breaker_cfg.get('reset_seconds', self.api_breaker_reset)
+                tick_cfg = api_cfg.get('tick_source', {})
+                self.tick_source = tick_cfg.get('type', self.tick_source)
+                self.tick_poll_interval = tick_cfg.get('poll_interval_ms', self.tick_poll_interval * 1000) / 1000.0
+                self.tick_websocket_url = tick_cfg.get('websocket_url', self.tick_websocket_url)
+                self.tick_replay_file = tick_cfg.get('replay_file', self.tick_replay_file)
+                self.tick_max_age = tick_cfg.get('max_age_seconds', self.tick_max_age)
+                for endpoint, value in api_cfg.get('timeouts', {}).items():
+                    if endpoint == 'comment':
+                        continue
+                    self.api_timeouts[endpoint] = tuple(value)
             
             logger.info(f"[OK] Configuration loaded from '{config_file}'")
             logger.info(f"   [!] LIVE TRADING MODE: {'ENABLED' if self.live_trading else 'DISABLED (Paper)'}")
@@ -0,0 +1,219 @@
+"""
+Warmup Module
+Pre-market warmup so the first ticks after 09:15 run at steady-state latency
+"""
+
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from src.batch_indicators import indicators_2d, stack_frames
+from src.lookback import converged_tail, history_days as lookback_history_days
+from src.resilience import BrokerBlindError
+from src.symbol_master import SymbolMaster
+
+logger = logging.getLogger(__name__)
+
+
+# Stages the session cannot run well without; the rest only cost latency if missing
+REQUIRED_STAGES = ("connections", "spot_quotes", "history", "daily_context")
+
+
+class StageResult:
+    """Outcome of one warmup stage"""
+    __slots__ = ("name", "ok", "seconds", "detail")
+
+    def __init__(self, name: str, ok: bool, seconds: float, detail: str):
+        self.name = name
+        self.ok = ok
+        self.seconds = seconds
+        self.detail = detail
+
+    def __repr__(self):
+        return f"StageResult({self.name}, ok={self.ok}, {self.seconds:.2f}s, {self.detail})"
+
+
+class WarmupReport:
+    """Per-stage readiness of a warmup run"""
+
+    def __init__(self):
+        self.stages: List[StageResult] = []
+
+    @property
+    def ready(self) -> bool:
+        """Every required stage succeeded"""
+        done = {stage.name: stage.ok for stage in self.stages}
+        return all(done.get(name, False) for name in REQUIRED_STAGES)
+
+    @property
+    def seconds(self) -> float:
+        return sum(stage.seconds for stage in self.stages)
+
+    def as_dict(self) -> Dict:
+        return {
+            "ready": self.ready,
+            "seconds": round(self.seconds, 3),
+            "stages": {s.name: {"ok": s.ok, "seconds": round(s.seconds, 3), "detail": s.detail} for s in self.stages},
+        }
+
+    def log(self):
+        """Log one line per stage and the overall verdict"""
+        for stage in self.stages:
+            status = "OK  " if stage.ok else "FAIL"
+            logger.info(f"  [{status}] {stage.name:<14} {stage.seconds * 1000:8.0f} ms  {stage.detail}")
+        if self.ready:
+            logger.info(f"WARMUP READY in {self.seconds:.1f}s")
+        else:
+            missing = [s.name for s in self.stages if not s.ok and s.name in REQUIRED_STAGES]
+            logger.warning(f"WARMUP INCOMPLETE ({', '.join(missing)}): first ticks will pay the cold-start cost")
+
+
+class Warmup:
+    """
+    Pre-market warmup pipeline
+
+    Runs once before the open (normally from config.warmup_start) and
+    pays every cold-start cost the first entry tick would otherwise pay:
+    symbol master parse, pooled TCP/TLS handshakes, intraday history
+    download (into the candle cache/store), the pinned daily context,
+    the yfinance import and first download, the first indicator pass, and
+    the trading symbols and tokens of the option strikes around today's
+    ATM. Stages are independent: one failing does not stop the others,
+    and the report says what is ready.
+    """
+
+    def __init__(
+        self,
+        api,
+        symbols_config: dict,
+        daily_context=None,
+        option_chain=None,
+        history_days: Optional[int] = None
+    ):
+        """
+        Initialize warmup
+
+        Parameters:
+        -----------
+        api : MStockAPI
+            Broker API (its caches and session pool are what gets warmed)
+        symbols_config : dict
+            {symbol: (exchange, token, underlying)} as loaded from config.json
+        daily_context : Optional[DailyContext]
+            Daily frames to pin before the open
+        option_chain : Optional[OptionChain]
+            Chain whose ATM band is resolved around the pre-open spot
+        history_days : Optional[int]
+            Intraday lookback to prefetch (default: the entry loop's,
+            see src.lookback.history_days)
+        """
+        self.api = api
+        self.symbols_config = symbols_config
+        self.daily_context = daily_context
+        self.option_chain = option_chain
+        self.history_days = history_days if history_days is not None else lookback_history_days("15minute")
+        self.spots: Dict[str, float] = {}
+        self.history: Dict[str, pd.DataFrame] = {}
+
+    def run(self) -> WarmupReport:
+        """
+        Run every stage in order and log the readiness report
+
+        Returns:
+        --------
+        WarmupReport
+        """
+        logger.info("PRE-MARKET WARMUP starting...")
+        report = WarmupReport()
+        for name, stage in (
+            ("symbol_master", self._load_symbol_master),
+            ("connections", self._open_connections),
+            ("spot_quotes", self._quote_spots),
+            ("yfinance", self._preload_yfinance),
+            ("history", self._prefetch_history),
+            ("daily_context", self._prepare_daily_context),
+            ("indicators", self._warm_indicators),
+            ("option_chain", self._resolve_option_chain),
+        ):
+            report.stages.append(self._run_stage(name, stage))
+        report.log()
+        return report
+
+    @staticmethod
+    def _run_stage(name: str, stage: Callable[[], Tuple[bool, str]]) -> StageResult:
+        start = time.perf_counter()
+        try:
+            ok, detail = stage()
+        except BrokerBlindError as e:
+            ok, detail = False, f"broker blind: {e}"
+        except Exception as e:
+            logger.error(f"Warmup stage {name} failed: {e}")
+            ok, detail = False, f"{type(e).__name__}: {e}"
+        return StageResult(name, ok, time.perf_counter() - start, detail)
+
+    def _instruments(self) -> List[Tuple[str, str]]:
+        return [(exchange, symbol) for symbol, (exchange, _, _) in self.symbols_config.items()]
+
+    def _load_symbol_master(self) -> Tuple[bool, str]:
+        master = SymbolMaster()
+        return bool(master.symbol_map), f"{len(master.symbol_map)} contracts"
+
+    def _open_connections(self) -> Tuple[bool, str]:
+        opened = self.api.warm_connections(self._instruments())
+        return opened > 0, f"{opened}/{self.api.http.pool_size} sessions"
+
+    def _quote_spots(self) -> Tuple[bool, str]:
+        quotes = self.api.get_quotes(self._instruments())
+        for (exchange, symbol), quote in quotes.items():
+            price = (quote or {}).get("last_price") or (quote or {}).get("ohlc", {}).get("close")
+            if price:
+                self.spots[symbol] = float(price)
+        return len(self.spots) == len(self.symbols_config), f"{len(self.spots)}/{len(self.symbols_config)} spots"
+
+    def _prefetch_history(self) -> Tuple[bool, str]:
+        def fetch(item):
+            symbol, (exchange, instrument_token, _) = item
+            return symbol, self.api.get_hybrid_history(symbol, exchange, instrument_token, "15minute", days=self.history_days)
+
+        items = list(self.symbols_config.items())
+        with ThreadPoolExecutor(max_workers=max(1, len(items)), thread_name_prefix="Warmup") as executor:
+            for symbol, frame in executor.map(fetch, items):
+                if frame is not None and not frame.empty:
+                    self.history[symbol] = frame
+        bars = sum(len(frame) for frame in self.history.values())
+        return len(self.history) == len(items), f"{len(self.history)}/{len(items)} symbols, {bars} bars"
+
+    def _prepare_daily_context(self) -> Tuple[bool, str]:
+        if self.daily_context is None:
+            return True, "skipped"
+        ready = self.daily_context.prepare(self.symbols_config)
+        return all(ready.values()), f"{sum(ready.values())}/{len(ready)} pinned"
+
+    def _preload_yfinance(self) -> Tuple[bool, str]:
+        symbols = [symbol for symbol in self.symbols_config if symbol in self.api.YF_SYMBOLS]
+        if not symbols:
+            return True, "not used"
+        loaded = self.api.yf_cache.preload(symbols)
+        return all(loaded.values()), f"{sum(loaded.values())}/{len(loaded)} symbols"
+
+    def _warm_indicators(self) -> Tuple[bool, str]:
+        # One batched pass over the windows the entry loop computes
+        if self.history:
+            _, stacked = stack_frames({symbol: converged_tail(frame) for symbol, frame in self.history.items()})
+            indicators_2d(stacked["high"], stacked["low"], stacked["close"])
+        return bool(self.history), f"{len(self.history)} frames"
+
+    def _resolve_option_chain(self) -> Tuple[bool, str]:
+        if self.option_chain is None:
+            return True, "skipped"
+        for symbol, (_, _, underlying) in self.symbols_config.items():
+            if symbol in self.spots:
+                self.option_chain.recenter(underlying, self.spots[symbol])
+        stats = self.option_chain.stats()
+        contracts = sum(band["contracts"] for band in stats.values())
+        tokens = sum(band["tokens"] for band in stats.values())
+        # Symbols the master does not list are generated, but only listed ones have a token
+        return contracts > 0 and tokens == contracts, f"{tokens}/{contracts} contracts with tokens"
@@ -0,0 +1,163 @@
+"""
+yfinance Bar Cache Module
+Boundary-aligned TTL cache for the yfinance leg of hybrid history
+"""
+
+import threading
+import logging
+from datetime import datetime, timedelta, time as dt_time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from src.utils import now_ist
+
+logger = logging.getLogger(__name__)
+
+
+# Background refreshes only while bars can still appear (last bar closes 15:30)
+MARKET_OPEN = dt_time(9, 15)
+REFRESH_UNTIL = dt_time(15, 45)
+
+
+def next_bar_boundary(now: datetime, bar_minutes: int = 15) -> datetime:
+    """Start of the next `bar_minutes` bar after `now`"""
+    floor = now.replace(minute=now.minute - now.minute % bar_minutes, second=0, microsecond=0)
+    return floor + timedelta(minutes=bar_minutes)
+
+
+class YFinanceBarCache:
+    """
+    Caches yfinance 15-minute bars per symbol until the next bar closes
+
+    yfinance can only add a bar once one closes, so a download stays valid
+    until the next 15-minute boundary (plus a short settle delay for
+    Yahoo to publish it). After expiry the stale bars keep being served
+    while one background refresh runs; only a symbol that has never been
+    fetched blocks the caller. A refresher thread re-downloads all known
+    symbols just after each boundary, so the entry loop normally never
+    waits on yfinance at all.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Optional[pd.DataFrame]],
+        bar_minutes: int = 15,
+        settle_seconds: int = 30
+    ):
+        """
+        Initialize yfinance cache
+
+        Parameters:
+        -----------
+        fetch : Callable[[str], Optional[pd.DataFrame]]
+            Downloads bars for a symbol (MStockAPI._fetch_yfinance_bars)
+        bar_minutes : int
+            Bar length the expiry is aligned to
+        settle_seconds : int
+            Delay after a boundary before the new bar is expected upstream
+        """
+        self.fetch = fetch
+        self.bar_minutes = bar_minutes
+        self.settle = timedelta(seconds=settle_seconds)
+        self._entries: Dict[str, Tuple[Optional[pd.DataFrame], datetime]] = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _expiry(self, fetched_at: datetime) -> datetime:
+        return next_bar_boundary(fetched_at - self.settle, self.bar_minutes) + self.settle
+
+    def get(self, symbol: str) -> Optional[pd.DataFrame]:
+        """
+        Get cached bars, refreshing in the background once expired
+
+        Returns:
+        --------
+        Optional[pd.DataFrame]
+            IST market-hours OHLC bars, or None if yfinance has nothing
+        """
+        now = now_ist()
+        with self._lock:
+            entry = self._entries.get(symbol)
+
+        if entry is None:
+            # Never fetched (warmup skipped): this one call has to block
+            return self.refresh(symbol)
+
+        bars, expires = entry
+        if now >= expires:
+            self._refresh_async(symbol)
+        return bars
+
+    def refresh(self, symbol: str) -> Optional[pd.DataFrame]:
+        """Download bars for a symbol now and store them"""
+        try:
+            bars = self.fetch(symbol)
+        except Exception as e:
+            logger.warning(f"yfinance refresh failed for {symbol}: {e}")
+            bars = None
+
+        now = now_ist()
+        with self._lock:
+            previous = self._entries.get(symbol)
+            if bars is None and previous is not None:
+                # Keep serving the last good download; retry after the next boundary
+                bars = previous[0]
+            self._entries[symbol] = (bars, self._expiry(now))
+            self._refreshing.discard(symbol)
+        return bars
+
+    def _refresh_async(self, symbol: str):
+        with self._lock:
+            if symbol in self._refreshing:
+                return
+            self._refreshing.add(symbol)
+        threading.Thread(target=self.refresh, args=(symbol,), name=f"YFRefresh-{symbol}", daemon=True).start()
+
+    def preload(self, symbols: Iterable[str]) -> Dict[str, bool]:
+        """
+        Import yfinance and fill the cache (warmup)
+
+        Returns:
+        --------
+        Dict[str, bool]
+            symbol -> whether bars were loaded
+        """
+        try:
+            import yfinance  # noqa: F401  (first import takes seconds; pay it before the open)
+        except ImportError:
+            logger.warning("yfinance not installed - hybrid history will use mStock bars only")
+            return {symbol: False for symbol in symbols}
+
+        return {symbol: self.refresh(symbol) is not None for symbol in symbols}
+
+    def start(self):
+        """Start the refresher thread (re-downloads known symbols after each boundary)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="YFRefresher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the refresher thread"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stop.is_set():
+            now = now_ist()
+            wake = self._expiry(now)
+            if self._stop.wait((wake - now).total_seconds()):
+                break
+            if not (MARKET_OPEN <= now_ist().time() <= REFRESH_UNTIL):
+                continue
+            with self._lock:
+                symbols = list(self._entries.keys())
+            for symbol in symbols:
+                if self._stop.is_set():
+                    break
+                self.refresh(symbol)
@@ -0,0 +1,81 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from backtest import COMPACT_CROSSOVER_COLUMNS, memory_budget, prepare_data_with_indicators
+from src.trading_config import TradingConfig
+from test_streaming_indicators import make_bars
+
+
+def ohlc_frame(count, seed, freq):
+    high, low, close = make_bars(count, seed)
+    index = pd.date_range("2024-01-01 09:15", periods=count, freq=freq, tz="Asia/Kolkata")
+    return pd.DataFrame({"open": close, "high": high, "low": low, "close": close, "volume": 1.0}, index=index)
+
+
+def entry_verdicts(intraday, daily, config):
+    """Per-bar CE/PE indicator verdicts of FnOTradingBot.check_entry_conditions_ce/pe"""
+    macd, signal = intraday['MACD'].to_numpy(), intraday['MACD_Signal'].to_numpy()
+    hist = intraday['MACD_Hist'].to_numpy()
+    prev_hist = np.concatenate([[0.0], hist[:-1]])
+    rsi = intraday['RSI'].to_numpy()
+    rsi_ok = (config.rsi_min <= rsi) & (rsi <= config.rsi_max)
+    adx_ok = daily['ADX'].to_numpy() > config.adx_daily_min
+    ce = (macd > signal) & (hist > 0) & (hist > prev_hist) & rsi_ok
+    pe = (macd < signal) & (hist < 0) & (hist < prev_hist) & rsi_ok
+    return ce, pe, adx_ok
+
+
+class TestBacktestCompact(unittest.TestCase):
+    def test_compact_matches_full_frames(self):
+        print("\nTesting compact backtest frames against the full float64 frames...")
+        daily_data, intraday_data = ohlc_frame(300, 5, "D"), ohlc_frame(2000, 6, "min")
+        config = TradingConfig()
+        daily, intraday = prepare_data_with_indicators(daily_data, intraday_data, config)
+        compact_daily, compact_intraday = prepare_data_with_indicators(daily_data, intraday_data, config, compact=True)
+
+        # Same rows, exact prices, MACD columns and crossover flags; float32 RSI/ADX within rounding
+        self.assertTrue(compact_intraday.index.equals(intraday.index))
+        self.assertTrue(compact_daily.index.equals(daily.index))
+        np.testing.assert_array_equal(compact_intraday['close'].to_numpy(), intraday['close'].to_numpy())
+        for column in COMPACT_CROSSOVER_COLUMNS:
+            np.testing.assert_array_equal(compact_intraday[column].to_numpy(), intraday[column].to_numpy())
+            self.assertTrue(compact_intraday[column].any(), column)
+        for column in ('MACD', 'MACD_Signal', 'MACD_Hist'):
+            np.testing.assert_array_equal(compact_intraday[column].to_numpy(), intraday[column].to_numpy())
+        for frame, full, column in ((compact_intraday, intraday, 'RSI'), (compact_daily, daily, 'ADX')):
+            self.assertEqual(frame[column].dtype, np.float32)
+            np.testing.assert_allclose(frame[column].to_numpy(dtype=float), full[column].to_numpy(), rtol=1e-6, atol=1e-4)
+
+        # Same entry verdicts on every bar (MACD ordering, dark green/red histogram, RSI range, daily ADX)
+        verdicts = entry_verdicts(intraday, daily, config)
+        compact_verdicts = entry_verdicts(compact_intraday, compact_daily, config)
+        for name, full_verdict, compact_verdict in zip(('CE', 'PE', 'ADX'), verdicts, compact_verdicts):
+            np.testing.assert_array_equal(compact_verdict, full_verdict, err_msg=name)
+            self.assertTrue(full_verdict.any() and not full_verdict.all(), name)
+
+        # Pruned: no OHLC/volume/DI/ADX columns left in the intraday frame
+        self.assertNotIn('open', compact_intraday.columns)
+        self.assertNotIn('+DI', compact_intraday.columns)
+        self.assertEqual(list(compact_daily.columns), ['close', 'ADX'])
+        print("PASS: same rows, flags and entry verdicts, RSI/ADX within float32 rounding")
+
+    def test_memory_budget(self):
+        print("\nTesting the per-symbol memory budget...")
+        daily_data, intraday_data = ohlc_frame(300, 5, "D"), ohlc_frame(5000, 6, "min")
+        full = memory_budget(*prepare_data_with_indicators(daily_data, intraday_data, TradingConfig()))
+        compact = memory_budget(*prepare_data_with_indicators(daily_data, intraday_data, TradingConfig(), compact=True))
+        self.assertEqual(full['total_bytes'], full['daily_bytes'] + full['intraday_bytes'])
+        self.assertEqual(compact['bytes_per_bar'], 48.0)        # index, close, 3 x MACD (8 each), RSI float32, 4 flags
+        self.assertLess(compact['total_bytes'], full['total_bytes'] / 2)
+        print(f"PASS: {full['bytes_per_bar']} -> {compact['bytes_per_bar']} bytes/bar")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import sys
+import os
+from datetime import datetime
+
+import pandas as pd
+import pytz
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.bar_aggregator import BarAggregator, append_live_bar
+
+IST = pytz.timezone("Asia/Kolkata")
+NIFTY = ("NSE", "NIFTY 50")
+
+
+def at(hour, minute, second=0):
+    return IST.localize(datetime(2025, 1, 2, hour, minute, second))
+
+
+def history_until(hour, minute):
+    """15-minute bars from 09:15 up to (and including) hour:minute"""
+    index = pd.date_range(at(9, 15), at(hour, minute), freq="15min")
+    closes = [100.0 + i for i in range(len(index))]
+    return pd.DataFrame({"open": closes, "high": [c + 1 for c in closes],
+                         "low": [c - 1 for c in closes], "close": closes}, index=index)
+
+
+class TestBarAggregator(unittest.TestCase):
+    def test_true_ohlc_and_sealing(self):
+        print("\nTesting ticks fold into real OHLC and seal at the boundary...")
+        bars = BarAggregator()
+        for second, price in ((1, 200.0), (60, 205.0), (120, 195.0), (840, 201.0)):
+            bars.update(NIFTY, price, at(10, 0, 0).timestamp() + second)
+        bar = bars.forming(NIFTY, now=at(10, 14))
+        self.assertEqual((bar.open, bar.high, bar.low, bar.close), (200.0, 205.0, 195.0, 201.0))
+        self.assertFalse(bar.partial)
+
+        # No tick after 10:15 yet: the bar is still sealed once the boundary passes
+        self.assertIsNone(bars.forming(NIFTY, now=at(10, 15, 1)))
+        self.assertEqual(len(bars.sealed(NIFTY)), 1)
+
+        sealed = bars.update(NIFTY, 202.0, at(10, 16))
+        self.assertIsNone(sealed)
+        self.assertTrue(bars.forming(NIFTY, now=at(10, 16)).partial)
+        # Outside the session nothing is aggregated
+        self.assertIsNone(bars.update(NIFTY, 1.0, at(15, 45)))
+        print("PASS: OHLC + seal")
+
+    def test_extend_fills_gap_without_refetch(self):
+        print("\nTesting stale history is completed with sealed and forming bars...")
+        bars = BarAggregator()
+        history = history_until(9, 45)        # Downloaded before 10:00
+        bars.update(NIFTY, 300.0, at(10, 0, 1))
+        bars.update(NIFTY, 310.0, at(10, 5))
+        bars.update(NIFTY, 290.0, at(10, 10))
+        bars.update(NIFTY, 305.0, at(10, 16))  # Seals 10:00, opens 10:15
+        bars.update(NIFTY, 307.0, at(10, 20))
+
+        live = bars.extend(NIFTY, history, now=at(10, 20))
+        self.assertEqual(len(live), len(history) + 2)
+        self.assertEqual(list(live.index[-2:]), [at(10, 0), at(10, 15)])
+        self.assertEqual(live.iloc[-2].tolist(), [300.0, 310.0, 290.0, 290.0])
+        # 10:15 bar joined at 10:16 (partial): opens at the previous close
+        self.assertEqual(live.iloc[-1].tolist(), [290.0, 307.0, 290.0, 307.0])
+        self.assertEqual(len(history), 3)  # Input untouched
+        print("PASS: gap filled")
+
+    def test_extend_merges_last_history_bar(self):
+        print("\nTesting a history frame that already has the forming bar is widened, not duplicated...")
+        bars = BarAggregator()
+        history = history_until(10, 0)        # Includes the (stale) 10:00 bar
+        bars.update(NIFTY, 150.0, at(10, 3))
+        bars.update(NIFTY, 90.0, at(10, 7))
+        live = bars.extend(NIFTY, history, now=at(10, 7))
+        self.assertEqual(len(live), len(history))
+        last = live.iloc[-1]
+        self.assertEqual((last["high"], last["low"], last["close"]), (150.0, 90.0, 90.0))
+        print("PASS: merged")
+
+    def test_fallback_live_bar(self):
+        print("\nTesting the estimated live bar when no aggregator is running...")
+        history = history_until(9, 45)
+        live = append_live_bar(history, 110.0, at(10, 7))
+        self.assertEqual(live.index[-1], at(10, 0))
+        self.assertEqual(live.iloc[-1].tolist(), [102.0, 110.0, 102.0, 110.0])
+        print("PASS: fallback")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src import recursive_filters
+from src.batch_indicators import ewm_2d, indicators_2d, stack_frames
+from src.daily_context import DailyContext
+from test_daily_context import daily_bars
+from test_streaming_indicators import assert_close, assert_identical, batch_frame, make_bars
+
+
+class TestBatchIndicators(unittest.TestCase):
+    def test_ewm_rows_match_pandas(self):
+        print("\nTesting ewm_2d rows against pandas ewm(adjust=False)...")
+        rows = np.array([
+            [np.nan, 1.0, 2.0, np.nan, np.nan, 5.0, 5.0, 4.0, np.nan, 7.0],
+            [3.0, 3.0, 2.5, 2.0, 2.5, 3.0, 3.5, 4.0, 4.5, 5.0],
+            [np.nan, np.nan, np.nan, 1.0, 2.0, 3.0, np.nan, 4.0, 5.0, 6.0],
+            [np.nan, np.nan, 2.0, 2.5, 3.0, 3.5, 3.0, 2.5, 2.0, 1.5],
+            [np.nan] * 10,
+        ])
+        for alpha, min_periods in ((0.3, 0), (1 / 14, 3), (2 / 13, 5)):
+            result = ewm_2d(rows, alpha, min_periods)
+            for index, (row, values) in enumerate(zip(result, rows)):
+                batch = pd.Series(values).ewm(alpha=alpha, adjust=False, min_periods=min_periods).mean()
+                # Gapped rows take the per-bar recursion (exact), the others the block scan
+                check = assert_identical if index in (0, 2) else assert_close
+                check(self, row, batch, f"row {index} alpha={alpha}")
+
+        # Many right-aligned rows in one scan; block boundaries well inside the rows
+        rng = np.random.default_rng(9)
+        matrix = 23000 + np.cumsum(rng.normal(0, 20, (60, 2000)), axis=1)
+        for row, start in enumerate(rng.integers(0, 1900, 60)):
+            matrix[row, :start] = np.nan
+        result = ewm_2d(matrix, 1 / 14, 14)
+        for row, values in enumerate(matrix):
+            assert_close(self, result[row], pd.Series(values).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean(), f"row {row}")
+        print("PASS: exact with gaps, within a few ulps on the scan")
+
+    def test_ragged_symbols_match_per_symbol_indicators(self):
+        print("\nTesting one 2-D pass over ragged histories matches per-symbol indicators...")
+        frames = {}
+        for seed, start in ((1, 0), (2, 35), (3, 120), (4, 399)):
+            high, low, close = make_bars(400, seed)
+            frames[f"S{seed}"] = pd.DataFrame({"open": close, "high": high, "low": low, "close": close}).iloc[start:]
+
+        symbols, stacked = stack_frames(frames)
+        self.assertEqual(stacked["close"].shape, (4, 400))
+        # The vectorised recursion, and numba's per-row kernel where installed
+        in_use = recursive_filters._ewm_kernel
+        kernels = [recursive_filters._ewm_numpy]
+        if recursive_filters._ewm_numba is not None:
+            kernels.append(recursive_filters._ewm_numba)
+        try:
+            for kernel in kernels:
+                recursive_filters._ewm_kernel = kernel
+                values = indicators_2d(stacked["high"], stacked["low"], stacked["close"])
+                for row, symbol in enumerate(symbols):
+                    expected = batch_frame(frames[symbol])
+                    n = len(expected)
+                    for column, matrix in values.items():
+                        assert_close(self, matrix[row, 400 - n:], expected[column], f"{symbol} {column} {kernel.__name__}")
+        finally:
+            recursive_filters._ewm_kernel = in_use
+        print("PASS: same values for every symbol")
+
+    def test_daily_context_prepare_is_batched(self):
+        print("\nTesting DailyContext.prepare pins the same frames as one-by-one builds...")
+        api = MagicMock()
+        api.get_historical_data.side_effect = lambda symbol, *args, **kwargs: daily_bars(60 if symbol == "A" else 45)
+        symbols = {"A": ("NSE", "1", "A"), "B": ("NSE", "2", "B")}
+
+        context = DailyContext(api)
+        self.assertEqual(context.prepare(symbols), {"A": True, "B": True})
+        for symbol, (exchange, token, _) in symbols.items():
+            single = DailyContext(api)._build(symbol, exchange, token, daily_bars(1).index[-1].date())
+            pd.testing.assert_frame_equal(context.get(symbol, exchange, token), single)
+        self.assertEqual(api.get_historical_data.call_count, 4)
+        print("PASS: identical frames, no extra downloads")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+import threading
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.market_data import MStockAPI
+from src.rate_limiter import Priority, RateLimiter, current_priority, priority_lane
+
+
+class TestBatchQuotes(unittest.TestCase):
+    def make_api(self):
+        with patch.dict(os.environ, {
+            'API_KEY': 'test', 'API_SECRET': 'test', 'CLIENT_CODE': 'test', 'PASSWORD': 'test'
+        }):
+            with patch.object(MStockAPI, 'load_access_token', return_value=None):
+                api = MStockAPI()
+        api.get_headers = MagicMock(return_value={})
+        return api
+
+    @patch('src.http_pool.requests.Session.request')
+    def test_get_quotes_single_request(self, mock_request):
+        print("\nTesting get_quotes packs instruments into one request...")
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            "status": "success",
+            "data": {
+                "NSE:NIFTY 50": {"last_price": 23000.5},
+                "NSE:INDIA VIX": {"last_price": 13.2},
+            }
+        }
+        mock_request.return_value = mock_response
+
+        api = self.make_api()
+        quotes = api.get_quotes([
+            ("NSE", "NIFTY 50"),
+            ("NSE", "INDIA VIX"),
+            ("NFO", "NIFTY25FEB23000CE"),
+            ("NSE", "NIFTY 50"),  # duplicate
+        ])
+
+        self.assertEqual(mock_request.call_count, 1)
+        params = mock_request.call_args.kwargs["params"]
+        self.assertEqual([v for _, v in params], ["NSE:NIFTY 50", "NSE:INDIA VIX", "NFO:NIFTY25FEB23000CE"])
+        self.assertEqual(quotes[("NSE", "NIFTY 50")]["last_price"], 23000.5)
+        self.assertEqual(quotes[("NSE", "INDIA VIX")]["last_price"], 13.2)
+        self.assertNotIn(("NFO", "NIFTY25FEB23000CE"), quotes)
+        print("PASS: one request, results keyed by (exchange, symbol)")
+
+    @patch('src.http_pool.requests.Session.request')
+    def test_get_quotes_chunks_large_batches(self, mock_request):
+        print("\nTesting get_quotes splits batches above MAX_QUOTE_BATCH...")
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"status": "success", "data": {}}
+        mock_request.return_value = mock_response
+
+        api = self.make_api()
+        instruments = [("NFO", f"SYM{i}") for i in range(MStockAPI.MAX_QUOTE_BATCH + 1)]
+        api.get_quotes(instruments)
+
+        self.assertEqual(mock_request.call_count, 2)
+        print("PASS: split into 2 requests")
+
+    @patch('src.http_pool.requests.Session.request')
+    def test_exit_quote_does_not_wait_on_background_batch(self, mock_request):
+        print("\nTesting an exit quote is not coalesced into a queued background batch...")
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {"status": "success", "data": {"NSE:NIFTY 50": {"last_price": 23000.5}}}
+        mock_request.return_value = mock_response
+
+        token = threading.Event()
+
+        class QueuedLimiter(RateLimiter):
+            def acquire(self, priority=None, timeout=None):
+                # Background waits for a token; exit is always served
+                if (priority if priority is not None else current_priority()) == Priority.BACKGROUND:
+                    token.wait(5)
+                return True
+
+        api = self.make_api()
+        api.http.limiter = QueuedLimiter(rate=100, burst=10)
+
+        def background():
+            with priority_lane(Priority.BACKGROUND):
+                api.get_quotes([("NSE", "NIFTY 50"), ("NSE", "INDIA VIX")])
+
+        thread = threading.Thread(target=background)
+        thread.start()
+        time.sleep(0.05)
+        try:
+            start = time.monotonic()
+            with priority_lane(Priority.EXIT):
+                quote = api.get_quote("NIFTY 50", "NSE")
+            self.assertLess(time.monotonic() - start, 1.0)
+            self.assertEqual(quote["last_price"], 23000.5)
+            self.assertFalse(token.is_set())
+        finally:
+            token.set()
+            thread.join(5)
+        self.assertEqual(mock_request.call_count, 2)
+        print("PASS: exit led its own request")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import sys
+import os
+
+# Add src and benchmarks to path
+sys.path.insert(0, os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "benchmarks"))
+
+from bench_indicators import CASES, case_key, find_regressions, run_suite
+
+
+def run(host, throughputs):
+    return {"host": host, "results": {key: {"throughput": value} for key, value in throughputs.items()}}
+
+
+class TestBenchIndicators(unittest.TestCase):
+    def test_suite_covers_grid(self):
+        print("\nTesting the benchmark grid runs every case and skips oversized cells...")
+        results = run_suite(list(CASES), [60, 400], [1, 3], repeat=1, max_cells=600, verbose=False)
+        for case in CASES:
+            for length, symbols in ((60, 1), (60, 3), (400, 1)):
+                key = case_key(case, length, symbols)
+                self.assertIn(key, results)
+                self.assertGreater(results[key]["throughput"], 0)
+            self.assertNotIn(case_key(case, 400, 3), results)        # 1200 cells > max_cells
+        print(f"PASS: {len(results)} results")
+
+    def test_regression_gate(self):
+        print("\nTesting throughput regressions against the per-host median baseline...")
+        key, other = case_key("adx", 1000, 1), case_key("rsi", 1000, 1)
+        history = [
+            run("box", {key: 100.0, other: 50.0}),
+            run("box", {key: 120.0}),
+            run("box", {key: 110.0}),
+            run("laptop", {key: 1000.0, other: 1000.0}),      # other hosts are never compared
+        ]
+        current = {key: {"throughput": 90.0}, other: {"throughput": 30.0}, "new": {"throughput": 1.0}}
+
+        # adx: 90 against a median of 110 is -18%, rsi: 30 against 50 is -40%
+        regressions = find_regressions(current, history, "box", threshold=20.0)
+        self.assertEqual([r[0] for r in regressions], [other])
+        self.assertAlmostEqual(regressions[0][3], -40.0)
+
+        regressions = find_regressions(current, history, "box", threshold=15.0)
+        self.assertEqual(sorted(r[0] for r in regressions), sorted([key, other]))
+        self.assertEqual(find_regressions(current, history, "ci", threshold=10.0), [])
+
+        # Only the most recent runs form the baseline
+        regressions = find_regressions({key: {"throughput": 100.0}}, history, "box", threshold=5.0, baseline_runs=1)
+        self.assertEqual(regressions[0][1], 110.0)
+        print("PASS")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from urllib.parse import unquote
+import sys
+import os
+import asyncio
+import tempfile
+import threading
+
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.market_data import MStockAPI
+from src.candle_cache import CandleCache
+from src.candle_store import CandleStore
+
+
+def candle_rows(start, count, base=100.0):
+    index = pd.date_range(start, periods=count, freq="15min", tz="Asia/Kolkata")
+    return [[ts.isoformat(), base + i, base + i + 1, base + i - 1, base + i + 0.5, 1000] for i, ts in enumerate(index)]
+
+
+class TestCandleCache(unittest.TestCase):
+    def make_api(self, base_url=None):
+        with patch.dict(os.environ, {
+            'API_KEY': 'test', 'API_SECRET': 'test', 'CLIENT_CODE': 'test', 'PASSWORD': 'test'
+        }):
+            with patch.object(MStockAPI, 'load_access_token', return_value=None):
+                api = MStockAPI(base_url=base_url)
+        api.get_headers = MagicMock(return_value={})
+        api.candle_cache = CandleCache()
+        api.candle_store = None
+        return api
+
+    def test_merge_replaces_forming_tail(self):
+        print("\nTesting incremental merge replaces the cached tail bar...")
+        cache = CandleCache()
+        key = CandleCache.make_key("NSE", "26000", "15minute")
+        full = MStockAPI._candles_to_frame(candle_rows("2025-01-02 09:15", 10), "15minute")
+        window_start = full.index[0].to_pydatetime()
+
+        self.assertIsNone(cache.fetch_start(key, window_start))
+        cache.update(key, window_start, full, incremental=False)
+        self.assertEqual(cache.fetch_start(key, window_start), full.index[-1].to_pydatetime())
+
+        # Tail bar re-fetched with a new close, plus one new bar
+        tail = MStockAPI._candles_to_frame(candle_rows("2025-01-02 11:30", 2, base=500.0), "15minute")
+        merged = cache.update(key, window_start, tail, incremental=True)
+
+        self.assertEqual(len(merged), 11)
+        self.assertEqual(merged["close"].iloc[-2], 500.5)
+        self.assertTrue(merged.index.is_monotonic_increasing)
+        print("PASS: tail bar replaced, new bar appended")
+
+    @patch('src.http_pool.requests.Session.request')
+    def test_second_call_fetches_only_tail(self, mock_request):
+        print("\nTesting get_historical_data requests only bars after the cached tail...")
+        api = self.make_api()
+        start = MStockAPI._history_window_start(10)
+
+        first = MagicMock(status_code=200)
+        first.json.return_value = {"status": "success", "data": {"candles": candle_rows(start, 20)}}
+        mock_request.return_value = first
+        df1 = api.get_historical_data("NIFTY 50", "NSE", "26000", "15minute", days=10)
+
+        tail_start = df1.index[-1]
+        second = MagicMock(status_code=200)
+        second.json.return_value = {"status": "success", "data": {"candles": candle_rows(tail_start, 2, base=900.0)}}
+        mock_request.return_value = second
+        df2 = api.get_historical_data("NIFTY 50", "NSE", "26000", "15minute", days=10)
+
+        url = unquote(mock_request.call_args.args[1])
+        self.assertIn(f"from={tail_start.strftime('%Y-%m-%d %H:%M:%S')}", url)
+        self.assertEqual(len(df2), len(df1) + 1)
+        self.assertEqual(df2["close"].iloc[-1], 901.5)
+        print("PASS: incremental fetch from cached tail")
+
+    @patch('src.http_pool.requests.Session.request')
+    def test_warm_start_from_store(self, mock_request):
+        print("\nTesting a fresh client reads stored candles and fetches only the gap...")
+        with tempfile.TemporaryDirectory() as root:
+            start = MStockAPI._history_window_start(10)
+            response = MagicMock(status_code=200)
+            response.json.return_value = {"status": "success", "data": {"candles": candle_rows(start, 20)}}
+            mock_request.return_value = response
+
+            first = self.make_api()
+            first.candle_store = CandleStore(root)
+            df1 = first.get_historical_data("NIFTY 50", "NSE", "26000", "15minute", days=10)
+
+            # Simulated restart: empty memory cache, same store
+            second = self.make_api()
+            second.candle_store = CandleStore(root)
+            tail = MagicMock(status_code=200)
+            tail.json.return_value = {"status": "success", "data": {"candles": candle_rows(df1.index[-1], 1)}}
+            mock_request.return_value = tail
+            with patch.object(CandleStore, 'is_current', return_value=False):
+                df2 = second.get_historical_data("NIFTY 50", "NSE", "26000", "15minute", days=10)
+
+            url = unquote(mock_request.call_args.args[1])
+            self.assertIn(f"from={df1.index[-1].strftime('%Y-%m-%d %H:%M:%S')}", url)
+            self.assertEqual(len(df2), len(df1))
+            self.assertTrue((df2.index == df1.index).all())
+
+            # After the close, stored data is complete: no request at all
+            third = self.make_api()
+            third.candle_store = CandleStore(root)
+            calls = mock_request.call_count
+            with patch.object(CandleStore, 'is_current', return_value=True):
+                df3 = third.get_historical_data("NIFTY 50", "NSE", "26000", "15minute", days=10)
+            self.assertEqual(mock_request.call_count, calls)
+            self.assertEqual(len(df3), len(df1))
+            print("PASS: warm start served from disk, only the gap fetched")
+
+    def test_async_histories_keep_disk_off_the_loop(self):
+        print("\nTesting concurrent async history fetches do candle store I/O in worker threads...")
+        try:
+            from src.async_market_data import AsyncMStockAPI
+        except ImportError:
+            self.skipTest("aiohttp not installed")
+        from mstock_simulator import start_simulator
+
+        tokens = ["26000", "26009", "26037", "1"]
+        server, state, base_url = start_simulator(port=0)
+        threads = []
+
+        class RecordingStore(CandleStore):
+            def load(self, *args, **kwargs):
+                threads.append(threading.get_ident())
+                return super().load(*args, **kwargs)
+
+            def write(self, *args, **kwargs):
+                threads.append(threading.get_ident())
+                return super().write(*args, **kwargs)
+
+            def is_current(self, *args, **kwargs):
+                threads.append(threading.get_ident())
+                return False
+
+        async def fetch_all(api):
+            client = AsyncMStockAPI(api)
+            try:
+                frames = await asyncio.gather(*(
+                    client.get_historical_data(f"SYM{token}", "NSE", token, "15minute", days=10) for token in tokens
+                ))
+            finally:
+                await client.close()
+            return threading.get_ident(), frames
+
+        try:
+            with tempfile.TemporaryDirectory() as root:
+                cold = self.make_api(base_url)
+                cold.candle_store = RecordingStore(root)
+                loop_thread, frames = asyncio.run(fetch_all(cold))
+                self.assertTrue(all(frame is not None and len(frame) > 0 for frame in frames))
+                for token in tokens:
+                    self.assertIsNotNone(cold.candle_store.coverage(CandleCache.make_key("NSE", token, "15minute")))
+
+                # Simulated restart: every window is read back from disk, concurrently
+                warm = self.make_api(base_url)
+                warm.candle_store = RecordingStore(root)
+                _, reloaded = asyncio.run(fetch_all(warm))
+                for frame, again in zip(frames, reloaded):
+                    self.assertTrue(again.index[:len(frame) - 1].equals(frame.index[:-1]))
+
+            self.assertGreaterEqual(len(threads), 3 * len(tokens))
+            self.assertNotIn(loop_thread, threads)
+            print(f"PASS: {len(threads)} store calls, none on the event loop")
+        finally:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
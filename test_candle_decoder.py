@@ -0,0 +1,61 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.candle_decoder import decode_candles
+from src.market_data import MStockAPI
+
+
+def legacy_frame(candles, timeframe):
+    """Previous list -> DataFrame -> to_datetime -> between_time path"""
+    df = pd.DataFrame(candles, columns=["timestamp", "open", "high", "low", "close", "volume"])
+    df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True).dt.tz_convert("Asia/Kolkata")
+    df.set_index("timestamp", inplace=True)
+    if timeframe != "day":
+        df = df.between_time("09:15", "15:30")
+    return df[["open", "high", "low", "close"]]
+
+
+def payload(fmt, periods=80, start="2025-01-02 08:00", freq="15min"):
+    index = pd.date_range(start, periods=periods, freq=freq, tz="Asia/Kolkata")
+    return [[fmt(t), 100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i, 10 * i] for i, t in enumerate(index)]
+
+
+class TestCandleDecoder(unittest.TestCase):
+    def assert_same(self, candles, timeframe="15minute"):
+        expected = legacy_frame(candles, timeframe)
+        actual = MStockAPI._candles_to_frame(candles, timeframe)
+        self.assertTrue(expected.index.equals(actual.index))
+        self.assertEqual(list(actual.columns), ["open", "high", "low", "close"])
+        np.testing.assert_array_equal(expected.to_numpy(dtype=float), actual.to_numpy())
+
+    def test_parity_with_previous_path(self):
+        print("\nTesting decoder output matches the old DataFrame path...")
+        self.assert_same(payload(lambda t: t.isoformat()))                          # +05:30
+        self.assert_same(payload(lambda t: t.strftime("%Y-%m-%dT%H:%M:%S+0530")))   # +0530
+        self.assert_same(payload(lambda t: t.tz_convert("UTC").strftime("%Y-%m-%dT%H:%M:%SZ")))
+        self.assert_same(payload(lambda t: t.strftime("%Y-%m-%d %H:%M:%S")))        # naive = UTC
+        self.assert_same(payload(lambda t: t.isoformat(), start="2024-12-01", freq="1D"), "day")
+        print("PASS: identical frames")
+
+    def test_arrays_and_mask(self):
+        print("\nTesting arrays, market-hours mask and volume column...")
+        block = decode_candles(payload(lambda t: t.isoformat(), periods=8, start="2025-01-02 08:45"))
+        self.assertEqual(block.ts.dtype, np.int64)
+        self.assertEqual(block.ohlcv.shape, (8, 5))
+        # 08:45 and 09:00 are pre-open
+        self.assertEqual(block.mask.tolist(), [False, False] + [True] * 6)
+        self.assertEqual(block.column("volume").tolist(), [20.0, 30.0, 40.0, 50.0, 60.0, 70.0])
+        self.assertEqual(block.ts[2], int(pd.Timestamp("2025-01-02 09:15", tz="Asia/Kolkata").timestamp()))
+        self.assertEqual(len(decode_candles([]).to_frame()), 0)
+        print("PASS: arrays")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from unittest.mock import MagicMock
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.daily_context import DailyContext
+from src.indicators import TechnicalIndicators
+from src.utils import now_ist
+
+
+def daily_bars(count):
+    end = pd.Timestamp(now_ist().date(), tz="Asia/Kolkata")
+    index = pd.date_range(end=end, periods=count, freq="D")
+    close = 23000 + np.cumsum(np.sin(np.arange(count)) * 50)
+    return pd.DataFrame({"open": close - 10, "high": close + 40, "low": close - 40, "close": close}, index=index)
+
+
+class TestDailyContext(unittest.TestCase):
+    def test_pinned_once_per_session(self):
+        print("\nTesting daily context downloads and computes once per session...")
+        api = MagicMock()
+        api.get_historical_data.return_value = daily_bars(60)
+        context = DailyContext(api)
+
+        first = context.get("NIFTY 50", "NSE", "26000")
+        second = context.get("NIFTY 50", "NSE", "26000")
+
+        self.assertTrue(first.equals(second))
+        self.assertEqual(api.get_historical_data.call_count, 1)
+        print("PASS: one download for repeated ticks")
+
+    def test_completed_sessions_only_and_parity(self):
+        print("\nTesting today's partial bar is excluded and values match batch indicators...")
+        bars = daily_bars(60)
+        api = MagicMock()
+        api.get_historical_data.return_value = bars
+        frame = DailyContext(api).get("NIFTY 50", "NSE", "26000")
+
+        completed = bars.iloc[:-1]
+        self.assertEqual(frame.index[-1], completed.index[-1])
+        adx, _, _ = TechnicalIndicators.calculate_adx(completed["high"], completed["low"], completed["close"])
+        self.assertAlmostEqual(frame["ADX"].iloc[-1], adx.iloc[-1])
+        print("PASS: pinned frame built from completed sessions")
+
+    def test_frame_is_read_only(self):
+        print("\nTesting callers cannot modify the pinned frame...")
+        api = MagicMock()
+        api.get_historical_data.return_value = daily_bars(60)
+        context = DailyContext(api)
+
+        frame = context.get("NIFTY 50", "NSE", "26000")
+        adx = frame["ADX"].iloc[-1]
+        frame["EXTRA"] = 1.0
+        try:
+            frame.iloc[-1, frame.columns.get_loc("ADX")] = -1.0
+        except ValueError:
+            pass  # read-only arrays reject in-place writes without copy-on-write
+
+        pinned = context.get("NIFTY 50", "NSE", "26000")
+        self.assertNotIn("EXTRA", pinned.columns)
+        self.assertEqual(pinned["ADX"].iloc[-1], adx)
+        print("PASS: pinned data protected")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.http_pool import PoolExhaustedError, SessionPool
+from src.resilience import CircuitBreaker, LatencyTracker
+from mstock_simulator import start_simulator
+
+
+class TestSessionPool(unittest.TestCase):
+    def setUp(self):
+        self.server, self.state, base_url = start_simulator(port=0)
+        self.url = f"{base_url}/instruments/quote/ohlc"
+        self.params = {"i": "NSE:NIFTY 50"}
+
+    def tearDown(self):
+        self.state.latency_ms = 0
+        self.server.shutdown()
+
+    def test_concurrent_borrowing_reuses_connections(self):
+        print("\nTesting concurrent requests share the pooled keep-alive sessions...")
+        pool = SessionPool(pool_size=3)
+        self.state.latency_ms = 20
+        errors = []
+
+        def worker():
+            for _ in range(5):
+                try:
+                    self.assertEqual(pool.get(self.url, "quote", params=self.params).status_code, 200)
+                except Exception as e:
+                    errors.append(e)
+
+        try:
+            threads = [threading.Thread(target=worker) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(10)
+
+            self.assertEqual(errors, [])
+            # A session is only opened while every existing one is borrowed: three were in use at once
+            stats = pool.stats()
+            self.assertEqual(stats["sessions"], 3)
+            self.assertEqual(stats["requests_by_endpoint"], {"quote": 40})
+            self.assertEqual(stats["requests"], 40)
+            self.assertEqual(stats["connections_opened"], 3)
+            self.assertEqual(stats["connections_reused"], 37)
+            print(f"PASS: 40 requests from 8 threads on {stats['connections_opened']} connections")
+        finally:
+            pool.close()
+
+    def test_busy_pool_times_out_with_clear_error(self):
+        print("\nTesting a request gives up waiting for a session at its deadline...")
+        breaker = CircuitBreaker(threshold=1, reset_after=30)
+        pool = SessionPool(pool_size=1, breaker=breaker)
+        try:
+            with pool.session():
+                with self.assertRaises(PoolExhaustedError):
+                    with pool.session(timeout=0.05):
+                        pass
+                start = time.monotonic()
+                with self.assertRaises(PoolExhaustedError):
+                    pool.get(self.url, "quote", params=self.params, timeout=(0.2, 5))
+                self.assertLess(time.monotonic() - start, 1.0)
+
+            # A busy pool is not a broker failure: the circuit stays closed
+            self.assertEqual(pool.get(self.url, "quote", params=self.params).status_code, 200)
+            self.assertEqual(pool.stats()["errors_by_endpoint"], {})
+            print("PASS: PoolExhaustedError after the connect timeout, circuit closed")
+        finally:
+            pool.close()
+
+    def test_hedge_needs_a_free_session(self):
+        print("\nTesting a hedge is skipped rather than queued for a session...")
+        pool = SessionPool(pool_size=1, latency=LatencyTracker(min_samples=5), hedge_delay=0.05)
+        try:
+            for _ in range(10):
+                pool.get(self.url, "quote", params=self.params)
+
+            self.state.latency_ms = 300
+            self.assertEqual(pool.get(self.url, "quote", params=self.params).status_code, 200)
+            stats = pool.stats()
+            self.assertEqual(stats["hedges_by_endpoint"], {})
+            self.assertEqual(stats["sessions"], 1)
+            print("PASS: slow GET answered on its own session")
+        finally:
+            pool.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.indicator_cache import IndicatorCache
+from src.streaming_indicators import ProvisionalIndicators
+from test_streaming_indicators import batch_frame, live_frame
+
+
+class TestIndicatorCache(unittest.TestCase):
+    def test_lru_eviction_by_bytes_and_entries(self):
+        print("\nTesting LRU eviction, memory budget and counters...")
+        cache = IndicatorCache(max_bytes=3000, max_entries=3)
+        for i in range(3):
+            cache.put(("NSE", f"S{i}"), np.zeros(100))    # 800 bytes each
+        self.assertIsNotNone(cache.get(("NSE", "S0")))     # S0 becomes most recent
+        cache.put(("NSE", "S3"), np.zeros(100))            # 4 entries > 3: S1 goes
+        self.assertIsNone(cache.get(("NSE", "S1")))
+        cache.put(("NSE", "S4"), np.zeros(200))            # 1600 bytes: over budget, S2 and S0 go
+        stats = cache.stats()
+        self.assertEqual((stats["entries"], stats["bytes"]), (2, 2400))
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (1, 1, 3))
+
+        cache.put("huge", np.zeros(1000))                  # larger than the whole budget: not cached
+        self.assertIsNone(cache.get("huge"))
+        self.assertEqual(cache.get_or_compute("k", lambda: np.ones(3)).sum(), 3.0)
+        self.assertEqual(cache.get_or_compute("k", lambda: None).sum(), 3.0)
+        print(f"PASS: {cache.stats()}")
+
+    def test_consumers_share_sealed_bars(self):
+        print("\nTesting a second consumer reuses sealed-bar results instead of recomputing...")
+        cache = IndicatorCache()
+        frame = live_frame(300)
+        key = ("NSE", "NIFTY 50")
+        entry_loop = ProvisionalIndicators(cache=cache)
+        dashboard = ProvisionalIndicators(cache=cache)
+
+        first = entry_loop.frame(key, frame.iloc[:250])
+        second = dashboard.frame(key, frame.iloc[:250])
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual((entry_loop.rebuilds, dashboard.rebuilds), (1, 0))
+
+        # Next sealed bar: computed by whoever sees it first, adopted by the other
+        entry_loop.last(key, frame.iloc[:251])
+        hits = cache.hits
+        pd.testing.assert_frame_equal(dashboard.frame(key, frame.iloc[:251]), batch_frame(frame.iloc[:251]))
+        self.assertEqual(cache.hits, hits + 1)
+
+        # Adopted state advances independently of the cached snapshot
+        dashboard.last(key, frame.iloc[:260])
+        pd.testing.assert_frame_equal(entry_loop.frame(key, frame.iloc[:255]), batch_frame(frame.iloc[:255]))
+
+        # Different parameters never share results
+        other = ProvisionalIndicators(rsi_period=7, cache=cache)
+        other.last(key, frame.iloc[:250])
+        self.assertEqual(other.rebuilds, 1)
+        print(f"PASS: {cache.stats()}")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.indicators import TechnicalIndicators
+from src.lookback import (
+    converged_tail, ewm_warmup, history_days, indicator_warmup, lookback_days, tolerance_report, warmup_bars
+)
+from src.trading_config import TradingConfig
+from test_streaming_indicators import make_bars
+
+
+def bars_frame(count, seed=11):
+    high, low, close = make_bars(count, seed)
+    return pd.DataFrame({"high": high, "low": low, "close": close})
+
+
+class TestLookback(unittest.TestCase):
+    def test_warmup_windows(self):
+        print("\nTesting convergence-bounded warmup windows...")
+        self.assertEqual(ewm_warmup(1 / 14, 0.01), 63)
+        self.assertLessEqual((13 / 14) ** 63, 0.01)
+        self.assertGreater((13 / 14) ** 62, 0.01)
+        self.assertEqual(indicator_warmup(tolerance=0.01), {"MACD": 81, "RSI": 64, "ADX": 127})
+        self.assertEqual(warmup_bars(TradingConfig()), 127)
+
+        # Windows cover the bars: 127 bars = 6 sessions + today, 127 daily sessions
+        self.assertEqual(lookback_days(127, "15minute"), 11)
+        self.assertEqual(lookback_days(127, "day"), 187)
+
+        # Downloads never grow past the windows already in use
+        self.assertEqual(history_days("15minute", TradingConfig()), 10)
+        self.assertEqual(history_days("day", TradingConfig()), 60)
+        with self.assertRaises(ValueError):
+            ewm_warmup(0.1, 0.0)
+        print("PASS")
+
+    def test_tolerance_report(self):
+        print("\nTesting truncated-window values against full history...")
+        frame = bars_frame(600)
+        report = tolerance_report(frame, 127, evaluate=300)
+        self.assertEqual(report["evaluated"], 300)
+        for name in ("RSI", "ADX", "+DI", "-DI"):
+            self.assertLess(report["max_abs_error"][name], 0.1, name)
+
+        # Batched windows agree with computing one truncated frame directly
+        tail = frame.iloc[-127:]
+        adx, _, _ = TechnicalIndicators.calculate_adx(tail["high"], tail["low"], tail["close"])
+        full_adx, _, _ = TechnicalIndicators.calculate_adx(frame["high"], frame["low"], frame["close"])
+        self.assertLessEqual(abs(adx.iloc[-1] - full_adx.iloc[-1]), report["max_abs_error"]["ADX"])
+
+        # Any verdict flip is within the measured error of its threshold
+        for name, count in report["flips"].items():
+            if count:
+                self.assertLess(report["flip_margin"][name], 0.1, name)
+
+        # Value deviation where the full-history verdict crosses its threshold
+        self.assertEqual(set(report["crossings"]), set(report["flips"]))
+        self.assertGreater(sum(report["crossings"].values()), 0)
+        for name, count in report["crossings"].items():
+            self.assertLess(report["crossing_error"][name], 0.1, name)
+            if not count:
+                self.assertEqual(report["crossing_error"][name], 0.0)
+
+        # A window shorter than the warmup is visibly worse
+        short = tolerance_report(frame, 60, evaluate=300)
+        self.assertGreater(short["max_abs_error"]["ADX"], 10 * report["max_abs_error"]["ADX"])
+        with self.assertRaises(ValueError):
+            tolerance_report(frame.iloc[:100], 127)
+        print(f"PASS: {report['max_abs_error']}")
+
+    def test_converged_tail(self):
+        print("\nTesting indicator compute window...")
+        sessions = pd.bdate_range("2026-01-05", periods=8)
+        index = pd.DatetimeIndex([
+            day + pd.Timedelta(hours=9, minutes=15 + 15 * bar) for day in sessions for bar in range(25)
+        ])
+        frame = bars_frame(len(index)).set_index(index)
+
+        # The bar 127 back starts its session: the window reaches back to 09:15 that day
+        tail = converged_tail(frame, 127)
+        self.assertEqual(len(tail), 150)
+        self.assertEqual(tail.index[0], sessions[2] + pd.Timedelta(hours=9, minutes=15))
+        self.assertEqual(tail.index[-1], frame.index[-1])
+
+        # Same start for every bar of the session, so states are not rebuilt per bar
+        for end in range(len(frame) - 23, len(frame) + 1):
+            self.assertEqual(converged_tail(frame.iloc[:end], 127).index[0], tail.index[0])
+
+        # Short frames (60 daily bars against the 127-bar warmup) are used as is
+        short = frame.iloc[:60]
+        self.assertEqual(len(converged_tail(short, 127)), 60)
+        self.assertEqual(len(converged_tail(short.reset_index(drop=True), 40)), 40)
+        print("PASS")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+from datetime import date
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.option_chain import OptionChain
+from src.tick_source import TickSource
+
+NIFTY = ("NSE", "NIFTY 50")
+SYMBOLS = {"NIFTY 50": ("NSE", "26000", "NIFTY50")}
+
+
+class FakeMaster:
+    def get_nearest_expiry(self, underlying):
+        return date(2030, 1, 3)
+
+    def get_symbol(self, underlying, expiry, strike, option_type):
+        return f"{underlying}30103{strike}{option_type}"
+
+    def get_token(self, symbol):
+        return f"T{symbol}"
+
+
+def quote_api(spot):
+    """get_quotes answering the spot and a premium derived from each option's strike"""
+    api = MagicMock()
+
+    def get_quotes(instruments):
+        quotes = {}
+        for exchange, symbol in instruments:
+            if (exchange, symbol) == NIFTY:
+                quotes[NIFTY] = {"last_price": spot[0]}
+            else:
+                quotes[(exchange, symbol)] = {"last_price": float(symbol[10:15]) / 100}
+        return quotes
+
+    api.get_quotes.side_effect = get_quotes
+    return api
+
+
+@patch('src.option_chain.SymbolMaster', FakeMaster)
+class TestOptionChain(unittest.TestCase):
+    def test_select_prices_from_memory(self):
+        print("\nTesting selection and entry premium come from the refreshed chain...")
+        spot = [23010.0]
+        api = quote_api(spot)
+        chain = OptionChain(api, SYMBOLS, band=2)
+        chain.refresh()
+        # Band appears after the spot is known, then gets quoted in a second batch
+        self.assertEqual(api.get_quotes.call_count, 2)
+        self.assertEqual(chain.atm("NIFTY50"), 23000)
+        self.assertEqual(len(chain.instruments()), 10)
+
+        calls = api.get_quotes.call_count
+        contract, premium = chain.select("NIFTY50", 23010.0, "CE", depth=1)
+        self.assertEqual((contract.strike, contract.symbol, contract.token), (22950, "NIFTY3010322950CE", "TNIFTY3010322950CE"))
+        self.assertEqual(premium, 229.5)
+        self.assertEqual(api.get_quotes.call_count, calls)
+
+        # Deeper than the band: caller falls back to a direct quote
+        self.assertIsNone(chain.select("NIFTY50", 23010.0, "PE", depth=3))
+        # Stale premiums are not served
+        self.assertIsNone(chain.select("NIFTY50", 23010.0, "CE", max_age=0.0))
+        print("PASS: chain hit without a request")
+
+    def test_band_follows_spot_on_feed(self):
+        print("\nTesting the band re-centres on spot ticks and updates the feed subscription...")
+        feed = TickSource()
+        chain = OptionChain(MagicMock(), SYMBOLS, band=1).attach(feed)
+        self.assertIn(NIFTY, feed.subscriptions())
+
+        feed._publish({NIFTY: {"last_price": 23010.0}})
+        self.assertEqual(len(chain.instruments()), 6)
+        feed._publish({("NFO", "NIFTY3010323050CE"): {"last_price": 80.0}})
+        kept = chain.contracts("NIFTY50")[(23050, "CE")]
+
+        feed._publish({NIFTY: {"last_price": 23060.0}})
+        self.assertEqual(chain.atm("NIFTY50"), 23050)
+        self.assertEqual(sorted({s for s, _ in chain.contracts("NIFTY50")}), [23000, 23050, 23100])
+        self.assertIs(chain.contracts("NIFTY50")[(23050, "CE")], kept)
+        subscribed = set(feed.subscriptions())
+        self.assertIn(("NFO", "NIFTY3010323100PE"), subscribed)
+        self.assertNotIn(("NFO", "NIFTY3010322950CE"), subscribed)
+
+        contract, premium = chain.select("NIFTY50", 23060.0, "CE")
+        self.assertEqual((contract.strike, premium), (23050, 80.0))
+        print("PASS: band follows the spot")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+import sys
+import os
+import asyncio
+import threading
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.rate_limiter import RateLimiter, Priority
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_reserve_kept_for_exit_lane(self):
+        print("\nTesting low lanes leave their reserve in the bucket...")
+        limiter = RateLimiter(rate=0.001, burst=4)
+
+        # BACKGROUND must leave 3 tokens: only one of four is available to it
+        self.assertTrue(limiter.acquire(Priority.BACKGROUND, timeout=0))
+        self.assertFalse(limiter.acquire(Priority.BACKGROUND, timeout=0))
+        # ENTRY must leave 1
+        self.assertTrue(limiter.acquire(Priority.ENTRY, timeout=0))
+        self.assertTrue(limiter.acquire(Priority.ENTRY, timeout=0))
+        self.assertFalse(limiter.acquire(Priority.ENTRY, timeout=0))
+        # EXIT can take the last token
+        self.assertTrue(limiter.acquire(Priority.EXIT, timeout=0))
+        print("PASS: reserves respected")
+
+    def test_exit_served_before_waiting_background(self):
+        print("\nTesting exit keeps its latency while background work floods the limiter...")
+        limiter = RateLimiter(rate=20, burst=1, reserve={Priority.BACKGROUND: 0, Priority.ENTRY: 0})
+        stop = threading.Event()
+
+        def flood():
+            while not stop.is_set():
+                limiter.acquire(Priority.BACKGROUND, timeout=0.5)
+
+        workers = [threading.Thread(target=flood, daemon=True) for _ in range(8)]
+        for worker in workers:
+            worker.start()
+        time.sleep(0.2)
+
+        waits = []
+        for _ in range(5):
+            start = time.monotonic()
+            self.assertTrue(limiter.acquire(Priority.EXIT, timeout=2))
+            waits.append(time.monotonic() - start)
+        stop.set()
+        for worker in workers:
+            worker.join(2)
+
+        # One token every 50ms: an exit waits at most about one refill interval
+        self.assertLess(max(waits), 0.15)
+        print(f"PASS: max exit wait {max(waits) * 1000:.0f} ms under 8 flooding threads")
+
+    def test_async_exit_orders_take_exit_lane(self):
+        print("\nTesting async SELL orders use the exit lane like the sync client...")
+        try:
+            from src.async_market_data import AsyncMStockAPI
+        except ImportError:
+            self.skipTest("aiohttp not installed")
+        from src.http_pool import SessionPool
+        from src.market_data import MStockAPI
+        from mstock_simulator import start_simulator
+
+        class RecordingLimiter(RateLimiter):
+            def acquire(self, priority=None, timeout=None):
+                lanes.append(priority)
+                return super().acquire(priority, timeout)
+
+        class SimulatorApi:
+            http = SessionPool(limiter=RecordingLimiter(rate=100, burst=10))
+            _build_order_payload = staticmethod(MStockAPI._build_order_payload)
+            _parse_order_response = staticmethod(MStockAPI._parse_order_response)
+
+            def get_headers(self):
+                return {}
+
+        lanes = []
+        server, state, base_url = start_simulator(port=0)
+        try:
+            api = SimulatorApi()
+            api.base_url = base_url
+            client = AsyncMStockAPI(api, priority=Priority.ENTRY)
+
+            async def orders():
+                try:
+                    for side in ("BUY", "SELL"):
+                        await client.place_order("NIFTY25FEB23000CE", "NFO", 75, side, paper_mode=False)
+                finally:
+                    await client.close()
+
+            asyncio.run(orders())
+            self.assertEqual(lanes, [Priority.ENTRY, Priority.EXIT])
+            self.assertEqual([order["transaction_type"] for order in state.orders], ["BUY", "SELL"])
+            print("PASS: BUY on the client lane, SELL on EXIT")
+        finally:
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
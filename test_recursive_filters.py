@@ -0,0 +1,144 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src import recursive_filters
+from src.indicators import TechnicalIndicators
+from src.recursive_filters import ema, rma, tv_rma, wilder_smooth
+from test_streaming_indicators import assert_close, assert_identical, make_bars
+
+
+# Outputs of the pandas-ewm implementation on make_bars(300, 11), bars 30/119/121/299
+GOLDEN = {
+    "MACD": [-28.293031414090365, 18.524380794340686, 18.502114406113833, -2.567397893399175],
+    "MACD_Signal": [-12.581678733876863, 13.278706616098978, 15.162696042620624, 5.851400340661826],
+    "MACD_Hist": [-15.711352680213501, 5.245674178241709, 3.339418363493209, -8.418798234061],
+    "RSI": [42.29621268241192, 57.99464597178535, 57.99464597178535, 39.860627770356544],
+    "ADX": [31.940570273342626, 18.02655427982474, 18.47559401659856, 17.167358964178547],
+    "+DI": [17.75674354682942, 40.65240942481806, 36.21356422059506, 25.184074587458433],
+    "-DI": [42.87892909413249, 26.383069659780993, 23.502296689888958, 42.02660837718442],
+}
+
+
+def reference_tv_rma(series, length):
+    """kickstart.tv_rma before the NumPy core (bar-by-bar .iloc loop)"""
+    x = pd.to_numeric(series, errors="coerce")
+    alpha = 1.0 / float(length)
+    sma = x.rolling(length, min_periods=length).mean()
+    out = pd.Series(np.nan, index=x.index)
+    first = sma.first_valid_index()
+    if first is None:
+        return out
+    out.loc[first] = sma.loc[first]
+    for i in range(x.index.get_loc(first) + 1, len(x)):
+        out.iloc[i] = alpha * x.iloc[i] + (1 - alpha) * out.iloc[i - 1]
+    return out
+
+
+def reference_wilder(values, period, seed):
+    """kickstart.compute_rsi_progressive's smoothing loop"""
+    out, previous = [], seed
+    for x in values:
+        previous = (previous * (period - 1) + x) / period
+        out.append(previous)
+    return out
+
+
+def inputs():
+    high, low, close = make_bars(300, 11)
+    gain = np.clip(np.diff(close, prepend=np.nan), 0, None)
+    yield "close", close
+    yield "gain", gain
+    yield "short", close[:5]
+    yield "empty", close[:0]
+    yield "integers", np.arange(40) % 7
+    yield "leading gap", np.concatenate([[np.nan] * 3, close[:10], [np.nan], close[10:60]])
+
+
+class TestRecursiveFilters(unittest.TestCase):
+    def test_ema_and_rma_match_pandas(self):
+        print("\nTesting ema/rma against pandas ewm(adjust=False) with every kernel...")
+        in_use = recursive_filters._ewm_kernel
+        kernels = [recursive_filters._ewm_reference, recursive_filters._ewm_numpy]
+        if recursive_filters._ewm_numba is not None:
+            kernels.append(recursive_filters._ewm_numba)
+        try:
+            for kernel in kernels:
+                recursive_filters._ewm_kernel = kernel
+                # Sequential kernels are bit-identical; the block scan is within a few ulps
+                check = assert_close if kernel is recursive_filters._ewm_numpy else assert_identical
+                for name, values in inputs():
+                    series = pd.Series(values, dtype=float)
+                    for span in (9, 12, 26):
+                        check(self, ema(values, span), series.ewm(span=span, adjust=False).mean(), f"{name} span={span}")
+                    for period, min_periods in ((14, 0), (14, 14), (3, 2)):
+                        expected = series.ewm(alpha=1 / period, adjust=False, min_periods=min_periods).mean()
+                        check(self, rma(values, period, min_periods), expected, f"{name} rma {period}")
+        finally:
+            recursive_filters._ewm_kernel = in_use
+        print(f"PASS: {[kernel.__name__ for kernel in kernels]} ({in_use.__name__} in use)")
+
+    def test_block_scan_long_series_and_verdicts(self):
+        print("\nTesting the NumPy block scan over long series and its trading verdicts...")
+        rng = np.random.default_rng(5)
+        values = 23000 + np.cumsum(rng.normal(0, 20, 200_000))
+        values[[1000, 1001, 50_000, 123_456]] = np.nan
+        series = pd.Series(values)
+        for com in (5.5, 12.5, 13.0):
+            assert_close(self, recursive_filters._ewm_numpy(values, com, 0), series.ewm(com=com, adjust=False).mean(), f"com={com}")
+
+        # Crossovers and threshold checks decided on the scan match the sequential recursion
+        in_use = recursive_filters._ewm_kernel
+        try:
+            for seed in range(1, 6):
+                high, low, close = (pd.Series(v) for v in make_bars(400, seed))
+                verdicts = {}
+                for kernel in (recursive_filters._ewm_reference, recursive_filters._ewm_numpy):
+                    recursive_filters._ewm_kernel = kernel
+                    macd, signal, _ = TechnicalIndicators.calculate_macd(close)
+                    adx, plus_di, minus_di = TechnicalIndicators.calculate_adx(high, low, close)
+                    rsi = TechnicalIndicators.calculate_rsi(close)
+                    verdicts[kernel] = np.concatenate([
+                        *TechnicalIndicators.crossover_masks(macd.to_numpy(), signal.to_numpy()),
+                        *TechnicalIndicators.crossover_masks(plus_di.to_numpy(), minus_di.to_numpy()),
+                        (macd > signal).to_numpy(), (rsi > 45).to_numpy(), (rsi < 65).to_numpy(), (adx > 25).to_numpy(),
+                    ])
+                np.testing.assert_array_equal(*verdicts.values(), err_msg=f"seed {seed}")
+        finally:
+            recursive_filters._ewm_kernel = in_use
+        print("PASS: within a few ulps, same verdicts")
+
+    def test_tradingview_rma_matches_loop(self):
+        print("\nTesting SMA-seeded tv_rma and Wilder smoothing against the old loops...")
+        for name, values in inputs():
+            for length in (3, 14):
+                assert_identical(self, tv_rma(values, length), reference_tv_rma(pd.Series(values), length), f"{name} tv_rma {length}")
+        _, _, close = make_bars(300, 11)
+        gain = np.clip(np.diff(close[:119]), 0, None)
+        assert_identical(self, wilder_smooth(gain[14:], 14, 2.5), reference_wilder(gain[14:], 14, 2.5), "wilder")
+        print("PASS: identical")
+
+    def test_indicator_golden_values(self):
+        print("\nTesting MACD/RSI/ADX against golden values of the pandas implementation...")
+        high, low, close = make_bars(300, 11)
+        close_s, high_s, low_s = pd.Series(close), pd.Series(high), pd.Series(low)
+        macd = TechnicalIndicators.calculate_macd(close_s)
+        adx = TechnicalIndicators.calculate_adx(high_s, low_s, close_s)
+        results = {
+            "MACD": macd[0], "MACD_Signal": macd[1], "MACD_Hist": macd[2],
+            "RSI": TechnicalIndicators.calculate_rsi(close_s),
+            "ADX": adx[0], "+DI": adx[1], "-DI": adx[2],
+        }
+        for name, expected in GOLDEN.items():
+            assert_close(self, [results[name].iloc[i] for i in (30, 119, 121, 299)], expected, name)
+        print("PASS: golden values reproduced")
+
+
+if __name__ == '__main__':
+    unittest.main()
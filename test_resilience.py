@@ -0,0 +1,204 @@
+import unittest
+import sys
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.http_pool import SessionPool
+from src.resilience import BrokerBlindError, CircuitBreaker, LatencyTracker
+from mstock_simulator import start_simulator
+
+
+class TestResilience(unittest.TestCase):
+    def test_deadline_follows_p95(self):
+        print("\nTesting adaptive deadline is a multiple of p95, clamped...")
+        tracker = LatencyTracker(multiplier=3, floor=0.5, min_samples=10)
+        self.assertEqual(tracker.deadline("quote", (5, 10)), (5, 10))
+        for _ in range(50):
+            tracker.record("quote", 0.2)
+        connect, read = tracker.deadline("quote", (5, 10))
+        self.assertAlmostEqual(read, 0.6, places=6)
+        self.assertAlmostEqual(connect, 0.6, places=6)
+        # Never above the configured ceiling
+        for _ in range(200):
+            tracker.record("quote", 8.0)
+        self.assertEqual(tracker.deadline("quote", (5, 10)), (5, 10))
+        print("PASS: deadline adapts")
+
+    def test_order_timeouts_stay_static(self):
+        print("\nTesting orders and auth keep their configured timeouts after many fast round trips...")
+        server, state, base_url = start_simulator(port=0)
+        try:
+            tracker = LatencyTracker(multiplier=3, floor=1.0, min_samples=5)
+            pool = SessionPool(latency=tracker)
+            url = f"{base_url}/instruments/quote/ohlc"
+            for _ in range(30):
+                for endpoint in ("quote", "orders", "auth"):
+                    self.assertEqual(pool.get(url, endpoint, params={"i": "NSE:NIFTY 50"}).status_code, 200)
+            for _ in range(30):
+                tracker.record("orders", 0.01)   # Even with samples from elsewhere
+
+            self.assertEqual(pool.deadline_for("orders"), (10, 30))
+            self.assertEqual(pool.deadline_for("auth"), (30, 60))
+            self.assertLess(pool.deadline_for("quote")[1], 10)
+            self.assertNotIn("auth", tracker.stats())
+            self.assertEqual(tracker.stats()["orders"]["samples"], 30)
+
+            try:
+                from src.async_market_data import AsyncMStockAPI
+            except ImportError:
+                AsyncMStockAPI = None
+            if AsyncMStockAPI is not None:
+                api = type("Api", (), {"http": pool})()
+                timeout = AsyncMStockAPI(api)._timeout("orders")
+                self.assertEqual((timeout.sock_connect, timeout.sock_read), (10, 30))
+            print("PASS: (10, 30) for orders, adaptive for quotes")
+        finally:
+            server.shutdown()
+
+    def test_breaker_opens_and_probes(self):
+        print("\nTesting circuit opens after repeated failures and closes on a good probe...")
+        breaker = CircuitBreaker(threshold=2, reset_after=0.1)
+        breaker.failure("quote", "timeout")
+        breaker.check("quote")
+        breaker.failure("quote", "timeout")
+        with self.assertRaises(BrokerBlindError):
+            breaker.check("quote")
+        # Orders are never short-circuited
+        breaker.check("orders")
+
+        time.sleep(0.15)
+        breaker.check("quote")  # The probe goes through
+        with self.assertRaises(BrokerBlindError):
+            breaker.check("quote")  # ...but only one
+        breaker.success("quote")
+        breaker.check("quote")
+        self.assertEqual(breaker.blind(), [])
+        print("PASS: open / half-open / closed")
+
+    def test_unfinished_probe_does_not_blind_for_good(self):
+        print("\nTesting a probe that raises before sending or is cancelled releases the circuit...")
+        from src.rate_limiter import Priority, RateLimiter
+
+        class FailingLimiter(RateLimiter):
+            def acquire(self, priority=None, timeout=None):
+                raise RuntimeError("interrupted")
+
+        def opened_breaker():
+            breaker = CircuitBreaker(threshold=1, reset_after=0.05)
+            breaker.failure("quote", "timeout")
+            time.sleep(0.06)
+            return breaker
+
+        # Sync: the probe dies waiting for a rate-limit token
+        breaker = opened_breaker()
+        pool = SessionPool(limiter=FailingLimiter(), breaker=breaker)
+        with self.assertRaises(RuntimeError):
+            pool.get("http://127.0.0.1:9/", "quote")
+        self.assertIsNotNone(breaker.check("quote"))   # The next caller becomes the probe
+
+        # Async: the probe is cancelled while waiting for a token in a worker thread
+        try:
+            import asyncio
+            from src.async_market_data import AsyncMStockAPI
+        except ImportError:
+            AsyncMStockAPI = None
+        if AsyncMStockAPI is not None:
+            breaker = opened_breaker()
+            limiter = RateLimiter(rate=4, burst=1, reserve={Priority.ENTRY: 0})
+            limiter.acquire(Priority.ENTRY, timeout=0)      # Empty bucket: the next token is 0.25s away
+            api = type("Api", (), {"http": SessionPool(limiter=limiter, breaker=breaker)})()
+
+            async def cancelled_probe():
+                task = asyncio.ensure_future(AsyncMStockAPI(api)._request("GET", "http://127.0.0.1:9/", "quote"))
+                await asyncio.sleep(0.05)
+                task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+
+            asyncio.run(cancelled_probe())
+            self.assertIsNotNone(breaker.check("quote"))
+
+        # A probe that never reports at all expires after probe_timeout
+        breaker = CircuitBreaker(threshold=1, reset_after=0.0, probe_timeout=0.05)
+        breaker.failure("quote", "timeout")
+        self.assertIsNotNone(breaker.check("quote"))
+        with self.assertRaises(BrokerBlindError):
+            breaker.check("quote")
+        time.sleep(0.06)
+        self.assertIsNotNone(breaker.check("quote"))
+        print("PASS: released or expired, never stuck open")
+
+    def test_hung_endpoint_fails_fast(self):
+        print("\nTesting a hung quote endpoint turns into an explicit blind state...")
+        server, state, base_url = start_simulator(port=0)
+        try:
+            tracker = LatencyTracker(multiplier=3, floor=0.2, min_samples=10)
+            pool = SessionPool(latency=tracker, breaker=CircuitBreaker(threshold=2, reset_after=30))
+            url = f"{base_url}/instruments/quote/ohlc"
+            for _ in range(15):
+                self.assertEqual(pool.get(url, "quote", params={"i": "NSE:NIFTY 50"}).status_code, 200)
+
+            state.latency_ms = 5000
+            start = time.monotonic()
+            for _ in range(2):
+                with self.assertRaises(Exception):
+                    pool.get(url, "quote", params={"i": "NSE:NIFTY 50"})
+            with self.assertRaises(BrokerBlindError):
+                pool.get(url, "quote", params={"i": "NSE:NIFTY 50"})
+            elapsed = time.monotonic() - start
+            # Two 0.2s deadlines instead of two 10s static read timeouts
+            self.assertLess(elapsed, 2.0)
+            print(f"PASS: blind after {elapsed:.2f}s")
+        finally:
+            state.latency_ms = 0
+            server.shutdown()
+
+    def test_slow_get_is_hedged(self):
+        print("\nTesting a GET slower than p95 is hedged...")
+        calls = []
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                calls.append(self.path)
+                if len(calls) == 11:
+                    time.sleep(1.5)  # Only the first request after warm-up stalls
+                body = b'{"status": "success"}'
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/quote"
+        pool = SessionPool(latency=LatencyTracker(min_samples=5), hedge_delay=0.05)
+        try:
+            for _ in range(10):
+                pool.get(url, "quote")
+            self.assertEqual(pool.stats()["hedges_by_endpoint"], {})
+
+            start = time.monotonic()
+            response = pool.get(url, "quote")
+            elapsed = time.monotonic() - start
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(pool.stats()["hedges_by_endpoint"], {"quote": 1})
+            self.assertLess(elapsed, 1.0)
+            print(f"PASS: hedged answer in {elapsed * 1000:.0f} ms")
+        finally:
+            pool.close()
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.indicators import TechnicalIndicators
+from test_streaming_indicators import batch_frame, live_frame
+
+
+class TestSignalMasks(unittest.TestCase):
+    def test_masks_match_per_bar_checks(self):
+        print("\nTesting crossover masks against the per-bar crossover checks...")
+        frame = batch_frame(live_frame(400))
+        pairs = (
+            ("MACD", "MACD_Signal", TechnicalIndicators.check_macd_crossover_bullish, TechnicalIndicators.check_macd_crossover_bearish),
+            ("+DI", "-DI", TechnicalIndicators.check_di_crossover_bullish, TechnicalIndicators.check_di_crossover_bearish),
+        )
+        for fast, slow, bullish_check, bearish_check in pairs:
+            bullish, bearish = TechnicalIndicators.crossover_masks(frame[fast], frame[slow])
+            expected_bullish = [bullish_check(frame[fast], frame[slow], i) for i in range(len(frame))]
+            expected_bearish = [bearish_check(frame[fast], frame[slow], i) for i in range(len(frame))]
+            self.assertEqual(bullish.tolist(), expected_bullish, fast)
+            self.assertEqual(bearish.tolist(), expected_bearish, fast)
+            self.assertTrue(bullish.any() and bearish.any())
+
+        # Equal values on both bars count as a cross exactly like the scalar checks
+        bullish, bearish = TechnicalIndicators.crossover_masks([1.0, 1.0, 2.0, 1.0, np.nan, 3.0], [1.0, 1.0, 1.0, 1.0, 1.0, 1.0])
+        self.assertEqual(bullish.tolist(), [False, False, True, False, False, False])
+        self.assertEqual(bearish.tolist(), [False, False, False, False, False, False])
+        print("PASS: identical for every bar")
+
+    def test_bars_since(self):
+        print("\nTesting bars-since arrays...")
+        since = TechnicalIndicators.bars_since([False, True, False, False, True, False])
+        self.assertTrue(np.isnan(since[0]))
+        self.assertEqual(since[1:].tolist(), [0.0, 1.0, 2.0, 0.0, 1.0])
+        self.assertEqual(len(TechnicalIndicators.bars_since([])), 0)
+
+        frame = TechnicalIndicators.add_crossover_columns(batch_frame(live_frame(300)).dropna())
+        crosses = frame['MACD_Cross_Up'] | frame['MACD_Cross_Down']
+        last = np.flatnonzero(crosses.to_numpy())[-1]
+        self.assertEqual(frame['Bars_Since_MACD_Cross'].iloc[-1], len(frame) - 1 - last)
+        print("PASS")
+
+
+if __name__ == '__main__':
+    unittest.main()
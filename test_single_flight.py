@@ -0,0 +1,123 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.single_flight import SingleFlight
+from src.rate_limiter import Priority
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_callers_share_one_request(self):
+        print("\nTesting concurrent identical calls share one request...")
+        flights = SingleFlight(window=0)
+        calls = []
+        release = threading.Event()
+
+        def fetch():
+            calls.append(1)
+            release.wait(5)
+            return {"last_price": 100.0}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(flights.do(("quote", "NSE:NIFTY 50"), fetch)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 8)
+        self.assertTrue(all(result == {"last_price": 100.0} for result in results))
+        self.assertEqual(flights.stats(), {"leaders": 1, "shared": 7})
+        print("PASS: 8 callers, 1 request")
+
+    def test_window_reuse_and_expiry(self):
+        print("\nTesting finished results are shared only within the window...")
+        flights = SingleFlight(window=0.2)
+        counter = iter(range(10))
+        self.assertEqual(flights.do("positions", lambda: next(counter)), 0)
+        self.assertEqual(flights.do("positions", lambda: next(counter)), 0)
+        time.sleep(0.3)
+        self.assertEqual(flights.do("positions", lambda: next(counter)), 1)
+        print("PASS: window respected")
+
+    def test_error_reaches_every_caller(self):
+        print("\nTesting a failed request raises in followers too...")
+        flights = SingleFlight(window=0)
+        release = threading.Event()
+        errors = []
+
+        def fetch():
+            release.wait(5)
+            raise ConnectionError("broker down")
+
+        def call():
+            try:
+                flights.do("tradebook", fetch)
+            except ConnectionError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(errors), 3)
+        print("PASS: error propagated")
+
+    def test_exit_caller_never_waits_on_lower_lane(self):
+        print("\nTesting an exit caller leads instead of joining a background request...")
+        flights = SingleFlight(window=0)
+        queued = threading.Event()
+        lanes = []
+
+        def fetch(lane):
+            lanes.append(lane)
+            if lane == Priority.BACKGROUND:
+                # Stuck behind the rate limiter's reserve
+                queued.wait(5)
+            return lane
+
+        results = {}
+        def background():
+            results["background"] = flights.do("quote", lambda: fetch(Priority.BACKGROUND), lane=Priority.BACKGROUND)
+
+        background = threading.Thread(target=background)
+        background.start()
+        time.sleep(0.05)
+
+        # Exit answers while the background call is still queued
+        start = time.monotonic()
+        self.assertEqual(flights.do("quote", lambda: fetch(Priority.EXIT), lane=Priority.EXIT), Priority.EXIT)
+        self.assertLess(time.monotonic() - start, 1.0)
+        self.assertFalse(queued.is_set())
+
+        # Equal or less urgent callers still join an in-flight call
+        call, leader = flights.begin("positions", Priority.ENTRY)
+        self.assertTrue(leader)
+        for lane in (Priority.ENTRY, Priority.BACKGROUND, None):
+            self.assertEqual(flights.begin("positions", lane), (call, False))
+        self.assertTrue(flights.begin("positions", Priority.EXIT)[1])
+
+        queued.set()
+        background.join(5)
+        self.assertEqual(results["background"], Priority.BACKGROUND)
+        self.assertEqual(lanes, [Priority.BACKGROUND, Priority.EXIT])
+        print("PASS: exit led its own request")
+
+
+if __name__ == '__main__':
+    unittest.main()
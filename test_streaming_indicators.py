@@ -0,0 +1,147 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.indicators import TechnicalIndicators
+from src.streaming_indicators import (
+    EWMState, IndicatorState, ProvisionalIndicators, StreamingADX, StreamingMACD, StreamingRSI
+)
+
+
+def make_bars(n=400, seed=7):
+    """Random walk with a flat stretch (0/0 RSI and DX) and NaN gaps"""
+    rng = np.random.default_rng(seed)
+    close = 23000 + np.cumsum(rng.normal(0, 20, n))
+    high = close + rng.uniform(0, 15, n)
+    low = close - rng.uniform(0, 15, n)
+    close[40:55] = high[40:55] = low[40:55] = close[39]
+    close[120] = high[120] = low[120] = np.nan
+    close[250:253] = np.nan
+    return high, low, close
+
+
+def assert_identical(testcase, streamed, batch, name):
+    streamed = np.asarray(streamed, dtype=float)
+    batch = np.asarray(batch, dtype=float)
+    same = (streamed == batch) | (np.isnan(streamed) & np.isnan(batch))
+    testcase.assertTrue(same.all(), f"{name} differs at bars {np.where(~same)[0][:5]}")
+
+
+# The NumPy ewm core (no numba) agrees with the sequential recursion to a few ulps
+RTOL, ATOL = 1e-12, 1e-9
+
+
+def assert_close(testcase, streamed, batch, name):
+    """Same NaN bars, values equal to within RTOL/ATOL"""
+    np.testing.assert_allclose(
+        np.asarray(streamed, dtype=float), np.asarray(batch, dtype=float), rtol=RTOL, atol=ATOL, err_msg=name
+    )
+
+
+class TestStreamingIndicators(unittest.TestCase):
+    def test_ewm_state_matches_pandas(self):
+        print("\nTesting EWMState against pandas ewm(adjust=False), NaN and min_periods included...")
+        values = [np.nan, 1.0, 2.0, np.nan, np.nan, 5.0, 5.0, 4.0, np.nan, 7.0]
+        for alpha, min_periods in ((0.3, 0), (1 / 14, 3), (2 / 13, 5)):
+            state = EWMState(alpha, min_periods)
+            streamed = [state.update(v) for v in values]
+            batch = pd.Series(values).ewm(alpha=alpha, adjust=False, min_periods=min_periods).mean()
+            assert_identical(self, streamed, batch, f"alpha={alpha}")
+        print("PASS: identical")
+
+    def test_parity_with_batch_indicators(self):
+        print("\nTesting streamed MACD/RSI/ADX match the batch functions...")
+        high, low, close = make_bars()
+        macd, rsi, adx = StreamingMACD(), StreamingRSI(), StreamingADX()
+        rows = [(macd.update(c), rsi.update(c), adx.update(h, l, c)) for h, l, c in zip(high, low, close)]
+
+        for i, batch in enumerate(TechnicalIndicators.calculate_macd(pd.Series(close))):
+            assert_close(self, [r[0][i] for r in rows], batch, "MACD")
+        assert_close(self, [r[1] for r in rows], TechnicalIndicators.calculate_rsi(pd.Series(close)), "RSI")
+        batch_adx = TechnicalIndicators.calculate_adx(pd.Series(high), pd.Series(low), pd.Series(close))
+        for i, batch in enumerate(batch_adx):
+            assert_close(self, [r[2][i] for r in rows], batch, "ADX")
+        self.assertEqual(adx.bars, len(close))
+        print("PASS: equal over 400 bars")
+
+    def test_peek_is_non_mutating(self):
+        print("\nTesting peek() evaluates a forming bar without touching the state...")
+        high, low, close = make_bars(200)
+        macd, rsi, adx = StreamingMACD(), StreamingRSI(), StreamingADX()
+        for h, l, c in zip(high[:-1], low[:-1], close[:-1]):
+            macd.update(c), rsi.update(c), adx.update(h, l, c)
+
+        for price in (close[-1] - 50, close[-1] + 50, close[-1]):
+            peeked = (macd.peek(price), rsi.peek(price), adx.peek(max(high[-1], price), min(low[-1], price), price))
+        self.assertEqual(peeked, (macd.update(close[-1]), rsi.update(close[-1]), adx.update(high[-1], low[-1], close[-1])))
+
+        batch_rsi = TechnicalIndicators.calculate_rsi(pd.Series(close)).iloc[-1]
+        self.assertEqual(peeked[1], batch_rsi)
+        print("PASS: peek == update for the same bar")
+
+
+def batch_frame(frame):
+    """The previous per-tick path: recompute everything over the live frame"""
+    out = frame[["open", "high", "low", "close"]].copy()
+    out["MACD"], out["MACD_Signal"], out["MACD_Hist"] = TechnicalIndicators.calculate_macd(out["close"])
+    out["RSI"] = TechnicalIndicators.calculate_rsi(out["close"])
+    out["ADX"], out["+DI"], out["-DI"] = TechnicalIndicators.calculate_adx(out["high"], out["low"], out["close"])
+    return out
+
+
+def assert_frames_close(frame, expected):
+    pd.testing.assert_frame_equal(frame, expected, check_exact=False, rtol=RTOL, atol=ATOL)
+
+
+def live_frame(n, seed=3):
+    high, low, close = make_bars(n, seed)
+    index = pd.date_range("2025-01-02 09:15", periods=n, freq="15min", tz="Asia/Kolkata")
+    return pd.DataFrame({"open": close, "high": high, "low": low, "close": close}, index=index)
+
+
+class TestProvisionalIndicators(unittest.TestCase):
+    def test_evaluate_provisional_matches_last_row(self):
+        print("\nTesting evaluate_provisional against the batch last row...")
+        frame = live_frame(300)
+        state = IndicatorState()
+        state.extend(frame.iloc[:-1].to_numpy())
+        last = frame.iloc[-1]
+        values = TechnicalIndicators.evaluate_provisional(state, last["high"], last["low"], last["close"])
+        expected = batch_frame(frame).iloc[-1]
+        for column, value in values.items():
+            assert_close(self, value, expected[column], column)
+        self.assertEqual(state.bars, 299)
+        print("PASS: same last bar")
+
+    def test_ticks_reuse_committed_state(self):
+        print("\nTesting per-tick frames match a full recompute without rebuilding...")
+        frame = live_frame(300)
+        live = ProvisionalIndicators()
+        key = ("NSE", "NIFTY 50")
+
+        history = frame.iloc[:250]
+        for price in (history["close"].iloc[-1] + 30, history["close"].iloc[-1] - 45):
+            ticked = history.copy()
+            ticked.iloc[-1, 1:] = [max(ticked.iloc[-1, 1], price), min(ticked.iloc[-1, 2], price), price]
+            assert_frames_close(live.frame(key, ticked), batch_frame(ticked))
+        # Next bar sealed: one O(1) commit, no rebuild
+        assert_frames_close(live.frame(key, frame.iloc[:251]), batch_frame(frame.iloc[:251]))
+        self.assertEqual(live.rebuilds, 1)
+        assert_close(self, live.last(key, frame.iloc[:251])["RSI"], batch_frame(frame.iloc[:251])["RSI"].iloc[-1], "RSI")
+
+        # A revised history bar forces a rebuild (still equal)
+        revised = frame.iloc[:251].copy()
+        revised.iloc[100, 3] += 5
+        assert_frames_close(live.frame(key, revised), batch_frame(revised))
+        self.assertEqual(live.rebuilds, 2)
+        print("PASS: 2 rebuilds for 5 frames")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import threading
+import time
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.resilience import BrokerBlindError
+from src.tick_source import TickSource, PollingTickSource, ReplayTickSource, record_ticks
+
+NIFTY = ("NSE", "NIFTY 50")
+OPTION = ("NFO", "NIFTY25FEB23000CE")
+
+
+def write_ticks(path, rows):
+    with open(path, "w") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+
+
+class FakeQuotesAPI:
+    """get_quotes() stand-in returning scripted prices"""
+
+    def __init__(self):
+        self.prices = {NIFTY: 22000.0}
+        self.blind = False
+        self.calls = 0
+
+    def get_quotes(self, instruments):
+        self.calls += 1
+        if self.blind:
+            raise BrokerBlindError("quote", 5.0)
+        return {i: {"last_price": self.prices[i]} for i in instruments if i in self.prices}
+
+
+class TestTickSource(unittest.TestCase):
+    def test_replay_publishes_changes_only(self):
+        print("\nTesting replay bumps the version only when a price moves...")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ticks.jsonl")
+            write_ticks(path, [
+                {"ts": 1.0, "exchange": "NSE", "symbol": "NIFTY 50", "last_price": 100.0},
+                {"ts": 2.0, "exchange": "NSE", "symbol": "NIFTY 50", "last_price": 100.0},
+                {"ts": 3.0, "exchange": "NSE", "symbol": "NIFTY 50", "last_price": 101.0},
+            ])
+            source = ReplayTickSource(path)
+            seen = []
+            source.add_listener(lambda instrument, quote, ts: seen.append((ts, quote["last_price"])))
+            source.subscribe([NIFTY])
+
+            self.assertEqual(source.step(), 1)
+            first = source.version
+            source.step()
+            self.assertEqual(source.version, first)
+            source.step()
+            self.assertEqual(source.version, first + 1)
+            self.assertEqual(source.snapshot([NIFTY])[NIFTY]["last_price"], 101.0)
+            self.assertEqual(seen, [(1.0, 100.0), (3.0, 101.0)])
+            self.assertEqual(source.step(), 0)
+        print("PASS: replay")
+
+    def test_wait_wakes_on_tick(self):
+        print("\nTesting a loop waiting for ticks wakes as soon as one arrives...")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ticks.jsonl")
+            write_ticks(path, [{"ts": 1.0, "exchange": "NSE", "symbol": "NIFTY 50", "last_price": 100.0}])
+            source = ReplayTickSource(path)
+            source.subscribe([NIFTY])
+            threading.Timer(0.05, source.step).start()
+
+            start = time.monotonic()
+            version = source.wait_for_update(source.version, timeout=2.0)
+            self.assertLess(time.monotonic() - start, 0.5)
+            self.assertEqual(version, 1)
+        print("PASS: push wake-up")
+
+    def test_owner_subscriptions_union(self):
+        print("\nTesting subscriptions are the union of the loops' needs...")
+        source = TickSource()
+        source.set_subscriptions("entry", [NIFTY])
+        source.set_subscriptions("exit", [NIFTY, OPTION])
+        self.assertEqual(sorted(source.subscriptions()), sorted([NIFTY, OPTION]))
+        source.set_subscriptions("exit", [NIFTY])
+        self.assertEqual(source.subscriptions(), [NIFTY])
+        source.set_subscriptions("entry", [])
+        self.assertEqual(source.subscriptions(), [NIFTY])
+        print("PASS: union kept, unused option dropped")
+
+    def test_poller_and_blind_state(self):
+        print("\nTesting the poller publishes batched quotes and surfaces a blind broker...")
+        api = FakeQuotesAPI()
+        source = PollingTickSource(api, interval=10)
+        source.subscribe([NIFTY])
+        source.poll_once()
+        self.assertEqual(source.snapshot()[NIFTY]["last_price"], 22000.0)
+        # Quotes not confirmed recently are dropped for staleness-sensitive callers
+        self.assertEqual(source.snapshot([NIFTY], max_age=0), {})
+
+        api.blind = True
+        source.poll_once()
+        with self.assertRaises(BrokerBlindError):
+            source.snapshot()
+        api.blind = False
+        api.prices[NIFTY] = 22010.0
+        source.poll_once()
+        self.assertEqual(source.snapshot()[NIFTY]["last_price"], 22010.0)
+        print("PASS: poller")
+
+    def test_record_then_replay(self):
+        print("\nTesting recorded ticks replay identically...")
+        api = FakeQuotesAPI()
+        source = PollingTickSource(api)
+        source.subscribe([NIFTY])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "recorded.jsonl")
+            record_ticks(source, path)
+            for price in (1.0, 2.0, 3.0):
+                api.prices[NIFTY] = price
+                source.poll_once()
+
+            replay = ReplayTickSource(path)
+            replay.subscribe([NIFTY])
+            prices = []
+            while replay.step():
+                prices.append(replay.snapshot()[NIFTY]["last_price"])
+            self.assertEqual(prices, [1.0, 2.0, 3.0])
+        print("PASS: record/replay")
+
+    def test_safety_confirmations_need_new_premium(self):
+        print("\nTesting spot/VIX ticks alone do not confirm the -50% safety net...")
+        from main import SAFETY_CONFIRM_SPACING, SAFETY_CONFIRMATIONS, confirm_safety_breach
+        source = TickSource()
+        source.subscribe([NIFTY, OPTION])
+        source._publish({NIFTY: {"last_price": 22000.0}, OPTION: {"last_price": 40.0}})
+
+        # Five version bumps from the spot within milliseconds, the premium cached at 40
+        counts, now, version = {}, 100.0, source.version
+        for step in range(5):
+            source._publish({NIFTY: {"last_price": 22001.0 + step}})
+            self.assertGreater(source.version, version)
+            version = source.version
+            premium = source.snapshot([OPTION])[OPTION]["last_price"]
+            count = confirm_safety_breach(counts, "pos", premium, now=now + step * 0.001)
+        self.assertEqual(count, 1)
+
+        # Counted again once the spacing has passed (polling feed) or the premium itself moves
+        self.assertEqual(confirm_safety_breach(counts, "pos", 40.0, now=now + SAFETY_CONFIRM_SPACING), 2)
+        source._publish({OPTION: {"last_price": 39.5}})
+        premium = source.snapshot([OPTION])[OPTION]["last_price"]
+        self.assertEqual(confirm_safety_breach(counts, "pos", premium, now=now + SAFETY_CONFIRM_SPACING), SAFETY_CONFIRMATIONS)
+        print("PASS: one confirmation per new premium or per second")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+from datetime import date
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.http_pool import SessionPool
+from src.market_data import MStockAPI
+from src.daily_context import DailyContext
+from src.warmup import Warmup
+from src.option_chain import OptionChain
+from mstock_simulator import start_simulator
+
+SYMBOLS = {
+    "NIFTY 50": ("NSE", "26000", "NIFTY50"),
+    "NIFTY BANK": ("NSE", "26009", "BANKNIFTY"),
+}
+
+
+class FakeMaster:
+    """Symbol master with tokens for every NIFTY strike and none for BANKNIFTY"""
+    symbol_map = {"NIFTY": "1"}
+
+    def get_nearest_expiry(self, underlying):
+        return date(2030, 1, 3)
+
+    def get_symbol(self, underlying, expiry, strike, option_type):
+        return f"{underlying}30103{strike}{option_type}"
+
+    def get_token(self, symbol):
+        return "1" if symbol.startswith("NIFTY3") else None
+
+
+class TestWarmup(unittest.TestCase):
+    def setUp(self):
+        self.server, self.state, self.base_url = start_simulator(port=0)
+
+    def tearDown(self):
+        self.server.shutdown()
+
+    def make_api(self):
+        with patch.dict(os.environ, {
+            'API_KEY': 'test', 'API_SECRET': 'test', 'CLIENT_CODE': 'test', 'PASSWORD': 'test'
+        }):
+            with patch.object(MStockAPI, 'load_access_token', return_value=None):
+                api = MStockAPI(pool_size=3, base_url=self.base_url)
+        api.candle_store = None
+        api.yf_cache.preload = lambda symbols: {symbol: True for symbol in symbols}
+        api.yf_cache.get = lambda symbol: None
+        return api
+
+    def test_prewarm_opens_every_session(self):
+        print("\nTesting prewarm opens one connection per pooled session...")
+        pool = SessionPool(pool_size=3)
+        try:
+            url = f"{self.base_url}/instruments/quote/ohlc"
+            self.assertEqual(pool.prewarm(url, "quote", params={"i": "NSE:NIFTY 50"}), 3)
+            stats = pool.stats()
+            self.assertEqual((stats["sessions"], stats["connections_opened"]), (3, 3))
+
+            for _ in range(6):
+                pool.get(url, "quote", params={"i": "NSE:NIFTY 50"})
+            self.assertEqual(pool.stats()["connections_opened"], 3)
+            print("PASS: later requests reuse the warm connections")
+        finally:
+            pool.close()
+
+    @patch('src.warmup.SymbolMaster', FakeMaster)
+    @patch('src.option_chain.SymbolMaster', FakeMaster)
+    def test_report_and_option_chain(self):
+        print("\nTesting warmup stages, readiness and the ATM option band...")
+        api = self.make_api()
+        chain = OptionChain(api, SYMBOLS, band=1)
+        warmup = Warmup(api, SYMBOLS, DailyContext(api), option_chain=chain)
+        report = warmup.run()
+
+        stages = report.as_dict()["stages"]
+        self.assertTrue(report.ready, stages)
+        self.assertEqual(api.http.stats()["sessions"], 3)
+        self.assertEqual(set(warmup.history), set(SYMBOLS))
+        self.assertGreaterEqual(api.get_connection_stats()["requests_by_endpoint"]["historical"], 2)
+
+        nifty = chain.contracts("NIFTY50")
+        atm = round(warmup.spots["NIFTY 50"] / 50) * 50
+        self.assertEqual(sorted({strike for strike, _ in nifty}), [atm - 50, atm, atm + 50])
+        self.assertEqual((nifty[(atm, "CE")].symbol, nifty[(atm, "CE")].token), (f"NIFTY30103{atm}CE", "1"))
+        self.assertEqual(len(chain.instruments()), 12)
+        # BANKNIFTY contracts have no token in this master: reported, but not fatal
+        self.assertFalse(stages["option_chain"]["ok"])
+        self.assertEqual(stages["option_chain"]["detail"], "6/12 contracts with tokens")
+        print(f"PASS: ready in {report.seconds:.2f}s")
+
+    def test_stage_failure_is_isolated(self):
+        print("\nTesting a failing stage is reported without stopping the rest...")
+        api = self.make_api()
+        api.get_quotes = MagicMock(side_effect=RuntimeError("pre-open"))
+        report = Warmup(api, SYMBOLS).run()
+        stages = report.as_dict()["stages"]
+        self.assertFalse(stages["spot_quotes"]["ok"])
+        self.assertIn("RuntimeError", stages["spot_quotes"]["detail"])
+        self.assertTrue(stages["history"]["ok"])
+        self.assertFalse(report.ready)
+        print("PASS: isolated")
+
+
+if __name__ == '__main__':
+    unittest.main()
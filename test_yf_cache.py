@@ -0,0 +1,64 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import threading
+from datetime import datetime
+
+import pytz
+
+# Add src to path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from src.yf_cache import YFinanceBarCache
+
+IST = pytz.timezone("Asia/Kolkata")
+
+
+def at(hour, minute, second=0):
+    return IST.localize(datetime(2025, 1, 2, hour, minute, second))
+
+
+class TestYFinanceBarCache(unittest.TestCase):
+    def test_expiry_aligned_to_boundary(self):
+        print("\nTesting expiry lands just after the next 15-minute boundary...")
+        cache = YFinanceBarCache(lambda symbol: None, settle_seconds=30)
+        self.assertEqual(cache._expiry(at(10, 14, 50)), at(10, 15, 30))
+        # Fetched before the settle delay: the just-closed bar may be missing, expire at the same point
+        self.assertEqual(cache._expiry(at(10, 15, 10)), at(10, 15, 30))
+        self.assertEqual(cache._expiry(at(10, 15, 40)), at(10, 30, 30))
+        print("PASS: expiry aligned")
+
+    def test_serves_cached_then_refreshes_in_background(self):
+        print("\nTesting cached bars are served without blocking after expiry...")
+        calls = []
+        release = threading.Event()
+
+        def fetch(symbol):
+            calls.append(symbol)
+            if len(calls) > 1:
+                release.wait(5)
+            return f"bars-{len(calls)}"
+
+        cache = YFinanceBarCache(fetch)
+        with patch('src.yf_cache.now_ist', return_value=at(10, 5)):
+            self.assertEqual(cache.get("NIFTY 50"), "bars-1")
+            self.assertEqual(cache.get("NIFTY 50"), "bars-1")
+        self.assertEqual(len(calls), 1)
+
+        with patch('src.yf_cache.now_ist', return_value=at(10, 16)):
+            # Expired: stale bars returned immediately while the refresh is blocked
+            self.assertEqual(cache.get("NIFTY 50"), "bars-1")
+            self.assertEqual(cache.get("NIFTY 50"), "bars-1")
+            release.set()
+            for thread in threading.enumerate():
+                if thread.name.startswith("YFRefresh"):
+                    thread.join(5)
+            self.assertEqual(cache.get("NIFTY 50"), "bars-2")
+
+        self.assertEqual(len(calls), 2)
+        print("PASS: one background refresh, no blocking")
+
+
+if __name__ == '__main__':
+    unittest.main()
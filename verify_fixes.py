@@ -15,7 +15,7 @@ except ImportError:
          pass
 
 class TestFixes(unittest.TestCase):
-    @patch('src.market_data.requests.get')
+    @patch('src.http_pool.requests.Session.request')
     def test_get_tradebook_405(self, mock_get):
         print("\nTesting get_tradebook with 405 error...")
         # Mock 405 response
@@ -40,7 +40,7 @@ class TestFixes(unittest.TestCase):
                 except Exception as e:
                     self.fail(f"get_tradebook raised exception on 405: {e}")
 
-    @patch('src.market_data.requests.get')
+    @patch('src.http_pool.requests.Session.request')
     def test_get_net_positions_dict_return(self, mock_get):
         print("\nTesting get_net_positions with Dict return (instead of List)...")
         # Mock success 200 but data is a dict